@@ -84,10 +84,14 @@ class Company:
 class ScraperDatabase:
     """SQLite database manager for the scraper."""
 
+    # Request log rows buffered before one executemany insert
+    REQUEST_LOG_BATCH = 50
+
     def __init__(self, config: StorageConfig):
         self.config = config
         self.db_path = Path(config.database_path)
         self.html_dir = Path(config.raw_html_dir)
+        self._request_log: List[tuple] = []
 
         # Create directories
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -101,12 +105,16 @@ class ScraperDatabase:
         """Get a database connection."""
         conn = sqlite3.connect(str(self.db_path))
         conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-16384")  # 16 MiB page cache
         return conn
 
     def _init_db(self):
         """Initialize database schema."""
         conn = self._get_connection()
         try:
+            # WAL is persistent: readers no longer block the writer
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.executescript("""
                 -- Job queue
                 CREATE TABLE IF NOT EXISTS jobs (
@@ -342,8 +350,13 @@ class ScraperDatabase:
         finally:
             conn.close()
 
-    def save_company(self, company, raw_html: bytes = None):
-        """Save parsed company data. Accepts either parser.Company or database.Company."""
+    def save_company(self, company, raw_html: bytes = None, complete_job: bool = False):
+        """
+        Save parsed company data. Accepts either parser.Company or database.Company.
+
+        With complete_job=True the company's job is marked completed in the
+        same transaction, so a crash never leaves saved data with an open job.
+        """
         conn = self._get_connection()
         try:
             # Serialize JSON fields
@@ -379,12 +392,12 @@ class ScraperDatabase:
 
             # Delete old directors and insert new
             conn.execute("DELETE FROM directors WHERE orgnr = ?", (company.orgnr,))
-            for director in (company.directors or []):
-                conn.execute(
-                    """
-                    INSERT INTO directors (orgnr, name, role, role_group, person_type, person_id, birth_date, birth_year)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
+            conn.executemany(
+                """
+                INSERT INTO directors (orgnr, name, role, role_group, person_type, person_id, birth_date, birth_year)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
                     (
                         company.orgnr,
                         director.get('name'),
@@ -395,6 +408,14 @@ class ScraperDatabase:
                         director.get('birth_date'),
                         director.get('birth_year')
                     )
+                    for director in (company.directors or [])
+                ]
+            )
+
+            if complete_job:
+                conn.execute(
+                    "UPDATE jobs SET status = 'completed', error = NULL WHERE orgnr = ?",
+                    (company.orgnr,)
                 )
 
             conn.commit()
@@ -425,16 +446,33 @@ class ScraperDatabase:
     def log_request(self, orgnr: str, success: bool, status_code: int,
                     response_time_ms: int, proxy_session: str,
                     error_type: str = None):
-        """Log a request for monitoring."""
+        """
+        Log a request for monitoring.
+
+        Rows are buffered and inserted REQUEST_LOG_BATCH at a time; the
+        read methods below flush first, so their figures stay current.
+        """
+        self._request_log.append((
+            datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+            orgnr, int(success), status_code, response_time_ms, proxy_session, error_type
+        ))
+        if len(self._request_log) >= self.REQUEST_LOG_BATCH:
+            self.flush_request_log()
+
+    def flush_request_log(self):
+        """Write buffered request log rows in one transaction."""
+        if not self._request_log:
+            return
+        rows, self._request_log = self._request_log, []
         conn = self._get_connection()
         try:
-            conn.execute(
+            conn.executemany(
                 """
                 INSERT INTO request_log
-                (orgnr, success, status_code, response_time_ms, proxy_session, error_type)
-                VALUES (?, ?, ?, ?, ?, ?)
+                (timestamp, orgnr, success, status_code, response_time_ms, proxy_session, error_type)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
-                (orgnr, int(success), status_code, response_time_ms, proxy_session, error_type)
+                rows
             )
             conn.commit()
         finally:
@@ -459,6 +497,7 @@ class ScraperDatabase:
 
     def get_recent_error_rate(self, minutes: int = 60) -> float:
         """Get error rate over the last N minutes."""
+        self.flush_request_log()
         conn = self._get_connection()
         try:
             cutoff = (datetime.utcnow() - timedelta(minutes=minutes)).isoformat()
@@ -482,6 +521,7 @@ class ScraperDatabase:
 
     def get_requests_today(self) -> int:
         """Get number of requests made today."""
+        self.flush_request_log()
         conn = self._get_connection()
         try:
             today_start = datetime.utcnow().replace(
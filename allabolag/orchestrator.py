@@ -135,6 +135,7 @@ class AllabolagScraper:
             logger.info("Interrupted by user")
         finally:
             self._running = False
+            self.db.flush_request_log()
             await self.session.close()
             self._log_progress()
 
@@ -167,8 +168,7 @@ class AllabolagScraper:
                 
                 if company:
                     company.scraped_at = datetime.utcnow().isoformat()
-                    self.db.save_company(company, response.content)
-                    self.db.complete_job(job.orgnr, success=True)
+                    self.db.save_company(company, response.content, complete_job=True)
                     self._stats['scraped'] += 1
                     logger.debug(f"Scraped: {company.name} ({job.orgnr})")
                 else:
@@ -33,6 +33,8 @@ class ScraperConfig:
 
     # Resume
     checkpoint_interval: int = 25   # Save progress every N items
+    write_batch_size: int = 50      # Results per database transaction
+    flush_interval: float = 30.0    # Max seconds a result waits to be written
 
     def __post_init__(self):
         # Ensure data directory exists
@@ -8,13 +8,33 @@ from contextlib import contextmanager
 
 from allabolag_scraper.config import ScraperConfig
 
+# UPDATE ... RETURNING (used to requeue failed items) needs SQLite 3.35
+MIN_SQLITE_VERSION = (3, 35, 0)
 
-def init_db(config: ScraperConfig) -> sqlite3.Connection:
-    """Initialize the database with schema."""
-    conn = sqlite3.connect(config.database_path)
+
+def init_db(config: ScraperConfig, check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Initialize the database with schema.
+
+    Pass check_same_thread=False when the connection is handed to a
+    dedicated database thread; callers must still use it from one thread
+    at a time.
+
+    Raises RuntimeError if the SQLite library is older than
+    MIN_SQLITE_VERSION.
+    """
+    if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+        raise RuntimeError(
+            f"SQLite {'.'.join(map(str, MIN_SQLITE_VERSION))} or newer is required, "
+            f"found {sqlite3.sqlite_version}"
+        )
+
+    conn = sqlite3.connect(config.database_path, check_same_thread=check_same_thread)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+    conn.execute("PRAGMA temp_store=MEMORY")
     conn.execute("PRAGMA foreign_keys=ON")
 
     # Load and execute schema
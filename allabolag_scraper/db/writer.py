@@ -0,0 +1,382 @@
+"""
+Write-behind persistence for parsed companies and persons.
+
+Parsed results are buffered as rows per statement and flushed in one
+transaction per batch with executemany. Each statement is a constant SQL
+string, so sqlite3's statement cache prepares it once per connection.
+
+Queue items are marked completed in the same transaction as their data:
+a crash loses at most the unflushed batch, whose items are still
+'in_progress' and are requeued on the next run.
+
+If a batch fails to write, its records are retried one transaction each
+so a single bad row cannot block the rest; records that still fail are
+dropped from the buffer and reported through take_failed().
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from allabolag_scraper.scraper.parser_company import Company as ParsedCompany
+from allabolag_scraper.scraper.parser_person import PersonProfile
+
+logger = logging.getLogger(__name__)
+
+
+def split_name(full_name: str) -> Tuple[Optional[str], Optional[str]]:
+    """Split full name into first_name and last_name for matching."""
+    if not full_name:
+        return None, None
+    parts = full_name.strip().split()
+    if len(parts) == 1:
+        return parts[0], None
+    return parts[0], ' '.join(parts[1:])
+
+
+def name_slug(name: str) -> str:
+    """URL slug used for person pages."""
+    return quote(name.lower().replace(' ', '-'), safe='-')
+
+
+# Statements in flush order. Conditional queue inserts run before the
+# inserts that would make their NOT EXISTS checks true. Within a batch,
+# company-page persons take precedence over connection placeholders.
+STATEMENTS = {
+    # Companies first seen on a person page are queued for a full scrape
+    'company_queue': """
+        INSERT OR IGNORE INTO company_scrape_queue (org_nr, created_at)
+        SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM companies WHERE org_nr = ?)
+    """,
+    'person_queue': """
+        INSERT OR IGNORE INTO person_scrape_queue
+        (allabolag_person_id, name, name_slug, discovered_from_company, created_at)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+    # Connected persons not yet known are queued for scraping
+    'connection_queue': """
+        INSERT OR IGNORE INTO person_scrape_queue
+        (allabolag_person_id, name, name_slug, created_at)
+        SELECT ?, ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM persons WHERE allabolag_person_id = ?)
+    """,
+    'company': """
+        INSERT INTO companies
+        (org_nr, name, legal_name, status, status_date, registration_date,
+         company_type, sni_code, sni_name, municipality, county,
+         parent_org_nr, parent_name, revenue, profit, employees,
+         allabolag_company_id, scraped_at, raw_json)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(org_nr) DO UPDATE SET
+            name = excluded.name,
+            legal_name = excluded.legal_name,
+            status = excluded.status,
+            status_date = excluded.status_date,
+            registration_date = excluded.registration_date,
+            company_type = excluded.company_type,
+            sni_code = excluded.sni_code,
+            sni_name = excluded.sni_name,
+            municipality = excluded.municipality,
+            county = excluded.county,
+            parent_org_nr = excluded.parent_org_nr,
+            parent_name = excluded.parent_name,
+            revenue = excluded.revenue,
+            profit = excluded.profit,
+            employees = excluded.employees,
+            allabolag_company_id = excluded.allabolag_company_id,
+            scraped_at = excluded.scraped_at,
+            raw_json = excluded.raw_json
+    """,
+    # Placeholder rows for role foreign keys
+    'company_placeholder': """
+        INSERT OR IGNORE INTO companies (org_nr, name, scraped_at, raw_json)
+        VALUES (?, ?, ?, '{}')
+    """,
+    'person': """
+        INSERT INTO persons (allabolag_person_id, name, first_name, last_name, birth_date, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(allabolag_person_id) DO NOTHING
+    """,
+    'person_placeholder': """
+        INSERT INTO persons (allabolag_person_id, name, first_name, last_name, gender, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(allabolag_person_id) DO NOTHING
+    """,
+    'person_profile': """
+        UPDATE persons SET
+            name = ?,
+            first_name = ?,
+            last_name = ?,
+            birth_date = ?,
+            year_of_birth = ?,
+            age = ?,
+            gender = ?,
+            person_page_scraped_at = ?,
+            person_page_raw_json = ?,
+            updated_at = ?
+        WHERE allabolag_person_id = ?
+    """,
+    'role': """
+        INSERT OR REPLACE INTO roles
+        (company_org_nr, person_id, role_type, role_group, discovered_from, scraped_at)
+        SELECT ?, id, ?, ?, ?, ? FROM persons WHERE allabolag_person_id = ?
+    """,
+    'connection': """
+        INSERT OR IGNORE INTO person_connections
+        (person_id, connected_person_id, num_shared_companies, discovered_at)
+        SELECT p.id, c.id, ?, ? FROM persons p, persons c
+        WHERE p.allabolag_person_id = ? AND c.allabolag_person_id = ?
+    """,
+    'company_completed': "UPDATE company_scrape_queue SET status = 'completed' WHERE org_nr = ?",
+    'person_completed': "UPDATE person_scrape_queue SET status = 'completed' WHERE allabolag_person_id = ?",
+}
+
+# Statements whose inserted rows are new queue items
+QUEUE_STATEMENTS = {
+    'company_queue': 'company',
+    'connection_queue': 'person',
+    'person_queue': 'person',
+}
+
+# Completion statements identify a record's queue item
+COMPLETION_STATEMENTS = {
+    'company_completed': 'company',
+    'person_completed': 'person',
+}
+
+# Errors caused by the rows themselves (constraints, unbindable values)
+WRITE_ERRORS = (sqlite3.Error, OverflowError)
+
+
+class BatchWriter:
+    """
+    Buffers parsed results and writes them in batched transactions.
+
+    A record is one finished queue item. The buffer is due for a flush
+    once it holds batch_size records or its oldest record is older than
+    flush_interval seconds.
+    """
+
+    def __init__(self, conn, batch_size: int = 50, flush_interval: float = 30.0):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._rows: Dict[str, List[tuple]] = {name: [] for name in STATEMENTS}
+        # Row counts per statement at the end of each record
+        self._marks: List[Dict[str, int]] = []
+        self._records = 0
+        self._oldest = None
+        # (kind, identifier, error) of records dropped by a failed flush
+        self._failed: List[Tuple[str, str, str]] = []
+
+        self.stats = {'flushes': 0, 'records': 0, 'rows': 0, 'seconds': 0.0, 'dropped': 0}
+
+    def __len__(self):
+        return self._records
+
+    def _record(self):
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        self._records += 1
+        self._marks.append({name: len(rows) for name, rows in self._rows.items()})
+
+    def due(self) -> bool:
+        """Whether the buffer should be flushed now."""
+        if not self._records:
+            return False
+        return (
+            self._records >= self.batch_size
+            or time.monotonic() - self._oldest >= self.flush_interval
+        )
+
+    def add_company(self, parsed: ParsedCompany, now: str):
+        """Buffer a parsed company, its persons and roles."""
+        rows = self._rows
+        rows['company'].append((
+            parsed.org_nr,
+            parsed.name,
+            parsed.legal_name,
+            parsed.status,
+            parsed.status_date.isoformat() if parsed.status_date else None,
+            parsed.registration_date.isoformat() if parsed.registration_date else None,
+            parsed.company_type,
+            parsed.sni_code,
+            parsed.sni_name,
+            parsed.municipality,
+            parsed.county,
+            parsed.parent_org_nr,
+            parsed.parent_name,
+            parsed.revenue,
+            parsed.profit,
+            parsed.employees,
+            parsed.allabolag_company_id,
+            now,
+            json.dumps(parsed.raw_json, ensure_ascii=False),
+        ))
+
+        for person in parsed.persons:
+            if not person.allabolag_id:
+                continue
+            first_name, last_name = split_name(person.name)
+            rows['person'].append((
+                person.allabolag_id,
+                person.name,
+                first_name,
+                last_name,
+                person.birth_date.isoformat() if person.birth_date else None,
+                now,
+            ))
+            rows['role'].append((
+                parsed.org_nr, person.role, person.role_group, 'company_page', now, person.allabolag_id,
+            ))
+            rows['person_queue'].append((
+                person.allabolag_id, person.name, name_slug(person.name), parsed.org_nr, now,
+            ))
+
+    def add_person(self, profile: PersonProfile, now: str):
+        """Buffer a person profile with its roles and connections."""
+        rows = self._rows
+        first_name, last_name = split_name(profile.name)
+        person_id = profile.allabolag_person_id
+        rows['person_profile'].append((
+            profile.name,
+            first_name,
+            last_name,
+            profile.birth_date.isoformat() if profile.birth_date else None,
+            profile.year_of_birth,
+            profile.age,
+            profile.gender,
+            now,
+            json.dumps(profile.raw_json, ensure_ascii=False),
+            now,
+            person_id,
+        ))
+
+        for role in profile.roles:
+            if not role.company_org_nr:
+                continue
+            rows['company_queue'].append((role.company_org_nr, now, role.company_org_nr))
+            rows['company_placeholder'].append((role.company_org_nr, role.company_name or 'Unknown', now))
+            rows['role'].append((role.company_org_nr, role.role, 'Unknown', 'person_page', now, person_id))
+
+        for conn_data in profile.connections:
+            if not conn_data.person_id:
+                continue
+            first_name, last_name = split_name(conn_data.name)
+            rows['connection_queue'].append((
+                conn_data.person_id, conn_data.name, name_slug(conn_data.name), now, conn_data.person_id,
+            ))
+            rows['person_placeholder'].append((
+                conn_data.person_id, conn_data.name, first_name, last_name, conn_data.gender, now,
+            ))
+            rows['connection'].append((conn_data.num_shared_companies, now, person_id, conn_data.person_id))
+
+    def complete_company(self, org_nr: str):
+        self._rows['company_completed'].append((org_nr,))
+        self._record()
+
+    def complete_person(self, person_id: str):
+        self._rows['person_completed'].append((person_id,))
+        self._record()
+
+    def flush(self) -> Dict[str, int]:
+        """
+        Write the buffer in one transaction.
+
+        If the transaction fails, each record is retried on its own and
+        records that still fail are dropped (see take_failed). The buffer
+        is empty afterwards either way.
+
+        Returns the number of new queue items per kind ('company', 'person').
+        """
+        queued = {'company': 0, 'person': 0}
+        if not self._records and not any(self._rows.values()):
+            return queued
+
+        start = time.perf_counter()
+        records = self._records
+        try:
+            try:
+                rows_written = self._write(self._rows, queued)
+            except WRITE_ERRORS as e:
+                logger.warning(f"Batch of {records} records failed ({e}), retrying records one by one")
+                rows_written = self._write_each(queued)
+        finally:
+            for rows in self._rows.values():
+                rows.clear()
+            self._marks.clear()
+            self._records = 0
+            self._oldest = None
+        elapsed = time.perf_counter() - start
+
+        self.stats['flushes'] += 1
+        self.stats['records'] += records
+        self.stats['rows'] += rows_written
+        self.stats['seconds'] += elapsed
+        logger.debug(
+            f"Flushed {records} records ({rows_written} rows) in {elapsed * 1000:.1f} ms, "
+            f"queued {queued['company']} companies, {queued['person']} persons"
+        )
+        return queued
+
+    def _write(self, rows_by_statement: Dict[str, List[tuple]], queued: Dict[str, int]) -> int:
+        """Execute rows in one transaction, adding new queue items to queued."""
+        rows_written = 0
+        counts = dict.fromkeys(QUEUE_STATEMENTS.values(), 0)
+        with self.conn:
+            for name, sql in STATEMENTS.items():
+                rows = rows_by_statement[name]
+                if not rows:
+                    continue
+                cursor = self.conn.executemany(sql, rows)
+                rows_written += len(rows)
+                if name in QUEUE_STATEMENTS:
+                    counts[QUEUE_STATEMENTS[name]] += cursor.rowcount
+        for kind, count in counts.items():
+            queued[kind] += count
+        return rows_written
+
+    def _split(self) -> List[Dict[str, List[tuple]]]:
+        """The buffer as one row dict per record; trailing rows form the last."""
+        records = []
+        previous = dict.fromkeys(STATEMENTS, 0)
+        for mark in self._marks + [{name: len(rows) for name, rows in self._rows.items()}]:
+            record = {name: rows[previous[name]:mark[name]] for name, rows in self._rows.items()}
+            if any(record.values()):
+                records.append(record)
+            previous = mark
+        return records
+
+    def _write_each(self, queued: Dict[str, int]) -> int:
+        """Write each record in its own transaction, dropping those that fail."""
+        rows_written = 0
+        for record in self._split():
+            try:
+                rows_written += self._write(record, queued)
+            except WRITE_ERRORS as e:
+                self.stats['dropped'] += 1
+                completions = [
+                    (kind, rows[0][0]) for name, kind in COMPLETION_STATEMENTS.items()
+                    if (rows := record[name])
+                ]
+                for kind, identifier in completions:
+                    self._failed.append((kind, identifier, f"Write failed: {e}"))
+                label = ', '.join(f"{kind} {identifier}" for kind, identifier in completions) or 'unfinished record'
+                logger.error(f"Dropped {label}: {e}")
+        return rows_written
+
+    def take_failed(self) -> List[Tuple[str, str, str]]:
+        """Records dropped since the last call, as (kind, identifier, error)."""
+        failed, self._failed = self._failed, []
+        return failed
+
+    def throughput(self) -> dict:
+        """Cumulative write statistics with records and rows per second."""
+        seconds = self.stats['seconds']
+        return {
+            **self.stats,
+            'records_per_second': self.stats['records'] / seconds if seconds else 0.0,
+            'rows_per_second': self.stats['rows'] / seconds if seconds else 0.0,
+        }
@@ -86,6 +86,9 @@ def cmd_run(args, config: ScraperConfig):
     if args.batch_size:
         config.batch_size = args.batch_size
 
+    if args.workers:
+        config.max_workers = args.workers
+
     orchestrator = Orchestrator(config)
 
     try:
@@ -109,12 +112,14 @@ def cmd_status(args, config: ScraperConfig):
     pending = stats.get('pending', 0)
     completed = stats.get('completed', 0)
     in_progress = stats.get('in_progress', 0)
-    total_companies = pending + completed + in_progress
+    failed = stats.get('failed', 0)
+    total_companies = pending + completed + in_progress + failed
 
     print(f"Company Queue:")
     print(f"  Pending:     {pending:,}")
     print(f"  In Progress: {in_progress:,}")
     print(f"  Completed:   {completed:,}")
+    print(f"  Failed:      {failed:,}")
     print(f"  Total:       {total_companies:,}")
 
     # Person queue
@@ -278,6 +283,11 @@ def main():
         type=int,
         help='Batch size'
     )
+    run_parser.add_argument(
+        '--workers',
+        type=int,
+        help='Concurrent fetch workers in interleaved mode (request rate is still set by --delay)'
+    )
 
     # Status command
     subparsers.add_parser('status', help='Show scraper status')
@@ -7,31 +7,21 @@ Phase 2: Scrape person pages for complete profiles and network discovery
 
 import asyncio
 import logging
-import json
 import sqlite3
 from datetime import datetime
 from typing import List, Optional, Tuple
-from urllib.parse import quote
 
 from allabolag_scraper.config import ScraperConfig
 from allabolag_scraper.db.connection import init_db
+from allabolag_scraper.db.writer import BatchWriter
 from allabolag_scraper.scraper.worker import Worker, FetchResult, FetchType
+from allabolag_scraper.scraper.scheduler import CrawlScheduler
 from allabolag_scraper.scraper.parser_company import parse_company, Company as ParsedCompany
 from allabolag_scraper.scraper.parser_person import parse_person_page, PersonProfile
 
 logger = logging.getLogger(__name__)
 
 
-def split_name(full_name: str) -> Tuple[Optional[str], Optional[str]]:
-    """Split full name into first_name and last_name for matching."""
-    if not full_name:
-        return None, None
-    parts = full_name.strip().split()
-    if len(parts) == 1:
-        return parts[0], None
-    return parts[0], ' '.join(parts[1:])
-
-
 class Orchestrator:
     """
     Manages two-phase scraping:
@@ -41,7 +31,14 @@ class Orchestrator:
 
     def __init__(self, config: ScraperConfig):
         self.config = config
-        self.conn = init_db(config)
+        # The interleaved scheduler drives this connection from its database thread
+        self.conn = init_db(config, check_same_thread=False)
+
+        # In-memory pending counts, kept current as items are leased and queued
+        self.pending = {'company': 0, 'person': 0}
+
+        # Parsed results are written in batches, together with their completions
+        self.writer = BatchWriter(self.conn, config.write_batch_size, config.flush_interval)
 
         # Stats per phase
         self.company_stats = {'processed': 0, 'success': 0, 'failed': 0, 'not_found': 0}
@@ -70,119 +67,23 @@ class Orchestrator:
             """, [datetime.utcnow().isoformat()] + org_nrs)
             self.conn.commit()
 
+        self.pending['company'] = max(0, self.pending['company'] - len(org_nrs))
         return org_nrs
 
     def save_company(self, parsed: ParsedCompany):
-        """Save parsed company and queue discovered persons for Phase 2."""
-        now = datetime.utcnow().isoformat()
-
-        # Upsert company
-        self.conn.execute("""
-            INSERT OR REPLACE INTO companies
-            (org_nr, name, legal_name, status, status_date, registration_date,
-             company_type, sni_code, sni_name, municipality, county,
-             parent_org_nr, parent_name, revenue, profit, employees,
-             allabolag_company_id, scraped_at, raw_json)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            parsed.org_nr,
-            parsed.name,
-            parsed.legal_name,
-            parsed.status,
-            parsed.status_date.isoformat() if parsed.status_date else None,
-            parsed.registration_date.isoformat() if parsed.registration_date else None,
-            parsed.company_type,
-            parsed.sni_code,
-            parsed.sni_name,
-            parsed.municipality,
-            parsed.county,
-            parsed.parent_org_nr,
-            parsed.parent_name,
-            parsed.revenue,
-            parsed.profit,
-            parsed.employees,
-            parsed.allabolag_company_id,
-            now,
-            json.dumps(parsed.raw_json, ensure_ascii=False)
-        ))
-
-        # Process each person discovered
-        for person_data in parsed.persons:
-            if not person_data.allabolag_id:
-                continue
-
-            # Check if person exists
-            cursor = self.conn.execute(
-                "SELECT id FROM persons WHERE allabolag_person_id = ?",
-                (person_data.allabolag_id,)
-            )
-            row = cursor.fetchone()
-
-            if row:
-                person_id = row[0]
-            else:
-                # Insert new person with split name for matching
-                first_name, last_name = split_name(person_data.name)
-                cursor = self.conn.execute("""
-                    INSERT INTO persons (allabolag_person_id, name, first_name, last_name, birth_date, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    person_data.allabolag_id,
-                    person_data.name,
-                    first_name,
-                    last_name,
-                    person_data.birth_date.isoformat() if person_data.birth_date else None,
-                    now
-                ))
-                person_id = cursor.lastrowid
-
-            # Upsert role
-            self.conn.execute("""
-                INSERT OR REPLACE INTO roles
-                (company_org_nr, person_id, role_type, role_group, discovered_from, scraped_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                parsed.org_nr,
-                person_id,
-                person_data.role,
-                person_data.role_group,
-                'company_page',
-                now
-            ))
-
-            # Queue person for Phase 2 scraping (if not already queued/scraped)
-            name_slug = person_data.name.lower().replace(' ', '-')
-            self.conn.execute("""
-                INSERT OR IGNORE INTO person_scrape_queue
-                (allabolag_person_id, name, name_slug, discovered_from_company, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                person_data.allabolag_id,
-                person_data.name,
-                quote(name_slug, safe='-'),
-                parsed.org_nr,
-                now
-            ))
-
-        self.conn.commit()
+        """Buffer a parsed company and queue discovered persons for Phase 2."""
+        self.writer.add_company(parsed, datetime.utcnow().isoformat())
 
     def mark_company_completed(self, org_nr: str):
-        self.conn.execute(
-            "UPDATE company_scrape_queue SET status = 'completed' WHERE org_nr = ?",
-            (org_nr,)
-        )
-        self.conn.commit()
+        """Buffer the completion; it is written with the company's data."""
+        self.writer.complete_company(org_nr)
+        self.flush_if_due()
 
-    def mark_company_failed(self, org_nr: str, error: str):
-        self.conn.execute("""
-            UPDATE company_scrape_queue
-            SET status = 'pending', attempts = attempts + 1, error_message = ?
-            WHERE org_nr = ?
-        """, (error, org_nr))
-        self.conn.commit()
+    def mark_company_failed(self, org_nr: str, error: str, count_attempt: bool = True):
+        self._mark_failed('company_scrape_queue', 'org_nr', org_nr, error, count_attempt, 'company')
 
-    async def process_company_result(self, result: FetchResult):
-        """Process a company fetch result."""
+    def handle_company_result(self, result: FetchResult):
+        """Parse and store a company fetch result."""
         if result.status_code == 200 and result.html:
             parsed = parse_company(result.html)
             if parsed:
@@ -199,12 +100,18 @@ class Orchestrator:
             self.company_stats['not_found'] += 1
             logger.debug(f"[404] {result.identifier}")
         else:
-            self.mark_company_failed(result.identifier, result.error or "Unknown")
+            self.mark_company_failed(
+                result.identifier, result.error or "Unknown", count_attempt=result.status_code != 429
+            )
             self.company_stats['failed'] += 1
             logger.warning(f"[FAIL] {result.identifier}: {result.error}")
 
         self.company_stats['processed'] += 1
 
+    async def process_company_result(self, result: FetchResult):
+        """Process a company fetch result."""
+        self.handle_company_result(result)
+
     # ========================
     # PHASE 2: Person Scraping
     # ========================
@@ -229,158 +136,55 @@ class Orchestrator:
             """, [datetime.utcnow().isoformat()] + person_ids)
             self.conn.commit()
 
+        self.pending['person'] = max(0, self.pending['person'] - len(persons))
         return persons
 
-    def save_person(self, profile: PersonProfile) -> int:
-        """Save complete person profile. Returns number of new companies discovered."""
-        now = datetime.utcnow().isoformat()
-        first_name, last_name = split_name(profile.name)
-
-        # Update person with full data
-        self.conn.execute("""
-            UPDATE persons SET
-                name = ?,
-                first_name = ?,
-                last_name = ?,
-                birth_date = ?,
-                year_of_birth = ?,
-                age = ?,
-                gender = ?,
-                person_page_scraped_at = ?,
-                person_page_raw_json = ?,
-                updated_at = ?
-            WHERE allabolag_person_id = ?
-        """, (
-            profile.name,
-            first_name,
-            last_name,
-            profile.birth_date.isoformat() if profile.birth_date else None,
-            profile.year_of_birth,
-            profile.age,
-            profile.gender,
-            now,
-            json.dumps(profile.raw_json, ensure_ascii=False),
-            now,
-            profile.allabolag_person_id
-        ))
-
-        # Get person ID
-        cursor = self.conn.execute(
-            "SELECT id FROM persons WHERE allabolag_person_id = ?",
-            (profile.allabolag_person_id,)
-        )
-        row = cursor.fetchone()
-        if not row:
-            return 0
-        person_id = row[0]
-
-        # Process roles (may include companies we haven't seen yet)
-        new_companies = 0
-        for role in profile.roles:
-            if not role.company_org_nr:
-                continue
-
-            # Check if company exists
-            cursor = self.conn.execute(
-                "SELECT org_nr FROM companies WHERE org_nr = ?",
-                (role.company_org_nr,)
-            )
-            if not cursor.fetchone():
-                # Create placeholder company entry (foreign key requires it)
-                self.conn.execute("""
-                    INSERT OR IGNORE INTO companies
-                    (org_nr, name, scraped_at, raw_json)
-                    VALUES (?, ?, ?, '{}')
-                """, (role.company_org_nr, role.company_name or 'Unknown', now))
-
-                # Queue for full scrape
-                self.conn.execute("""
-                    INSERT OR IGNORE INTO company_scrape_queue (org_nr, created_at)
-                    VALUES (?, ?)
-                """, (role.company_org_nr, now))
-                new_companies += 1
-
-            # Upsert role
-            self.conn.execute("""
-                INSERT OR REPLACE INTO roles
-                (company_org_nr, person_id, role_type, role_group, discovered_from, scraped_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                role.company_org_nr,
-                person_id,
-                role.role,
-                'Unknown',
-                'person_page',
-                now
-            ))
-
-        # Process connections (other persons)
-        for conn_data in profile.connections:
-            if not conn_data.person_id:
-                continue
-
-            # Ensure connected person exists
-            cursor = self.conn.execute(
-                "SELECT id FROM persons WHERE allabolag_person_id = ?",
-                (conn_data.person_id,)
-            )
-            row = cursor.fetchone()
+    def save_person(self, profile: PersonProfile):
+        """Buffer a complete person profile with its roles and connections."""
+        self.writer.add_person(profile, datetime.utcnow().isoformat())
 
-            if row:
-                connected_person_id = row[0]
-            else:
-                # Create placeholder person with split name
-                first_name, last_name = split_name(conn_data.name)
-                cursor = self.conn.execute("""
-                    INSERT INTO persons (allabolag_person_id, name, first_name, last_name, gender, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (conn_data.person_id, conn_data.name, first_name, last_name, conn_data.gender, now))
-                connected_person_id = cursor.lastrowid
-
-                # Queue for scraping
-                name_slug = conn_data.name.lower().replace(' ', '-')
-                self.conn.execute("""
-                    INSERT OR IGNORE INTO person_scrape_queue
-                    (allabolag_person_id, name, name_slug, created_at)
-                    VALUES (?, ?, ?, ?)
-                """, (conn_data.person_id, conn_data.name, quote(name_slug, safe='-'), now))
-
-            # Record connection
-            self.conn.execute("""
-                INSERT OR IGNORE INTO person_connections
-                (person_id, connected_person_id, num_shared_companies, discovered_at)
-                VALUES (?, ?, ?, ?)
-            """, (person_id, connected_person_id, conn_data.num_shared_companies, now))
+    def mark_person_completed(self, person_id: str):
+        """Buffer the completion; it is written with the person's data."""
+        self.writer.complete_person(person_id)
+        self.flush_if_due()
 
-        self.conn.commit()
-        return new_companies
+    def mark_person_failed(self, person_id: str, error: str, count_attempt: bool = True):
+        self._mark_failed('person_scrape_queue', 'allabolag_person_id', person_id, error, count_attempt, 'person')
 
-    def mark_person_completed(self, person_id: str):
-        self.conn.execute(
-            "UPDATE person_scrape_queue SET status = 'completed' WHERE allabolag_person_id = ?",
-            (person_id,)
-        )
-        self.conn.commit()
+    def _mark_failed(self, table: str, key: str, identifier: str, error: str,
+                     count_attempt: bool, kind: str):
+        """
+        Requeue a failed item, or mark it 'failed' after max_retries attempts.
 
-    def mark_person_failed(self, person_id: str, error: str):
-        self.conn.execute("""
-            UPDATE person_scrape_queue
-            SET status = 'pending', attempts = attempts + 1, error_message = ?
-            WHERE allabolag_person_id = ?
-        """, (error, person_id))
+        Rate-limited fetches (count_attempt=False) are requeued without
+        using up an attempt. Uses UPDATE ... RETURNING (SQLite 3.35+,
+        checked by init_db).
+        """
+        step = 1 if count_attempt else 0
+        cursor = self.conn.execute(f"""
+            UPDATE {table}
+            SET attempts = attempts + ?,
+                status = CASE WHEN attempts + ? >= ? THEN 'failed' ELSE 'pending' END,
+                error_message = ?
+            WHERE {key} = ?
+            RETURNING status
+        """, (step, step, self.config.max_retries, error, identifier))
+        row = cursor.fetchone()
         self.conn.commit()
+        if row and row[0] == 'pending':
+            self.pending[kind] += 1
 
-    async def process_person_result(self, result: FetchResult, name: str):
-        """Process a person fetch result."""
+    def handle_person_result(self, result: FetchResult, name: str):
+        """Parse and store a person fetch result."""
         if result.status_code == 200 and result.html:
             profile = parse_person_page(result.html)
             if profile:
-                new_companies = self.save_person(profile)
+                self.save_person(profile)
                 self.mark_person_completed(result.identifier)
                 self.person_stats['success'] += 1
                 logger.info(
                     f"[OK] {profile.name}: {len(profile.roles)} roles, "
-                    f"{len(profile.connections)} connections, {new_companies} new companies"
+                    f"{len(profile.connections)} connections"
                 )
             else:
                 self.mark_person_failed(result.identifier, "Parse failed")
@@ -391,12 +195,18 @@ class Orchestrator:
             self.person_stats['not_found'] += 1
             logger.debug(f"[404] Person {result.identifier}")
         else:
-            self.mark_person_failed(result.identifier, result.error or "Unknown")
+            self.mark_person_failed(
+                result.identifier, result.error or "Unknown", count_attempt=result.status_code != 429
+            )
             self.person_stats['failed'] += 1
             logger.warning(f"[FAIL] Person {result.identifier}: {result.error}")
 
         self.person_stats['processed'] += 1
 
+    async def process_person_result(self, result: FetchResult, name: str):
+        """Process a person fetch result."""
+        self.handle_person_result(result, name)
+
     # ========================
     # Stats
     # ========================
@@ -418,6 +228,44 @@ class Orchestrator:
             'person_pending': person_pending
         }
 
+    def flush(self):
+        """
+        Write buffered results and count the queue items they discovered.
+
+        Items whose results could not be written are marked failed, so
+        they are retried up to max_retries like failed fetches.
+        """
+        queued = self.writer.flush()
+        self.pending['company'] += queued['company']
+        self.pending['person'] += queued['person']
+
+        for kind, identifier, error in self.writer.take_failed():
+            if kind == 'company':
+                self.mark_company_failed(identifier, error)
+                self.company_stats['failed'] += 1
+            else:
+                self.mark_person_failed(identifier, error)
+                self.person_stats['failed'] += 1
+
+    def flush_if_due(self):
+        """Flush once the buffer is full or its oldest result has waited flush_interval."""
+        if self.writer.due():
+            self.flush()
+
+    def reset_queue_counts(self) -> dict:
+        """
+        Release items left 'in_progress' by an interrupted run and load
+        the in-memory pending counts. The only COUNT queries of a run.
+        """
+        self.conn.execute("UPDATE company_scrape_queue SET status = 'pending' WHERE status = 'in_progress'")
+        self.conn.execute("UPDATE person_scrape_queue SET status = 'pending' WHERE status = 'in_progress'")
+        self.conn.commit()
+
+        stats = self.get_queue_stats()
+        self.pending['company'] = stats['company_pending']
+        self.pending['person'] = stats['person_pending']
+        return dict(self.pending)
+
     def print_stats(self, phase: str):
         """Print current progress stats."""
         elapsed = datetime.now() - self.start_time
@@ -435,6 +283,14 @@ class Orchestrator:
             f"{rate:.1f}/min"
         )
 
+    def print_write_stats(self):
+        """Log database write throughput."""
+        stats = self.writer.throughput()
+        logger.info(
+            f"[WRITES] {stats['records']} records, {stats['rows']} rows in {stats['flushes']} "
+            f"transactions, {stats['seconds']:.2f}s | {stats['rows_per_second']:.0f} rows/s"
+        )
+
     # ========================
     # Main Run Methods
     # ========================
@@ -461,6 +317,8 @@ class Orchestrator:
                     if self.company_stats['processed'] % self.config.checkpoint_interval == 0:
                         self.print_stats('company')
 
+                self.flush()
+
         self.print_stats('company')
 
     async def run_phase2_persons(self):
@@ -485,61 +343,24 @@ class Orchestrator:
                     if self.person_stats['processed'] % self.config.checkpoint_interval == 0:
                         self.print_stats('person')
 
+                # Connections discovered in this batch join the queue
+                self.flush()
+
         self.print_stats('person')
 
     async def run_interleaved(self):
         """
         Run both phases concurrently - process companies and persons as they become available.
-        More efficient than sequential phases.
+
+        Several fetch workers share one connection pool and one politeness
+        budget (see CrawlScheduler); parsing and database writes run off
+        the fetch path.
         """
         logger.info("=" * 50)
         logger.info("INTERLEAVED MODE: Companies + Persons")
         logger.info("=" * 50)
 
-        async with Worker(self.config) as worker:
-            companies_done = False
-            persons_done = False
-
-            while not (companies_done and persons_done):
-                # Get pending counts
-                stats = self.get_queue_stats()
-                company_pending = stats['company_pending']
-                person_pending = stats['person_pending']
-
-                # Process a company if available
-                if company_pending > 0:
-                    batch = self.get_pending_companies(1)
-                    if batch:
-                        org_nr = batch[0]
-                        result = await worker.fetch_company(org_nr)
-                        await self.process_company_result(result)
-                        await worker.delay()
-
-                        if self.company_stats['processed'] % self.config.checkpoint_interval == 0:
-                            self.print_stats('company')
-                else:
-                    companies_done = True
-
-                # Process a person if available (interleave)
-                stats = self.get_queue_stats()
-                if stats['person_pending'] > 0:
-                    persons_done = False  # New persons may have been discovered
-                    batch = self.get_pending_persons(1)
-                    if batch:
-                        person_id, name, _ = batch[0]
-                        result = await worker.fetch_person(name, person_id)
-                        await self.process_person_result(result, name)
-                        await worker.delay()
-
-                        if self.person_stats['processed'] % self.config.checkpoint_interval == 0:
-                            self.print_stats('person')
-                elif companies_done:
-                    persons_done = True
-
-                # Check for newly discovered companies from person pages
-                stats = self.get_queue_stats()
-                if stats['company_pending'] > 0:
-                    companies_done = False
+        await CrawlScheduler(self).run()
 
         self.print_stats('company')
         self.print_stats('person')
@@ -565,6 +386,9 @@ class Orchestrator:
         elif phase == 'persons':
             await self.run_phase2_persons()
 
+        self.flush()
+        self.print_write_stats()
+
         # Check if new companies were discovered during person scraping
         final_stats = self.get_queue_stats()
         if final_stats['company_pending'] > 0:
@@ -576,6 +400,7 @@ class Orchestrator:
         logger.info("Scraper finished")
 
     def close(self):
-        """Close database connection."""
+        """Write any buffered results and close the database connection."""
         if self.conn:
+            self.flush()
             self.conn.close()
@@ -5,13 +5,13 @@ The site uses Next.js and embeds all data in a <script id="__NEXT_DATA__"> tag
 as JSON. We extract this and parse the relevant fields.
 """
 
-from bs4 import BeautifulSoup
 from dataclasses import dataclass
 from datetime import date
 from typing import Optional, List
-import json
 import re
 
+from allabolag_scraper.scraper.next_data import Page, extract_next_data
+
 
 @dataclass
 class Person:
@@ -98,22 +98,15 @@ def parse_int(value) -> Optional[int]:
     return None
 
 
-def parse_company(html: str) -> Optional[Company]:
+def parse_company(html: Page) -> Optional[Company]:
     """
     Parse company data from allabolag.se HTML.
 
     Returns Company object or None if parsing fails.
     """
-    soup = BeautifulSoup(html, 'html.parser')
-
-    # Find the __NEXT_DATA__ script tag
-    script_tag = soup.select_one('script#__NEXT_DATA__')
-    if not script_tag or not script_tag.string:
-        return None
-
-    try:
-        data = json.loads(script_tag.string)
-    except json.JSONDecodeError:
+    # Extract the __NEXT_DATA__ JSON blob
+    data = extract_next_data(html)
+    if data is None:
         return None
 
     # Navigate to company data
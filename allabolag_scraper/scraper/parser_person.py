@@ -8,13 +8,13 @@ Person pages provide:
 - Historical role information
 """
 
-from bs4 import BeautifulSoup
 from dataclasses import dataclass
 from datetime import date
 from typing import Optional, List
-import json
 from urllib.parse import quote
 
+from allabolag_scraper.scraper.next_data import Page, extract_next_data
+
 
 @dataclass
 class PersonRole:
@@ -65,22 +65,15 @@ def build_person_url(name: str, person_id: str) -> str:
     return f"https://www.allabolag.se/befattning/{name_slug}/-/{person_id}"
 
 
-def parse_person_page(html: str) -> Optional[PersonProfile]:
+def parse_person_page(html: Page) -> Optional[PersonProfile]:
     """
     Parse person data from allabolag.se person page HTML.
 
     Returns PersonProfile object or None if parsing fails.
     """
-    soup = BeautifulSoup(html, 'html.parser')
-
-    # Find the __NEXT_DATA__ script tag
-    script_tag = soup.select_one('script#__NEXT_DATA__')
-    if not script_tag or not script_tag.string:
-        return None
-
-    try:
-        data = json.loads(script_tag.string)
-    except json.JSONDecodeError:
+    # Extract the __NEXT_DATA__ JSON blob
+    data = extract_next_data(html)
+    if data is None:
         return None
 
     # Navigate to person data
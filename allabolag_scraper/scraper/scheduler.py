@@ -0,0 +1,236 @@
+"""
+Concurrent crawl scheduler for interleaved company and person scraping.
+
+N fetch workers share one httpx connection pool and one politeness
+budget, so the request rate is set by the configured delays rather than
+by response latency: a slow page holds up one worker, not the crawl.
+Company and person queues are buffered in memory and refilled from
+SQLite in leased batches. Pending counts are kept in memory by the
+orchestrator instead of being re-counted with COUNT queries.
+
+Parsing and database writes happen in a single writer that runs on a
+dedicated database thread, off the fetch path. Results are written in
+batches (see BatchWriter); the buffer is flushed early whenever the
+queues run dry, since it may hold newly discovered items, and by a timer
+once its oldest result has waited flush_interval seconds. A failed
+flush is logged and does not end the crawl.
+"""
+
+import asyncio
+import logging
+import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from allabolag_scraper.scraper.worker import Worker, FetchResult, FetchType
+
+logger = logging.getLogger(__name__)
+
+
+class PolitenessBudget:
+    """
+    Global spacing between request starts, shared by all fetch workers.
+
+    Each request reserves the next slot, min_delay..max_delay seconds after
+    the previous one. A 429 response stretches the spacing by
+    backoff_factor (up to max_backoff times); successful responses
+    shrink it back.
+    """
+
+    def __init__(
+        self,
+        min_delay: float,
+        max_delay: float,
+        backoff_factor: float = 2.0,
+        max_backoff: float = 16.0,
+    ):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.multiplier = 1.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Wait for this request's slot; returns the slot's loop time."""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next_slot)
+            spacing = random.uniform(self.min_delay, self.max_delay) * self.multiplier
+            self._next_slot = slot + spacing
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        return slot
+
+    def back_off(self):
+        """Slow down after the site signalled rate limiting."""
+        self.multiplier = min(self.multiplier * self.backoff_factor, self.max_backoff)
+        logger.warning(f"Rate limited, request spacing now x{self.multiplier:.1f}")
+
+    def recover(self):
+        """Ease back towards the configured spacing."""
+        if self.multiplier > 1.0:
+            self.multiplier = max(1.0, self.multiplier * 0.9)
+
+
+class CrawlScheduler:
+    """
+    Runs the interleaved crawl for an Orchestrator.
+
+    Items are dispatched alternately from the company and person queues.
+    The crawl ends when both queues are drained and no fetched result is
+    still waiting to be written (written results may queue new items).
+    """
+
+    def __init__(self, orchestrator, workers: Optional[int] = None):
+        self.orchestrator = orchestrator
+        self.config = orchestrator.config
+        self.workers = workers or self.config.max_workers
+        self.budget = PolitenessBudget(
+            self.config.min_delay,
+            self.config.max_delay,
+            self.config.backoff_factor,
+        )
+        self.queues = {FetchType.COMPANY: deque(), FetchType.PERSON: deque()}
+        self._refill_locks = {kind: asyncio.Lock() for kind in self.queues}
+        self._results: asyncio.Queue = asyncio.Queue(maxsize=self.workers * 4)
+        self._db = ThreadPoolExecutor(max_workers=1, thread_name_prefix="allabolag-db")
+        self._changed = asyncio.Condition()
+        self._version = 0    # Bumped whenever a result has been written
+        self._in_flight = 0  # Dispatched items whose result is not yet written
+        self._turn = 0
+
+    async def _run_db(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._db, func, *args)
+
+    async def _flush(self, func):
+        """Run a flush on the database thread; errors are logged, not raised."""
+        try:
+            await self._run_db(func)
+        except Exception as e:
+            logger.error(f"Failed to flush results: {e}")
+
+    async def _flush_loop(self):
+        """Write results that have waited flush_interval, even when no new ones arrive."""
+        interval = max(self.config.flush_interval / 2, 0.01)
+        while True:
+            await asyncio.sleep(interval)
+            await self._flush(self.orchestrator.flush_if_due)
+
+    async def _refill(self, kind: FetchType):
+        """Lease the next batch for a queue if it is empty and SQLite has more."""
+        async with self._refill_locks[kind]:
+            queue = self.queues[kind]
+            if queue or self.orchestrator.pending[kind.value] <= 0:
+                return
+            if kind is FetchType.COMPANY:
+                batch = await self._run_db(self.orchestrator.get_pending_companies, self.config.batch_size)
+            else:
+                batch = await self._run_db(self.orchestrator.get_pending_persons, self.config.batch_size)
+            if not batch:
+                # The in-memory count drifted; SQLite is authoritative
+                self.orchestrator.pending[kind.value] = 0
+            queue.extend(batch)
+
+    async def next_item(self) -> Optional[Tuple[FetchType, object]]:
+        """Next item to fetch, or None once the crawl is complete."""
+        while True:
+            seen = self._version
+            self._turn ^= 1
+            order = [FetchType.COMPANY, FetchType.PERSON]
+            if self._turn:
+                order.reverse()
+
+            for kind in order:
+                if not self.queues[kind]:
+                    await self._refill(kind)
+                if self.queues[kind]:
+                    self._in_flight += 1
+                    return kind, self.queues[kind].popleft()
+
+            if len(self.orchestrator.writer):
+                # Buffered results may hold newly discovered items
+                await self._flush(self.orchestrator.flush)
+                continue
+            if self._in_flight == 0:
+                return None
+            # Results still being fetched or written may queue more work
+            async with self._changed:
+                await self._changed.wait_for(lambda: self._version != seen)
+
+    async def _fetch_loop(self, worker: Worker):
+        while True:
+            item = await self.next_item()
+            if item is None:
+                return
+            kind, entry = item
+
+            await self.budget.acquire()
+            try:
+                if kind is FetchType.COMPANY:
+                    result = await worker.fetch_company(entry)
+                else:
+                    person_id, name, _ = entry
+                    result = await worker.fetch_person(name, person_id)
+            except Exception as e:
+                identifier = entry if kind is FetchType.COMPANY else entry[0]
+                result = FetchResult(identifier, kind, None, 0, str(e))
+
+            if result.status_code == 429:
+                self.budget.back_off()
+            else:
+                self.budget.recover()
+            await self._results.put((kind, entry, result))
+
+    def _handle(self, kind: FetchType, entry, result: FetchResult):
+        """Parse and store one result (database thread)."""
+        orchestrator = self.orchestrator
+        if kind is FetchType.COMPANY:
+            orchestrator.handle_company_result(result)
+            if orchestrator.company_stats['processed'] % self.config.checkpoint_interval == 0:
+                orchestrator.print_stats('company')
+        else:
+            orchestrator.handle_person_result(result, entry[1])
+            if orchestrator.person_stats['processed'] % self.config.checkpoint_interval == 0:
+                orchestrator.print_stats('person')
+
+    async def _write_loop(self):
+        while True:
+            item = await self._results.get()
+            if item is None:
+                return
+            try:
+                await self._run_db(self._handle, *item)
+            except Exception as e:
+                logger.error(f"Failed to store {item[0].value} {item[2].identifier}: {e}")
+            finally:
+                self._in_flight -= 1
+                self._version += 1
+                async with self._changed:
+                    self._changed.notify_all()
+
+    async def run(self):
+        """Crawl until both queues are exhausted."""
+        counts = await self._run_db(self.orchestrator.reset_queue_counts)
+        logger.info(
+            f"Scheduler: {self.workers} workers, "
+            f"{counts['company']} companies and {counts['person']} persons pending"
+        )
+
+        try:
+            async with Worker(self.config) as worker:
+                writer = asyncio.create_task(self._write_loop())
+                flusher = asyncio.create_task(self._flush_loop())
+                try:
+                    await asyncio.gather(*(self._fetch_loop(worker) for _ in range(self.workers)))
+                finally:
+                    await self._results.put(None)
+                    await writer
+                    flusher.cancel()
+                    await asyncio.gather(flusher, return_exceptions=True)
+                    await self._flush(self.orchestrator.flush)
+        finally:
+            self._db.shutdown(wait=True)
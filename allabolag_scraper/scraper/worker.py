@@ -22,7 +22,7 @@ class FetchType(Enum):
 class FetchResult:
     identifier: str        # org_nr for company, person_id for person
     fetch_type: FetchType
-    html: Optional[str]
+    html: Optional[bytes]  # Raw response body; parsers decode only __NEXT_DATA__
     status_code: int
     error: Optional[str]
 
@@ -65,10 +65,15 @@ class Worker:
         self.client: Optional[httpx.AsyncClient] = None
 
     async def __aenter__(self):
+        # One pool shared by every concurrent fetch worker
         self.client = httpx.AsyncClient(
             timeout=self.config.request_timeout,
             follow_redirects=True,
             http2=True,
+            limits=httpx.Limits(
+                max_connections=self.config.max_workers,
+                max_keepalive_connections=self.config.max_workers,
+            ),
         )
         return self
 
@@ -99,7 +104,7 @@ class Worker:
                 return FetchResult(
                     identifier=identifier,
                     fetch_type=fetch_type,
-                    html=response.text,
+                    html=response.content,
                     status_code=200,
                     error=None
                 )
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: exclusion list matching, single pattern vs per-list scans.
+
+Classifies every director name with intelligence.exclusion_lists and with
+the previous implementation (one compiled pattern per list entry, lists
+scanned in priority order), checks that both give the same categories and
+reports names per second.
+
+Usage:
+    python scripts/benchmark_exclusion_lists.py                      # data/directors.db
+    python scripts/benchmark_exclusion_lists.py --db path/to/directors.db
+    python scripts/benchmark_exclusion_lists.py --synthetic 200000  # no database
+"""
+
+import argparse
+import random
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from halo.intelligence import exclusion_lists  # noqa: E402
+from halo.intelligence.exclusion_lists import EXCLUSION_CATEGORIES  # noqa: E402
+
+FIRST_NAMES = ["Anna", "Erik", "Lars", "Karin", "Johan", "Maria", "Sebastian", "Per", "Eva",
+               "Anders", "Kerstin", "Mikael", "Ingrid", "Björn", "Elin", "Jeyla"]
+LAST_NAMES = ["Andersson", "Johansson", "Karlsson", "Nilsson", "Eriksson", "Larsson", "Olsson",
+              "Persson", "Svensson", "Gustafsson", "Lindqvist", "Hamilton", "Berg", "Ek"]
+COMPANY_WORDS = ["Bygg", "Konsult", "Fastighets", "Nordic", "Revision", "Holding", "Invest",
+                 "Förvaltning", "Advokatbyrå", "Kommun", "Teknik", "Handel"]
+
+
+def reference_classify(name, compiled):
+    """The previous is_excluded_entity: one search per list entry."""
+    if not name:
+        return None
+    name_lower = name.lower()
+    for category, patterns in compiled:
+        for pattern in patterns:
+            if pattern.search(name_lower):
+                return category
+    return None
+
+
+def load_names(db_path: Path) -> list[str]:
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("SELECT first_name, last_name FROM directors")
+        return [f"{first or ''} {last or ''}".strip() for first, last in rows]
+    finally:
+        conn.close()
+
+
+def synthetic_names(count: int, seed: int = 7) -> list[str]:
+    """Director-like names, about one in ten a company name, many repeated."""
+    rng = random.Random(seed)
+    distinct = []
+    for i in range(max(1, count // 3)):
+        if rng.random() < 0.1:
+            distinct.append(f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_WORDS)} {i} AB")
+        else:
+            middle = rng.choice(FIRST_NAMES + LAST_NAMES) + str(i)
+            distinct.append(f"{rng.choice(FIRST_NAMES)} {middle} {rng.choice(LAST_NAMES)}")
+    return [rng.choice(distinct) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=ROOT / "data" / "directors.db", help="directors.db")
+    parser.add_argument("--synthetic", type=int, default=0, help="Generate N synthetic names instead")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        names = synthetic_names(args.synthetic)
+    elif args.db.exists():
+        names = load_names(args.db)
+    else:
+        parser.error(f"{args.db} not found; give --db or --synthetic N")
+
+    compiled = [
+        (category, [re.compile(re.escape(p), re.IGNORECASE) for p in patterns])
+        for category, patterns in EXCLUSION_CATEGORIES
+    ]
+
+    start = time.perf_counter()
+    expected = [reference_classify(name, compiled) for name in names]
+    reference = time.perf_counter() - start
+
+    exclusion_lists._classify.cache_clear()
+    start = time.perf_counter()
+    got = [exclusion_lists.is_excluded_entity(name) for name in names]
+    single = time.perf_counter() - start
+
+    exclusion_lists._classify.cache_clear()
+    start = time.perf_counter()
+    batch = exclusion_lists.classify_names(names)
+    batched = time.perf_counter() - start
+
+    distinct = list(set(names))
+    start = time.perf_counter()
+    for name in distinct:
+        reference_classify(name, compiled)
+    reference_distinct = time.perf_counter() - start
+    start = time.perf_counter()
+    for name in distinct:
+        exclusion_lists._classify.__wrapped__(name.lower())
+    single_distinct = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(expected, got) if a != b)
+    mismatches += sum(1 for a, b in zip(expected, batch) if a != b)
+
+    print(f"Names: {len(names):,} ({len(set(names)):,} distinct, {sum(1 for c in got if c):,} excluded)")
+    print(f"  per-list scans:     {reference:8.3f}s  {len(names) / reference:12,.0f} names/s")
+    print(f"  single pattern:     {single:8.3f}s  {len(names) / single:12,.0f} names/s")
+    print(f"  classify_names:     {batched:8.3f}s  {len(names) / batched:12,.0f} names/s")
+    print(f"  speedup:            {reference / single:8.1f}x  (batch {reference / batched:.1f}x)")
+    print(f"  distinct, no cache: {reference_distinct / single_distinct:8.1f}x  "
+          f"({len(distinct) / single_distinct:,.0f} vs {len(distinct) / reference_distinct:,.0f} names/s)")
+    print(f"  mismatches:         {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: KB-BERT NER throughput on document-upload workloads.
+
+Runs NamedEntityRecognizer over a set of documents one text at a time and
+as one batch (windows from all documents packed into shared forward
+passes), and reports tokens per second for both. Documents are read from
+a directory through DocumentUploadAdapter, the same text extraction used
+for uploads, or generated.
+
+Usage:
+    python scripts/benchmark_ner.py --dir uploads/                # pdf, docx, txt, html, eml
+    python scripts/benchmark_ner.py --synthetic 200               # no documents
+    python scripts/benchmark_ner.py --synthetic 200 --quantize    # dynamic int8
+    python scripts/benchmark_ner.py --synthetic 200 --onnx ner.onnx --export
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from halo.ingestion.document_upload import DocumentUploadAdapter  # noqa: E402
+from halo.nlp.ner import NamedEntityRecognizer  # noqa: E402
+
+FIRST_NAMES = ["Anna", "Erik", "Lars", "Karin", "Johan", "Maria", "Per", "Eva", "Anders", "Ingrid"]
+LAST_NAMES = ["Andersson", "Johansson", "Karlsson", "Nilsson", "Eriksson", "Larsson", "Berg", "Ek"]
+PLACES = ["Stockholm", "Göteborg", "Malmö", "Uppsala", "Västerås", "Örebro", "Linköping"]
+COMPANIES = ["Nordic Bygg AB", "Konsultgruppen i Sverige AB", "Fastighets AB Ekbacken", "Handelsbolaget Lund"]
+
+
+async def load_documents(directory: Path) -> list[str]:
+    adapter = DocumentUploadAdapter()
+    texts = []
+    for path in sorted(p for p in directory.rglob("*") if p.is_file()):
+        try:
+            record = await adapter.process_file(path.read_bytes(), path.name)
+        except (ValueError, ImportError) as e:
+            print(f"  skipping {path.name}: {e}")
+            continue
+        if record.raw_data["content"]:
+            texts.append(record.raw_data["content"])
+    return texts
+
+
+def synthetic_documents(count: int, seed: int = 7) -> list[str]:
+    """Swedish-like case notes, from a paragraph to several pages long."""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        sentences = []
+        for _ in range(rng.choice([5, 20, 80, 300])):
+            person = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            sentences.append(rng.choice([
+                f"{person} är styrelseledamot i {rng.choice(COMPANIES)}.",
+                f"Bolaget har sitt säte i {rng.choice(PLACES)} sedan {rng.randrange(1990, 2024)}.",
+                f"Enligt uppgift träffade {person} företrädare för {rng.choice(COMPANIES)} i {rng.choice(PLACES)}.",
+                f"Omsättningen uppgick till {rng.randrange(1, 900)} mkr under året.",
+            ]))
+        texts.append(" ".join(sentences))
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", type=Path, help="Directory of documents to extract and analyze")
+    parser.add_argument("--synthetic", type=int, default=0, help="Generate N synthetic documents instead")
+    parser.add_argument("--model", type=Path, help="KB-BERT NER model path (default from settings)")
+    parser.add_argument("--batch-size", type=int, default=16, help="Token windows per forward pass")
+    parser.add_argument("--quantize", action="store_true", help="Dynamic int8 quantisation (PyTorch)")
+    parser.add_argument("--onnx", type=Path, help="Run inference with onnxruntime on this model")
+    parser.add_argument("--export", action="store_true", help="Export --onnx (int8) before benchmarking")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        texts = synthetic_documents(args.synthetic)
+    elif args.dir and args.dir.is_dir():
+        texts = asyncio.run(load_documents(args.dir))
+    else:
+        parser.error("give --dir DIRECTORY or --synthetic N")
+
+    if args.export:
+        if not args.onnx:
+            parser.error("--export needs --onnx PATH")
+        NamedEntityRecognizer(model_path=args.model).export_onnx(args.onnx, quantize=True)
+
+    def recognizer():
+        ner = NamedEntityRecognizer(
+            model_path=args.model,
+            batch_size=args.batch_size,
+            quantize=args.quantize,
+            onnx_path=args.onnx,
+        )
+        ner._load_model()
+        if ner._model is None:
+            sys.exit("KB-BERT NER model could not be loaded")
+        return ner
+
+    single = recognizer()
+    start = time.perf_counter()
+    expected = [single.extract_entities(text) for text in texts]
+    single_seconds = time.perf_counter() - start
+
+    batched = recognizer()
+    start = time.perf_counter()
+    got = batched.extract_entities_batch(texts)
+    batch_seconds = time.perf_counter() - start
+
+    stats = batched.throughput()
+    mismatches = sum(
+        1 for a, b in zip(expected, got)
+        if [(e.label, e.start, e.end) for e in a] != [(e.label, e.start, e.end) for e in b]
+    )
+
+    print(f"Documents: {len(texts):,} ({sum(len(t) for t in texts):,} chars, "
+          f"{stats['tokens']:,} tokens, {stats['windows']:,} windows)")
+    print(f"  per text:  {single_seconds:8.2f}s  {stats['tokens'] / single_seconds:10,.0f} tokens/s")
+    print(f"  batched:   {batch_seconds:8.2f}s  {stats['tokens'] / batch_seconds:10,.0f} tokens/s  "
+          f"(model only {stats['tokens_per_second']:,.0f} tokens/s)")
+    print(f"  speedup:   {single_seconds / batch_seconds:8.1f}x")
+    print(f"  entities:  {sum(len(e) for e in got):,}, {mismatches} documents differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: __NEXT_DATA__ extraction, byte-range scan vs BeautifulSoup.
+
+Runs both extraction paths over saved allabolag.se pages, checks that they
+decode the same JSON and reports pages per second for each.
+
+Usage:
+    python scripts/benchmark_next_data.py pages/*.html
+    python scripts/benchmark_next_data.py --synthetic 50   # no saved pages
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from allabolag_scraper.scraper.next_data import (  # noqa: E402
+    extract_next_data_fast,
+    extract_next_data_soup,
+)
+
+
+def synthetic_page(i: int) -> bytes:
+    """A page shaped like allabolag.se: large markup around one JSON blob."""
+    roles = [
+        {"type": "Person", "name": f"Person {i}-{j}", "id": f"{i}{j}", "birthDate": "01.02.1970"}
+        for j in range(40)
+    ]
+    data = {
+        "props": {"pageProps": {"company": {
+            "orgnr": f"55{i:08d}", "name": f"Bolag {i} AB",
+            "roles": {"roleGroups": [{"name": "Board", "roles": roles}]},
+            "companyAccounts": [{"year": 2000 + y, "accounts": [{"code": "SDI", "amount": y}] * 30}
+                                for y in range(20)],
+        }}},
+        "page": "/[orgnr]",
+    }
+    body = "".join(
+        f'<div class="row r{k}"><span>Rad {k}</span><a href="/x/{k}">länk</a></div>\n'
+        for k in range(2000)
+    )
+    return (
+        f'<!DOCTYPE html><html><head><title>Bolag {i} AB</title>'
+        f'<script src="/_next/static/chunks/main.js"></script></head><body>{body}'
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script>'
+        f'</body></html>'
+    ).encode('utf-8')
+
+
+def time_path(func, pages: list, repeat: int) -> float:
+    """Best-of-repeat seconds to extract every page once."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            func(page)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pages', nargs='*', type=Path, help='Saved HTML pages')
+    parser.add_argument('--synthetic', type=int, default=0, help='Generate N synthetic pages')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (best is reported)')
+    args = parser.parse_args()
+
+    pages = [p.read_bytes() for p in args.pages]
+    pages += [synthetic_page(i) for i in range(args.synthetic)]
+    if not pages:
+        parser.error('give saved pages or --synthetic N')
+
+    mismatches = sum(1 for p in pages if extract_next_data_fast(p) != extract_next_data_soup(p))
+    missing = sum(1 for p in pages if extract_next_data_fast(p) is None)
+
+    fast = time_path(extract_next_data_fast, pages, args.repeat)
+    soup = time_path(extract_next_data_soup, pages, args.repeat)
+    sizes = [len(p) for p in pages]
+
+    print(f"Pages: {len(pages)} (median {statistics.median(sizes) / 1024:.0f} KiB)")
+    print(f"  byte scan:     {fast:8.3f}s  {len(pages) / fast:10.0f} pages/s")
+    print(f"  BeautifulSoup: {soup:8.3f}s  {len(pages) / soup:10.0f} pages/s")
+    print(f"  speedup:       {soup / fast:8.1f}x")
+    print(f"  fast path missed {missing} pages (served by fallback); {mismatches} mismatches")
+
+
+if __name__ == '__main__':
+    main()
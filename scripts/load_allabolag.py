@@ -21,7 +21,7 @@ from collections import defaultdict
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -29,6 +29,7 @@ import networkx as nx
 
 from halo.graph.schema import Company, Person, Address
 from halo.graph.edges import DirectsEdge, RegisteredAtEdge
+from halo.graph.snapshot_store import GraphSnapshotReader
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -474,8 +475,17 @@ class AllabolagGraphLoader:
             print(f"  {node_type}: {count}")
 
 
-def run_pattern_detection(graph: nx.MultiDiGraph) -> dict:
-    """Run pattern detection on the graph."""
+def run_pattern_detection(graph: Union[nx.MultiDiGraph, GraphSnapshotReader, Path]) -> dict:
+    """
+    Run pattern detection on the graph.
+
+    Accepts an in-memory graph, an open GraphSnapshotReader, or the path of
+    a graph snapshot store (opened read-only without loading it into memory).
+    """
+    if isinstance(graph, Path):
+        with GraphSnapshotReader.open(graph) as snapshot:
+            return run_pattern_detection(snapshot)
+
     from scripts.load_and_analyze import PatternDetector
 
     detector = PatternDetector(graph)
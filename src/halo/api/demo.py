@@ -8,12 +8,14 @@ No auth, no database - just serves the intelligence results for demo purposes.
 import json
 import pickle
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 import networkx as nx
 
+from halo.graph.snapshot_store import GraphSnapshotReader
+
 app = FastAPI(
     title="Halo Intelligence Demo",
     description="Shell company detection demo using real Swedish company data",
@@ -30,10 +32,11 @@ app.add_middleware(
 # Data paths
 DATA_DIR = Path(__file__).parent.parent / "data"
 GRAPH_PATH = DATA_DIR / "scb_graph.pickle"
+GRAPH_STORE_PATH = DATA_DIR / "scb_graph.store"
 RESULTS_PATH = DATA_DIR / "intelligence_results.json"
 
 # Load data at startup
-GRAPH: Optional[nx.MultiDiGraph] = None
+GRAPH: Optional[Union[nx.MultiDiGraph, GraphSnapshotReader]] = None
 RESULTS: Optional[dict] = None
 
 
@@ -41,7 +44,11 @@ def load_data():
     """Load graph and intelligence results."""
     global GRAPH, RESULTS
 
-    if GRAPH_PATH.exists():
+    if (GRAPH_STORE_PATH / "manifest.json").exists():
+        # Memory-mapped, read-only snapshot; nothing is deserialised up front
+        GRAPH = GraphSnapshotReader.open(GRAPH_STORE_PATH)
+        print(f"Opened graph store: {GRAPH.number_of_nodes()} nodes, {GRAPH.number_of_edges()} edges")
+    elif GRAPH_PATH.exists():
         with open(GRAPH_PATH, "rb") as f:
             GRAPH = pickle.load(f)
         print(f"Loaded graph: {GRAPH.number_of_nodes()} nodes, {GRAPH.number_of_edges()} edges")
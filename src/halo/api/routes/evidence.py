@@ -12,15 +12,20 @@ from typing import Any, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.concurrency import iterate_in_threadpool
 
 from halo.api.deps import AuditRepo, User
+from halo.config import settings
 from halo.evidence import (
     EvidencePackage,
+    EvidenceExporter,
     create_evidence_package,
     ProvenanceChain,
     ExportFormat,
 )
+from halo.investigation.blob_store import BlobStore
 
 router = APIRouter()
 
@@ -332,3 +337,54 @@ async def export_evidence_package(
         "format": request.format,
         "expires_at": datetime.utcnow().isoformat(),
     }
+
+
+@router.get("/{package_id}/export/stream")
+async def stream_evidence_package(
+    package_id: UUID,
+    audit_repo: AuditRepo,
+    user: User,
+    format: str = Query("json", description="Items format: json (NDJSON), csv, xml"),
+):
+    """
+    Download an evidence package as a ZIP archive.
+
+    The archive is generated while it is sent, together with the stored
+    payloads of its items and a manifest with the package hash, so memory
+    use does not grow with the package size.
+    """
+    valid_formats = [f.value for f in EvidenceExporter.STREAM_ITEM_FILES]
+    if format not in valid_formats:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format. Valid options: {valid_formats}",
+        )
+
+    # In production, this would query a repository
+    package = None  # await evidence_repo.get_by_id(package_id)
+
+    if not package:
+        raise HTTPException(status_code=404, detail="Evidence package not found")
+
+    export = EvidenceExporter().export_stream(
+        package,
+        ExportFormat(format),
+        blob_store=BlobStore(settings.evidence_storage_path / "blobs"),
+    )
+
+    await audit_repo.log(
+        user_id=user.user_id,
+        user_name=user.user_name,
+        action="export",
+        resource_type="evidence_package",
+        resource_id=package_id,
+        justification=f"Exported in {format} format (streamed archive)",
+        details={"format": format},
+    )
+
+    # Compression and file reads run in a worker thread, off the event loop
+    return StreamingResponse(
+        iterate_in_threadpool(iter(export)),
+        media_type=export.content_type,
+        headers={"Content-Disposition": f'attachment; filename="{export.filename}"'},
+    )
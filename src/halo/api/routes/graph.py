@@ -298,28 +298,30 @@ async def get_full_graph(
     Returns nodes, edges, clusters, and statistics for network visualization.
     """
     async with graph:
-        # Get all entities from the graph
-        all_entities = await graph.get_all_entities(limit=max_nodes * 2)
+        # Rank entities in the backend rather than sorting a sample here
+        order_by = {"connected": "degree", "high_risk": "shell_score"}.get(mode)
+        all_entities = await graph.get_all_entities(limit=max_nodes * 2, order_by=order_by)
 
         # Filter by mode
-        if mode == "connected":
-            # Prioritize entities with more connections
-            entities = sorted(all_entities, key=lambda e: e.get("degree", 0), reverse=True)[:max_nodes]
-        elif mode == "high_risk":
-            # Prioritize high shell scores
+        if mode == "high_risk":
             entities = [e for e in all_entities if e.get("shell_score", 0) >= min_shell_score]
-            entities = sorted(entities, key=lambda e: e.get("shell_score", 0), reverse=True)[:max_nodes]
-        else:  # all
+            entities = entities[:max_nodes]
+        else:  # connected (already ranked by degree) or all
             entities = all_entities[:max_nodes]
 
-        entity_ids = {e["id"] for e in entities}
+        entity_by_id = {e["id"]: e for e in entities}
 
-        # Get all edges between these entities
-        all_edges = []
-        for entity in entities:
-            entity_edges = await graph.get_entity_edges(entity["id"])
-            # Only include edges where both nodes are in our entity set
-            all_edges.extend([e for e in entity_edges if e["source"] in entity_ids and e["target"] in entity_ids])
+        # Nodes, edges among them and component labels in one backend call
+        subgraph = await graph.get_induced_subgraph(list(entity_by_id))
+        all_edges = [
+            {
+                "id": edge.get("id"),
+                "source": edge["from_id"],
+                "target": edge["to_id"],
+                "type": (edge.get("_type") or "").replace("Edge", "").upper(),
+            }
+            for edge in subgraph["edges"]
+        ]
 
         # Remove duplicate edges
         unique_edges = []
@@ -330,30 +332,32 @@ async def get_full_graph(
                 seen_edges.add(edge_key)
                 unique_edges.append(edge)
 
-        # Find clusters (connected components)
-        components = graph.find_connected_components()
+        # Find clusters (connected components), largest first
+        members: dict[int, list[str]] = {}
+        for entity_id, label in subgraph["components"].items():
+            members.setdefault(label, []).append(entity_id)
+        sizes = subgraph["component_sizes"]
+        ranked = sorted(members, key=lambda label: sizes[label], reverse=True)[:20]
 
         # Convert to cluster format
         clusters = []
-        for i, component in enumerate(sorted(components, key=len, reverse=True)[:20]):
-            # Only include clusters that have entities in our filtered set
-            cluster_entities = [eid for eid in component if eid in entity_ids]
-            if not cluster_entities:
-                continue
-
-            cluster_companies = sum(1 for eid in cluster_entities if entities[entity_ids.index(eid)].get("type") == "Company")
-            cluster_persons = sum(1 for eid in cluster_entities if entities[entity_ids.index(eid)].get("type") == "Person")
-            shell_scores = [entities[entity_ids.index(eid)].get("shell_score", 0) for eid in cluster_entities]
+        cluster_of: dict[str, str] = {}
+        for i, label in enumerate(ranked):
+            cluster_entities = members[label]
+            cluster_id = f"cluster_{i}"
+            shell_scores = [entity_by_id[eid].get("shell_score", 0) for eid in cluster_entities]
 
             clusters.append({
-                "id": f"cluster_{i}",
+                "id": cluster_id,
                 "nodes": cluster_entities,
                 "size": len(cluster_entities),
                 "avgShellScore": sum(shell_scores) / len(shell_scores) if shell_scores else 0,
                 "maxShellScore": max(shell_scores) if shell_scores else 0,
-                "companyCount": cluster_companies,
-                "personCount": cluster_persons,
+                "companyCount": sum(1 for eid in cluster_entities if entity_by_id[eid].get("type") == "Company"),
+                "personCount": sum(1 for eid in cluster_entities if entity_by_id[eid].get("type") == "Person"),
             })
+            for eid in cluster_entities:
+                cluster_of[eid] = cluster_id
 
         # Convert entities to node format
         nodes = []
@@ -365,7 +369,7 @@ async def get_full_graph(
                 "riskScore": entity.get("risk_score", 0),
                 "shellScore": entity.get("shell_score", 0),
                 "degree": entity.get("degree", 0),
-                "clusterId": next((c["id"] for c in clusters if entity["id"] in c["nodes"]), None),
+                "clusterId": cluster_of.get(entity["id"]),
             })
 
         # Calculate stats
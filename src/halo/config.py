@@ -144,6 +144,12 @@ class Settings(BaseSettings):
         description="Path to GPT-SW3 model",
     )
 
+    # Evidence storage
+    evidence_storage_path: Path = Field(
+        default=Path("./evidence"),
+        description="Directory for evidence payloads (content-addressed blobs under blobs/)",
+    )
+
     # Security - CORS
     cors_origins: list[str] = Field(
         default=["http://localhost:3000"],
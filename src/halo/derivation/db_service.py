@@ -4,11 +4,17 @@ Database-backed derivation service.
 Connects the derivation calculators to the ontology database tables
 for nightly batch computation of derived facts.
 
+Derivations are set-based: each page of entities is fetched together with
+its address / shell-association context in one joined query (keyset
+pagination on entity id), scored in memory, and written back with a single
+UPDATE ... FROM (VALUES ...) per page.
+
 Target: <4 hours for full graph recomputation.
 """
 
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, date
 from typing import Any, Optional, TYPE_CHECKING
 from uuid import UUID, uuid4
@@ -19,7 +25,7 @@ from halo.derivation.risk_score import (
     AddressRiskScorer,
     RiskScoreResult,
 )
-from halo.derivation.velocity import DirectorVelocityCalculator, DirectorChange
+from halo.derivation.velocity import DirectorVelocityCalculator
 from halo.derivation.shell_indicators import ShellIndicatorCalculator, ShellIndicators
 
 if TYPE_CHECKING:
@@ -29,6 +35,9 @@ logger = logging.getLogger(__name__)
 
 
 # SQL Queries for derivation jobs
+# Smallest UUID; keyset pagination starts strictly after it
+KEYSET_START = UUID(int=0)
+
 FETCH_ACTIVE_PERSONS_QUERY = """
 SELECT
     e.id as entity_id,
@@ -36,24 +45,26 @@ SELECT
     pa.company_count,
     pa.active_directorship_count,
     pa.risk_score as current_risk_score,
-    pa.risk_factors
+    pa.risk_factors,
+    COALESCE(sc.shell_count, 0) as shell_count
 FROM onto_entities e
 JOIN onto_person_attributes pa ON pa.entity_id = e.id
+LEFT JOIN LATERAL (
+    SELECT COUNT(*) as shell_count
+    FROM onto_facts f
+    JOIN onto_company_attributes ca ON ca.entity_id = f.object_id
+    WHERE f.subject_id = e.id
+    AND f.predicate = 'DIRECTOR_OF'
+    AND f.superseded_by IS NULL
+    AND f.valid_to IS NULL
+    AND ca.shell_indicators IS NOT NULL
+    AND array_length(ca.shell_indicators, 1) >= 3
+) sc ON TRUE
 WHERE e.entity_type = 'PERSON'
 AND e.status = 'ACTIVE'
-LIMIT :batch_size OFFSET :offset;
-"""
-
-FETCH_PERSON_SHELL_ASSOCIATIONS_QUERY = """
-SELECT COUNT(*) as shell_count
-FROM onto_facts f
-JOIN onto_company_attributes ca ON ca.entity_id = f.object_id
-WHERE f.subject_id = :person_id
-AND f.predicate = 'DIRECTOR_OF'
-AND f.superseded_by IS NULL
-AND f.valid_to IS NULL
-AND ca.shell_indicators IS NOT NULL
-AND array_length(ca.shell_indicators, 1) >= 3;
+AND e.id > :after_id
+ORDER BY e.id
+LIMIT :batch_size;
 """
 
 FETCH_ACTIVE_COMPANIES_QUERY = """
@@ -68,25 +79,25 @@ SELECT
     ca.sni_primary,
     ca.director_change_velocity,
     ca.shell_indicators,
-    ca.risk_score as current_risk_score
+    ca.risk_score as current_risk_score,
+    addr.street as address_street
 FROM onto_entities e
 JOIN onto_company_attributes ca ON ca.entity_id = e.id
 LEFT JOIN onto_entity_identifiers ei ON ei.entity_id = e.id AND ei.identifier_type = 'ORGANISATIONSNUMMER'
+LEFT JOIN LATERAL (
+    SELECT aa.street
+    FROM onto_facts f
+    JOIN onto_address_attributes aa ON aa.entity_id = f.object_id
+    WHERE f.subject_id = e.id
+    AND f.predicate = 'REGISTERED_AT'
+    AND f.superseded_by IS NULL
+    LIMIT 1
+) addr ON TRUE
 WHERE e.entity_type = 'COMPANY'
 AND e.status = 'ACTIVE'
-LIMIT :batch_size OFFSET :offset;
-"""
-
-FETCH_COMPANY_ADDRESS_TYPE_QUERY = """
-SELECT
-    aa.street,
-    aa.city
-FROM onto_facts f
-JOIN onto_address_attributes aa ON aa.entity_id = f.object_id
-WHERE f.subject_id = :company_id
-AND f.predicate = 'REGISTERED_AT'
-AND f.superseded_by IS NULL
-LIMIT 1;
+AND e.id > :after_id
+ORDER BY e.id
+LIMIT :batch_size;
 """
 
 FETCH_ACTIVE_ADDRESSES_QUERY = """
@@ -104,7 +115,23 @@ FROM onto_entities e
 JOIN onto_address_attributes aa ON aa.entity_id = e.id
 WHERE e.entity_type = 'ADDRESS'
 AND e.status = 'ACTIVE'
-LIMIT :batch_size OFFSET :offset;
+AND e.id > :after_id
+ORDER BY e.id
+LIMIT :batch_size;
+"""
+
+FETCH_ADDRESS_COUNTS_QUERY = """
+SELECT
+    f.object_id as address_id,
+    COUNT(DISTINCT f.subject_id) as company_count,
+    COUNT(DISTINCT dir.subject_id) as person_count
+FROM onto_facts f
+LEFT JOIN onto_facts dir ON dir.object_id = f.subject_id
+    AND dir.predicate = 'DIRECTOR_OF'
+    AND dir.superseded_by IS NULL
+WHERE f.predicate = 'REGISTERED_AT'
+AND f.superseded_by IS NULL
+GROUP BY f.object_id
 """
 
 FETCH_DIRECTOR_CHANGES_QUERY = """
@@ -122,33 +149,59 @@ AND f.valid_from >= :start_date
 ORDER BY f.valid_from;
 """
 
+# Bulk updates: {values} is filled by _values_clause() with one typed
+# row per entity, so a whole page is written in a single statement.
 UPDATE_PERSON_RISK_SCORE_QUERY = """
-UPDATE onto_person_attributes
-SET risk_score = :risk_score,
-    risk_factors = :risk_factors,
+UPDATE onto_person_attributes AS pa
+SET risk_score = v.risk_score,
+    risk_factors = v.risk_factors,
     updated_at = NOW()
-WHERE entity_id = :entity_id;
+FROM (VALUES {values}) AS v(entity_id, risk_score, risk_factors)
+WHERE pa.entity_id = v.entity_id;
 """
 
+PERSON_UPDATE_COLUMNS = (
+    ("entity_id", "uuid"),
+    ("risk_score", "double precision"),
+    ("risk_factors", "text[]"),
+)
+
 UPDATE_COMPANY_ATTRIBUTES_QUERY = """
-UPDATE onto_company_attributes
-SET risk_score = :risk_score,
-    risk_factors = :risk_factors,
-    shell_indicators = :shell_indicators,
-    director_change_velocity = :velocity,
+UPDATE onto_company_attributes AS ca
+SET risk_score = v.risk_score,
+    risk_factors = v.risk_factors,
+    shell_indicators = v.shell_indicators,
+    director_change_velocity = v.velocity,
     updated_at = NOW()
-WHERE entity_id = :entity_id;
+FROM (VALUES {values}) AS v(entity_id, risk_score, risk_factors, shell_indicators, velocity)
+WHERE ca.entity_id = v.entity_id;
 """
 
+COMPANY_UPDATE_COLUMNS = (
+    ("entity_id", "uuid"),
+    ("risk_score", "double precision"),
+    ("risk_factors", "text[]"),
+    ("shell_indicators", "text[]"),
+    ("velocity", "double precision"),
+)
+
 UPDATE_ADDRESS_ATTRIBUTES_QUERY = """
-UPDATE onto_address_attributes
-SET company_count = :company_count,
-    person_count = :person_count,
-    is_registration_hub = :is_hub,
+UPDATE onto_address_attributes AS aa
+SET company_count = v.company_count,
+    person_count = v.person_count,
+    is_registration_hub = v.is_hub,
     updated_at = NOW()
-WHERE entity_id = :entity_id;
+FROM (VALUES {values}) AS v(entity_id, company_count, person_count, is_hub)
+WHERE aa.entity_id = v.entity_id;
 """
 
+ADDRESS_UPDATE_COLUMNS = (
+    ("entity_id", "uuid"),
+    ("company_count", "integer"),
+    ("person_count", "integer"),
+    ("is_hub", "boolean"),
+)
+
 LOG_DERIVATION_RUN_QUERY = """
 INSERT INTO onto_derivation_runs (id, rule_id, started_at, completed_at, entities_processed, status, error_message)
 VALUES (:id, :rule_id, :started_at, :completed_at, :entities_processed, :status, :error_message);
@@ -159,6 +212,38 @@ SELECT id FROM onto_derivation_rules WHERE rule_name = :rule_name AND active = T
 """
 
 
+def _values_clause(rows: list[dict], columns: tuple) -> tuple[str, dict]:
+    """
+    Build a typed VALUES list and its bind parameters for a bulk update.
+
+    Args:
+        rows: One dict per entity, keyed by column name
+        columns: (name, sql_type) pairs in VALUES column order
+
+    Returns:
+        (SQL fragment, parameters)
+    """
+    tuples = []
+    params = {}
+    for i, row in enumerate(rows):
+        parts = []
+        for name, sql_type in columns:
+            key = f"{name}_{i}"
+            params[key] = row[name]
+            parts.append(f"CAST(:{key} AS {sql_type})")
+        tuples.append("(" + ", ".join(parts) + ")")
+    return ",\n".join(tuples), params
+
+
+def _address_type(street: Optional[str]) -> Optional[str]:
+    """Classify a registered street address for shell scoring."""
+    if street:
+        addr_lower = street.lower()
+        if "c/o" in addr_lower or "box" in addr_lower:
+            return "c_o"
+    return None
+
+
 @dataclass
 class DerivationJobStats:
     """Statistics from a derivation job run."""
@@ -169,6 +254,7 @@ class DerivationJobStats:
     entities_processed: int = 0
     entities_updated: int = 0
     errors: list[str] = None
+    phase_seconds: dict[str, float] = field(default_factory=dict)
 
     def __post_init__(self):
         if self.errors is None:
@@ -180,6 +266,10 @@ class DerivationJobStats:
             return (self.completed_at - self.started_at).total_seconds()
         return None
 
+    def add_phase(self, phase: str, seconds: float) -> None:
+        """Accumulate wall time spent in a phase (fetch, compute, write)."""
+        self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + seconds
+
 
 class DerivationDBService:
     """
@@ -216,7 +306,9 @@ class DerivationDBService:
         stats = {}
 
         # 1. Load director changes for velocity
+        t0 = time.perf_counter()
         await self._load_director_changes()
+        logger.info(f"Director changes loaded in {time.perf_counter() - t0:.1f}s")
 
         # 2. Company derivations (shell indicators + velocity + risk)
         stats["company_derivation"] = await self.compute_company_derivations()
@@ -252,72 +344,86 @@ class DerivationDBService:
         rows = result.fetchall()
 
         self.velocity_calculator.clear()
-
-        for row in rows:
-            # A fact with valid_from creates an "added" event
-            self.velocity_calculator.add_change(DirectorChange(
-                company_id=row.company_id,
-                person_id=row.person_id,
-                person_name=row.person_name or "",
-                change_type="added",
-                change_date=row.valid_from,
-                role=row.role or "director",
-            ))
-
-            # If valid_to is set, that's a "removed" event
-            if row.valid_to:
-                self.velocity_calculator.add_change(DirectorChange(
-                    company_id=row.company_id,
-                    person_id=row.person_id,
-                    person_name=row.person_name or "",
-                    change_type="removed",
-                    change_date=row.valid_to,
-                    role=row.role or "director",
-                ))
+        self.velocity_calculator.load_fact_rows(rows)
 
         logger.info(f"Loaded {len(rows)} director change records")
 
+    async def _fetch_page(self, query: str, after_id: UUID, stats: DerivationJobStats) -> list:
+        """Fetch the next keyset page of entities ordered by id."""
+        from sqlalchemy import text
+
+        t0 = time.perf_counter()
+        result = await self.session.execute(
+            text(query),
+            {"batch_size": self.BATCH_SIZE, "after_id": after_id}
+        )
+        rows = result.fetchall()
+        stats.add_phase("fetch", time.perf_counter() - t0)
+        return rows
+
+    async def _write_page(
+        self,
+        query: str,
+        columns: tuple,
+        updates: list[dict],
+        stats: DerivationJobStats,
+        label: str,
+    ) -> None:
+        """Write one page of results with a single bulk UPDATE and commit."""
+        from sqlalchemy import text
+
+        if not updates:
+            return
+
+        t0 = time.perf_counter()
+        values, params = _values_clause(updates, columns)
+        try:
+            await self.session.execute(text(query.format(values=values)), params)
+            await self.session.commit()
+            stats.entities_updated += len(updates)
+        except Exception as e:
+            await self.session.rollback()
+            first = updates[0]["entity_id"]
+            stats.errors.append(f"{label} batch from {first}: {str(e)}")
+            logger.error(f"Error writing {label.lower()} batch from {first}: {e}")
+        stats.add_phase("write", time.perf_counter() - t0)
+
+    def _finish(self, stats: DerivationJobStats) -> None:
+        stats.completed_at = datetime.utcnow()
+        phases = ", ".join(f"{k}={v:.1f}s" for k, v in stats.phase_seconds.items())
+        logger.info(
+            f"{stats.job_type} complete: {stats.entities_processed} processed, "
+            f"{stats.entities_updated} updated in {stats.duration_seconds:.1f}s ({phases})"
+        )
+
     async def compute_company_derivations(self) -> DerivationJobStats:
         """
         Compute shell indicators, velocity, and risk for all companies.
         """
-        from sqlalchemy import text
-
         stats = DerivationJobStats(
             job_type="company_derivation",
             started_at=datetime.utcnow(),
         )
 
-        offset = 0
-        while True:
-            result = await self.session.execute(
-                text(FETCH_ACTIVE_COMPANIES_QUERY),
-                {"batch_size": self.BATCH_SIZE, "offset": offset}
-            )
-            rows = result.fetchall()
+        # All company velocities in one pass over the change index
+        t0 = time.perf_counter()
+        velocities = self.velocity_calculator.calculate_all_company_velocities()
+        stats.add_phase("compute", time.perf_counter() - t0)
 
+        after_id = KEYSET_START
+        while True:
+            rows = await self._fetch_page(FETCH_ACTIVE_COMPANIES_QUERY, after_id, stats)
             if not rows:
                 break
 
+            t0 = time.perf_counter()
+            updates = []
             for row in rows:
                 try:
-                    # Calculate velocity
-                    velocity_result = self.velocity_calculator.calculate_company_velocity(
-                        row.entity_id
-                    )
+                    velocity = velocities.get(row.entity_id, 0.0)
 
                     # Calculate shell indicators
-                    # Get address type
-                    addr_result = await self.session.execute(
-                        text(FETCH_COMPANY_ADDRESS_TYPE_QUERY),
-                        {"company_id": row.entity_id}
-                    )
-                    addr_row = addr_result.fetchone()
-                    address_type = None
-                    if addr_row and addr_row.street:
-                        addr_lower = addr_row.street.lower()
-                        if "c/o" in addr_lower or "box" in addr_lower:
-                            address_type = "c_o"
+                    address_type = _address_type(row.address_street)
 
                     shell_indicators = self.shell_calculator.calculate(
                         company_id=row.entity_id,
@@ -328,7 +434,7 @@ class DerivationDBService:
                         sni_code=row.sni_primary,
                         registration_date=row.registration_date,
                         address_type=address_type,
-                        director_velocity=velocity_result.velocity,
+                        director_velocity=velocity,
                     )
 
                     # Calculate company risk
@@ -339,105 +445,80 @@ class DerivationDBService:
                         sni_code=row.sni_primary,
                         registration_date=row.registration_date,
                         address_type=address_type,
-                        director_velocity=velocity_result.velocity,
+                        director_velocity=velocity,
                     )
 
-                    # Update company attributes
-                    await self.session.execute(
-                        text(UPDATE_COMPANY_ATTRIBUTES_QUERY),
-                        {
-                            "entity_id": row.entity_id,
-                            "risk_score": risk_result.risk_score,
-                            "risk_factors": risk_result.factors.to_list(),
-                            "shell_indicators": shell_indicators.to_list(),
-                            "velocity": velocity_result.velocity,
-                        }
-                    )
-                    stats.entities_updated += 1
+                    updates.append({
+                        "entity_id": row.entity_id,
+                        "risk_score": risk_result.risk_score,
+                        "risk_factors": risk_result.factors.to_list(),
+                        "shell_indicators": shell_indicators.to_list(),
+                        "velocity": velocity,
+                    })
 
                 except Exception as e:
                     stats.errors.append(f"Company {row.entity_id}: {str(e)}")
                     logger.error(f"Error processing company {row.entity_id}: {e}")
 
                 stats.entities_processed += 1
+            stats.add_phase("compute", time.perf_counter() - t0)
 
-            await self.session.commit()
-            offset += self.BATCH_SIZE
+            await self._write_page(
+                UPDATE_COMPANY_ATTRIBUTES_QUERY, COMPANY_UPDATE_COLUMNS,
+                updates, stats, "Company",
+            )
+            after_id = rows[-1].entity_id
 
             logger.debug(f"Processed {stats.entities_processed} companies")
 
-        stats.completed_at = datetime.utcnow()
-        logger.info(
-            f"Company derivation complete: {stats.entities_processed} processed, "
-            f"{stats.entities_updated} updated in {stats.duration_seconds:.1f}s"
-        )
-
+        self._finish(stats)
         return stats
 
     async def compute_person_risk_scores(self) -> DerivationJobStats:
         """Compute risk scores for all persons."""
-        from sqlalchemy import text
-
         stats = DerivationJobStats(
             job_type="person_risk",
             started_at=datetime.utcnow(),
         )
 
-        offset = 0
+        after_id = KEYSET_START
         while True:
-            result = await self.session.execute(
-                text(FETCH_ACTIVE_PERSONS_QUERY),
-                {"batch_size": self.BATCH_SIZE, "offset": offset}
-            )
-            rows = result.fetchall()
-
+            rows = await self._fetch_page(FETCH_ACTIVE_PERSONS_QUERY, after_id, stats)
             if not rows:
                 break
 
+            t0 = time.perf_counter()
+            updates = []
             for row in rows:
                 try:
-                    # Get shell company associations
-                    shell_result = await self.session.execute(
-                        text(FETCH_PERSON_SHELL_ASSOCIATIONS_QUERY),
-                        {"person_id": row.entity_id}
-                    )
-                    shell_row = shell_result.fetchone()
-                    shell_count = shell_row.shell_count if shell_row else 0
-
-                    # Calculate person risk
+                    # Calculate person risk (shell associations come from the page query)
                     risk_result = self.person_scorer.compute(
                         person_id=row.entity_id,
                         company_count=row.company_count or 0,
                         active_directorship_count=row.active_directorship_count or 0,
-                        shell_company_count=shell_count,
+                        shell_company_count=row.shell_count or 0,
                     )
 
-                    # Update person attributes
-                    await self.session.execute(
-                        text(UPDATE_PERSON_RISK_SCORE_QUERY),
-                        {
-                            "entity_id": row.entity_id,
-                            "risk_score": risk_result.risk_score,
-                            "risk_factors": risk_result.factors.to_list(),
-                        }
-                    )
-                    stats.entities_updated += 1
+                    updates.append({
+                        "entity_id": row.entity_id,
+                        "risk_score": risk_result.risk_score,
+                        "risk_factors": risk_result.factors.to_list(),
+                    })
 
                 except Exception as e:
                     stats.errors.append(f"Person {row.entity_id}: {str(e)}")
                     logger.error(f"Error processing person {row.entity_id}: {e}")
 
                 stats.entities_processed += 1
+            stats.add_phase("compute", time.perf_counter() - t0)
 
-            await self.session.commit()
-            offset += self.BATCH_SIZE
-
-        stats.completed_at = datetime.utcnow()
-        logger.info(
-            f"Person risk computation complete: {stats.entities_processed} processed, "
-            f"{stats.entities_updated} updated in {stats.duration_seconds:.1f}s"
-        )
+            await self._write_page(
+                UPDATE_PERSON_RISK_SCORE_QUERY, PERSON_UPDATE_COLUMNS,
+                updates, stats, "Person",
+            )
+            after_id = rows[-1].entity_id
 
+        self._finish(stats)
         return stats
 
     async def compute_address_statistics(self) -> DerivationJobStats:
@@ -449,52 +530,31 @@ class DerivationDBService:
             started_at=datetime.utcnow(),
         )
 
-        # Query to count companies at each address
-        count_query = """
-        SELECT
-            f.object_id as address_id,
-            COUNT(DISTINCT f.subject_id) as company_count,
-            COUNT(DISTINCT dir.subject_id) as person_count
-        FROM onto_facts f
-        LEFT JOIN onto_facts dir ON dir.object_id = f.subject_id
-            AND dir.predicate = 'DIRECTOR_OF'
-            AND dir.superseded_by IS NULL
-        WHERE f.predicate = 'REGISTERED_AT'
-        AND f.superseded_by IS NULL
-        GROUP BY f.object_id
-        """
-
-        result = await self.session.execute(text(count_query))
+        t0 = time.perf_counter()
+        result = await self.session.execute(text(FETCH_ADDRESS_COUNTS_QUERY))
         rows = result.fetchall()
+        stats.add_phase("fetch", time.perf_counter() - t0)
 
-        for row in rows:
-            try:
+        for start in range(0, len(rows), self.BATCH_SIZE):
+            t0 = time.perf_counter()
+            updates = []
+            for row in rows[start:start + self.BATCH_SIZE]:
                 is_hub = row.company_count >= 10 and row.person_count < row.company_count / 2
+                updates.append({
+                    "entity_id": row.address_id,
+                    "company_count": row.company_count,
+                    "person_count": row.person_count,
+                    "is_hub": is_hub,
+                })
+                stats.entities_processed += 1
+            stats.add_phase("compute", time.perf_counter() - t0)
 
-                await self.session.execute(
-                    text(UPDATE_ADDRESS_ATTRIBUTES_QUERY),
-                    {
-                        "entity_id": row.address_id,
-                        "company_count": row.company_count,
-                        "person_count": row.person_count,
-                        "is_hub": is_hub,
-                    }
-                )
-                stats.entities_updated += 1
-
-            except Exception as e:
-                stats.errors.append(f"Address {row.address_id}: {str(e)}")
-
-            stats.entities_processed += 1
-
-        await self.session.commit()
-
-        stats.completed_at = datetime.utcnow()
-        logger.info(
-            f"Address stats complete: {stats.entities_processed} processed, "
-            f"{stats.entities_updated} updated"
-        )
+            await self._write_page(
+                UPDATE_ADDRESS_ATTRIBUTES_QUERY, ADDRESS_UPDATE_COLUMNS,
+                updates, stats, "Address",
+            )
 
+        self._finish(stats)
         return stats
 
     async def log_derivation_run(
@@ -555,6 +615,7 @@ async def run_nightly_derivation(session: "AsyncSession") -> dict[str, Any]:
             "processed": s.entities_processed,
             "updated": s.entities_updated,
             "duration_seconds": s.duration_seconds,
+            "phase_seconds": s.phase_seconds,
             "errors": len(s.errors),
         }
         for job_type, s in stats.items()
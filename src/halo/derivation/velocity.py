@@ -6,6 +6,7 @@ which is an indicator of potential fraud.
 """
 
 import logging
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 from typing import Optional
@@ -64,21 +65,117 @@ class DirectorVelocityCalculator:
     - Shell companies (directors move frequently)
     - Phoenix fraud (directors abandon failing companies)
     - Nominee director arrangements
+
+    Changes are indexed per company and per person as date-sorted arrays,
+    so a window query is two bisects rather than a scan of every change.
+    The index is built lazily and rebuilt after changes are added.
     """
 
     DEFAULT_PERIOD_DAYS = 365 * 2  # 2 years of history
 
+    # Entity stride for the flattened (entity, ordinal) key used by the
+    # vectorised queries; larger than any date.toordinal().
+    _ORDINAL_STRIDE = 10_000_000
+
     def __init__(self, period_days: int = DEFAULT_PERIOD_DAYS):
         self.period_days = period_days
         self._changes: list[DirectorChange] = []
+        self._index: Optional[dict[str, "_EntityIndex"]] = None
 
     def add_change(self, change: DirectorChange) -> None:
         """Add a director change event."""
         self._changes.append(change)
+        self._index = None
 
     def add_changes(self, changes: list[DirectorChange]) -> None:
         """Add multiple director change events."""
         self._changes.extend(changes)
+        self._index = None
+
+    def load_fact_rows(self, rows) -> int:
+        """
+        Bulk load DIRECTOR_OF fact rows.
+
+        Each row needs company_id, person_id, person_name, valid_from,
+        valid_to and role (as returned by FETCH_DIRECTOR_CHANGES_QUERY).
+        valid_from becomes an "added" event and valid_to, when set, a
+        "removed" event.
+
+        Returns:
+            Number of change events added
+        """
+        changes = []
+        for row in rows:
+            person_name = row.person_name or ""
+            role = row.role or "director"
+            changes.append(DirectorChange(
+                company_id=row.company_id,
+                person_id=row.person_id,
+                person_name=person_name,
+                change_type="added",
+                change_date=row.valid_from,
+                role=role,
+            ))
+            if row.valid_to:
+                changes.append(DirectorChange(
+                    company_id=row.company_id,
+                    person_id=row.person_id,
+                    person_name=person_name,
+                    change_type="removed",
+                    change_date=row.valid_to,
+                    role=role,
+                ))
+
+        self.add_changes(changes)
+        return len(changes)
+
+    def _ensure_index(self) -> dict[str, "_EntityIndex"]:
+        if self._index is None:
+            order = sorted(
+                range(len(self._changes)),
+                key=lambda i: self._changes[i].change_date.toordinal(),
+            )
+            ordered = [self._changes[i] for i in order]
+            self._index = {
+                "company": _EntityIndex(ordered, lambda c: c.company_id),
+                "person": _EntityIndex(ordered, lambda c: c.person_id),
+            }
+        return self._index
+
+    def _window(self, as_of_date: Optional[date]) -> tuple[int, int]:
+        as_of_date = as_of_date or date.today()
+        cutoff_date = as_of_date - timedelta(days=self.period_days)
+        return cutoff_date.toordinal(), as_of_date.toordinal()
+
+    def _velocity(self, total_changes: int) -> float:
+        years = self.period_days / 365
+        return total_changes / years if years > 0 else 0.0
+
+    def _calculate(
+        self,
+        kind: str,
+        entity_id: UUID,
+        as_of_date: Optional[date],
+    ) -> VelocityResult:
+        lo, hi = self._window(as_of_date)
+        changes = self._ensure_index()[kind].window(entity_id, lo, hi)
+
+        return VelocityResult(
+            entity_id=entity_id,
+            entity_type=kind.upper(),
+            velocity=self._velocity(len(changes)),
+            total_changes=len(changes),
+            period_days=self.period_days,
+            changes=changes,
+        )
+
+    def _calculate_all(self, kind: str, as_of_date: Optional[date]) -> dict[UUID, float]:
+        lo, hi = self._window(as_of_date)
+        counts = self._ensure_index()[kind].window_counts(lo, hi, self._ORDINAL_STRIDE)
+        years = self.period_days / 365
+        if years <= 0:
+            return {entity_id: 0.0 for entity_id in counts}
+        return {entity_id: count / years for entity_id, count in counts.items()}
 
     def calculate_company_velocity(
         self,
@@ -95,29 +192,7 @@ class DirectorVelocityCalculator:
         Returns:
             Velocity result with changes per year
         """
-        as_of_date = as_of_date or date.today()
-        cutoff_date = as_of_date - timedelta(days=self.period_days)
-
-        # Filter changes for this company within period
-        company_changes = [
-            c for c in self._changes
-            if c.company_id == company_id
-            and cutoff_date <= c.change_date <= as_of_date
-        ]
-
-        # Calculate velocity (changes per year)
-        total_changes = len(company_changes)
-        years = self.period_days / 365
-        velocity = total_changes / years if years > 0 else 0.0
-
-        return VelocityResult(
-            entity_id=company_id,
-            entity_type="COMPANY",
-            velocity=velocity,
-            total_changes=total_changes,
-            period_days=self.period_days,
-            changes=company_changes,
-        )
+        return self._calculate("company", company_id, as_of_date)
 
     def calculate_person_velocity(
         self,
@@ -136,29 +211,40 @@ class DirectorVelocityCalculator:
         Returns:
             Velocity result with changes per year
         """
-        as_of_date = as_of_date or date.today()
-        cutoff_date = as_of_date - timedelta(days=self.period_days)
+        return self._calculate("person", person_id, as_of_date)
 
-        # Filter changes involving this person within period
-        person_changes = [
-            c for c in self._changes
-            if c.person_id == person_id
-            and cutoff_date <= c.change_date <= as_of_date
-        ]
+    def calculate_all_company_velocities(
+        self,
+        as_of_date: Optional[date] = None,
+    ) -> dict[UUID, float]:
+        """
+        Calculate director velocity for every company with changes.
 
-        # Calculate velocity
-        total_changes = len(person_changes)
-        years = self.period_days / 365
-        velocity = total_changes / years if years > 0 else 0.0
+        All windows are counted in one vectorised pass over the index.
+        Companies without any recorded change are absent (velocity 0.0).
 
-        return VelocityResult(
-            entity_id=person_id,
-            entity_type="PERSON",
-            velocity=velocity,
-            total_changes=total_changes,
-            period_days=self.period_days,
-            changes=person_changes,
-        )
+        Args:
+            as_of_date: Calculate as of this date (default: today)
+
+        Returns:
+            Mapping of company ID to changes per year
+        """
+        return self._calculate_all("company", as_of_date)
+
+    def calculate_all_person_velocities(
+        self,
+        as_of_date: Optional[date] = None,
+    ) -> dict[UUID, float]:
+        """
+        Calculate directorship change velocity for every person with changes.
+
+        Args:
+            as_of_date: Calculate as of this date (default: today)
+
+        Returns:
+            Mapping of person ID to changes per year
+        """
+        return self._calculate_all("person", as_of_date)
 
     def calculate_average_velocity_for_person_companies(
         self,
@@ -182,6 +268,26 @@ class DirectorVelocityCalculator:
 
         return total_velocity / len(company_ids)
 
+    def _find_high_velocity(
+        self,
+        kind: str,
+        threshold: float,
+        as_of_date: Optional[date],
+    ) -> list[VelocityResult]:
+        as_of_date = as_of_date or date.today()
+
+        velocities = self._calculate_all(kind, as_of_date)
+        results = [
+            self._calculate(kind, entity_id, as_of_date)
+            for entity_id, velocity in velocities.items()
+            if velocity >= threshold
+        ]
+
+        # Sort by velocity descending
+        results.sort(key=lambda r: r.velocity, reverse=True)
+
+        return results
+
     def find_high_velocity_companies(
         self,
         threshold: float = 2.0,
@@ -197,21 +303,7 @@ class DirectorVelocityCalculator:
         Returns:
             List of velocity results for high-velocity companies
         """
-        as_of_date = as_of_date or date.today()
-
-        # Get unique company IDs
-        company_ids = set(c.company_id for c in self._changes)
-
-        results = []
-        for company_id in company_ids:
-            result = self.calculate_company_velocity(company_id, as_of_date)
-            if result.velocity >= threshold:
-                results.append(result)
-
-        # Sort by velocity descending
-        results.sort(key=lambda r: r.velocity, reverse=True)
-
-        return results
+        return self._find_high_velocity("company", threshold, as_of_date)
 
     def find_high_velocity_persons(
         self,
@@ -228,41 +320,79 @@ class DirectorVelocityCalculator:
         Returns:
             List of velocity results for high-velocity persons
         """
-        as_of_date = as_of_date or date.today()
-
-        # Get unique person IDs
-        person_ids = set(c.person_id for c in self._changes)
-
-        results = []
-        for person_id in person_ids:
-            result = self.calculate_person_velocity(person_id, as_of_date)
-            if result.velocity >= threshold:
-                results.append(result)
-
-        results.sort(key=lambda r: r.velocity, reverse=True)
-
-        return results
+        return self._find_high_velocity("person", threshold, as_of_date)
 
     def clear(self) -> None:
         """Clear all stored changes."""
         self._changes.clear()
+        self._index = None
 
     def stats(self) -> dict:
         """Get statistics about stored changes."""
         if not self._changes:
             return {"total_changes": 0}
 
-        company_ids = set(c.company_id for c in self._changes)
-        person_ids = set(c.person_id for c in self._changes)
-
+        index = self._ensure_index()
         dates = [c.change_date for c in self._changes]
 
         return {
             "total_changes": len(self._changes),
-            "unique_companies": len(company_ids),
-            "unique_persons": len(person_ids),
+            "unique_companies": len(index["company"]),
+            "unique_persons": len(index["person"]),
             "earliest_date": min(dates).isoformat() if dates else None,
             "latest_date": max(dates).isoformat() if dates else None,
             "additions": sum(1 for c in self._changes if c.change_type == "added"),
             "removals": sum(1 for c in self._changes if c.change_type == "removed"),
         }
+
+
+class _EntityIndex:
+    """Date-sorted change arrays grouped by one entity key."""
+
+    def __init__(self, ordered_changes: list[DirectorChange], key):
+        self._ordinals: dict[UUID, list[int]] = {}
+        self._changes: dict[UUID, list[DirectorChange]] = {}
+        for change in ordered_changes:
+            entity_id = key(change)
+            if entity_id not in self._changes:
+                self._ordinals[entity_id] = []
+                self._changes[entity_id] = []
+            self._ordinals[entity_id].append(change.change_date.toordinal())
+            self._changes[entity_id].append(change)
+        self._flat = None
+
+    def __len__(self) -> int:
+        return len(self._changes)
+
+    def window(self, entity_id: UUID, lo: int, hi: int) -> list[DirectorChange]:
+        """Changes for one entity with lo <= ordinal <= hi."""
+        ordinals = self._ordinals.get(entity_id)
+        if not ordinals:
+            return []
+        start = bisect_left(ordinals, lo)
+        end = bisect_right(ordinals, hi)
+        return self._changes[entity_id][start:end]
+
+    def window_counts(self, lo: int, hi: int, stride: int) -> dict[UUID, int]:
+        """Window counts for every entity via two searchsorted calls."""
+        import numpy as np
+
+        if self._flat is None:
+            entity_ids = list(self._ordinals)
+            keys = np.fromiter(
+                (
+                    idx * stride + ordinal
+                    for idx, entity_id in enumerate(entity_ids)
+                    for ordinal in self._ordinals[entity_id]
+                ),
+                dtype=np.int64,
+            )
+            self._flat = (entity_ids, keys)
+
+        entity_ids, keys = self._flat
+        base = np.arange(len(entity_ids), dtype=np.int64) * stride
+        counts = (
+            np.searchsorted(keys, base + hi, side="right")
+            - np.searchsorted(keys, base + lo, side="left")
+        )
+        return dict(zip(entity_ids, counts.tolist()))
@@ -2,17 +2,28 @@
 Evidence package export functionality.
 
 Exports evidence packages in various formats for different authorities and purposes.
+
+export() builds the whole export in memory. export_stream() produces a
+ZIP archive chunk by chunk instead: items are written incrementally as
+NDJSON, CSV or XML, referenced payloads are copied from the blob store,
+and the package hash is computed in the same pass. Memory use stays
+bounded whatever the package size.
 """
 
+import csv
+import hashlib
+import io
 import json
 import logging
+import zipfile
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
-from halo.evidence.package import EvidencePackage
+from halo.evidence.package import EvidencePackage, EvidenceItem
+from halo.investigation.blob_store import CHUNK_SIZE, BlobStore, is_digest
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +49,82 @@ class ExportResult:
     package_hash: str
 
 
+class _ZipSink(io.RawIOBase):
+    """Unseekable output for ZipFile that collects the bytes written."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._buffered = 0
+        self._offset = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._buffered += len(data)
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def drain(self, min_size: int = 0) -> Iterator[bytes]:
+        """Yield the collected bytes as one chunk once at least min_size are buffered."""
+        if self._buffered and self._buffered >= min_size:
+            chunk = b"".join(self._chunks)
+            self._chunks = []
+            self._buffered = 0
+            yield chunk
+
+
+class _HashingWriter(io.RawIOBase):
+    """Passes writes to a ZIP member while hashing them for the manifest."""
+
+    def __init__(self, member):
+        self.member = member
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.member.write(data)
+
+
+class StreamingExport:
+    """
+    An evidence package export produced as ZIP chunks.
+
+    Iterate over it (once) to get the archive. package_hash and size are
+    set when iteration finishes.
+    """
+
+    content_type = "application/zip"
+
+    def __init__(
+        self,
+        exporter: "EvidenceExporter",
+        package: EvidencePackage,
+        format: "ExportFormat",
+        blob_store: Optional[BlobStore],
+    ):
+        self.format = format
+        self.filename = f"evidence_package_{package.id}.zip"
+        self.exported_at = datetime.utcnow()
+        self.package_hash: Optional[str] = None
+        self.size = 0
+        self._chunks = exporter._iter_zip(self, package, blob_store)
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._chunks:
+            self.size += len(chunk)
+            yield chunk
+
+
 class EvidenceExporter:
     """
     Exports evidence packages in various formats.
@@ -79,6 +166,172 @@ class EvidenceExporter:
         else:
             raise ValueError(f"Unsupported export format: {format}")
 
+    # Formats export_stream can write, with the items file name
+    STREAM_ITEM_FILES = {
+        ExportFormat.JSON: "items.ndjson",
+        ExportFormat.CSV: "items.csv",
+        ExportFormat.XML: "items.xml",
+    }
+
+    CSV_HEADER = [
+        "Item ID",
+        "Type",
+        "Title",
+        "Description",
+        "Source",
+        "Source Timestamp",
+        "Content Hash",
+    ]
+
+    def export_stream(
+        self,
+        package: EvidencePackage,
+        format: ExportFormat,
+        blob_store: Optional[BlobStore] = None,
+    ) -> StreamingExport:
+        """
+        Export an evidence package as a ZIP archive, produced incrementally.
+
+        The archive holds package.json (package metadata), the items as
+        items.ndjson, items.csv or items.xml, the payload of every item
+        whose content hash is in blob_store under blobs/, and
+        manifest.json (written last) with the size and SHA-256 of each
+        file and the package hash. Items are written in the order they
+        enter the package hash, which is computed as they are written.
+
+        Args:
+            package: The evidence package to export
+            format: JSON (as NDJSON), CSV or XML
+            blob_store: Store to copy referenced payloads from
+
+        Returns:
+            StreamingExport to iterate over, e.g. as a StreamingResponse body
+        """
+        if format not in self.STREAM_ITEM_FILES:
+            raise ValueError(f"Unsupported streaming export format: {format}")
+        return StreamingExport(self, package, format, blob_store)
+
+    def _iter_zip(
+        self,
+        export: StreamingExport,
+        package: EvidencePackage,
+        blob_store: Optional[BlobStore],
+    ) -> Iterator[bytes]:
+        """Write the archive into a sink, yielding about CHUNK_SIZE bytes at a time."""
+        sink = _ZipSink()
+        files = []
+        hasher = hashlib.sha256()
+        blobs: dict[str, None] = {}
+
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+
+            def member(name: str) -> _HashingWriter:
+                return _HashingWriter(archive.open(name, "w", force_zip64=True))
+
+            def close(writer: _HashingWriter, name: str):
+                writer.member.close()
+                files.append({"path": name, "size": writer.size, "sha256": writer.sha256.hexdigest()})
+
+            writer = None
+            try:
+                header = package.header_dict()
+                header["item_count"] = len(package.items)
+                writer = member("package.json")
+                writer.write(json.dumps(header, ensure_ascii=False, indent=2, default=str).encode("utf-8"))
+                close(writer, "package.json")
+
+                name = self.STREAM_ITEM_FILES[export.format]
+                writer = member(name)
+                text = io.TextIOWrapper(writer, encoding="utf-8", newline="")
+                write_item = self._stream_writer(export.format, text, package)
+                for item in package.hash_order():
+                    hasher.update(item.content_hash.encode())
+                    write_item(item)
+                    if blob_store is not None:
+                        digest = item.content_hash.removeprefix("sha256:")
+                        # Anything but a plain digest could name a path outside the store
+                        if not is_digest(digest):
+                            logger.debug(f"Item {item.id} has no blob digest, payload not exported")
+                        elif digest not in blobs and blob_store.exists(digest):
+                            blobs[digest] = None
+                    yield from sink.drain(CHUNK_SIZE)
+
+                export.package_hash = package.finish_hash(hasher)
+                write_item(None)
+                text.flush()
+                text.detach()
+                close(writer, name)
+
+                for digest in blobs:
+                    name = f"blobs/{digest}"
+                    writer = member(name)
+                    with blob_store.open(digest) as f:
+                        while chunk := f.read(CHUNK_SIZE):
+                            writer.write(chunk)
+                            yield from sink.drain(CHUNK_SIZE)
+                    close(writer, name)
+                    if files[-1]["sha256"] != digest:
+                        logger.warning(f"Blob {digest} does not match its digest")
+
+                manifest = {
+                    "package_id": str(package.id),
+                    "package_hash": export.package_hash,
+                    "sealed_hash": package.package_hash,
+                    "hash_verified": (
+                        package.package_hash == export.package_hash if package.package_hash else None
+                    ),
+                    "format": export.format.value,
+                    "exported_at": export.exported_at.isoformat(),
+                    "files": files,
+                }
+                archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+            finally:
+                # Abandoned mid-stream (e.g. the client disconnected): close the
+                # open member so the archive can be closed
+                if writer is not None and not writer.member.closed:
+                    writer.member.close()
+
+        yield from sink.drain()
+        logger.info(
+            f"Exported evidence package {package.id}: {len(package.items)} items, "
+            f"{len(blobs)} blobs"
+        )
+
+    def _stream_writer(self, format: ExportFormat, out: io.TextIOBase, package: EvidencePackage):
+        """
+        Item writer for a streaming format.
+
+        Call it with each item, then once with None to finish the file.
+        """
+        if format == ExportFormat.JSON:
+
+            def write(item: Optional[EvidenceItem]):
+                if item is not None:
+                    out.write(json.dumps(item.to_dict(), ensure_ascii=False, default=str))
+                    out.write("\n")
+
+            return write
+
+        if format == ExportFormat.CSV:
+            writer = csv.writer(out)
+            writer.writerow(self.CSV_HEADER)
+
+            def write(item: Optional[EvidenceItem]):
+                if item is not None:
+                    writer.writerow(self._csv_row(item))
+
+            return write
+
+        out.write("\n".join(self._xml_header(package)) + "\n")
+
+        def write(item: Optional[EvidenceItem]):
+            if item is None:
+                out.write("\n".join(self._xml_footer(package)))
+            else:
+                out.write("\n".join(self._xml_item(item)) + "\n")
+
+        return write
+
     def _export_json(
         self,
         package: EvidencePackage,
@@ -110,34 +363,15 @@ class EvidenceExporter:
         options: dict,
     ) -> ExportResult:
         """Export evidence items as CSV."""
-        import csv
-        import io
-
         output = io.StringIO()
         writer = csv.writer(output)
 
         # Header
-        writer.writerow([
-            "Item ID",
-            "Type",
-            "Title",
-            "Description",
-            "Source",
-            "Source Timestamp",
-            "Content Hash",
-        ])
+        writer.writerow(self.CSV_HEADER)
 
         # Data rows
         for item in package.items:
-            writer.writerow([
-                str(item.id),
-                item.item_type,
-                item.title,
-                item.description,
-                item.source,
-                item.source_timestamp.isoformat(),
-                item.content_hash,
-            ])
+            writer.writerow(self._csv_row(item))
 
         content = output.getvalue().encode("utf-8")
 
@@ -157,35 +391,12 @@ class EvidenceExporter:
     ) -> ExportResult:
         """Export as XML."""
         # Simple XML generation (would use proper XML library in production)
-        lines = [
-            '<?xml version="1.0" encoding="UTF-8"?>',
-            f'<evidence_package id="{package.id}">',
-            f'  <case_id>{package.case_id}</case_id>',
-            f'  <title>{self._xml_escape(package.title)}</title>',
-            f'  <status>{package.status.value}</status>',
-            f'  <created_at>{package.created_at.isoformat()}</created_at>',
-            f'  <created_by>{self._xml_escape(package.created_by)}</created_by>',
-            f'  <summary>{self._xml_escape(package.summary)}</summary>',
-            '  <items>',
-        ]
+        lines = self._xml_header(package)
 
         for item in package.items:
-            lines.extend([
-                f'    <item id="{item.id}">',
-                f'      <type>{item.item_type}</type>',
-                f'      <title>{self._xml_escape(item.title)}</title>',
-                f'      <description>{self._xml_escape(item.description)}</description>',
-                f'      <source>{self._xml_escape(item.source)}</source>',
-                f'      <source_timestamp>{item.source_timestamp.isoformat()}</source_timestamp>',
-                f'      <content_hash>{item.content_hash}</content_hash>',
-                '    </item>',
-            ])
+            lines.extend(self._xml_item(item))
 
-        lines.extend([
-            '  </items>',
-            f'  <package_hash>{package.package_hash or ""}</package_hash>',
-            '</evidence_package>',
-        ])
+        lines.extend(self._xml_footer(package))
 
         content = '\n'.join(lines).encode("utf-8")
 
@@ -255,6 +466,51 @@ class EvidenceExporter:
             package_hash=package.package_hash or package.calculate_hash(),
         )
 
+    @staticmethod
+    def _csv_row(item: EvidenceItem) -> list[str]:
+        return [
+            str(item.id),
+            item.item_type,
+            item.title,
+            item.description,
+            item.source,
+            item.source_timestamp.isoformat(),
+            item.content_hash,
+        ]
+
+    def _xml_header(self, package: EvidencePackage) -> list[str]:
+        return [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            f'<evidence_package id="{package.id}">',
+            f'  <case_id>{package.case_id}</case_id>',
+            f'  <title>{self._xml_escape(package.title)}</title>',
+            f'  <status>{package.status.value}</status>',
+            f'  <created_at>{package.created_at.isoformat()}</created_at>',
+            f'  <created_by>{self._xml_escape(package.created_by)}</created_by>',
+            f'  <summary>{self._xml_escape(package.summary)}</summary>',
+            '  <items>',
+        ]
+
+    def _xml_item(self, item: EvidenceItem) -> list[str]:
+        return [
+            f'    <item id="{item.id}">',
+            f'      <type>{item.item_type}</type>',
+            f'      <title>{self._xml_escape(item.title)}</title>',
+            f'      <description>{self._xml_escape(item.description)}</description>',
+            f'      <source>{self._xml_escape(item.source)}</source>',
+            f'      <source_timestamp>{item.source_timestamp.isoformat()}</source_timestamp>',
+            f'      <content_hash>{item.content_hash}</content_hash>',
+            '    </item>',
+        ]
+
+    @staticmethod
+    def _xml_footer(package: EvidencePackage) -> list[str]:
+        return [
+            '  </items>',
+            f'  <package_hash>{package.package_hash or ""}</package_hash>',
+            '</evidence_package>',
+        ]
+
     @staticmethod
     def _xml_escape(text: str) -> str:
         """Escape special XML characters."""
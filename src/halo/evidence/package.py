@@ -83,20 +83,32 @@ class EvidencePackage:
         self.items.append(item)
         logger.info(f"Added evidence item {item.id} to package {self.id}")
 
+    def hash_order(self) -> list[EvidenceItem]:
+        """Items in the order their hashes enter the package hash."""
+        return sorted(self.items, key=lambda x: str(x.id))
+
+    def finish_hash(self, hasher) -> str:
+        """
+        Complete a package hash.
+
+        hasher is a SHA-256 object already fed every item's content_hash
+        in hash_order(); this adds the package metadata.
+        """
+        hasher.update(str(self.id).encode())
+        hasher.update(str(self.case_id).encode())
+        hasher.update(self.title.encode())
+        return hasher.hexdigest()
+
     def calculate_hash(self) -> str:
         """Calculate the integrity hash of the entire package."""
         hasher = hashlib.sha256()
 
         # Include all item hashes in order
-        for item in sorted(self.items, key=lambda x: str(x.id)):
+        for item in self.hash_order():
             hasher.update(item.content_hash.encode())
 
         # Include package metadata
-        hasher.update(str(self.id).encode())
-        hasher.update(str(self.case_id).encode())
-        hasher.update(self.title.encode())
-
-        return hasher.hexdigest()
+        return self.finish_hash(hasher)
 
     def seal(self, sealed_by: str) -> None:
         """
@@ -122,6 +134,12 @@ class EvidencePackage:
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for serialization."""
+        data = self.header_dict()
+        data["items"] = [item.to_dict() for item in self.items]
+        return data
+
+    def header_dict(self) -> dict[str, Any]:
+        """Package fields without the items, for streaming exports."""
         return {
             "id": str(self.id),
             "case_id": str(self.case_id),
@@ -129,7 +147,6 @@ class EvidencePackage:
             "status": self.status.value,
             "created_at": self.created_at.isoformat(),
             "created_by": self.created_by,
-            "items": [item.to_dict() for item in self.items],
             "summary": self.summary,
             "package_hash": self.package_hash,
             "sealed_at": self.sealed_at.isoformat() if self.sealed_at else None,
@@ -6,11 +6,17 @@ Orchestrates the full workflow:
 2. Fetch document list for a company
 3. Download annual report ZIP
 4. Extract directors using XBRL extractor
+
+Extraction (unzipping, XML parsing and PDF text extraction) is CPU-bound
+and runs in a process pool, so downloads for other companies continue
+while a document is parsed and parsing uses every core.
 """
 
 import asyncio
 import logging
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from typing import Optional
 
@@ -35,6 +41,46 @@ class PipelineConfig:
     min_confidence: float = 0.5
     rate_limit_delay: float = 0.5  # Seconds between requests
     request_timeout: float = 60.0
+    # Extraction processes; None uses every core, 0 extracts in a thread
+    extraction_workers: Optional[int] = None
+
+
+# Extractors built once per worker process, keyed by min_confidence
+_process_extractors: dict[float, tuple[XBRLExtractor, PDFExtractor]] = {}
+
+
+def _extract_with(
+    xbrl_extractor: XBRLExtractor,
+    pdf_extractor: PDFExtractor,
+    zip_bytes: bytes,
+    orgnr: str,
+    document_id: str,
+) -> ExtractionResult:
+    """
+    Extract directors from one document: XBRL first, PDF as fallback.
+
+    processing_time_ms covers both attempts.
+    """
+    start = time.perf_counter()
+    result = xbrl_extractor.extract_from_zip(zip_bytes, orgnr, document_id)
+    if not result.directors:
+        result = pdf_extractor.extract_from_zip(zip_bytes, orgnr, document_id)
+    result.processing_time_ms = int((time.perf_counter() - start) * 1000)
+    return result
+
+
+def _extract_document(
+    zip_bytes: bytes, orgnr: str, document_id: str, min_confidence: float
+) -> ExtractionResult:
+    """Process-pool entry point for extracting one document."""
+    extractors = _process_extractors.get(min_confidence)
+    if extractors is None:
+        extractors = (
+            XBRLExtractor(min_confidence=min_confidence),
+            PDFExtractor(min_confidence=min_confidence),
+        )
+        _process_extractors[min_confidence] = extractors
+    return _extract_with(*extractors, zip_bytes, orgnr, document_id)
 
 
 @dataclass
@@ -76,11 +122,20 @@ class ExtractionPipeline:
             result = await pipeline.process_company("5592584386")
     """
 
-    def __init__(self, config: PipelineConfig):
+    def __init__(self, config: PipelineConfig, rate_limiter=None):
+        """
+        Args:
+            config: Pipeline configuration
+            rate_limiter: Optional shared RateLimiter. When given, every API
+                request acquires a token from it instead of sleeping
+                ``rate_limit_delay`` after each document.
+        """
         self.config = config
+        self._rate_limiter = rate_limiter
         self._token: Optional[str] = None
         self._token_expires: float = 0
         self._http: Optional[httpx.AsyncClient] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
 
         # Initialize extractors
         self.xbrl_extractor = XBRLExtractor(min_confidence=config.min_confidence)
@@ -88,11 +143,44 @@ class ExtractionPipeline:
 
     async def __aenter__(self):
         self._http = httpx.AsyncClient(timeout=self.config.request_timeout)
+        workers = self.config.extraction_workers
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers > 0:
+            self._pool = ProcessPoolExecutor(max_workers=workers)
         return self
 
     async def __aexit__(self, *args):
         if self._http:
             await self._http.aclose()
+        if self._pool:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    async def extract_document(
+        self, zip_bytes: bytes, orgnr: str, document_id: str
+    ) -> ExtractionResult:
+        """
+        Extract directors from a downloaded document off the event loop.
+
+        Runs in the process pool when the pipeline is open with
+        extraction_workers > 0, otherwise in a worker thread.
+        """
+        if self._pool is not None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._pool, _extract_document,
+                zip_bytes, orgnr, document_id, self.config.min_confidence,
+            )
+        return await asyncio.to_thread(
+            _extract_with, self.xbrl_extractor, self.pdf_extractor,
+            zip_bytes, orgnr, document_id,
+        )
+
+    async def _throttle(self):
+        """Wait for a request token from the shared rate limiter, if any."""
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire_async()
 
     async def _get_token(self) -> str:
         """Get or refresh OAuth token."""
@@ -132,6 +220,7 @@ class ExtractionPipeline:
         token = await self._get_token()
 
         try:
+            await self._throttle()
             response = await self._http.post(
                 f"{self.config.bv_base_url}/organisationer",
                 json={"identitetsbeteckning": orgnr},
@@ -207,6 +296,7 @@ class ExtractionPipeline:
         token = await self._get_token()
 
         try:
+            await self._throttle()
             response = await self._http.post(
                 f"{self.config.bv_base_url}/dokumentlista",
                 json={"identitetsbeteckning": orgnr},
@@ -246,6 +336,7 @@ class ExtractionPipeline:
         token = await self._get_token()
 
         try:
+            await self._throttle()
             response = await self._http.get(
                 f"{self.config.bv_base_url}/dokument/{document_id}",
                 headers={"Authorization": f"Bearer {token}"},
@@ -310,25 +401,21 @@ class ExtractionPipeline:
                     )
                     continue
 
-                # Extract - try XBRL first, fall back to PDF
+                # Extract - XBRL first, PDF fallback - off the event loop
                 logger.debug(f"Extracting from {doc.document_id}")
-                result = self.xbrl_extractor.extract_from_zip(
-                    zip_bytes, orgnr, doc.document_id
+                result = await self.extract_document(zip_bytes, orgnr, doc.document_id)
+                logger.debug(
+                    f"Extracted {len(result.directors)} directors from {doc.document_id} "
+                    f"({result.extraction_method}, {result.processing_time_ms} ms)"
                 )
 
-                # If XBRL extraction found no directors, try PDF fallback
-                if not result.directors:
-                    logger.debug(f"XBRL extraction empty, trying PDF fallback for {doc.document_id}")
-                    result = self.pdf_extractor.extract_from_zip(
-                        zip_bytes, orgnr, doc.document_id
-                    )
-
                 result.company_name = company_info.name
 
                 results.append(result)
 
-                # Rate limiting
-                await asyncio.sleep(self.config.rate_limit_delay)
+                # Rate limiting (a shared limiter already paces requests)
+                if self._rate_limiter is None:
+                    await asyncio.sleep(self.config.rate_limit_delay)
 
             except Exception as e:
                 logger.error(f"Failed to process {doc.document_id}: {e}")
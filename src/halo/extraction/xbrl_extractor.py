@@ -138,6 +138,7 @@ class XBRLExtractor:
         """
         start_time = time.time()
         result = ExtractionResult(orgnr=orgnr, document_id=document_id)
+        xhtml_content = None
 
         try:
             with zipfile.ZipFile(BytesIO(zip_bytes)) as zf:
@@ -150,8 +151,12 @@ class XBRLExtractor:
                     result.warnings.append("No XHTML/XML file found in ZIP")
                     return result
 
-                # Read the first XHTML file
-                xhtml_content = zf.read(xhtml_files[0]).decode("utf-8")
+                # Stream the first XHTML file; the text is only read in full
+                # when the regex fallbacks need it
+                with zf.open(xhtml_files[0]) as stream:
+                    fields = self._iterparse_xbrl_fields(stream)
+                if not fields:
+                    xhtml_content = zf.read(xhtml_files[0]).decode("utf-8")
 
         except zipfile.BadZipFile as e:
             result.warnings.append(f"Invalid ZIP file: {e}")
@@ -160,8 +165,10 @@ class XBRLExtractor:
             result.warnings.append(f"Failed to read ZIP: {e}")
             return result
 
-        # Extract from XHTML content
-        return self.extract_from_xhtml(xhtml_content, orgnr, document_id, start_time)
+        if fields is None:
+            fields = self._extract_fields_regex(xhtml_content)
+
+        return self._build_result(fields, xhtml_content, orgnr, document_id, start_time)
 
     def extract_from_xhtml(
         self,
@@ -184,11 +191,22 @@ class XBRLExtractor:
         if start_time is None:
             start_time = time.time()
 
-        result = ExtractionResult(orgnr=orgnr, document_id=document_id)
-
         # Extract all XBRL fields
         fields = self._extract_xbrl_fields(xhtml_content)
 
+        return self._build_result(fields, xhtml_content, orgnr, document_id, start_time)
+
+    def _build_result(
+        self,
+        fields: list[XBRLField],
+        xhtml_content: Optional[str],
+        orgnr: str,
+        document_id: str,
+        start_time: float,
+    ) -> ExtractionResult:
+        """Build the extraction result from the document's XBRL fields."""
+        result = ExtractionResult(orgnr=orgnr, document_id=document_id)
+
         if not fields:
             result.warnings.append("No XBRL fields found in document")
             # Try regex fallback
@@ -243,6 +261,72 @@ class XBRLExtractor:
 
         return fields
 
+    def _iterparse_xbrl_fields(self, stream) -> Optional[list[XBRLField]]:
+        """
+        Extract XBRL fields incrementally from a binary stream.
+
+        Yields the same fields, in the same order, as _extract_xbrl_fields,
+        but elements are discarded as soon as they have been read, so the
+        document is never held as a tree. Parsing stops once the board
+        signature block is complete: a signature date and board-member
+        names have been seen and a field outside the signature block
+        follows.
+
+        Returns None if the document is not well-formed XML.
+        """
+        fields: list[Optional[XBRLField]] = []
+        open_fields: list[int] = []  # Slots of enclosing ix:nonNumeric elements
+        checked = 0
+        seen_signatures = False
+        seen_date = False
+
+        try:
+            for event, elem in ET.iterparse(stream, events=("start", "end")):
+                if "nonNumeric" not in elem.tag:
+                    if event == "end" and not open_fields:
+                        elem.clear()
+                    continue
+
+                if event == "start":
+                    # Reserve the slot so nested fields keep document order
+                    open_fields.append(len(fields))
+                    fields.append(None)
+                    continue
+
+                name = elem.get("name", "")
+                text = "".join(elem.itertext()).strip()
+                if name and text:
+                    fields[open_fields[-1]] = XBRLField(
+                        name=name, value=text, context_ref=elem.get("contextRef")
+                    )
+                open_fields.pop()
+                if open_fields:
+                    continue
+                elem.clear()
+
+                for index in range(checked, len(fields)):
+                    field = fields[index]
+                    if field is None:
+                        continue
+                    field_name = field.name.split(":")[-1]
+                    if not field_name.startswith("Underskrift"):
+                        if seen_signatures and seen_date:
+                            del fields[index:]
+                            return [f for f in fields if f is not None]
+                    elif "UnderskriftHandling" in field_name and any(
+                        p in field_name for p in self.FIRST_NAME_PATTERNS
+                    ):
+                        seen_signatures = True
+                    if any(p in field_name for p in self.DATE_PATTERNS):
+                        seen_date = True
+                checked = len(fields)
+
+        except ET.ParseError as e:
+            logger.warning(f"XML parse error, falling back to regex: {e}")
+            return None
+
+        return [f for f in fields if f is not None]
+
     def _extract_fields_regex(self, xhtml_content: str) -> list[XBRLField]:
         """Fallback: extract XBRL fields using regex."""
         fields = []
@@ -18,6 +18,7 @@ from halo.fincrime.aml_patterns import (
     RapidMovementDetector,
     RoundTripDetector,
     SmurfingDetector,
+    TransactionPathIndex,
 )
 from halo.fincrime.sar_generator import (
     SARGenerator,
@@ -34,6 +35,7 @@ from halo.fincrime.risk_scoring import (
 )
 from halo.fincrime.watchlist import (
     WatchlistChecker,
+    WatchlistIndex,
     WatchlistMatch,
     WatchlistType,
 )
@@ -48,6 +50,7 @@ __all__ = [
     "RapidMovementDetector",
     "RoundTripDetector",
     "SmurfingDetector",
+    "TransactionPathIndex",
     # SAR
     "SARGenerator",
     "SARReport",
@@ -61,6 +64,7 @@ __all__ = [
     "RiskLevel",
     # Watchlist
     "WatchlistChecker",
+    "WatchlistIndex",
     "WatchlistMatch",
     "WatchlistType",
 ]
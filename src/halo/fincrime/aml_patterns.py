@@ -11,6 +11,7 @@ Implements detection for common money laundering typologies:
 
 import logging
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -282,6 +283,258 @@ class StructuringDetector(AMLPattern):
         return PatternSeverity.LOW
 
 
+class TransactionPathIndex:
+    """
+    Time-respecting path search over a transaction set.
+
+    Outgoing transactions are grouped by sender and sorted by timestamp, so
+    the admissible next hops from an account (not earlier than the previous
+    hop, not later than the path deadline) are found with two bisects.
+    Searches backtrack over one shared path instead of copying it per step,
+    prune with memoised bounds, and stop after examining ``max_expansions``
+    candidate hops per start account so hub accounts cannot blow up a run.
+    Truncated searches are counted in ``truncated_starts``; their results
+    are incomplete.
+
+    Shared by LayeringDetector (maximal forward chains) and
+    RoundTripDetector (paths that return to their origin).
+    """
+
+    DEFAULT_MAX_EXPANSIONS = 50_000
+
+    def __init__(
+        self,
+        transactions: list[dict],
+        min_amount: Optional[Decimal] = None,
+        max_expansions: int = DEFAULT_MAX_EXPANSIONS,
+    ):
+        """
+        Args:
+            transactions: Normalized transaction dicts
+            min_amount: Ignore hops below this amount (they can never be
+                part of a match)
+            max_expansions: Candidate hops examined per start account
+        """
+        self.max_expansions = max_expansions
+        self.truncated_starts = 0
+
+        self._outgoing: dict[UUID, list[dict]] = {}
+        for txn in transactions:
+            sender = txn.get("from_entity_id") or txn.get("entity_id")
+            if not sender or not txn.get("to_entity_id"):
+                continue
+            if min_amount is not None and Decimal(str(txn.get("amount", 0))) < min_amount:
+                continue
+            self._outgoing.setdefault(sender, []).append(txn)
+
+        self._times: dict[UUID, list[datetime]] = {}
+        self._senders_of: dict[UUID, set[UUID]] = {}
+        for sender, txns in self._outgoing.items():
+            txns.sort(key=self.timestamp)
+            self._times[sender] = [self.timestamp(t) for t in txns]
+            for txn in txns:
+                self._senders_of.setdefault(txn["to_entity_id"], set()).add(sender)
+
+        self._suffix_bounds: Optional[dict[int, int]] = None
+        self._suffix_cap = 0
+
+    @staticmethod
+    def timestamp(txn: dict) -> datetime:
+        return txn.get("timestamp") or datetime.min
+
+    def senders(self) -> list[UUID]:
+        """Accounts with at least one outgoing transaction."""
+        return list(self._outgoing)
+
+    def next_hops(self, entity: UUID, not_before: datetime, deadline: datetime) -> list[dict]:
+        """Outgoing transactions of ``entity`` with not_before <= time <= deadline."""
+        times = self._times.get(entity)
+        if not times:
+            return []
+        lo = bisect_left(times, not_before)
+        hi = bisect_right(times, deadline)
+        return self._outgoing[entity][lo:hi]
+
+    def _suffix_bound(self, txn: dict, cap: int) -> int:
+        """
+        Upper bound on the number of hops in any chain starting with ``txn``.
+
+        Computed once for all transactions in descending time order: a
+        transaction's bound is one more than the best bound among the later
+        outgoing transactions of its receiver. Ignores deadlines and the
+        no-revisit rule, so it never under-estimates.
+        """
+        if self._suffix_bounds is None or self._suffix_cap != cap:
+            bounds: dict[int, int] = {}
+            best: dict[UUID, int] = {}
+            done: dict[UUID, int] = {}
+            ordered = sorted(
+                (t for txns in self._outgoing.values() for t in txns),
+                key=self.timestamp,
+                reverse=True,
+            )
+            for t in ordered:
+                receiver = t["to_entity_id"]
+                times = self._times.get(receiver)
+                if not times:
+                    bound = 1
+                else:
+                    later = len(times) - bisect_left(times, self.timestamp(t))
+                    if done.get(receiver, 0) < later:
+                        # Same-timestamp hops not yet visited: stay conservative
+                        bound = cap
+                    else:
+                        bound = min(cap, 1 + best.get(receiver, 0))
+                bounds[id(t)] = bound
+                sender = t.get("from_entity_id") or t.get("entity_id")
+                best[sender] = max(best.get(sender, 0), bound)
+                done[sender] = done.get(sender, 0) + 1
+            self._suffix_bounds = bounds
+            self._suffix_cap = cap
+        return self._suffix_bounds[id(txn)]
+
+    def _distances_to(self, target: UUID, max_depth: int) -> dict[UUID, int]:
+        """Fewest hops from each account to ``target`` (reverse BFS)."""
+        dist = {target: 0}
+        frontier = [target]
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for entity in frontier:
+                for sender in self._senders_of.get(entity, ()):
+                    if sender not in dist:
+                        dist[sender] = depth
+                        next_frontier.append(sender)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return dist
+
+    def chains(
+        self,
+        start: UUID,
+        window: timedelta,
+        min_length: int,
+        max_depth: int,
+    ) -> list[list[dict]]:
+        """
+        Maximal forward chains from ``start``.
+
+        A chain visits each account at most once, every hop is no earlier
+        than the previous one and no later than ``window`` after the first.
+        Chains that cannot be extended and have at least ``min_length`` hops
+        are returned.
+        """
+        return self._search(start, window, max_depth, min_length=min_length, closing=False)
+
+    def cycles(
+        self,
+        start: UUID,
+        window: timedelta,
+        max_depth: int,
+        min_first_amount: Optional[Decimal] = None,
+    ) -> list[list[dict]]:
+        """
+        Time-respecting paths of 2+ hops that leave and return to ``start``.
+
+        Only outgoing transactions of at least ``min_first_amount`` are
+        tried as the first hop.
+        """
+        return self._search(
+            start, window, max_depth, min_length=2, closing=True,
+            min_first_amount=min_first_amount,
+        )
+
+    def _search(
+        self,
+        start: UUID,
+        window: timedelta,
+        max_depth: int,
+        min_length: int,
+        closing: bool,
+        min_first_amount: Optional[Decimal] = None,
+    ) -> list[list[dict]]:
+        results: list[list[dict]] = []
+        dist = self._distances_to(start, max_depth) if closing else None
+
+        def admissible(txn: dict, length: int, visited: set[UUID]) -> bool:
+            # length = path length including txn
+            receiver = txn["to_entity_id"]
+            if closing:
+                if receiver == start:
+                    return length >= min_length
+                remaining = dist.get(receiver)
+                return (
+                    receiver not in visited
+                    and remaining is not None
+                    and length + remaining <= max_depth
+                )
+            return (
+                receiver not in visited
+                and length - 1 + self._suffix_bound(txn, max_depth) >= min_length
+            )
+
+        expansions = 0
+        for first in self._outgoing.get(start, ()):
+            if min_first_amount is not None and Decimal(str(first.get("amount", 0))) < min_first_amount:
+                continue
+            visited = {start}
+            expansions += 1
+            if not admissible(first, 1, visited):
+                continue
+
+            deadline = self.timestamp(first) + window
+            path = [first]
+            visited.add(first["to_entity_id"])
+            # Each frame: [candidate iterator, extended?]
+            stack = [[iter(self._frame(first, deadline, max_depth, 1)), False]]
+
+            while stack:
+                if expansions >= self.max_expansions:
+                    self.truncated_starts += 1
+                    logger.debug(f"Path search from {start} truncated after {expansions} expansions")
+                    return results
+
+                frame = stack[-1]
+                txn = next(frame[0], None)
+                if txn is None:
+                    # Frame exhausted: emit maximal chains, then backtrack
+                    if not closing and not frame[1] and len(path) >= min_length:
+                        results.append(list(path))
+                    stack.pop()
+                    visited.discard(path.pop()["to_entity_id"])
+                    continue
+
+                expansions += 1
+                if not admissible(txn, len(path) + 1, visited):
+                    continue
+
+                frame[1] = True
+                receiver = txn["to_entity_id"]
+                if closing and receiver == start:
+                    results.append(path + [txn])
+                    continue
+
+                path.append(txn)
+                visited.add(receiver)
+                stack.append([iter(self._frame(txn, deadline, max_depth, len(path))), False])
+
+        return results
+
+    def _frame(self, txn: dict, deadline: datetime, max_depth: int, length: int) -> list[dict]:
+        if length >= max_depth:
+            return []
+        return self.next_hops(txn["to_entity_id"], self.timestamp(txn), deadline)
+
+
+def _warn_truncated(pattern_type: str, index: TransactionPathIndex) -> None:
+    """Warn when a detector's path search was cut short."""
+    if index.truncated_starts:
+        logger.warning(
+            f"{pattern_type}: path search truncated for {index.truncated_starts} start "
+            f"accounts after {index.max_expansions} expansions; results are incomplete"
+        )
+
+
 class LayeringDetector(AMLPattern):
     """
     Detect layering patterns.
@@ -308,10 +561,16 @@ class LayeringDetector(AMLPattern):
         min_hops: int = 3,
         max_hours: int = 72,
         min_amount: Decimal = Decimal("50000"),
+        max_depth: int = 10,
+        max_expansions: int = TransactionPathIndex.DEFAULT_MAX_EXPANSIONS,
     ):
         self.min_hops = min_hops
         self.max_hours = max_hours
         self.min_amount = min_amount
+        self.max_depth = max_depth
+        self.max_expansions = max_expansions
+        # Start accounts whose search hit max_expansions in the last detect()
+        self.truncated_starts = 0
 
     def detect(
         self,
@@ -323,95 +582,60 @@ class LayeringDetector(AMLPattern):
         # Normalize all transactions to dicts
         normalized = [_normalize_transaction(t) for t in transactions]
 
-        # Build transaction graph
-        # Node = entity, Edge = transaction
-        graph: dict[UUID, list[dict]] = {}
-        for txn in normalized:
-            sender = txn.get("from_entity_id") or txn.get("entity_id")
-            if sender:
-                graph.setdefault(sender, []).append(txn)
+        # Index transactions by sender; hops below min_amount can never be
+        # part of a match, so they are left out of the search entirely
+        index = TransactionPathIndex(
+            normalized,
+            min_amount=self.min_amount,
+            max_expansions=self.max_expansions,
+        )
+        window = timedelta(hours=self.max_hours)
 
         # Find chains starting from each entity
         checked_chains: set[tuple] = set()
 
-        for start_entity in graph:
+        for start_entity in index.senders():
             if entity_id and start_entity != entity_id:
                 continue
 
-            chains = self._find_chains(graph, start_entity, [], set())
+            truncated_before = index.truncated_starts
+            chains = index.chains(start_entity, window, self.min_hops, self.max_depth)
+            truncated = index.truncated_starts > truncated_before
 
             for chain in chains:
-                if len(chain) >= self.min_hops:
-                    chain_key = tuple(t.get("id") for t in chain)
-                    if chain_key in checked_chains:
-                        continue
-                    checked_chains.add(chain_key)
-
-                    # Check timing
-                    first_time = chain[0].get("timestamp", datetime.utcnow())
-                    last_time = chain[-1].get("timestamp", datetime.utcnow())
-                    hours = (last_time - first_time).total_seconds() / 3600
-
-                    if hours <= self.max_hours:
-                        # Check amounts (should be similar, minus fees)
-                        amounts = [Decimal(str(t.get("amount", 0))) for t in chain]
-                        if min(amounts) >= self.min_amount:
-                            entities = self._extract_entities(chain)
-
-                            matches.append(PatternMatch(
-                                pattern_type=self.pattern_type,
-                                severity=self._calculate_severity(len(chain), min(amounts)),
-                                confidence=0.7 + min(0.25, len(chain) * 0.05),
-                                description=f"Funds moved through {len(entities)} entities in {hours:.1f} hours",
-                                entity_ids=entities,
-                                transaction_ids=[t.get("id") for t in chain if t.get("id")],
-                                total_amount=amounts[0],
-                                pattern_start=first_time,
-                                pattern_end=last_time,
-                                details={
-                                    "hop_count": len(chain),
-                                    "hours_elapsed": hours,
-                                    "entity_count": len(entities),
-                                },
-                            ))
-
+                chain_key = tuple(t.get("id") for t in chain)
+                if chain_key in checked_chains:
+                    continue
+                checked_chains.add(chain_key)
+
+                first_time = index.timestamp(chain[0])
+                last_time = index.timestamp(chain[-1])
+                hours = (last_time - first_time).total_seconds() / 3600
+                amounts = [Decimal(str(t.get("amount", 0))) for t in chain]
+                entities = self._extract_entities(chain)
+
+                matches.append(PatternMatch(
+                    pattern_type=self.pattern_type,
+                    severity=self._calculate_severity(len(chain), min(amounts)),
+                    confidence=0.7 + min(0.25, len(chain) * 0.05),
+                    description=f"Funds moved through {len(entities)} entities in {hours:.1f} hours",
+                    entity_ids=entities,
+                    transaction_ids=[t.get("id") for t in chain if t.get("id")],
+                    total_amount=amounts[0],
+                    pattern_start=first_time,
+                    pattern_end=last_time,
+                    details={
+                        "hop_count": len(chain),
+                        "hours_elapsed": hours,
+                        "entity_count": len(entities),
+                        "search_truncated": truncated,
+                    },
+                ))
+
+        self.truncated_starts = index.truncated_starts
+        _warn_truncated(self.pattern_type, index)
         return matches
 
-    def _find_chains(
-        self,
-        graph: dict[UUID, list[dict]],
-        current: UUID,
-        path: list[dict],
-        visited: set[UUID],
-        max_depth: int = 10,
-    ) -> list[list[dict]]:
-        """Find transaction chains using DFS."""
-        if len(path) >= max_depth or current in visited:
-            return [path] if len(path) >= self.min_hops else []
-
-        visited = visited | {current}
-        chains = []
-
-        for txn in graph.get(current, []):
-            next_entity = txn.get("to_entity_id")
-            if next_entity and next_entity not in visited:
-                # Check timing continuity
-                if path:
-                    last_time = path[-1].get("timestamp", datetime.min)
-                    this_time = txn.get("timestamp", datetime.max)
-                    if this_time < last_time:
-                        continue
-
-                new_chains = self._find_chains(
-                    graph, next_entity, path + [txn], visited, max_depth
-                )
-                chains.extend(new_chains)
-
-        if not chains and len(path) >= self.min_hops:
-            chains = [path]
-
-        return chains
-
     def _extract_entities(self, chain: list[dict]) -> list[UUID]:
         """Extract unique entities from transaction chain."""
         entities = []
@@ -563,10 +787,16 @@ class RoundTripDetector(AMLPattern):
         min_amount: Decimal = Decimal("50000"),
         max_days: int = 30,
         max_loss_percentage: float = 0.15,
+        max_depth: int = 8,
+        max_expansions: int = TransactionPathIndex.DEFAULT_MAX_EXPANSIONS,
     ):
         self.min_amount = min_amount
         self.max_days = max_days
         self.max_loss_percentage = max_loss_percentage
+        self.max_depth = max_depth
+        self.max_expansions = max_expansions
+        # Start accounts whose search hit max_expansions in the last detect()
+        self.truncated_starts = 0
 
     def detect(
         self,
@@ -578,22 +808,24 @@ class RoundTripDetector(AMLPattern):
         # Normalize all transactions to dicts
         normalized = [_normalize_transaction(t) for t in transactions]
 
-        # Build graph with amounts
-        graph: dict[UUID, list[dict]] = {}
-        for txn in normalized:
-            sender = txn.get("from_entity_id") or txn.get("entity_id")
-            if sender:
-                graph.setdefault(sender, []).append(txn)
+        # Index transactions by sender for time-ordered path search
+        index = TransactionPathIndex(normalized, max_expansions=self.max_expansions)
+        # (last - first).days <= max_days, i.e. strictly less than max_days + 1
+        window = timedelta(days=self.max_days + 1) - timedelta(microseconds=1)
 
         # For each entity, check if funds return
         checked_patterns: set[tuple] = set()
 
-        for start_entity in graph:
+        for start_entity in index.senders():
             if entity_id and start_entity != entity_id:
                 continue
 
             # Find paths that return to start
-            round_trips = self._find_round_trips(graph, start_entity)
+            truncated_before = index.truncated_starts
+            round_trips = index.cycles(
+                start_entity, window, self.max_depth, min_first_amount=self.min_amount
+            )
+            truncated = index.truncated_starts > truncated_before
 
             for trip in round_trips:
                 if len(trip) < 2:
@@ -633,35 +865,14 @@ class RoundTripDetector(AMLPattern):
                                     "loss_percentage": float(loss * 100),
                                     "intermediary_count": len(entities) - 1,
                                     "days_elapsed": days,
+                                    "search_truncated": truncated,
                                 },
                             ))
 
+        self.truncated_starts = index.truncated_starts
+        _warn_truncated(self.pattern_type, index)
         return matches
 
-    def _find_round_trips(
-        self,
-        graph: dict[UUID, list[dict]],
-        start: UUID,
-        max_depth: int = 8,
-    ) -> list[list[dict]]:
-        """Find transaction paths that return to start."""
-        round_trips = []
-
-        def dfs(current: UUID, path: list[dict], visited: set[UUID]):
-            if len(path) >= max_depth:
-                return
-
-            for txn in graph.get(current, []):
-                next_entity = txn.get("to_entity_id")
-                if next_entity == start and len(path) >= 1:
-                    # Found round trip
-                    round_trips.append(path + [txn])
-                elif next_entity and next_entity not in visited:
-                    dfs(next_entity, path + [txn], visited | {next_entity})
-
-        dfs(start, [], {start})
-        return round_trips
-
     def _extract_entities(self, chain: list[dict]) -> list[UUID]:
         """Extract unique entities from transaction chain."""
         entities = []
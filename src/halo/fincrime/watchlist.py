@@ -9,11 +9,13 @@ Checks entities against:
 """
 
 import logging
+import math
 import re
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from uuid import UUID
 
 logger = logging.getLogger(__name__)
@@ -104,6 +106,229 @@ class WatchlistMatch:
         }
 
 
+def _normalize_identifier(value: str) -> str:
+    """Normalize an identifier (personnummer, orgnr, passport) for lookup."""
+    return re.sub(r"[\s\-]", "", value.upper())
+
+
+def _bounded_levenshtein(s1: str, s2: str, max_distance: int) -> int:
+    """
+    Levenshtein distance, giving up once it must exceed ``max_distance``.
+
+    Only a diagonal band of width 2 * max_distance + 1 is evaluated.
+    Returns max_distance + 1 when the distance is larger than the bound.
+    """
+    if abs(len(s1) - len(s2)) > max_distance:
+        return max_distance + 1
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    if not s2:
+        return len(s1)
+
+    over = max_distance + 1
+    previous = [j if j <= max_distance else over for j in range(len(s2) + 1)]
+    for i, c1 in enumerate(s1, start=1):
+        lo = max(1, i - max_distance)
+        hi = min(len(s2), i + max_distance)
+        current = [over] * (len(s2) + 1)
+        current[0] = i if i <= max_distance else over
+        row_min = current[0]
+        for j in range(lo, hi + 1):
+            value = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (c1 != s2[j - 1]),
+            )
+            current[j] = value if value <= max_distance else over
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return over
+        previous = current
+
+    return min(previous[-1], over)
+
+
+class WatchlistIndex:
+    """
+    Precompiled screening index over watchlist entries.
+
+    Names and aliases are normalized once when entries are added. Exact,
+    alias and identifier lookups are hash-map hits. Fuzzy candidates come
+    from a token inverted index (or, for thresholds low enough that names
+    need not share a token, a character trigram index with q-gram count
+    filtering), and only candidates are scored, with an edit distance
+    bounded by what the threshold still allows.
+
+    Scores are identical to WatchlistChecker._fuzzy_match.
+    """
+
+    NGRAM = 3
+    TOKEN_WEIGHT = 0.4
+    CHAR_WEIGHT = 0.6
+
+    def __init__(self, normalize: Callable[[str], str]):
+        self._normalize = normalize
+
+        self.entries: list[WatchlistEntry] = []
+        self._names: list[str] = []
+        self._tokens: list[frozenset[str]] = []
+
+        self._by_name: dict[str, list[int]] = {}
+        self._by_alias: dict[str, list[tuple[int, str]]] = {}
+        self._by_identifier: dict[tuple[str, str], list[int]] = {}
+        self._by_token: dict[str, list[int]] = {}
+        self._by_gram: dict[str, list[tuple[int, int]]] = {}
+        self._by_length: dict[int, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, entry: WatchlistEntry) -> int:
+        """Index an entry. Returns its sequence number."""
+        seq = len(self.entries)
+        self.entries.append(entry)
+
+        name = self._normalize(entry.name)
+        tokens = frozenset(name.split())
+        self._names.append(name)
+        self._tokens.append(tokens)
+
+        self._by_name.setdefault(name, []).append(seq)
+
+        seen_aliases = set()
+        for alias in entry.aliases:
+            alias_normalized = self._normalize(alias)
+            if alias_normalized not in seen_aliases:
+                seen_aliases.add(alias_normalized)
+                self._by_alias.setdefault(alias_normalized, []).append((seq, alias))
+
+        for id_type, value in entry.identifiers.items():
+            if value:
+                key = (id_type, _normalize_identifier(value))
+                self._by_identifier.setdefault(key, []).append(seq)
+
+        for token in tokens:
+            self._by_token.setdefault(token, []).append(seq)
+        for gram, count in self._grams(name).items():
+            self._by_gram.setdefault(gram, []).append((seq, count))
+        self._by_length.setdefault(len(name), []).append(seq)
+
+        return seq
+
+    def _grams(self, text: str) -> Counter:
+        n = self.NGRAM
+        return Counter(text[i:i + n] for i in range(len(text) - n + 1))
+
+    def by_identifier(self, id_type: str, value: str) -> list[int]:
+        return self._by_identifier.get((id_type, _normalize_identifier(value)), [])
+
+    def by_name(self, normalized: str) -> list[int]:
+        return self._by_name.get(normalized, [])
+
+    def by_alias(self, normalized: str) -> list[tuple[int, str]]:
+        return self._by_alias.get(normalized, [])
+
+    def _max_distance(self, min_score: float, jaccard: float, max_len: int) -> int:
+        """Largest edit distance that can still reach ``min_score``."""
+        min_char = (min_score - self.TOKEN_WEIGHT * jaccard) / self.CHAR_WEIGHT
+        if min_char > 1:
+            return -1
+        # Small epsilon so float rounding never drops a borderline candidate;
+        # the exact score is re-checked afterwards.
+        return math.floor((1 - min_char) * max_len + 1e-9)
+
+    def _candidates(self, query: str, tokens: frozenset[str], min_score: float) -> dict[int, int]:
+        """Candidate entries mapped to their shared token count."""
+        # Zero shared tokens caps the score at CHAR_WEIGHT; above that the
+        # token index alone is complete, and the Jaccard floor means every
+        # match shares at least `required` query tokens. Prefix filtering:
+        # probing the len(tokens) - required + 1 rarest tokens finds them all.
+        min_jaccard = (min_score - self.CHAR_WEIGHT) / self.TOKEN_WEIGHT
+        required = max(1, math.ceil(min_jaccard * len(tokens) - 1e-9))
+        by_rarity = sorted(tokens, key=lambda t: len(self._by_token.get(t, ())))
+        probe = by_rarity[:len(tokens) - required + 1] if min_jaccard > 0 else by_rarity
+
+        shared: dict[int, int] = {}
+        for token in probe:
+            for seq in self._by_token.get(token, ()):
+                if seq not in shared:
+                    shared[seq] = len(tokens & self._tokens[seq])
+
+        if min_jaccard > 0:
+            return shared
+
+        # Otherwise add trigram candidates. q-gram lemma: within distance k,
+        # strings share at least max_len - n + 1 - k * n grams; lengths whose
+        # bound is not positive cannot be filtered and are taken whole.
+        n = self.NGRAM
+        gram_counts: Counter = Counter()
+        for gram, count in self._grams(query).items():
+            for seq, entry_count in self._by_gram.get(gram, ()):
+                gram_counts[seq] += min(count, entry_count)
+
+        candidates = dict(shared)
+        unfiltered_lengths = set()
+        for length in self._by_length:
+            max_len = max(len(query), length)
+            k = self._max_distance(min_score, 0.0, max_len)
+            if k < 0 or abs(length - len(query)) > k:
+                continue
+            if max_len - n + 1 - k * n <= 0:
+                unfiltered_lengths.add(length)
+
+        for length in unfiltered_lengths:
+            for seq in self._by_length[length]:
+                candidates.setdefault(seq, 0)
+        for seq, count in gram_counts.items():
+            if seq in candidates:
+                continue
+            max_len = max(len(query), len(self._names[seq]))
+            k = self._max_distance(min_score, 0.0, max_len)
+            if k >= 0 and count >= max_len - n + 1 - k * n:
+                candidates[seq] = 0
+        return candidates
+
+    def fuzzy(self, query: str, min_score: float) -> list[tuple[int, float]]:
+        """
+        Entries whose name scores at least ``min_score`` against ``query``.
+
+        Args:
+            query: Normalized query name
+            min_score: Minimum combined score
+
+        Returns:
+            (sequence number, score) pairs
+        """
+        tokens = frozenset(query.split())
+        if not query or not tokens:
+            return []
+
+        results = []
+        for seq, shared in self._candidates(query, tokens, min_score).items():
+            target = self._names[seq]
+            target_tokens = self._tokens[seq]
+            if not target or not target_tokens:
+                continue
+            if target == query:
+                results.append((seq, 1.0))
+                continue
+
+            jaccard = shared / (len(tokens) + len(target_tokens) - shared)
+            max_len = max(len(query), len(target))
+            k = self._max_distance(min_score, jaccard, max_len)
+            if k < 0:
+                continue
+            distance = _bounded_levenshtein(query, target, k)
+            if distance > k:
+                continue
+
+            score = (jaccard * self.TOKEN_WEIGHT) + ((1 - (distance / max_len)) * self.CHAR_WEIGHT)
+            if score >= min_score:
+                results.append((seq, score))
+        return results
+
+
 class WatchlistChecker:
     """
     Check entities against multiple watchlists.
@@ -116,6 +341,8 @@ class WatchlistChecker:
     - Commercial PEP/sanctions data providers
 
     This implementation provides the interface and fuzzy matching logic.
+    Entries are compiled into a WatchlistIndex as they are added, so a
+    check only scores candidate entries rather than every list entry.
     """
 
     def __init__(
@@ -138,10 +365,12 @@ class WatchlistChecker:
         self._entries: dict[WatchlistType, list[WatchlistEntry]] = {
             wl_type: [] for wl_type in WatchlistType
         }
+        self._index = WatchlistIndex(self._normalize_name)
 
     def add_entry(self, entry: WatchlistEntry) -> None:
         """Add an entry to a watchlist."""
         self._entries[entry.list_type].append(entry)
+        self._index.add(entry)
 
     def load_entries(self, entries: list[WatchlistEntry]) -> int:
         """Load multiple entries. Returns count loaded."""
@@ -172,83 +401,98 @@ class WatchlistChecker:
         Returns:
             List of matches found
         """
-        matches = []
         lists = lists_to_check or list(WatchlistType)
+        list_order = {list_type: pos for pos, list_type in enumerate(lists)}
+        index = self._index
+
+        # Matches per entry sequence number; entries settled by an
+        # identifier or exact name match skip the remaining checks
+        found: dict[int, list[WatchlistMatch]] = {}
+        settled: set[int] = set()
+
+        def eligible(seq: int) -> bool:
+            entry = index.entries[seq]
+            return entry.is_active and entry.list_type in list_order and seq not in settled
 
         # Normalize query name
         query_name_normalized = self._normalize_name(name)
 
-        for list_type in lists:
-            for entry in self._entries.get(list_type, []):
-                if not entry.is_active:
+        # Check identifier first (most reliable)
+        if identifier:
+            for seq in index.by_identifier(identifier_type, identifier):
+                if not eligible(seq):
                     continue
-
-                # Check identifier first (most reliable)
-                if identifier and identifier_type in entry.identifiers:
-                    if self._identifiers_match(
-                        identifier,
-                        entry.identifiers[identifier_type],
-                        identifier_type,
-                    ):
-                        matches.append(WatchlistMatch(
-                            entry=entry,
-                            match_type=MatchType.IDENTIFIER,
-                            match_score=1.0,
-                            matched_field=identifier_type,
-                            matched_value=identifier,
-                            query_name=name,
-                            query_identifier=identifier,
-                        ))
-                        continue  # No need to check name if ID matches
-
-                # Check exact name match
-                if query_name_normalized == self._normalize_name(entry.name):
-                    matches.append(WatchlistMatch(
-                        entry=entry,
-                        match_type=MatchType.EXACT,
-                        match_score=1.0,
-                        matched_field="name",
-                        matched_value=entry.name,
-                        query_name=name,
-                        query_identifier=identifier,
-                    ))
+                found.setdefault(seq, []).append(WatchlistMatch(
+                    entry=index.entries[seq],
+                    match_type=MatchType.IDENTIFIER,
+                    match_score=1.0,
+                    matched_field=identifier_type,
+                    matched_value=identifier,
+                    query_name=name,
+                    query_identifier=identifier,
+                ))
+                settled.add(seq)  # No need to check name if ID matches
+
+        # Check exact name match
+        for seq in index.by_name(query_name_normalized):
+            if not eligible(seq):
+                continue
+            entry = index.entries[seq]
+            found.setdefault(seq, []).append(WatchlistMatch(
+                entry=entry,
+                match_type=MatchType.EXACT,
+                match_score=1.0,
+                matched_field="name",
+                matched_value=entry.name,
+                query_name=name,
+                query_identifier=identifier,
+            ))
+            settled.add(seq)
+
+        # Check aliases (only one match per entry)
+        if self.check_aliases:
+            for seq, alias in index.by_alias(query_name_normalized):
+                if not eligible(seq):
                     continue
-
-                # Check aliases
-                if self.check_aliases:
-                    for alias in entry.aliases:
-                        if query_name_normalized == self._normalize_name(alias):
-                            matches.append(WatchlistMatch(
-                                entry=entry,
-                                match_type=MatchType.ALIAS,
-                                match_score=0.95,
-                                matched_field="alias",
-                                matched_value=alias,
-                                query_name=name,
-                                query_identifier=identifier,
-                            ))
-                            break  # Only one match per entry
-
-                # Fuzzy name match
-                fuzzy_score = self._fuzzy_match(query_name_normalized, entry.name)
-                if fuzzy_score >= self.min_fuzzy_score:
-                    # Additional validation if DOB available
-                    if date_of_birth and entry.date_of_birth:
-                        if date_of_birth != entry.date_of_birth:
-                            fuzzy_score *= 0.5  # Reduce confidence
-
-                    if fuzzy_score >= self.min_fuzzy_score:
-                        matches.append(WatchlistMatch(
-                            entry=entry,
-                            match_type=MatchType.FUZZY,
-                            match_score=fuzzy_score,
-                            matched_field="name",
-                            matched_value=entry.name,
-                            query_name=name,
-                            query_identifier=identifier,
-                        ))
-
-        # Sort by score descending
+                found.setdefault(seq, []).append(WatchlistMatch(
+                    entry=index.entries[seq],
+                    match_type=MatchType.ALIAS,
+                    match_score=0.95,
+                    matched_field="alias",
+                    matched_value=alias,
+                    query_name=name,
+                    query_identifier=identifier,
+                ))
+
+        # Fuzzy name match, scored only for index candidates
+        fuzzy_query = self._normalize_name(query_name_normalized)
+        for seq, fuzzy_score in index.fuzzy(fuzzy_query, self.min_fuzzy_score):
+            if not eligible(seq):
+                continue
+            entry = index.entries[seq]
+
+            # Additional validation if DOB available
+            if date_of_birth and entry.date_of_birth:
+                if date_of_birth != entry.date_of_birth:
+                    fuzzy_score *= 0.5  # Reduce confidence
+
+            if fuzzy_score >= self.min_fuzzy_score:
+                found.setdefault(seq, []).append(WatchlistMatch(
+                    entry=entry,
+                    match_type=MatchType.FUZZY,
+                    match_score=fuzzy_score,
+                    matched_field="name",
+                    matched_value=entry.name,
+                    query_name=name,
+                    query_identifier=identifier,
+                ))
+
+        # Report in list order, then entry order, then by score descending
+        matches = [
+            match
+            for seq in sorted(found, key=lambda q: (list_order[index.entries[q].list_type], q))
+            for match in found[seq]
+        ]
         matches.sort(key=lambda m: m.match_score, reverse=True)
 
         return matches
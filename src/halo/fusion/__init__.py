@@ -14,12 +14,14 @@ from halo.fusion.engine import (
     DomainCorrelation,
 )
 from halo.fusion.temporal import (
+    SlidingWindowEngine,
     TemporalAnalyzer,
     TimelineEvent,
     TemporalPattern,
 )
 from halo.fusion.flow import (
     FlowAnalyzer,
+    FlowGraph,
     FlowPath,
     FlowNode,
 )
@@ -33,8 +35,10 @@ __all__ = [
     "TemporalAnalyzer",
     "TimelineEvent",
     "TemporalPattern",
+    "SlidingWindowEngine",
     # Flow
     "FlowAnalyzer",
+    "FlowGraph",
     "FlowPath",
     "FlowNode",
 ]
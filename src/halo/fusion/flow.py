@@ -8,6 +8,8 @@ Analyzes flows across the network:
 """
 
 import logging
+from collections import deque
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -133,6 +135,277 @@ class FlowPath:
         }
 
 
+class FlowGraph:
+    """
+    Index-based view of a flow network for path and cycle enumeration.
+
+    Nodes are numbered in insertion order and edges are kept as
+    ``(target_index, FlowEdge)`` lists, filtered once by flow type and
+    value when the view is built. Searches walk a single node/edge stack
+    instead of copying the path at every step, yield results as they are
+    found, and count every edge extension in ``stats["paths_explored"]``.
+
+    Cycles are only searched inside non-trivial strongly connected
+    components, rooted at their lowest-numbered node as in Johnson's
+    algorithm so each elementary cycle is reported once. Johnson's
+    blocking sets are unsound under a length bound, so the search prunes
+    with per-root distances back to the root instead.
+    """
+
+    def __init__(
+        self,
+        node_ids: Iterable[UUID],
+        adjacency: dict[UUID, list[FlowEdge]],
+        flow_type: Optional[FlowType] = None,
+        min_edge_value: float = 0.0,
+    ):
+        self.node_ids: list[UUID] = list(node_ids)
+        self.index: dict[UUID, int] = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.out: list[list[tuple[int, FlowEdge]]] = [[] for _ in self.node_ids]
+        self._reverse: Optional[list[list[int]]] = None
+        self.stats: dict[str, Any] = {}
+        self.reset_stats()
+
+        for source_id, edges in adjacency.items():
+            i = self.index.get(source_id)
+            if i is None:
+                continue
+            out = self.out[i]
+            for edge in edges:
+                if flow_type and edge.flow_type != flow_type:
+                    continue
+                if edge.value < min_edge_value:
+                    continue
+                j = self.index.get(edge.target_id)
+                if j is not None:
+                    out.append((j, edge))
+
+    def reset_stats(self) -> None:
+        """Clear search counters."""
+        self.stats.clear()
+        self.stats.update({
+            "paths_explored": 0,
+            "paths_found": 0,
+            "cycles_found": 0,
+            "components": 0,
+            "cyclic_components": 0,
+            "truncated": False,
+        })
+
+    @property
+    def reverse(self) -> list[list[int]]:
+        """Predecessor lists, built on first use."""
+        if self._reverse is None:
+            self._reverse = [[] for _ in self.node_ids]
+            for i, out in enumerate(self.out):
+                for j, _ in out:
+                    self._reverse[j].append(i)
+        return self._reverse
+
+    def strongly_connected_components(self) -> list[list[int]]:
+        """Tarjan's algorithm, iterative. Members are sorted by node index."""
+        n = len(self.node_ids)
+        order = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        stack: list[int] = []
+        components: list[list[int]] = []
+        counter = 0
+
+        for root in range(n):
+            if order[root] != -1:
+                continue
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, iter(self.out[root]))]
+
+            while work:
+                v, successors = work[-1]
+                for w, _ in successors:
+                    if order[w] == -1:
+                        order[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, iter(self.out[w])))
+                        break
+                    if on_stack[w] and order[w] < low[v]:
+                        low[v] = order[w]
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        if low[v] < low[parent]:
+                            low[parent] = low[v]
+                    if low[v] == order[v]:
+                        component = []
+                        while True:
+                            w = stack.pop()
+                            on_stack[w] = False
+                            component.append(w)
+                            if w == v:
+                                break
+                        components.append(sorted(component))
+
+        self.stats["components"] = len(components)
+        return components
+
+    def iter_paths(
+        self,
+        source_id: UUID,
+        target_id: Optional[UUID] = None,
+        max_edges: int = 4,
+        max_paths: Optional[int] = None,
+        interior: Optional[set[int]] = None,
+        min_interior: int = 0,
+    ) -> Iterator[tuple[tuple[int, ...], tuple[FlowEdge, ...]]]:
+        """
+        Yield simple paths from ``source_id`` as (node indices, edges).
+
+        Without a target every non-empty prefix is a path; with a target
+        only paths ending there are yielded and they are not extended
+        further. With ``interior``, only paths with at least
+        ``min_interior`` of those nodes strictly between the endpoints are
+        yielded, and branches that cannot reach that count are pruned.
+        """
+        s = self.index.get(source_id)
+        t = self.index.get(target_id) if target_id is not None else None
+        if s is None or (target_id is not None and t is None):
+            return
+
+        on_path = [False] * len(self.node_ids)
+        on_path[s] = True
+        nodes = [s]
+        edges: list[FlowEdge] = []
+        inside = 0  # interior-set nodes among nodes[1:]
+        stack = [iter(self.out[s])]
+        stats = self.stats
+        found = 0
+
+        while stack:
+            for j, edge in stack[-1]:
+                if on_path[j]:
+                    continue
+                stats["paths_explored"] += 1
+                nodes.append(j)
+                edges.append(edge)
+
+                if (t is None or j == t) and inside >= min_interior:
+                    stats["paths_found"] += 1
+                    found += 1
+                    yield tuple(nodes), tuple(edges)
+                    if max_paths is not None and found >= max_paths:
+                        stats["truncated"] = True
+                        return
+
+                if j != t and len(edges) < max_edges:
+                    flagged = interior is not None and j in interior
+                    reachable = inside + flagged + max_edges - len(edges) - 1
+                    if reachable >= min_interior:
+                        on_path[j] = True
+                        inside += flagged
+                        stack.append(iter(self.out[j]))
+                        break
+
+                nodes.pop()
+                edges.pop()
+            else:
+                stack.pop()
+                last = nodes.pop()
+                on_path[last] = False
+                if edges:
+                    edges.pop()
+                    inside -= interior is not None and last in interior
+
+    def iter_cycles(
+        self,
+        max_length: int = 6,
+        min_value: float = 0.0,
+        max_cycles: Optional[int] = None,
+    ) -> Iterator[tuple[tuple[int, ...], tuple[FlowEdge, ...]]]:
+        """
+        Yield elementary cycles of at most ``max_length`` edges.
+
+        Each cycle starts and ends at its lowest-numbered node. Cycles
+        whose summed edge value is below ``min_value`` are skipped, and
+        branches that cannot reach it with the component's largest edge
+        value are pruned.
+        """
+        stats = self.stats
+        components = self.strongly_connected_components()
+        label = [0] * len(self.node_ids)
+        for c, members in enumerate(components):
+            for v in members:
+                label[v] = c
+
+        for c, members in enumerate(components):
+            if len(members) == 1 and not any(j == members[0] for j, _ in self.out[members[0]]):
+                continue
+            stats["cyclic_components"] += 1
+            top_value = max(
+                (e.value for v in members for j, e in self.out[v] if label[j] == c),
+                default=0.0,
+            )
+
+            for s in members:
+                dist = self._distances_to(s, label, max_length - 1)
+                on_path = {s}
+                nodes = [s]
+                edges: list[FlowEdge] = []
+                values = [0.0]  # prefix sums of edge values
+                stack = [iter(self.out[s])]
+
+                while stack:
+                    for j, edge in stack[-1]:
+                        if j != s and (j < s or j in on_path or label[j] != c):
+                            continue
+                        stats["paths_explored"] += 1
+                        total = values[-1] + edge.value
+                        if j == s:
+                            if total >= min_value:
+                                stats["cycles_found"] += 1
+                                yield (*nodes, s), (*edges, edge)
+                                if max_cycles is not None and stats["cycles_found"] >= max_cycles:
+                                    stats["truncated"] = True
+                                    return
+                            continue
+                        depth = len(edges) + 1
+                        if j not in dist or depth + dist[j] > max_length:
+                            continue
+                        if total + (max_length - depth) * top_value < min_value:
+                            continue
+                        on_path.add(j)
+                        nodes.append(j)
+                        edges.append(edge)
+                        values.append(total)
+                        stack.append(iter(self.out[j]))
+                        break
+                    else:
+                        stack.pop()
+                        on_path.discard(nodes.pop())
+                        if edges:
+                            edges.pop()
+                            values.pop()
+
+    def _distances_to(self, root: int, label: list[int], limit: int) -> dict[int, int]:
+        """Edge counts to ``root`` from nodes numbered above it in its component."""
+        dist = {root: 0}
+        queue = deque([root])
+        reverse = self.reverse
+        while queue:
+            v = queue.popleft()
+            d = dist[v]
+            if d >= limit:
+                continue
+            for u in reverse[v]:
+                if u > root and u not in dist and label[u] == label[root]:
+                    dist[u] = d + 1
+                    queue.append(u)
+        return dist
+
+
 class FlowAnalyzer:
     """
     Analyzes flow patterns in entity networks.
@@ -147,6 +420,7 @@ class FlowAnalyzer:
         self._nodes: dict[UUID, FlowNode] = {}
         self._edges: list[FlowEdge] = []
         self._adjacency: dict[UUID, list[FlowEdge]] = {}
+        self.search_stats: dict[str, Any] = {}
 
     def add_node(self, node: FlowNode) -> None:
         """Add a node to the flow network."""
@@ -171,12 +445,43 @@ class FlowAnalyzer:
             self._nodes[edge.target_id].inflow_count += 1
             self._nodes[edge.target_id].inflow_value += edge.value
 
+    def flow_graph(
+        self,
+        flow_type: Optional[FlowType] = None,
+        min_edge_value: float = 0.0,
+    ) -> FlowGraph:
+        """Build a search view of the current network; its stats become ``search_stats``."""
+        graph = FlowGraph(self._nodes, self._adjacency, flow_type, min_edge_value)
+        self.search_stats = graph.stats
+        return graph
+
+    def iter_paths(
+        self,
+        source_id: UUID,
+        target_id: Optional[UUID] = None,
+        flow_type: Optional[FlowType] = None,
+        max_depth: int = 5,
+        max_paths: Optional[int] = None,
+    ) -> Iterator[FlowPath]:
+        """
+        Yield flow paths from source to target as they are found.
+
+        Same arguments as ``find_paths``; ``max_paths`` stops the search
+        early. Progress is reported in ``search_stats``.
+        """
+        graph = self.flow_graph(flow_type)
+        for nodes, edges in graph.iter_paths(
+            source_id, target_id, max_edges=max_depth - 1, max_paths=max_paths
+        ):
+            yield self._path_from(graph, nodes, edges, flow_type)
+
     def find_paths(
         self,
         source_id: UUID,
         target_id: Optional[UUID] = None,
         flow_type: Optional[FlowType] = None,
         max_depth: int = 5,
+        max_paths: Optional[int] = None,
     ) -> list[FlowPath]:
         """
         Find flow paths from source to target.
@@ -185,113 +490,102 @@ class FlowAnalyzer:
             source_id: Starting node
             target_id: Ending node (optional, finds all paths if None)
             flow_type: Filter by flow type
-            max_depth: Maximum path length
+            max_depth: Maximum number of nodes on a path
+            max_paths: Stop after this many paths
 
         Returns:
             List of flow paths
         """
-        paths = []
-
-        def dfs(
-            current: UUID,
-            path_nodes: list[FlowNode],
-            path_edges: list[FlowEdge],
-            visited: set[UUID],
-        ):
-            if len(path_nodes) > max_depth:
-                return
-
-            # Check if we've reached target
-            if target_id and current == target_id and path_edges:
-                paths.append(self._create_path(path_nodes, path_edges, flow_type))
-                return
+        return list(self.iter_paths(source_id, target_id, flow_type, max_depth, max_paths))
 
-            # If no target, create path at each node
-            if not target_id and path_edges:
-                paths.append(self._create_path(path_nodes, path_edges, flow_type))
-
-            # Continue DFS
-            for edge in self._adjacency.get(current, []):
-                if flow_type and edge.flow_type != flow_type:
-                    continue
-                if edge.target_id in visited:
-                    continue
-
-                target_node = self._nodes.get(edge.target_id)
-                if not target_node:
-                    continue
-
-                visited.add(edge.target_id)
-                dfs(
-                    edge.target_id,
-                    path_nodes + [target_node],
-                    path_edges + [edge],
-                    visited,
-                )
-                visited.remove(edge.target_id)
-
-        start_node = self._nodes.get(source_id)
-        if start_node:
-            dfs(source_id, [start_node], [], {source_id})
+    def iter_circular_flows(
+        self,
+        flow_type: Optional[FlowType] = None,
+        min_value: float = 0.0,
+        max_length: int = 6,
+        max_cycles: Optional[int] = None,
+    ) -> Iterator[FlowPath]:
+        """
+        Yield circular flows as they are found.
 
-        return paths
+        Same arguments as ``find_circular_flows``.
+        """
+        graph = self.flow_graph(flow_type)
+        for nodes, edges in graph.iter_cycles(max_length, min_value, max_cycles):
+            path = self._path_from(graph, nodes, edges, flow_type)
+            path.risk_indicators.append("Circular flow detected")
+            yield path
 
     def find_circular_flows(
         self,
         flow_type: Optional[FlowType] = None,
         min_value: float = 0.0,
+        max_length: int = 6,
+        max_cycles: Optional[int] = None,
     ) -> list[FlowPath]:
         """
         Find circular flow patterns (money laundering indicator).
 
+        Each elementary cycle is reported once, starting and ending at
+        the node that was added to the network first.
+
         Args:
             flow_type: Filter by flow type
-            min_value: Minimum flow value
+            min_value: Minimum total flow value around the cycle
+            max_length: Maximum number of edges in a cycle
+            max_cycles: Stop after this many cycles
 
         Returns:
             List of circular flow paths
         """
-        circular_paths = []
-
-        for node_id in self._nodes:
-            # Find paths that return to source
-            paths = self.find_paths(
-                source_id=node_id,
-                target_id=node_id,
-                flow_type=flow_type,
-                max_depth=6,
-            )
-
-            for path in paths:
-                if path.total_value >= min_value:
-                    path.risk_indicators.append("Circular flow detected")
-                    circular_paths.append(path)
-
+        circular_paths = list(
+            self.iter_circular_flows(flow_type, min_value, max_length, max_cycles)
+        )
+        logger.debug(
+            f"Found {len(circular_paths)} circular flows "
+            f"({self.search_stats['paths_explored']} paths explored, "
+            f"{self.search_stats['cyclic_components']} cyclic components)"
+        )
         return circular_paths
 
     def find_layering_patterns(
         self,
         min_layers: int = 3,
+        max_depth: int = 5,
+        max_paths: Optional[int] = None,
     ) -> list[FlowPath]:
         """
         Find layering patterns (many pass-through entities).
 
         Args:
             min_layers: Minimum number of pass-through entities
+            max_depth: Maximum number of nodes on a path
+            max_paths: Stop after this many paths
 
         Returns:
             List of paths with layering
         """
+        graph = self.flow_graph()
+        pass_through = {
+            i for i, node_id in enumerate(graph.node_ids)
+            if self._nodes[node_id].is_pass_through()
+        }
         layering_paths = []
 
-        for path in self._get_all_paths():
-            # Count pass-through nodes (excluding source and sink)
-            middle_nodes = path.nodes[1:-1] if len(path.nodes) > 2 else []
-            pass_through_count = sum(
-                1 for n in middle_nodes if n.is_pass_through()
-            )
-
-            if pass_through_count >= min_layers:
+        for source_id in graph.node_ids:
+            remaining = None if max_paths is None else max_paths - len(layering_paths)
+            if remaining == 0:
+                graph.stats["truncated"] = True
+                break
+            for nodes, edges in graph.iter_paths(
+                source_id,
+                max_edges=max_depth - 1,
+                max_paths=remaining,
+                interior=pass_through,
+                min_interior=min_layers,
+            ):
+                pass_through_count = sum(1 for i in nodes[1:-1] if i in pass_through)
+                path = self._path_from(graph, nodes, edges, None)
                 path.risk_indicators.append(
                     f"Layering: {pass_through_count} pass-through entities"
                 )
@@ -378,17 +672,24 @@ class FlowAnalyzer:
             risk_indicators=[],
         )
 
-    def _get_all_paths(self, max_depth: int = 5) -> list[FlowPath]:
-        """Get all paths in the network."""
-        all_paths = []
-        for node_id in self._nodes:
-            paths = self.find_paths(source_id=node_id, max_depth=max_depth)
-            all_paths.extend(paths)
-        return all_paths
+    def _path_from(
+        self,
+        graph: FlowGraph,
+        nodes: tuple[int, ...],
+        edges: tuple[FlowEdge, ...],
+        flow_type: Optional[FlowType],
+    ) -> FlowPath:
+        """Create a FlowPath from a FlowGraph search result."""
+        return self._create_path(
+            [self._nodes[graph.node_ids[i]] for i in nodes], list(edges), flow_type
+        )
 
-    def _average_path_length(self) -> float:
+    def _average_path_length(self, max_depth: int = 3) -> float:
         """Calculate average path length in the network."""
-        paths = self._get_all_paths(max_depth=3)  # Limit for performance
-        if not paths:
-            return 0.0
-        return sum(p.path_length for p in paths) / len(paths)
+        graph = self.flow_graph()
+        count = total = 0
+        for source_id in graph.node_ids:
+            for _, edges in graph.iter_paths(source_id, max_edges=max_depth - 1):
+                count += 1
+                total += len(edges)
+        return total / count if count else 0.0
@@ -7,7 +7,10 @@ Analyzes timing patterns across entities and events to identify:
 - Event sequences indicating organized crime
 """
 
+import heapq
 import logging
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -97,6 +100,89 @@ class TemporalPattern:
         }
 
 
+def _occurred_at(event: TimelineEvent) -> datetime:
+    return event.occurred_at
+
+
+class SlidingWindowEngine:
+    """
+    Two-pointer window detection over a time-ordered event stream.
+
+    A window opens at its earliest event and covers ``span`` from there.
+    When an event past the span arrives, the window closes: if it holds at
+    least ``min_events`` events from at least ``min_entities`` distinct
+    entities it is emitted whole and the next window starts after it, so
+    emitted windows never overlap; otherwise the earliest event is dropped
+    and the next one becomes the window start.
+
+    Each event is appended and dropped at most once, so a stream of n
+    events costs O(n).
+    """
+
+    def __init__(self, span: timedelta, min_events: int = 1, min_entities: int = 1):
+        self.span = span
+        self.min_events = min_events
+        self.min_entities = min_entities
+        self._window: deque[TimelineEvent] = deque()
+        self._entities: Counter = Counter()
+        self._last: Optional[datetime] = None
+
+    def push(self, event: TimelineEvent) -> Optional[list[TimelineEvent]]:
+        """
+        Append an event; return the window it closed, if that qualified.
+
+        Raises ValueError if the event is older than the previous one.
+        """
+        if self._last is not None and event.occurred_at < self._last:
+            raise ValueError(
+                f"Event {event.id} at {event.occurred_at} arrived after {self._last}"
+            )
+        self._last = event.occurred_at
+
+        emitted = None
+        window = self._window
+        while window and event.occurred_at > window[0].occurred_at + self.span:
+            if self._qualifies():
+                emitted = list(window)
+                window.clear()
+                self._entities.clear()
+                break
+            self._drop_first()
+
+        window.append(event)
+        self._entities[event.entity_id] += 1
+        return emitted
+
+    def flush(self) -> Optional[list[TimelineEvent]]:
+        """Close the open window at end of stream; return it if it qualified."""
+        # Dropping events only shrinks the window, so one check is enough
+        emitted = list(self._window) if self._qualifies() else None
+        self._window.clear()
+        self._entities.clear()
+        return emitted
+
+    def run(self, events: list[TimelineEvent]) -> list[list[TimelineEvent]]:
+        """Windows emitted for a whole time-ordered event list."""
+        windows = [w for w in map(self.push, events) if w is not None]
+        last = self.flush()
+        if last is not None:
+            windows.append(last)
+        self._last = None
+        return windows
+
+    def _qualifies(self) -> bool:
+        return (
+            len(self._window) >= self.min_events
+            and len(self._entities) >= self.min_entities
+        )
+
+    def _drop_first(self) -> None:
+        entity_id = self._window.popleft().entity_id
+        self._entities[entity_id] -= 1
+        if not self._entities[entity_id]:
+            del self._entities[entity_id]
+
+
 class TemporalAnalyzer:
     """
     Analyzes temporal patterns in event data.
@@ -115,16 +201,56 @@ class TemporalAnalyzer:
         self.burst_min_events = burst_min_events
         self.coordination_window = coordination_window
         self._events: list[TimelineEvent] = []
+        self._by_entity: dict[UUID, list[TimelineEvent]] = {}
+        self._burst_streams: dict[UUID, SlidingWindowEngine] = {}
 
     def add_event(self, event: TimelineEvent) -> None:
         """Add an event to the timeline."""
-        self._events.append(event)
-        self._events.sort(key=lambda e: e.occurred_at)
+        # insort keeps insertion order among equal timestamps, like a stable sort
+        insort(self._events, event, key=_occurred_at)
+        insort(self._by_entity.setdefault(event.entity_id, []), event, key=_occurred_at)
 
     def add_events(self, events: list[TimelineEvent]) -> None:
         """Add multiple events to the timeline."""
+        # Timsort merges the already sorted runs in linear time
         self._events.extend(events)
-        self._events.sort(key=lambda e: e.occurred_at)
+        self._events.sort(key=_occurred_at)
+        touched = set()
+        for event in events:
+            self._by_entity.setdefault(event.entity_id, []).append(event)
+            touched.add(event.entity_id)
+        for entity_id in touched:
+            self._by_entity[entity_id].sort(key=_occurred_at)
+
+    def push_event(self, event: TimelineEvent) -> list[TemporalPattern]:
+        """
+        Add an event for live burst alerting.
+
+        Each entity's events feed a streaming window; a burst is reported
+        once its window closes, i.e. when an event for the same entity
+        arrives past the burst threshold. Events must arrive in time order
+        per entity. Call flush_bursts() to report bursts still open.
+
+        Returns:
+            Burst patterns completed by this event (at most one)
+        """
+        stream = self._burst_streams.get(event.entity_id)
+        if stream is None:
+            stream = SlidingWindowEngine(self.burst_threshold, min_events=self.burst_min_events)
+            self._burst_streams[event.entity_id] = stream
+
+        window = stream.push(event)
+        self.add_event(event)
+        return [self._burst_pattern(window)] if window else []
+
+    def flush_bursts(self) -> list[TemporalPattern]:
+        """Close all open streaming windows and report qualifying bursts."""
+        patterns = []
+        for stream in self._burst_streams.values():
+            window = stream.flush()
+            if window:
+                patterns.append(self._burst_pattern(window))
+        return patterns
 
     def get_timeline(
         self,
@@ -148,11 +274,11 @@ class TemporalAnalyzer:
         events = self._events
 
         if entity_id:
-            events = [e for e in events if e.entity_id == entity_id]
-        if start:
-            events = [e for e in events if e.occurred_at >= start]
-        if end:
-            events = [e for e in events if e.occurred_at <= end]
+            events = self._by_entity.get(entity_id, [])
+        if start or end:
+            lo = bisect_left(events, start, key=_occurred_at) if start else 0
+            hi = bisect_right(events, end, key=_occurred_at) if end else len(events)
+            events = events[lo:hi]
         if event_types:
             events = [e for e in events if e.event_type in event_types]
 
@@ -165,42 +291,23 @@ class TemporalAnalyzer:
         """
         Detect burst patterns (many events in short time).
 
+        Windows are found in one pass and never overlap: each burst holds
+        every event within burst_threshold of its first event.
+
         Args:
             entity_id: Filter by entity
 
         Returns:
-            List of detected burst patterns
+            List of detected burst patterns, highest confidence first
         """
         events = self.get_timeline(entity_id=entity_id)
-        patterns = []
-
         if len(events) < self.burst_min_events:
-            return patterns
-
-        # Sliding window to find bursts
-        for i, event in enumerate(events):
-            window_end = event.occurred_at + self.burst_threshold
-            window_events = [
-                e for e in events[i:]
-                if e.occurred_at <= window_end
-            ]
-
-            if len(window_events) >= self.burst_min_events:
-                # Found a burst
-                entity_ids = list(set(e.entity_id for e in window_events))
-                pattern = TemporalPattern(
-                    pattern_type=PatternType.BURST,
-                    events=window_events,
-                    entity_ids=entity_ids,
-                    start_time=window_events[0].occurred_at,
-                    end_time=window_events[-1].occurred_at,
-                    confidence=min(1.0, len(window_events) / 10),
-                    description=f"Burst of {len(window_events)} events in {self.burst_threshold}",
-                    risk_score=self._calculate_burst_risk(window_events),
-                )
-                patterns.append(pattern)
+            return []
 
-        return self._deduplicate_patterns(patterns)
+        engine = SlidingWindowEngine(self.burst_threshold, min_events=self.burst_min_events)
+        patterns = [self._burst_pattern(window) for window in engine.run(events)]
+        patterns.sort(key=lambda p: p.confidence, reverse=True)
+        return patterns
 
     def detect_coordinated_activity(
         self,
@@ -209,57 +316,57 @@ class TemporalAnalyzer:
         """
         Detect coordinated activity across multiple entities.
 
+        Merges the entities' sorted timelines and slides one window over
+        them, tracking distinct entities incrementally.
+
         Args:
             entity_ids: Entities to check for coordination
 
         Returns:
-            List of detected coordination patterns
+            List of detected coordination patterns, highest confidence first
         """
-        patterns = []
-
-        # Get events for all entities
-        entity_events = {
-            eid: self.get_timeline(entity_id=eid)
-            for eid in entity_ids
-        }
-
-        # Find overlapping windows
-        all_events = []
-        for events in entity_events.values():
-            all_events.extend(events)
-        all_events.sort(key=lambda e: e.occurred_at)
-
-        for event in all_events:
-            window_start = event.occurred_at
-            window_end = window_start + self.coordination_window
-
-            # Find events from different entities in this window
-            window_events = [
-                e for e in all_events
-                if window_start <= e.occurred_at <= window_end
-            ]
+        entity_ids = list(dict.fromkeys(entity_ids))
+        all_events = list(heapq.merge(
+            *(self._by_entity.get(eid, []) for eid in entity_ids),
+            key=_occurred_at,
+        ))
 
+        engine = SlidingWindowEngine(self.coordination_window, min_events=2, min_entities=2)
+        patterns = []
+        for window_events in engine.run(all_events):
             participating_entities = set(e.entity_id for e in window_events)
+            window_start = window_events[0].occurred_at
+            patterns.append(TemporalPattern(
+                pattern_type=PatternType.COORDINATED,
+                events=window_events,
+                entity_ids=list(participating_entities),
+                start_time=window_start,
+                end_time=window_start + self.coordination_window,
+                confidence=len(participating_entities) / len(entity_ids),
+                description=(
+                    f"Coordinated activity: {len(participating_entities)} entities "
+                    f"within {self.coordination_window}"
+                ),
+                risk_score=self._calculate_coordination_risk(
+                    window_events, participating_entities
+                ),
+            ))
 
-            if len(participating_entities) >= 2:
-                pattern = TemporalPattern(
-                    pattern_type=PatternType.COORDINATED,
-                    events=window_events,
-                    entity_ids=list(participating_entities),
-                    start_time=window_start,
-                    end_time=window_end,
-                    confidence=len(participating_entities) / len(entity_ids),
-                    description=(
-                        f"Coordinated activity: {len(participating_entities)} entities "
-                        f"within {self.coordination_window}"
-                    ),
-                    risk_score=self._calculate_coordination_risk(
-                        window_events, participating_entities
-                    ),
-                )
-                patterns.append(pattern)
+        patterns.sort(key=lambda p: p.confidence, reverse=True)
+        return patterns
 
-        return self._deduplicate_patterns(patterns)
+    def _burst_pattern(self, window_events: list[TimelineEvent]) -> TemporalPattern:
+        """Build a burst pattern from a window of events."""
+        return TemporalPattern(
+            pattern_type=PatternType.BURST,
+            events=window_events,
+            entity_ids=list(set(e.entity_id for e in window_events)),
+            start_time=window_events[0].occurred_at,
+            end_time=window_events[-1].occurred_at,
+            confidence=min(1.0, len(window_events) / 10),
+            description=f"Burst of {len(window_events)} events in {self.burst_threshold}",
+            risk_score=self._calculate_burst_risk(window_events),
+        )
 
     def detect_sequences(
         self,
@@ -336,36 +443,3 @@ class TemporalAnalyzer:
         type_similarity = types.count(types[0]) / len(types) if types else 0
 
         return (entity_risk + type_similarity) / 2
-
-    def _deduplicate_patterns(
-        self,
-        patterns: list[TemporalPattern],
-    ) -> list[TemporalPattern]:
-        """Remove overlapping patterns, keeping highest confidence."""
-        if not patterns:
-            return []
-
-        # Sort by confidence descending
-        patterns.sort(key=lambda p: p.confidence, reverse=True)
-
-        unique = []
-        for pattern in patterns:
-            # Check if overlaps with existing pattern
-            overlaps = False
-            for existing in unique:
-                if (
-                    pattern.start_time <= existing.end_time and
-                    pattern.end_time >= existing.start_time
-                ):
-                    # Check for significant event overlap
-                    pattern_event_ids = {e.id for e in pattern.events}
-                    existing_event_ids = {e.id for e in existing.events}
-                    overlap = len(pattern_event_ids & existing_event_ids)
-                    if overlap >= len(pattern.events) / 2:
-                        overlaps = True
-                        break
-
-            if not overlaps:
-                unique.append(pattern)
-
-        return unique
@@ -31,6 +31,9 @@ from halo.graph.edges import (
 )
 from halo.graph.client import GraphClient, create_graph_client, Neo4jBackend, NetworkXBackend
 from halo.graph.age_backend import AgeBackend, create_age_backend
+from halo.graph.compact_backend import CompactGraphBackend
+from halo.graph.metrics_cache import GraphMetricsCache
+from halo.graph.snapshot_store import GraphDelta, GraphSnapshotReader, GraphSnapshotStore
 
 __all__ = [
     # Nodes
@@ -57,4 +60,10 @@ __all__ = [
     "NetworkXBackend",
     "AgeBackend",
     "create_age_backend",
+    "CompactGraphBackend",
+    "GraphMetricsCache",
+    # Snapshot store
+    "GraphSnapshotStore",
+    "GraphSnapshotReader",
+    "GraphDelta",
 ]
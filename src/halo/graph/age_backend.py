@@ -14,11 +14,15 @@ Requirements:
 
 import json
 import logging
+import time
+from collections import defaultdict
 from dataclasses import asdict
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Optional
 
-from halo.graph.client import GraphBackend, NodeType, EdgeType
+from halo.graph.client import (
+    GraphBackend, NodeType, EdgeType, NODE_ORDER_FIELDS, label_components, node_summary,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -46,11 +50,15 @@ class AgeBackend(GraphBackend):
         "Document": ["id", "doc_type", "title", "source", "created_at"],
     }
 
+    # Rows sent per UNWIND statement in batch ingestion
+    DEFAULT_BATCH_SIZE = 5000
+
     def __init__(
         self,
         connection_string: str,
         graph_name: str = DEFAULT_GRAPH,
         auto_setup: bool = True,
+        batch_size: int = DEFAULT_BATCH_SIZE,
     ):
         """
         Initialize the AGE backend.
@@ -59,12 +67,20 @@ class AgeBackend(GraphBackend):
             connection_string: PostgreSQL connection string
             graph_name: Name of the AGE graph to use
             auto_setup: Whether to create graph and indexes on connect
+            batch_size: Rows per statement for create_nodes_batch/create_edges_batch
         """
         self.connection_string = connection_string
         self.graph_name = graph_name
         self.auto_setup = auto_setup
+        self.batch_size = batch_size
         self._pool = None
         self._setup_done = False
+        self.ingest_stats = {
+            "nodes_written": 0,
+            "edges_written": 0,
+            "statements": 0,
+            "seconds": 0.0,
+        }
 
     async def connect(self) -> None:
         """Establish connection to PostgreSQL with AGE extension."""
@@ -75,13 +91,11 @@ class AgeBackend(GraphBackend):
                 self.connection_string,
                 min_size=2,
                 max_size=10,
+                init=self._init_connection,
             )
 
             # Test AGE extension is available
             async with self._pool.acquire() as conn:
-                await conn.execute("LOAD 'age';")
-                await conn.execute("SET search_path = ag_catalog, \"$user\", public;")
-
                 # Check if our graph exists
                 result = await conn.fetchval(
                     "SELECT EXISTS(SELECT 1 FROM ag_catalog.ag_graph WHERE name = $1)",
@@ -119,9 +133,23 @@ class AgeBackend(GraphBackend):
             self._pool = None
             logger.info("PostgreSQL AGE connection closed")
 
-    def _prepare_connection(self, conn) -> None:
-        """Prepare a connection for AGE queries."""
-        # Note: This is synchronous; called via run_sync in execute methods
+    async def _init_connection(self, conn) -> None:
+        """
+        Prepare a pooled connection for AGE queries.
+
+        Runs once per physical connection (asyncpg ``init`` hook) rather than
+        once per query. agtype is exchanged as text so batch statements can
+        pass their rows as a single cypher() parameter.
+        """
+        await conn.execute("LOAD 'age';")
+        await conn.execute("SET search_path = ag_catalog, \"$user\", public;")
+        await conn.set_type_codec(
+            "agtype",
+            schema="ag_catalog",
+            encoder=str,
+            decoder=str,
+            format="text",
+        )
 
     async def execute(self, query: str, params: Optional[dict] = None) -> list[dict]:
         """
@@ -140,9 +168,6 @@ class AgeBackend(GraphBackend):
             raise RuntimeError("Not connected to PostgreSQL AGE")
 
         async with self._pool.acquire() as conn:
-            await conn.execute("LOAD 'age';")
-            await conn.execute("SET search_path = ag_catalog, \"$user\", public;")
-
             # AGE requires wrapping Cypher in cypher() function
             # Parameters must be embedded (AGE has limited parameterized query support)
             wrapped_query = f"""
@@ -253,6 +278,187 @@ class AgeBackend(GraphBackend):
         result = await self.execute(query)
         return result[0].get("id", edge.id) if result else edge.id
 
+    def _to_agtype_value(self, value: Any) -> Any:
+        """Convert a dataclass field value into a JSON-serialisable agtype value."""
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, (list, dict)):
+            # Stored as JSON strings, matching create_node/create_edge
+            return json.dumps(value, default=str)
+        return value
+
+    def _to_agtype_row(self, data: dict) -> dict:
+        """Convert a dataclass dict into an agtype property map, dropping nulls."""
+        return {
+            key: self._to_agtype_value(value)
+            for key, value in data.items()
+            if value is not None
+        }
+
+    async def _execute_unwind(self, query: str, rows: list[dict]) -> None:
+        """
+        Execute an ``UNWIND $rows`` Cypher statement with rows as a parameter.
+
+        The rows are sent as one agtype map parameter, so a batch costs a
+        single round-trip and no Cypher string escaping.
+        """
+        if not self._pool:
+            raise RuntimeError("Not connected to PostgreSQL AGE")
+
+        wrapped_query = f"""
+            SELECT * FROM cypher('{self.graph_name}', $$
+                {query}
+            $$, $1) AS (result agtype);
+        """
+        params = json.dumps({"rows": rows})
+
+        async with self._pool.acquire() as conn:
+            try:
+                async with conn.transaction():
+                    await conn.execute(wrapped_query, params)
+            except Exception as e:
+                logger.error(f"AGE batch error ({len(rows)} rows): {e}\nQuery: {query}")
+                raise
+
+    async def _fetch(self, query: str, params: dict) -> list[dict]:
+        """
+        Execute a read-only Cypher query with params as one agtype map.
+
+        The query must return a single column; rows come back parsed.
+        """
+        if not self._pool:
+            raise RuntimeError("Not connected to PostgreSQL AGE")
+
+        wrapped_query = f"""
+            SELECT * FROM cypher('{self.graph_name}', $$
+                {query}
+            $$, $1) AS (result agtype);
+        """
+        async with self._pool.acquire() as conn:
+            try:
+                rows = await conn.fetch(wrapped_query, json.dumps(params, default=str))
+            except Exception as e:
+                logger.error(f"AGE query error: {e}\nQuery: {query}")
+                raise
+        return [self._parse_agtype(row["result"]) for row in rows]
+
+    @staticmethod
+    def _decode_props(props: Any, node_type: Optional[str] = None) -> dict:
+        """Property map with JSON-encoded fields parsed."""
+        node = dict(props) if isinstance(props, dict) else {}
+        for key, value in node.items():
+            if isinstance(value, str) and value.startswith(('[', '{')):
+                try:
+                    node[key] = json.loads(value)
+                except json.JSONDecodeError:
+                    pass
+        if node_type is not None:
+            node["_type"] = node_type
+        return node
+
+    def _record_ingest(self, kind: str, rows: int, statements: int, elapsed: float) -> None:
+        """Accumulate ingest counters and log throughput for load sizing."""
+        self.ingest_stats[f"{kind}_written"] += rows
+        self.ingest_stats["statements"] += statements
+        self.ingest_stats["seconds"] += elapsed
+
+        rate = rows / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f"AGE batch ingest: {rows} {kind} in {statements} statements, "
+            f"{elapsed:.2f}s ({rate:.0f} rows/sec)"
+        )
+
+    async def create_nodes_batch(
+        self,
+        nodes: list[NodeType],
+        batch_size: Optional[int] = None,
+    ) -> list[str]:
+        """
+        Create or update many nodes using one UNWIND MERGE per label and chunk.
+
+        Args:
+            nodes: Nodes to write (may mix node types)
+            batch_size: Rows per statement (defaults to ``self.batch_size``)
+
+        Returns:
+            Node IDs in input order
+        """
+        if not nodes:
+            return []
+
+        batch_size = batch_size or self.batch_size
+        by_label: dict[str, list[dict]] = defaultdict(list)
+        for node in nodes:
+            by_label[type(node).__name__].append(self._to_agtype_row(asdict(node)))
+
+        start = time.perf_counter()
+        statements = 0
+        for label, rows in by_label.items():
+            query = f"""
+                UNWIND $rows AS row
+                MERGE (n:{label} {{id: row.id}})
+                SET n = row
+                RETURN count(n)
+            """
+            for i in range(0, len(rows), batch_size):
+                await self._execute_unwind(query, rows[i:i + batch_size])
+                statements += 1
+
+        self._record_ingest("nodes", len(nodes), statements, time.perf_counter() - start)
+        return [node.id for node in nodes]
+
+    async def create_edges_batch(
+        self,
+        edges: list[EdgeType],
+        batch_size: Optional[int] = None,
+    ) -> list[str]:
+        """
+        Create or update many edges using one UNWIND MERGE per type and chunk.
+
+        Endpoints must already exist; rows whose endpoints are missing are
+        skipped by the MATCH, as with create_edge.
+
+        Args:
+            edges: Edges to write (may mix edge types)
+            batch_size: Rows per statement (defaults to ``self.batch_size``)
+
+        Returns:
+            Edge IDs in input order
+        """
+        if not edges:
+            return []
+
+        batch_size = batch_size or self.batch_size
+        by_type: dict[str, list[dict]] = defaultdict(list)
+        for edge in edges:
+            data = asdict(edge)
+            from_id = data.pop("from_id")
+            to_id = data.pop("to_id")
+            data.pop("from_type", None)
+            by_type[type(edge).__name__.replace("Edge", "").upper()].append({
+                "from_id": from_id,
+                "to_id": to_id,
+                "props": self._to_agtype_row(data),
+            })
+
+        start = time.perf_counter()
+        statements = 0
+        for edge_type, rows in by_type.items():
+            query = f"""
+                UNWIND $rows AS row
+                MATCH (a {{id: row.from_id}})
+                MATCH (b {{id: row.to_id}})
+                MERGE (a)-[r:{edge_type}]->(b)
+                SET r = row.props
+                RETURN count(r)
+            """
+            for i in range(0, len(rows), batch_size):
+                await self._execute_unwind(query, rows[i:i + batch_size])
+                statements += 1
+
+        self._record_ingest("edges", len(edges), statements, time.perf_counter() - start)
+        return [edge.id for edge in edges]
+
     async def get_node(self, node_id: str, node_type: str) -> Optional[dict]:
         """Get a node by ID and type."""
         query = f"""
@@ -331,6 +537,108 @@ class AgeBackend(GraphBackend):
 
         return neighbors
 
+    async def get_neighbors_batch(
+        self,
+        node_ids: list[str],
+        edge_types: Optional[list[str]] = None,
+        direction: str = "both",
+        limit_per_node: Optional[int] = None,
+    ) -> dict[str, list[dict]]:
+        """
+        Get neighbors of many nodes in one cypher() call.
+
+        The IDs travel as an agtype parameter; per-node limits are applied
+        to the returned rows.
+        """
+        edge_filter = ""
+        if edge_types:
+            rel_types = [t.replace("Edge", "").upper() for t in edge_types]
+            edge_filter = ":" + "|".join(rel_types)
+
+        if direction == "out":
+            pattern = f"(n)-[r{edge_filter}]->(m)"
+        elif direction == "in":
+            pattern = f"(n)<-[r{edge_filter}]-(m)"
+        else:
+            pattern = f"(n)-[r{edge_filter}]-(m)"
+
+        query = f"""
+            UNWIND $ids AS node_id
+            MATCH {pattern}
+            WHERE n.id = node_id
+            RETURN {{source: node_id, props: properties(m), label: label(m),
+                    edge_type: type(r), edge: properties(r)}}
+        """
+        ids = list(dict.fromkeys(node_ids))
+        rows = await self._fetch(query, {"ids": ids})
+
+        batch: dict[str, list[dict]] = {node_id: [] for node_id in ids}
+        for row in rows:
+            neighbors = batch.get(row.get("source"))
+            if neighbors is None or (limit_per_node is not None and len(neighbors) >= limit_per_node):
+                continue
+            edge = self._decode_props(row.get("edge"))
+            edge["_type"] = row.get("edge_type")
+            neighbors.append({
+                "m": self._decode_props(row.get("props"), row.get("label")),
+                "edge_type": row.get("edge_type"),
+                "edge": edge,
+            })
+        return batch
+
+    async def list_nodes(self, limit: int, order_by: Optional[str] = None) -> list[dict]:
+        """List node summaries, ranked in the database."""
+        order = ""
+        if order_by == "degree":
+            order = "ORDER BY degree DESC"
+        elif order_by in NODE_ORDER_FIELDS:
+            order = f"ORDER BY coalesce(n.{order_by}, 0) DESC"
+        query = f"""
+            MATCH (n)
+            OPTIONAL MATCH (n)-[r]-()
+            WITH n, count(r) AS degree
+            {order}
+            LIMIT {int(limit)}
+            RETURN {{props: properties(n), label: label(n), degree: degree}}
+        """
+        rows = await self._fetch(query, {})
+        return [
+            node_summary(self._decode_props(row.get("props"), row.get("label")), row.get("degree", 0))
+            for row in rows
+        ]
+
+    async def induced_subgraph(self, node_ids: list[str]) -> dict:
+        """Induced subgraph in one cypher() call; components are labelled locally."""
+        query = """
+            MATCH (n) WHERE n.id IN $ids
+            OPTIONAL MATCH (n)-[r]->(m) WHERE m.id IN $ids
+            RETURN {props: properties(n), label: label(n),
+                    edge_type: type(r), edge: properties(r), to_id: m.id}
+        """
+        rows = await self._fetch(query, {"ids": list(node_ids)})
+
+        nodes: dict[str, dict] = {}
+        edges = []
+        for row in rows:
+            node = self._decode_props(row.get("props"), row.get("label"))
+            node_id = node.get("id")
+            nodes.setdefault(node_id, node)
+            if row.get("edge_type"):
+                edges.append({
+                    **self._decode_props(row.get("edge")),
+                    "from_id": node_id,
+                    "to_id": row.get("to_id"),
+                    "_type": row["edge_type"],
+                })
+
+        components, sizes = label_components(list(nodes), edges)
+        return {
+            "nodes": list(nodes.values()),
+            "edges": edges,
+            "components": components,
+            "component_sizes": sizes,
+        }
+
     async def find_by_orgnr(self, orgnr: str) -> Optional[dict]:
         """Find a company by organisationsnummer."""
         query = f"""
@@ -342,6 +650,16 @@ class AgeBackend(GraphBackend):
             return result[0].get("c", result[0])
         return None
 
+    async def find_by_orgnrs(self, orgnrs: list[str]) -> dict[str, dict]:
+        """Find many companies by organisationsnummer in one cypher() call."""
+        query = """
+            UNWIND $orgnrs AS orgnr
+            MATCH (c:Company {orgnr: orgnr})
+            RETURN {orgnr: orgnr, props: properties(c)}
+        """
+        rows = await self._fetch(query, {"orgnrs": list(dict.fromkeys(orgnrs))})
+        return {row["orgnr"]: self._decode_props(row.get("props"), "Company") for row in rows}
+
     async def find_by_personnummer(self, personnummer: str) -> Optional[dict]:
         """Find a person by personnummer."""
         query = f"""
@@ -5,10 +5,13 @@ Provides a unified interface for graph operations, supporting both
 PostgreSQL with Apache AGE and Neo4j backends.
 """
 
+import copy
+import heapq
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import asdict
 from datetime import datetime
+from itertools import islice
 from typing import Any, Optional, TypeVar, Union
 
 import networkx as nx
@@ -18,6 +21,7 @@ from halo.graph.edges import (
     DirectsEdge, OwnsEdge, BeneficialOwnerEdge, RegisteredAtEdge,
     LivesAtEdge, CoDirectorEdge, CoRegisteredEdge, TransactsEdge, SameAsEdge
 )
+from halo.graph.metrics_cache import GraphMetricsCache
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +32,64 @@ EdgeType = Union[
 ]
 T = TypeVar("T")
 
+# Summary fields get_all_entities can rank by
+NODE_ORDER_FIELDS = ("degree", "shell_score", "risk_score")
+
+
+def node_display_name(node: dict) -> str:
+    """Display name for a stored node dict (current name first, as in the schema)."""
+    names = node.get("names") or []
+    if isinstance(names, list) and names:
+        current = [n for n in names if isinstance(n, dict) and not n.get("to")]
+        first = (current or names)[0]
+        if isinstance(first, dict) and first.get("name"):
+            return first["name"]
+    return node.get("name") or node.get("id", "")
+
+
+def node_summary(node: dict, degree: int) -> dict:
+    """Compact listing entry for a node, as used by the graph visualisation."""
+    return {
+        "id": node.get("id"),
+        "type": node.get("_type", "Unknown"),
+        "name": node_display_name(node),
+        "degree": degree,
+        "shell_score": node.get("shell_score", 0) or 0,
+        "risk_score": node.get("risk_score", 0) or 0,
+    }
+
+
+def label_components(node_ids: list[str], edges: list[dict]) -> tuple[dict[str, int], dict[int, int]]:
+    """
+    Weakly connected components of a small edge list via union-find.
+
+    Returns (label per node ID, size per label). Used by backends that can
+    only see the requested subgraph.
+    """
+    parent = {node_id: node_id for node_id in node_ids}
+
+    def find(x: str) -> str:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for edge in edges:
+        a, b = edge["from_id"], edge["to_id"]
+        if a in parent and b in parent:
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[rb] = ra
+
+    roots: dict[str, int] = {}
+    labels = {}
+    sizes: dict[int, int] = {}
+    for node_id in node_ids:
+        label = roots.setdefault(find(node_id), len(roots))
+        labels[node_id] = label
+        sizes[label] = sizes.get(label, 0) + 1
+    return labels, sizes
+
 
 class GraphBackend(ABC):
     """Abstract base class for graph database backends."""
@@ -72,6 +134,88 @@ class GraphBackend(ABC):
         """Get neighboring nodes."""
         pass
 
+    async def get_neighbors_batch(
+        self,
+        node_ids: list[str],
+        edge_types: Optional[list[str]] = None,
+        direction: str = "both",
+        limit_per_node: Optional[int] = None,
+    ) -> dict[str, list[dict]]:
+        """
+        Get neighbors of many nodes at once.
+
+        Returns the get_neighbors result for every requested node ID (empty
+        for unknown nodes). With limit_per_node, each node keeps only its
+        first neighbors in backend order, so hubs are cut deterministically.
+
+        This fallback issues one get_neighbors call per node; backends
+        override it with a single query or adjacency scan.
+        """
+        result = {}
+        for node_id in dict.fromkeys(node_ids):
+            neighbors = await self.get_neighbors(node_id, edge_types=edge_types, direction=direction)
+            result[node_id] = neighbors[:limit_per_node] if limit_per_node is not None else neighbors
+        return result
+
+    async def find_by_orgnrs(self, orgnrs: list[str]) -> dict[str, dict]:
+        """
+        Find many companies by organisationsnummer.
+
+        Returns the company node for every orgnr that exists; unknown
+        orgnrs are left out. This fallback issues one find_by_orgnr call
+        per orgnr; backends override it with an index or a single query.
+        """
+        result = {}
+        for orgnr in dict.fromkeys(orgnrs):
+            company = await self.find_by_orgnr(orgnr)
+            if company:
+                result[orgnr] = company
+        return result
+
+    async def list_nodes(self, limit: int, order_by: Optional[str] = None) -> list[dict]:
+        """
+        List node summaries (see node_summary), optionally ranked.
+
+        Args:
+            limit: Maximum number of nodes
+            order_by: One of NODE_ORDER_FIELDS (descending), or None
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support node listing")
+
+    async def induced_subgraph(self, node_ids: list[str]) -> dict:
+        """
+        Nodes, edges and component labels of the subgraph on node_ids.
+
+        Returns a dict with ``nodes`` (node dicts, unknown IDs skipped),
+        ``edges`` (edge dicts with from_id/to_id/_type, both ends in the
+        set), ``components`` (label per returned node) and
+        ``component_sizes`` (node count per label). In-memory backends
+        label by global weakly connected component; others by component
+        within the subgraph.
+
+        This fallback issues one get_neighbors call per node; backends
+        override it with a single query.
+        """
+        wanted = set(node_ids)
+        nodes = []
+        edges = []
+        for node_id in dict.fromkeys(node_ids):
+            for neighbor in await self.get_neighbors(node_id, direction="out"):
+                edge = neighbor.get("edge", {})
+                target = neighbor.get("m", {}).get("id") or edge.get("to_id")
+                if target in wanted:
+                    edges.append({**edge, "from_id": node_id, "to_id": target,
+                                  "_type": edge.get("_type", neighbor.get("edge_type"))})
+            for node_type in ["Company", "Person", "Address", "Property", "BankAccount", "Document"]:
+                node = await self.get_node(node_id, node_type)
+                if node:
+                    nodes.append(node)
+                    break
+
+        found = [n["id"] for n in nodes]
+        components, sizes = label_components(found, edges)
+        return {"nodes": nodes, "edges": edges, "components": components, "component_sizes": sizes}
+
 
 class Neo4jBackend(GraphBackend):
     """
@@ -365,6 +509,110 @@ class Neo4jBackend(GraphBackend):
 
         return neighbors
 
+    async def get_neighbors_batch(
+        self,
+        node_ids: list[str],
+        edge_types: Optional[list[str]] = None,
+        direction: str = "both",
+        limit_per_node: Optional[int] = None,
+    ) -> dict[str, list[dict]]:
+        """Get neighbors of many nodes in one UNWIND query."""
+        edge_filter = ""
+        if edge_types:
+            rel_types = [t.replace("Edge", "").upper() for t in edge_types]
+            edge_filter = ":" + "|".join(rel_types)
+
+        if direction == "out":
+            pattern = f"(n)-[r{edge_filter}]->(m)"
+        elif direction == "in":
+            pattern = f"(n)<-[r{edge_filter}]-(m)"
+        else:
+            pattern = f"(n)-[r{edge_filter}]-(m)"
+
+        query = f"""
+        UNWIND $ids AS node_id
+        MATCH {pattern}
+        WHERE n.id = node_id
+        WITH node_id, collect({{m: m, labels: labels(m), edge_type: type(r), edge: properties(r)}}) AS rows
+        RETURN node_id, CASE WHEN $limit IS NULL THEN rows ELSE rows[..$limit] END AS rows
+        """
+        ids = list(dict.fromkeys(node_ids))
+        results = await self.execute(query, {"ids": ids, "limit": limit_per_node})
+
+        batch: dict[str, list[dict]] = {node_id: [] for node_id in ids}
+        for row in results:
+            neighbors = batch[row["node_id"]]
+            for rel in row["rows"]:
+                edge = dict(rel["edge"]) if rel["edge"] else {}
+                edge["_type"] = rel["edge_type"]
+                neighbors.append({
+                    "m": self._decode_node(rel["m"], rel["labels"]),
+                    "edge_type": rel["edge_type"],
+                    "edge": edge,
+                })
+        return batch
+
+    @staticmethod
+    def _decode_node(record: Any, labels: list[str]) -> dict:
+        """Node properties with JSON fields parsed and _type set."""
+        import json
+        node = dict(record)
+        node["_type"] = labels[0] if labels else "Unknown"
+        for key, value in node.items():
+            if isinstance(value, str) and value.startswith(('[', '{')):
+                try:
+                    node[key] = json.loads(value)
+                except json.JSONDecodeError:
+                    pass
+        return node
+
+    async def list_nodes(self, limit: int, order_by: Optional[str] = None) -> list[dict]:
+        """List node summaries, ranked in the database."""
+        order = ""
+        if order_by == "degree":
+            order = "ORDER BY degree DESC"
+        elif order_by in NODE_ORDER_FIELDS:
+            order = f"ORDER BY coalesce(n.{order_by}, 0) DESC"
+        query = f"""
+        MATCH (n)
+        WITH n, size([(n)--() | 1]) AS degree
+        RETURN n, labels(n) AS labels, degree
+        {order}
+        LIMIT $limit
+        """
+        results = await self.execute(query, {"limit": limit})
+        return [
+            node_summary(self._decode_node(r["n"], r["labels"]), r["degree"])
+            for r in results
+        ]
+
+    async def induced_subgraph(self, node_ids: list[str]) -> dict:
+        """Induced subgraph in one query; components are labelled locally."""
+        query = """
+        MATCH (n) WHERE n.id IN $ids
+        OPTIONAL MATCH (n)-[r]->(m) WHERE m.id IN $ids
+        RETURN n, labels(n) AS labels,
+               collect(CASE WHEN r IS NULL THEN NULL
+                       ELSE {edge_type: type(r), edge: properties(r), to_id: m.id} END) AS edges
+        """
+        results = await self.execute(query, {"ids": list(node_ids)})
+
+        nodes = []
+        edges = []
+        for row in results:
+            node = self._decode_node(row["n"], row["labels"])
+            nodes.append(node)
+            for rel in row["edges"]:
+                edges.append({
+                    **(rel["edge"] or {}),
+                    "from_id": node["id"],
+                    "to_id": rel["to_id"],
+                    "_type": rel["edge_type"],
+                })
+
+        components, sizes = label_components([n["id"] for n in nodes], edges)
+        return {"nodes": nodes, "edges": edges, "components": components, "component_sizes": sizes}
+
     async def find_by_orgnr(self, orgnr: str) -> Optional[dict]:
         """Find a company by organisationsnummer."""
         query = """
@@ -374,6 +622,16 @@ class Neo4jBackend(GraphBackend):
         result = await self.execute(query, {"orgnr": orgnr})
         return dict(result[0]["c"]) if result else None
 
+    async def find_by_orgnrs(self, orgnrs: list[str]) -> dict[str, dict]:
+        """Find many companies by organisationsnummer in one query."""
+        query = """
+        UNWIND $orgnrs AS orgnr
+        MATCH (c:Company {orgnr: orgnr})
+        RETURN orgnr, c
+        """
+        result = await self.execute(query, {"orgnrs": list(dict.fromkeys(orgnrs))})
+        return {row["orgnr"]: dict(row["c"]) for row in result}
+
     async def find_by_personnummer(self, personnummer: str) -> Optional[dict]:
         """Find a person by personnummer."""
         query = """
@@ -454,6 +712,10 @@ class NetworkXBackend(GraphBackend):
         self.graph = nx.MultiDiGraph()
         self._nodes: dict[str, dict] = {}
         self._edges: dict[str, dict] = {}
+        self._orgnr_index: dict[str, str] = {}
+        # Bumped on every mutation; keys cached graph metrics
+        self.version = 0
+        self._components: Optional[tuple[int, dict[str, int], dict[int, int]]] = None
 
     async def connect(self) -> None:
         """Initialize the graph."""
@@ -464,6 +726,8 @@ class NetworkXBackend(GraphBackend):
         self.graph.clear()
         self._nodes.clear()
         self._edges.clear()
+        self._orgnr_index.clear()
+        self.version += 1
 
     async def execute(self, query: str, params: Optional[dict] = None) -> list[dict]:
         """
@@ -483,8 +747,16 @@ class NetworkXBackend(GraphBackend):
         data = asdict(node)
         data["_type"] = node_type
 
+        # An update may change the orgnr; drop the old index entry first
+        previous = self._nodes.get(node.id, {}).get("orgnr")
+        if previous and self._orgnr_index.get(previous) == node.id:
+            del self._orgnr_index[previous]
+
         self.graph.add_node(node.id, **data)
         self._nodes[node.id] = data
+        if data.get("orgnr"):
+            self._orgnr_index[data["orgnr"]] = node.id
+        self.version += 1
 
         return node.id
 
@@ -499,6 +771,7 @@ class NetworkXBackend(GraphBackend):
 
         self.graph.add_edge(from_id, to_id, key=edge.id, **data)
         self._edges[edge.id] = data
+        self.version += 1
 
         return edge.id
 
@@ -517,30 +790,120 @@ class NetworkXBackend(GraphBackend):
         direction: str = "both"
     ) -> list[dict]:
         """Get neighboring nodes."""
-        neighbors = []
+        return list(self._iter_neighbors(node_id, edge_types, direction))
+
+    async def get_neighbors_batch(
+        self,
+        node_ids: list[str],
+        edge_types: Optional[list[str]] = None,
+        direction: str = "both",
+        limit_per_node: Optional[int] = None,
+    ) -> dict[str, list[dict]]:
+        """Get neighbors of many nodes in one pass over the adjacency."""
+        return {
+            node_id: list(islice(self._iter_neighbors(node_id, edge_types, direction), limit_per_node))
+            for node_id in dict.fromkeys(node_ids)
+        }
+
+    def _iter_neighbors(
+        self,
+        node_id: str,
+        edge_types: Optional[list[str]],
+        direction: str,
+    ):
+        if node_id not in self.graph:
+            return
 
         if direction in ("out", "both"):
             for _, target, data in self.graph.out_edges(node_id, data=True):
                 if edge_types is None or data.get("_type") in edge_types:
-                    neighbors.append({
+                    yield {
                         "m": self._nodes.get(target, {}),
                         "edge_type": data.get("_type"),
                         "edge": data
-                    })
+                    }
 
         if direction in ("in", "both"):
             for source, _, data in self.graph.in_edges(node_id, data=True):
                 if edge_types is None or data.get("_type") in edge_types:
-                    neighbors.append({
+                    yield {
                         "m": self._nodes.get(source, {}),
                         "edge_type": data.get("_type"),
                         "edge": data
-                    })
+                    }
 
-        return neighbors
+    async def find_by_orgnr(self, orgnr: str) -> Optional[dict]:
+        """Find a company by organisationsnummer via the orgnr index."""
+        node = self._nodes.get(self._orgnr_index.get(orgnr))
+        if node and node.get("_type") == "Company":
+            return node
+        return None
+
+    async def find_by_orgnrs(self, orgnrs: list[str]) -> dict[str, dict]:
+        """Find many companies by organisationsnummer via the orgnr index."""
+        result = {}
+        for orgnr in dict.fromkeys(orgnrs):
+            node = await self.find_by_orgnr(orgnr)
+            if node:
+                result[orgnr] = node
+        return result
+
+    async def list_nodes(self, limit: int, order_by: Optional[str] = None) -> list[dict]:
+        """List node summaries, ranked by a summary field if requested."""
+        summaries = (
+            node_summary(data, self.graph.degree(node_id))
+            for node_id, data in self._nodes.items()
+        )
+        if order_by in NODE_ORDER_FIELDS:
+            return heapq.nlargest(limit, summaries, key=lambda s: s[order_by])
+        return list(islice(summaries, limit))
+
+    async def induced_subgraph(self, node_ids: list[str]) -> dict:
+        """Induced subgraph from adjacency, labelled by global component."""
+        wanted = {n for n in node_ids if n in self._nodes}
+        nodes = [self._nodes[n] for n in dict.fromkeys(node_ids) if n in wanted]
+        edges = [
+            data
+            for node_id in wanted
+            for _, target, data in self.graph.out_edges(node_id, data=True)
+            if target in wanted
+        ]
+
+        labels, sizes = self.component_labels()
+        components = {n["id"]: labels[n["id"]] for n in nodes}
+        return {
+            "nodes": nodes,
+            "edges": edges,
+            "components": components,
+            "component_sizes": {label: sizes[label] for label in set(components.values())},
+        }
 
     # NetworkX-specific graph algorithms
 
+    def component_labels(self) -> tuple[dict[str, int], dict[int, int]]:
+        """Weakly connected component label per node, cached per graph version."""
+        if self._components is None or self._components[0] != self.version:
+            labels: dict[str, int] = {}
+            sizes: dict[int, int] = {}
+            for label, component in enumerate(nx.weakly_connected_components(self.graph)):
+                sizes[label] = len(component)
+                for node_id in component:
+                    labels[node_id] = label
+            self._components = (self.version, labels, sizes)
+        return self._components[1], self._components[2]
+
+    def frozen_copy(self) -> "NetworkXBackend":
+        """
+        Copy of the backend over a copy of the graph, for running graph
+        algorithms in a worker thread while this backend keeps changing.
+
+        Node and edge lookups are shared with this backend; only the
+        algorithm methods are meant to be called on the copy.
+        """
+        frozen = copy.copy(self)
+        frozen.graph = self.graph.copy()
+        return frozen
+
     def compute_centrality(self) -> dict[str, dict[str, float]]:
         """Compute various centrality metrics for all nodes."""
         # Convert to simple graph for clustering (multigraph not supported)
@@ -613,6 +976,7 @@ class GraphClient:
         """
         self.backend = backend or NetworkXBackend()
         self._connected = False
+        self.metrics = GraphMetricsCache(self.backend)
 
     async def connect(self) -> None:
         """Connect to the graph database."""
@@ -677,46 +1041,72 @@ class GraphClient:
         self,
         seed_entities: list[str],
         hops: int = 2,
-        edge_types: Optional[list[str]] = None
+        edge_types: Optional[list[str]] = None,
+        max_nodes: Optional[int] = None,
+        max_edges: Optional[int] = None,
+        max_neighbors: Optional[int] = None,
     ) -> dict[str, Any]:
         """
         Expand network from seed entities.
 
-        Returns nodes and edges within N hops.
+        Returns nodes and edges within N hops, fetching each hop's
+        frontier with one get_neighbors_batch call.
+
+        Args:
+            seed_entities: Entity IDs to start from
+            hops: Number of hops
+            edge_types: Edge types to follow (all if None)
+            max_nodes: Stop adding nodes beyond this many
+            max_edges: Stop adding edges beyond this many
+            max_neighbors: Neighbors read per node (caps hubs)
+
+        Budgets are applied in a fixed order (frontier sorted by ID, then
+        backend neighbor order), so truncated results are repeatable;
+        ``truncated`` reports whether any budget was hit.
         """
         visited = set()
         nodes = {}
         edges = []
         frontier = set(seed_entities)
+        truncated = False
 
         for _ in range(hops):
-            next_frontier = set()
-
-            for node_id in frontier:
-                if node_id in visited:
-                    continue
+            batch = sorted(node_id for node_id in frontier if node_id not in visited)
+            if not batch or truncated:
+                break
+            visited.update(batch)
 
-                visited.add(node_id)
-                neighbors = await self.backend.get_neighbors(
-                    node_id,
-                    edge_types=edge_types
-                )
+            neighbors_by_node = await self.backend.get_neighbors_batch(
+                batch,
+                edge_types=edge_types,
+                limit_per_node=max_neighbors,
+            )
 
-                for neighbor in neighbors:
+            next_frontier = set()
+            for node_id in batch:
+                for neighbor in neighbors_by_node.get(node_id, []):
                     neighbor_node = neighbor.get("m", {})
                     neighbor_id = neighbor_node.get("id")
+                    if not neighbor_id:
+                        continue
+
+                    if max_edges is not None and len(edges) >= max_edges:
+                        truncated = True
+                        break
+                    if neighbor_id not in nodes and max_nodes is not None and len(nodes) >= max_nodes:
+                        truncated = True
+                        continue
+
+                    nodes[neighbor_id] = neighbor_node
+                    edges.append({
+                        "from": node_id,
+                        "to": neighbor_id,
+                        "type": neighbor.get("edge_type"),
+                        "data": neighbor.get("edge", {})
+                    })
 
-                    if neighbor_id:
-                        nodes[neighbor_id] = neighbor_node
-                        edges.append({
-                            "from": node_id,
-                            "to": neighbor_id,
-                            "type": neighbor.get("edge_type"),
-                            "data": neighbor.get("edge", {})
-                        })
-
-                        if neighbor_id not in visited:
-                            next_frontier.add(neighbor_id)
+                    if neighbor_id not in visited:
+                        next_frontier.add(neighbor_id)
 
             frontier = next_frontier
 
@@ -724,7 +1114,8 @@ class GraphClient:
             "nodes": nodes,
             "edges": edges,
             "seed_entities": seed_entities,
-            "hops": hops
+            "hops": hops,
+            "truncated": truncated,
         }
 
     async def get_companies_at_address(self, address_id: str) -> list[dict]:
@@ -752,32 +1143,41 @@ class GraphClient:
     async def get_ownership_chain(
         self,
         company_id: str,
-        max_depth: int = 10
+        max_depth: int = 10,
+        max_nodes: Optional[int] = None,
+        max_edges: Optional[int] = None,
     ) -> list[dict]:
         """
         Traverse ownership chain upward to find beneficial owners.
 
-        Returns the ownership path from company to ultimate owners.
+        Returns the ownership path from company to ultimate owners. Each
+        level is fetched with one get_neighbors_batch call; max_nodes caps
+        the companies expanded and max_edges the chain entries returned.
         """
         chain = []
         visited = set()
         current = [company_id]
 
         for depth in range(max_depth):
-            next_level = []
+            batch = [e for e in dict.fromkeys(current) if e not in visited]
+            if max_nodes is not None:
+                batch = batch[:max(max_nodes - len(visited), 0)]
+            if not batch:
+                break
+            visited.update(batch)
 
-            for entity_id in current:
-                if entity_id in visited:
-                    continue
+            owners_by_entity = await self.backend.get_neighbors_batch(
+                batch,
+                edge_types=["OwnsEdge"],
+                direction="in"
+            )
 
-                visited.add(entity_id)
-                neighbors = await self.backend.get_neighbors(
-                    entity_id,
-                    edge_types=["OwnsEdge"],
-                    direction="in"
-                )
+            next_level = []
+            for entity_id in batch:
+                for neighbor in owners_by_entity.get(entity_id, []):
+                    if max_edges is not None and len(chain) >= max_edges:
+                        return chain
 
-                for neighbor in neighbors:
                     owner = neighbor["m"]
                     edge = neighbor["edge"]
 
@@ -827,6 +1227,20 @@ class GraphClient:
                 return result
         return None
 
+    async def get_all_entities(self, limit: int = 1000, order_by: Optional[str] = None) -> list[dict]:
+        """
+        List entity summaries (id, type, name, degree, shell_score, risk_score).
+
+        Args:
+            limit: Maximum number of entities
+            order_by: Rank descending by "degree", "shell_score" or "risk_score"
+        """
+        return await self.backend.list_nodes(limit, order_by=order_by)
+
+    async def get_induced_subgraph(self, entity_ids: list[str]) -> dict:
+        """Entities, the edges among them, and their component labels in one call."""
+        return await self.backend.induced_subgraph(entity_ids)
+
     async def get_entity_with_context(self, entity_id: str) -> Optional[dict]:
         """Get entity with network context and metrics."""
         entity = await self.get_entity(entity_id)
@@ -840,15 +1254,9 @@ class GraphClient:
         entity["neighbor_count"] = len(neighbors)
         entity["neighbors"] = neighbors[:10]  # First 10 neighbors
 
-        # Add network metrics if available
-        if isinstance(self.backend, NetworkXBackend):
-            metrics = self.backend.compute_centrality()
-            entity["network_metrics"] = {
-                "degree": metrics.get("degree", {}).get(entity_id, 0),
-                "betweenness": metrics.get("betweenness", {}).get(entity_id, 0),
-                "pagerank": metrics.get("pagerank", {}).get(entity_id, 0),
-                "clustering": metrics.get("clustering", {}).get(entity_id, 0),
-            }
+        # Add network metrics if available (cached per graph version)
+        if hasattr(self.backend, "compute_centrality"):
+            entity["network_metrics"] = await self.metrics.get(entity_id)
 
         return entity
 
@@ -856,24 +1264,33 @@ class GraphClient:
         self,
         entity_id: str,
         hops: int = 1,
-        edge_types: Optional[list[str]] = None
+        edge_types: Optional[list[str]] = None,
+        max_nodes: Optional[int] = None,
     ) -> list[dict]:
-        """Get neighbors of an entity up to N hops away."""
+        """
+        Get neighbors of an entity up to N hops away.
+
+        Multi-hop traversal stops once max_nodes neighbors are collected.
+        """
         if hops == 1:
             return await self.backend.get_neighbors(entity_id, edge_types=edge_types)
 
-        # Multi-hop traversal
+        # Multi-hop traversal, one batched call per hop
         visited = {entity_id}
         all_neighbors = []
         frontier = [entity_id]
 
         for _ in range(hops):
+            if not frontier:
+                break
+            neighbors_by_node = await self.backend.get_neighbors_batch(frontier, edge_types=edge_types)
             next_frontier = []
             for node_id in frontier:
-                neighbors = await self.backend.get_neighbors(node_id, edge_types=edge_types)
-                for neighbor in neighbors:
+                for neighbor in neighbors_by_node.get(node_id, []):
                     neighbor_id = neighbor.get("m", {}).get("id")
                     if neighbor_id and neighbor_id not in visited:
+                        if max_nodes is not None and len(all_neighbors) >= max_nodes:
+                            return all_neighbors
                         visited.add(neighbor_id)
                         all_neighbors.append(neighbor)
                         next_frontier.append(neighbor_id)
@@ -885,7 +1302,7 @@ class GraphClient:
 
     async def find_company_by_orgnr(self, orgnr: str) -> Optional[dict]:
         """Find a company by organisationsnummer."""
-        if isinstance(self.backend, Neo4jBackend):
+        if hasattr(self.backend, "find_by_orgnr"):
             return await self.backend.find_by_orgnr(orgnr)
         # NetworkX fallback - search all nodes
         for node_id, data in self.backend._nodes.items():
@@ -893,9 +1310,13 @@ class GraphClient:
                 return data
         return None
 
+    async def find_companies_by_orgnrs(self, orgnrs: list[str]) -> dict[str, dict]:
+        """Find many companies by organisationsnummer; missing orgnrs are left out."""
+        return await self.backend.find_by_orgnrs(orgnrs)
+
     async def find_person_by_personnummer(self, personnummer: str) -> Optional[dict]:
         """Find a person by personnummer."""
-        if isinstance(self.backend, Neo4jBackend):
+        if hasattr(self.backend, "find_by_personnummer"):
             return await self.backend.find_by_personnummer(personnummer)
         # NetworkX fallback
         for node_id, data in self.backend._nodes.items():
@@ -907,22 +1328,34 @@ class GraphClient:
 
     async def add_companies_batch(self, companies: list[Company]) -> list[str]:
         """Add multiple companies in a single transaction."""
-        if isinstance(self.backend, Neo4jBackend):
+        if hasattr(self.backend, "create_nodes_batch"):
             return await self.backend.create_nodes_batch(companies)
         # NetworkX fallback
         return [await self.add_company(c) for c in companies]
 
     async def add_persons_batch(self, persons: list[Person]) -> list[str]:
         """Add multiple persons in a single transaction."""
-        if isinstance(self.backend, Neo4jBackend):
+        if hasattr(self.backend, "create_nodes_batch"):
             return await self.backend.create_nodes_batch(persons)
         return [await self.add_person(p) for p in persons]
 
+    async def add_addresses_batch(self, addresses: list[Address]) -> list[str]:
+        """Add multiple addresses in a single transaction."""
+        if hasattr(self.backend, "create_nodes_batch"):
+            return await self.backend.create_nodes_batch(addresses)
+        return [await self.add_address(a) for a in addresses]
+
+    async def add_edges_batch(self, edges: list[EdgeType]) -> list[str]:
+        """Add multiple edges, batched where the backend supports it."""
+        if hasattr(self.backend, "create_edges_batch"):
+            return await self.backend.create_edges_batch(edges)
+        return [await self.backend.create_edge(e) for e in edges]
+
     # Statistics
 
     async def get_statistics(self) -> dict:
         """Get graph statistics."""
-        if isinstance(self.backend, Neo4jBackend):
+        if hasattr(self.backend, "get_network_statistics"):
             return await self.backend.get_network_statistics()
         # NetworkX fallback
         return {
@@ -936,27 +1369,29 @@ class GraphClient:
     # Graph algorithms
 
     def compute_centrality(self) -> dict[str, dict[str, float]]:
-        """Compute centrality metrics (NetworkX backend only)."""
-        if isinstance(self.backend, NetworkXBackend):
+        """Compute centrality metrics (in-memory backends only)."""
+        if hasattr(self.backend, "compute_centrality"):
             return self.backend.compute_centrality()
-        raise NotImplementedError("Centrality computation only available with NetworkX backend")
+        raise NotImplementedError("Centrality computation only available with in-memory backends")
 
     def find_connected_components(self) -> list[set[str]]:
-        """Find connected components (NetworkX backend only)."""
+        """Find connected components (in-memory backends only)."""
+        if hasattr(self.backend, "connected_components"):
+            return self.backend.connected_components()
         if isinstance(self.backend, NetworkXBackend):
             undirected = self.backend.graph.to_undirected()
             return [set(c) for c in nx.connected_components(undirected)]
-        raise NotImplementedError("Component detection only available with NetworkX backend")
+        raise NotImplementedError("Component detection only available with in-memory backends")
 
     def compute_network_metrics(self) -> dict[str, dict[str, float]]:
         """
         Compute network metrics for all nodes.
 
-        Only available with NetworkX backend.
+        Only available with in-memory backends.
         """
-        if isinstance(self.backend, NetworkXBackend):
+        if hasattr(self.backend, "compute_centrality"):
             return self.backend.compute_centrality()
-        raise NotImplementedError("Network metrics only available with NetworkX backend")
+        raise NotImplementedError("Network metrics only available with in-memory backends")
 
     def find_cycles(self, max_length: int = 6) -> list[list[str]]:
         """
@@ -979,7 +1414,7 @@ def create_graph_client(
     Create a graph client with the specified backend.
 
     Args:
-        backend_type: One of "networkx", "neo4j", "age"
+        backend_type: One of "networkx", "compact", "neo4j", "age"
         **kwargs: Backend-specific configuration
 
     Returns:
@@ -989,6 +1424,9 @@ def create_graph_client(
         # NetworkX (default, for development/testing)
         client = create_graph_client("networkx")
 
+        # Compact arrays (register-scale analytics)
+        client = create_graph_client("compact")
+
         # Neo4j
         client = create_graph_client("neo4j",
             uri="bolt://localhost:7687",
@@ -1008,6 +1446,9 @@ def create_graph_client(
     """
     if backend_type == "networkx":
         backend = NetworkXBackend()
+    elif backend_type == "compact":
+        from halo.graph.compact_backend import CompactGraphBackend
+        backend = CompactGraphBackend()
     elif backend_type == "neo4j":
         backend = Neo4jBackend(
             uri=kwargs.get("uri", "bolt://localhost:7687"),
@@ -1026,6 +1467,6 @@ def create_graph_client(
             graph_name=kwargs.get("graph_name", "halo_graph"),
         )
     else:
-        raise ValueError(f"Unknown backend type: {backend_type}. Supported: networkx, neo4j, age")
+        raise ValueError(f"Unknown backend type: {backend_type}. Supported: networkx, compact, neo4j, age")
 
     return GraphClient(backend)
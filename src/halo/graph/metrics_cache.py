@@ -0,0 +1,195 @@
+"""
+Versioned cache of per-node graph metrics.
+
+Betweenness, PageRank and clustering are global computations: the value
+for one node needs the whole graph. Recomputing them per entity lookup
+makes every ``include_metrics`` request cost a full-graph pass. This cache
+computes the centrality vectors once per graph version, keeps them as
+arrays aligned with the node index they were computed on, and serves
+single-node lookups from the arrays.
+
+Backends expose a ``version`` counter that is bumped on every mutation.
+A snapshot whose version differs from the backend's is stale; it is
+recomputed on the next lookup, or, with ``refresh_in_background``, served
+as-is (marked stale) while a refresh runs in a worker thread.
+
+The worker thread never walks the live graph: backends with
+``frozen_copy`` hand it a copy taken on the event loop. For other
+backends, a computation that fails while the graph version moved is
+retried, and finally run on the loop where no mutation can interleave.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+METRIC_NAMES = ("degree", "betweenness", "pagerank", "clustering")
+
+
+@dataclass
+class MetricsSnapshot:
+    """Centrality vectors for one graph version."""
+
+    version: Optional[int]
+    computed_at: datetime
+    arrays: dict[str, np.ndarray]
+    index: dict[str, int]  # Node ID to array position, frozen with the arrays
+
+    @property
+    def node_count(self) -> int:
+        return len(self.arrays["degree"])
+
+
+class GraphMetricsCache:
+    """
+    Per-version centrality metrics for in-memory graph backends.
+
+    Works with any backend providing ``compute_centrality``; backends with
+    ``compute_centrality_arrays`` (the compact backend) are stored with the
+    node index of the frozen copy they were computed on, so a stale
+    snapshot stays aligned after the graph is reset or rebuilt.
+    """
+
+    # Worker-thread attempts before computing on the event loop
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, backend: Any, refresh_in_background: bool = False):
+        self.backend = backend
+        self.refresh_in_background = refresh_in_background
+        self._snapshot: Optional[MetricsSnapshot] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def snapshot(self) -> Optional[MetricsSnapshot]:
+        return self._snapshot
+
+    def graph_version(self) -> Optional[int]:
+        return getattr(self.backend, "version", None)
+
+    def is_stale(self, snapshot: Optional[MetricsSnapshot] = None) -> bool:
+        """Whether the snapshot was computed against an older graph."""
+        snapshot = snapshot or self._snapshot
+        if snapshot is None or snapshot.version is None:
+            return True
+        return snapshot.version != self.graph_version()
+
+    def invalidate(self) -> None:
+        """Drop the current snapshot; the next lookup recomputes."""
+        self._snapshot = None
+
+    def compute(self, backend: Any = None) -> MetricsSnapshot:
+        """
+        Compute a snapshot synchronously.
+
+        Args:
+            backend: Backend (or frozen copy of it) to compute on; defaults
+                to the cached backend
+        """
+        backend = backend if backend is not None else self.backend
+        version = getattr(backend, "version", None)
+        computed_at = datetime.now(timezone.utc)
+
+        if hasattr(backend, "compute_centrality_arrays") and hasattr(backend, "node_index_map"):
+            if backend is self.backend:
+                # The snapshot keeps the node index, so it must not be the live one
+                backend = backend.frozen_copy()
+            arrays = backend.compute_centrality_arrays()
+            snapshot = MetricsSnapshot(
+                version=version,
+                computed_at=computed_at,
+                arrays={name: np.asarray(arrays[name], dtype=np.float64) for name in METRIC_NAMES},
+                index=backend.node_index_map(),
+            )
+        else:
+            metrics = backend.compute_centrality()
+            node_ids = list(metrics.get("degree", {}))
+            index = {node_id: i for i, node_id in enumerate(node_ids)}
+            snapshot = MetricsSnapshot(
+                version=version,
+                computed_at=computed_at,
+                arrays={
+                    name: np.fromiter(
+                        (metrics.get(name, {}).get(node_id, 0.0) for node_id in node_ids),
+                        dtype=np.float64,
+                        count=len(node_ids),
+                    )
+                    for name in METRIC_NAMES
+                },
+                index=index,
+            )
+
+        logger.info(
+            f"Computed graph metrics for {snapshot.node_count} nodes (graph version {version})"
+        )
+        return snapshot
+
+    async def refresh(self, force: bool = False) -> MetricsSnapshot:
+        """Recompute the snapshot in a worker thread unless it is current."""
+        async with self._lock:
+            if not force and self._snapshot is not None and not self.is_stale():
+                return self._snapshot
+            self._snapshot = await self._compute_off_loop()
+            return self._snapshot
+
+    async def _compute_off_loop(self) -> MetricsSnapshot:
+        """Compute in a worker thread without racing graph mutations."""
+        frozen_copy = getattr(self.backend, "frozen_copy", None)
+        if frozen_copy is not None:
+            return await asyncio.to_thread(self.compute, frozen_copy())
+
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            version = self.graph_version()
+            try:
+                return await asyncio.to_thread(self.compute)
+            except (RuntimeError, IndexError, KeyError, ValueError) as e:
+                # "dictionary changed size during iteration" and friends
+                if self.graph_version() == version:
+                    raise
+                logger.info(
+                    f"Graph changed during metrics computation (attempt {attempt}): {e}"
+                )
+
+        return self.compute()
+
+    def schedule_refresh(self) -> None:
+        """Start a background refresh if one is not already running."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._background_refresh())
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            # The snapshot stays stale, so the next lookup retries
+            logger.warning(f"Background graph metrics refresh failed: {e}")
+
+    async def get(self, entity_id: str) -> dict[str, Any]:
+        """
+        Metrics for one entity, with the snapshot's staleness marker.
+
+        Entities unknown to the snapshot get zeros, as with a missing key
+        in ``compute_centrality`` output.
+        """
+        snapshot = self._snapshot
+        if self.is_stale(snapshot):
+            if snapshot is not None and self.refresh_in_background:
+                self.schedule_refresh()
+            else:
+                snapshot = await self.refresh()
+
+        position = snapshot.index.get(entity_id)
+        result: dict[str, Any] = {
+            name: float(snapshot.arrays[name][position]) if position is not None else 0.0
+            for name in METRIC_NAMES
+        }
+        result["computed_at"] = snapshot.computed_at.isoformat()
+        result["graph_version"] = snapshot.version
+        result["stale"] = self.is_stale(snapshot)
+        return result
@@ -0,0 +1,557 @@
+"""
+Append-only graph snapshot store.
+
+Replaces whole-graph pickles for the pipeline graph stage. The store is a
+directory of immutable segments plus a manifest:
+
+    company_graph.store/
+        manifest.json                   # version, live segments, counts
+        seg-000001.nodes.jsonl          # [node_id, attrs] per line
+        seg-000001.edges.jsonl          # [from_id, to_id, attrs] per line
+        seg-000001.nodes.idx.npy        # sorted (id hash, offset, length)
+        seg-000001.out.idx.npy          # edges sorted by from_id hash
+        seg-000001.in.idx.npy           # edges sorted by to_id hash
+
+Each append writes one new segment and atomically swaps the manifest, so
+readers never see partial writes and never need a lock. Readers mmap the
+data and index files; opening a store reads only the manifest, and node or
+edge lookups are binary searches in the index arrays. Compaction merges all
+segments into one when too many accumulate. The segments it supersedes are
+listed as retired in the manifest and only deleted by the next compaction,
+so a reader that loaded the previous manifest can still open them.
+
+Node records are upserts (attributes of later segments override earlier
+ones, like ``MultiDiGraph.add_node``); edge records accumulate as parallel
+edges, like ``MultiDiGraph.add_edge``.
+
+Single writer per store; any number of concurrent readers.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+INDEX_DTYPE = np.dtype([("h", "<u8"), ("off", "<u8"), ("len", "<u4")])
+
+
+def _hash_id(node_id: str) -> int:
+    """Stable 64-bit hash of a node ID."""
+    return int.from_bytes(
+        hashlib.blake2b(node_id.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def _dump_line(record: list) -> bytes:
+    return json.dumps(record, ensure_ascii=False, default=_json_default).encode("utf-8") + b"\n"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _write_index(path: Path, entries: list[tuple[int, int, int]]) -> None:
+    index = np.array(entries, dtype=INDEX_DTYPE)
+    index.sort(order="h", kind="stable")
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, index)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class _Segment:
+    """Read-only, memory-mapped view of one segment."""
+
+    def __init__(self, root: Path, name: str):
+        self.name = name
+        self._files = []
+        self.nodes = self.edges = None
+        try:
+            self.nodes = self._map(root / f"{name}.nodes.jsonl")
+            self.edges = self._map(root / f"{name}.edges.jsonl")
+            self.node_index = np.load(root / f"{name}.nodes.idx.npy", mmap_mode="r")
+            self.out_index = np.load(root / f"{name}.out.idx.npy", mmap_mode="r")
+            self.in_index = np.load(root / f"{name}.in.idx.npy", mmap_mode="r")
+        except BaseException:
+            self.close()
+            raise
+
+    def _map(self, path: Path) -> Optional[mmap.mmap]:
+        f = open(path, "rb")
+        self._files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        for mapped in (self.nodes, self.edges):
+            if mapped is not None:
+                mapped.close()
+        for f in self._files:
+            f.close()
+
+    @staticmethod
+    def _lookup(index: np.ndarray, h: int) -> np.ndarray:
+        lo = np.searchsorted(index["h"], h, side="left")
+        hi = np.searchsorted(index["h"], h, side="right")
+        return index[lo:hi]
+
+    @staticmethod
+    def _read(data: Optional[mmap.mmap], entry) -> list:
+        off = int(entry["off"])
+        return json.loads(data[off:off + int(entry["len"])])
+
+    def get_node(self, node_id: str, h: int) -> Optional[dict]:
+        for entry in self._lookup(self.node_index, h):
+            record = self._read(self.nodes, entry)
+            if record[0] == node_id:
+                return record[1]
+        return None
+
+    def edges_for(self, node_id: str, h: int, outgoing: bool) -> list[list]:
+        index = self.out_index if outgoing else self.in_index
+        position = 0 if outgoing else 1
+        matches = []
+        for entry in self._lookup(index, h):
+            record = self._read(self.edges, entry)
+            if record[position] == node_id:
+                matches.append(record)
+        return matches
+
+    @staticmethod
+    def _iter_lines(data: Optional[mmap.mmap]) -> Iterator[list]:
+        # Explicit positions so nested iterations don't share mmap state
+        if data is None:
+            return
+        pos, size = 0, len(data)
+        while pos < size:
+            end = data.find(b"\n", pos)
+            if end < 0:
+                end = size
+            yield json.loads(data[pos:end])
+            pos = end + 1
+
+    def iter_nodes(self) -> Iterator[list]:
+        return self._iter_lines(self.nodes)
+
+    def iter_edges(self) -> Iterator[list]:
+        return self._iter_lines(self.edges)
+
+
+class _NodeView:
+    """Subset of networkx's NodeView over a snapshot."""
+
+    def __init__(self, reader: "GraphSnapshotReader"):
+        self._reader = reader
+
+    def __call__(self, data: bool = False):
+        if data:
+            return ((node_id, attrs) for node_id, attrs in self._reader.iter_nodes())
+        return self
+
+    def __iter__(self) -> Iterator[str]:
+        return (node_id for node_id, _ in self._reader.iter_nodes())
+
+    def __len__(self) -> int:
+        return self._reader.number_of_nodes()
+
+    def __contains__(self, node_id: str) -> bool:
+        return self._reader.has_node(node_id)
+
+    def __getitem__(self, node_id: str) -> dict:
+        attrs = self._reader.get_node(node_id)
+        if attrs is None:
+            raise KeyError(node_id)
+        return attrs
+
+
+class GraphSnapshotReader:
+    """
+    Read-only view of a store at a fixed manifest version.
+
+    Exposes the subset of the ``networkx.MultiDiGraph`` read API used by
+    pattern detection and the demo API (``nodes``, ``edges``, ``out_edges``,
+    ``in_edges``, ``number_of_nodes``, ``number_of_edges``), so callers can
+    work on the snapshot without materialising it.
+    """
+
+    def __init__(self, root: Path, manifest: dict):
+        self.root = Path(root)
+        self.manifest = manifest
+        self.version = manifest["version"]
+        # Newest first for lookups
+        self._segments = []
+        try:
+            for s in reversed(manifest["segments"]):
+                self._segments.append(_Segment(self.root, s["name"]))
+        except BaseException:
+            self.close()
+            raise
+
+    # Attempts to open the current version if segments vanish meanwhile
+    OPEN_ATTEMPTS = 3
+
+    @classmethod
+    def open(cls, root: Union[str, Path]) -> "GraphSnapshotReader":
+        """
+        Open the current version of a store.
+
+        Retired segments are kept for one compaction cycle, so a missing
+        segment means the manifest is at least two compactions old; the
+        current manifest is read again in that case.
+        """
+        root = Path(root)
+        for attempt in range(1, cls.OPEN_ATTEMPTS + 1):
+            with open(root / "manifest.json") as f:
+                manifest = json.load(f)
+            try:
+                return cls(root, manifest)
+            except FileNotFoundError:
+                if attempt == cls.OPEN_ATTEMPTS:
+                    raise
+                logger.info(f"Graph store {root.name}: version {manifest['version']} gone, reopening")
+
+    def close(self) -> None:
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+
+    def __enter__(self) -> "GraphSnapshotReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # Lookups
+
+    def has_node(self, node_id: str) -> bool:
+        h = _hash_id(node_id)
+        return any(s.get_node(node_id, h) is not None for s in self._segments)
+
+    __contains__ = has_node
+
+    def get_node(self, node_id: str) -> Optional[dict]:
+        """Merged node attributes (later segments override earlier ones)."""
+        h = _hash_id(node_id)
+        found = None
+        for segment in reversed(self._segments):
+            attrs = segment.get_node(node_id, h)
+            if attrs is not None:
+                found = {**found, **attrs} if found else attrs
+        return found
+
+    def iter_nodes(self) -> Iterator[tuple[str, dict]]:
+        """Iterate (node_id, merged attrs) once per node."""
+        if len(self._segments) == 1:
+            for node_id, attrs in self._segments[0].iter_nodes():
+                yield node_id, attrs
+            return
+
+        seen: set[str] = set()
+        for segment in self._segments:
+            for node_id, _ in segment.iter_nodes():
+                if node_id not in seen:
+                    seen.add(node_id)
+                    yield node_id, self.get_node(node_id)
+
+    def iter_edges(self) -> Iterator[tuple[str, str, dict]]:
+        for segment in reversed(self._segments):
+            for from_id, to_id, attrs in segment.iter_edges():
+                yield from_id, to_id, attrs
+
+    def _node_edges(self, node_id: str, outgoing: bool) -> list[list]:
+        h = _hash_id(node_id)
+        records = []
+        for segment in reversed(self._segments):
+            records.extend(segment.edges_for(node_id, h, outgoing))
+        return records
+
+    # networkx-compatible read API
+
+    @property
+    def nodes(self) -> _NodeView:
+        return _NodeView(self)
+
+    def number_of_nodes(self) -> int:
+        return self.manifest["node_count"]
+
+    def number_of_edges(self) -> int:
+        return self.manifest["edge_count"]
+
+    def _edge_tuples(self, records: Iterable, data: bool):
+        for from_id, to_id, attrs in records:
+            yield (from_id, to_id, attrs) if data else (from_id, to_id)
+
+    def out_edges(self, nbunch: Optional[Union[str, Iterable[str]]] = None, data: bool = False):
+        if nbunch is None:
+            return self._edge_tuples(self.iter_edges(), data)
+        node_ids = [nbunch] if isinstance(nbunch, str) else nbunch
+        return self._edge_tuples(
+            (r for n in node_ids for r in self._node_edges(n, outgoing=True)), data
+        )
+
+    edges = out_edges
+
+    def in_edges(self, nbunch: Optional[Union[str, Iterable[str]]] = None, data: bool = False):
+        if nbunch is None:
+            return self._edge_tuples(self.iter_edges(), data)
+        node_ids = [nbunch] if isinstance(nbunch, str) else nbunch
+        return self._edge_tuples(
+            (r for n in node_ids for r in self._node_edges(n, outgoing=False)), data
+        )
+
+    def to_networkx(self):
+        """Materialise the snapshot as a MultiDiGraph."""
+        import networkx as nx
+
+        graph = nx.MultiDiGraph()
+        for node_id, attrs in self.iter_nodes():
+            graph.add_node(node_id, **attrs)
+        for from_id, to_id, attrs in self.iter_edges():
+            graph.add_edge(from_id, to_id, **attrs)
+        return graph
+
+
+class GraphDelta:
+    """
+    Pending node/edge changes for one append.
+
+    Mirrors ``MultiDiGraph.add_node``/``add_edge`` so existing graph-building
+    code can write deltas with minimal changes. Membership checks consult
+    the delta first and then the base snapshot.
+    """
+
+    def __init__(self, base: Optional[GraphSnapshotReader] = None):
+        self.base = base
+        self.nodes: dict[str, dict] = {}
+        self.edges: list[tuple[str, str, dict]] = []
+
+    def add_node(self, node_id: str, **attrs) -> None:
+        if node_id in self.nodes:
+            self.nodes[node_id].update(attrs)
+        else:
+            self.nodes[node_id] = attrs
+
+    def add_edge(self, from_id: str, to_id: str, **attrs) -> None:
+        self.edges.append((from_id, to_id, attrs))
+
+    def __contains__(self, node_id: str) -> bool:
+        if node_id in self.nodes:
+            return True
+        return self.base is not None and self.base.has_node(node_id)
+
+    def __len__(self) -> int:
+        return len(self.nodes) + len(self.edges)
+
+
+class GraphSnapshotStore:
+    """
+    Writer for an append-only graph snapshot store.
+
+    Usage:
+        store = GraphSnapshotStore(data_dir / "company_graph.store")
+        with store.open_reader() as base:
+            delta = GraphDelta(base)
+            delta.add_node("company-5560125790", _type="Company", orgnr="5560125790")
+        store.append(delta)
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, root: Union[str, Path], max_segments: int = 16):
+        self.root = Path(root)
+        self.max_segments = max_segments
+        self.root.mkdir(parents=True, exist_ok=True)
+        if not (self.root / self.MANIFEST).exists():
+            self._write_manifest(self._empty_manifest())
+
+    @staticmethod
+    def _empty_manifest() -> dict:
+        return {
+            "format": FORMAT_VERSION,
+            "version": 0,
+            "next_segment": 1,
+            "segments": [],
+            "node_count": 0,
+            "edge_count": 0,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def _read_manifest(self) -> dict:
+        with open(self.root / self.MANIFEST) as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: dict) -> None:
+        manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+        _write_atomic(self.root / self.MANIFEST, json.dumps(manifest, indent=2).encode("utf-8"))
+
+    def exists(self) -> bool:
+        """Whether the store holds any data."""
+        return bool(self._read_manifest()["segments"])
+
+    def open_reader(self) -> GraphSnapshotReader:
+        """Open a read-only snapshot of the current version."""
+        return GraphSnapshotReader.open(self.root)
+
+    def _write_segment(
+        self,
+        name: str,
+        nodes: Iterable[tuple[str, dict]],
+        edges: Iterable[tuple[str, str, dict]],
+    ) -> tuple[int, int]:
+        """Write segment data and index files; returns (node_count, edge_count)."""
+        node_entries = []
+        with open(self.root / f"{name}.nodes.jsonl.tmp", "wb") as f:
+            offset = 0
+            for node_id, attrs in nodes:
+                line = _dump_line([node_id, attrs])
+                f.write(line)
+                node_entries.append((_hash_id(node_id), offset, len(line) - 1))
+                offset += len(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+        out_entries = []
+        in_entries = []
+        with open(self.root / f"{name}.edges.jsonl.tmp", "wb") as f:
+            offset = 0
+            for from_id, to_id, attrs in edges:
+                line = _dump_line([from_id, to_id, attrs])
+                f.write(line)
+                out_entries.append((_hash_id(from_id), offset, len(line) - 1))
+                in_entries.append((_hash_id(to_id), offset, len(line) - 1))
+                offset += len(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+        for kind in ("nodes", "edges"):
+            os.replace(self.root / f"{name}.{kind}.jsonl.tmp", self.root / f"{name}.{kind}.jsonl")
+        _write_index(self.root / f"{name}.nodes.idx.npy", node_entries)
+        _write_index(self.root / f"{name}.out.idx.npy", out_entries)
+        _write_index(self.root / f"{name}.in.idx.npy", in_entries)
+        return len(node_entries), len(out_entries)
+
+    def _remove_segment(self, name: str) -> None:
+        for suffix in ("nodes.jsonl", "edges.jsonl", "nodes.idx.npy", "out.idx.npy", "in.idx.npy"):
+            try:
+                (self.root / f"{name}.{suffix}").unlink()
+            except FileNotFoundError:
+                pass
+
+    def append(self, delta: GraphDelta) -> dict:
+        """
+        Append a delta as a new segment and publish it.
+
+        Returns the new manifest. Compacts afterwards if the number of
+        segments exceeds ``max_segments``.
+        """
+        manifest = self._read_manifest()
+        if not delta.nodes and not delta.edges:
+            return manifest
+
+        with GraphSnapshotReader(self.root, manifest) as base:
+            new_nodes = sum(1 for node_id in delta.nodes if not base.has_node(node_id))
+
+        name = f"seg-{manifest['next_segment']:06d}"
+        node_count, edge_count = self._write_segment(name, delta.nodes.items(), delta.edges)
+
+        manifest["segments"].append({"name": name, "nodes": node_count, "edges": edge_count})
+        manifest["next_segment"] += 1
+        manifest["version"] += 1
+        manifest["node_count"] += new_nodes
+        manifest["edge_count"] += edge_count
+        self._write_manifest(manifest)
+
+        logger.info(
+            f"Graph store {self.root.name}: appended {name} "
+            f"({node_count} nodes, {edge_count} edges, version {manifest['version']})"
+        )
+
+        if len(manifest["segments"]) > self.max_segments:
+            manifest = self.compact()
+        return manifest
+
+    def _replace_all(self, manifest: dict, nodes, edges) -> dict:
+        """
+        Publish a single segment holding the given data, retiring all others.
+
+        Segments retired by the previous call are deleted once the new
+        manifest is published; those retired now stay on disk until the
+        next call, so readers holding the previous manifest can still open
+        them.
+        """
+        expired = manifest.get("retired", [])
+        name = f"seg-{manifest['next_segment']:06d}"
+        node_count, edge_count = self._write_segment(name, nodes, edges)
+
+        manifest["retired"] = [s["name"] for s in manifest["segments"]]
+        manifest["segments"] = [{"name": name, "nodes": node_count, "edges": edge_count}]
+        manifest["next_segment"] += 1
+        manifest["version"] += 1
+        manifest["node_count"] = node_count
+        manifest["edge_count"] = edge_count
+        self._write_manifest(manifest)
+
+        # Readers that still have these segments mapped keep working (POSIX)
+        for old in expired:
+            self._remove_segment(old)
+        return manifest
+
+    def compact(self) -> dict:
+        """Merge all live segments into one."""
+        manifest = self._read_manifest()
+        segment_count = len(manifest["segments"])
+        if segment_count <= 1:
+            return manifest
+
+        with GraphSnapshotReader(self.root, manifest) as reader:
+            manifest["compacted_at"] = datetime.now(timezone.utc).isoformat()
+            manifest = self._replace_all(manifest, reader.iter_nodes(), reader.iter_edges())
+
+        logger.info(f"Graph store {self.root.name}: compacted {segment_count} segments")
+        return manifest
+
+    def import_graph(self, graph, replace: bool = False) -> dict:
+        """
+        Import a NetworkX graph (e.g. a legacy pickle).
+
+        Args:
+            graph: Graph to import
+            replace: Replace the store contents instead of appending
+        """
+        if replace:
+            return self._replace_all(
+                self._read_manifest(), graph.nodes(data=True), graph.edges(data=True)
+            )
+
+        delta = GraphDelta()
+        for node_id, attrs in graph.nodes(data=True):
+            delta.add_node(node_id, **attrs)
+        for from_id, to_id, attrs in graph.edges(data=True):
+            delta.add_edge(from_id, to_id, **attrs)
+        return self.append(delta)
@@ -20,6 +20,7 @@ OAuth2 Scopes:
 Auth: OAuth2 Client Credentials
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
@@ -233,6 +234,10 @@ class BolagsverketHVDAdapter(BaseAdapter):
     # Required OAuth2 scopes
     OAUTH_SCOPES = f"{OAuthScope.PING.value} {OAuthScope.READ.value}"
 
+    # Upper bound on in-flight requests in batch fetches; the rate
+    # limiter's window budget caps it further
+    MAX_CONCURRENCY = 8
+
     def __init__(
         self,
         client_id: Optional[str] = None,
@@ -254,8 +259,10 @@ class BolagsverketHVDAdapter(BaseAdapter):
         self.use_test = use_test if use_test is not None else settings.bolagsverket_use_test
         self.base_url = base_url or (self.TEST_BASE_URL if self.use_test else self.PROD_BASE_URL)
 
-        # Token cache for OAuth2
+        # Token cache for OAuth2; the lock keeps concurrent requests from
+        # each fetching a token
         self._token_cache: Optional[TokenCache] = None
+        self._token_lock = asyncio.Lock()
 
         if not self.client_id or not self.client_secret:
             logger.warning(
@@ -271,7 +278,8 @@ class BolagsverketHVDAdapter(BaseAdapter):
             },
             timeout=30.0,
         )
-        self._client = RateLimitedClient(self._raw_client, BOLAGSVERKET_RATE_LIMITER)
+        self.rate_limiter = BOLAGSVERKET_RATE_LIMITER
+        self._client = RateLimitedClient(self._raw_client, self.rate_limiter)
 
     @property
     def token_url(self) -> str:
@@ -289,6 +297,13 @@ class BolagsverketHVDAdapter(BaseAdapter):
         if self._token_cache and self._token_cache.expires_at > datetime.utcnow():
             return self._token_cache.token
 
+        async with self._token_lock:
+            if self._token_cache and self._token_cache.expires_at > datetime.utcnow():
+                return self._token_cache.token
+            return await self._fetch_token()
+
+    async def _fetch_token(self) -> str:
+        """Request a new access token and cache it."""
         if not self.client_id or not self.client_secret:
             raise ValueError(
                 "Bolagsverket OAuth2 credentials not configured. "
@@ -523,25 +538,71 @@ class BolagsverketHVDAdapter(BaseAdapter):
 
         return parse_hvd_response(record.raw_data)
 
+    def batch_concurrency(self, concurrency: Optional[int] = None) -> int:
+        """
+        Number of requests a batch fetch keeps in flight.
+
+        Capped by the rate limiter's per-window budget: more in-flight
+        requests than that would only queue inside the limiter.
+        """
+        wanted = concurrency or self.MAX_CONCURRENCY
+        return max(1, min(wanted, self.rate_limiter.config.requests_per_window))
+
+    async def fetch_company_records(
+        self,
+        orgnummers: list[str],
+        concurrency: Optional[int] = None,
+    ) -> dict[str, IngestionRecord]:
+        """
+        Fetch raw records for many companies concurrently.
+
+        Requests run with bounded parallelism (see ``batch_concurrency``)
+        and still pass through the shared rate limiter. Failed lookups are
+        logged and left out, as are companies that were not found.
+
+        Args:
+            orgnummers: Org numbers to fetch (duplicates are fetched once)
+            concurrency: Maximum in-flight requests
+
+        Returns:
+            Normalized orgnr -> IngestionRecord, in input order
+        """
+        orgnrs = list(dict.fromkeys(o.replace("-", "").replace(" ", "") for o in orgnummers))
+        semaphore = asyncio.Semaphore(self.batch_concurrency(concurrency))
+
+        async def fetch_one(orgnr: str) -> Optional[IngestionRecord]:
+            async with semaphore:
+                try:
+                    return await self.fetch_company(orgnr)
+                except Exception as e:
+                    logger.warning(f"Failed to fetch company {orgnr}: {e}")
+                    return None
+
+        records = await asyncio.gather(*(fetch_one(orgnr) for orgnr in orgnrs))
+        return {orgnr: record for orgnr, record in zip(orgnrs, records) if record}
+
     async def fetch_companies_batch(
         self,
         orgnummers: list[str],
+        concurrency: Optional[int] = None,
     ) -> list[ParsedCompany]:
         """
         Fetch multiple companies by organisationsnummer.
 
         Args:
             orgnummers: List of org numbers to fetch
+            concurrency: Maximum in-flight requests (see ``batch_concurrency``)
 
         Returns:
-            List of ParsedCompany for found companies
+            List of ParsedCompany for found companies, in input order
         """
+        records = await self.fetch_company_records(orgnummers, concurrency)
         results = []
-        for orgnr in orgnummers:
+        for orgnr, record in records.items():
+            if not record.raw_data:
+                continue
             try:
-                parsed = await self.fetch_company_parsed(orgnr)
-                if parsed:
-                    results.append(parsed)
+                results.append(parse_hvd_response(record.raw_data))
             except Exception as e:
-                logger.warning(f"Failed to fetch company {orgnr}: {e}")
+                logger.warning(f"Failed to parse company {orgnr}: {e}")
         return results
@@ -5,10 +5,12 @@ This module connects data sources (Bolagsverket, SCB, etc.) to the graph databas
 transforming raw API data into graph nodes and edges.
 """
 
+import asyncio
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Optional, Union
 from uuid import uuid4
 
 from halo.graph.client import GraphClient, create_graph_client
@@ -31,18 +33,35 @@ class LoadResult:
     timestamp: datetime
 
 
+@dataclass
+class CompanyLoadPlan:
+    """Nodes and edges to write for one fetched company."""
+    company: Company
+    addresses: list[Address] = field(default_factory=list)  # New address nodes only
+    persons: list[Person] = field(default_factory=list)
+    edges: list[Union[RegisteredAtEdge, DirectsEdge]] = field(default_factory=list)
+
+
 class GraphLoader:
     """
     Loads data from ingestion adapters into the intelligence graph.
 
     Transforms raw API data into graph nodes and edges,
     handling deduplication and relationship creation.
+
+    Batch loads run in three stages per chunk of ``write_batch_size``
+    companies: a concurrent fetch (bounded by the adapter's rate budget),
+    a transform into nodes and edges, and grouped graph writes preceded
+    by one bulk orgnr existence check. The next chunk is fetched while
+    the current one is written. Per-stage throughput of the last batch is
+    kept in ``batch_stats``.
     """
 
     def __init__(
         self,
         graph_client: Optional[GraphClient] = None,
         bolagsverket_adapter: Optional[BolagsverketHVDAdapter] = None,
+        write_batch_size: int = 100,
     ):
         """
         Initialize the graph loader.
@@ -50,10 +69,13 @@ class GraphLoader:
         Args:
             graph_client: Graph client (defaults to NetworkX for development)
             bolagsverket_adapter: Bolagsverket HVD adapter (created if not provided)
+            write_batch_size: Companies per fetch/write chunk in batch loads
         """
         self.graph = graph_client or GraphClient()
         self.bolagsverket = bolagsverket_adapter or BolagsverketHVDAdapter()
+        self.write_batch_size = write_batch_size
         self._address_cache: dict[str, str] = {}  # Cache address -> ID mapping
+        self.batch_stats: dict[str, Any] = {}
 
     async def __aenter__(self):
         await self.graph.connect()
@@ -105,6 +127,7 @@ class GraphLoader:
         orgnrs: list[str],
         include_directors: bool = True,
         include_address: bool = True,
+        concurrency: Optional[int] = None,
     ) -> list[LoadResult]:
         """
         Load multiple companies from Bolagsverket.
@@ -113,22 +136,89 @@ class GraphLoader:
             orgnrs: List of organisation numbers
             include_directors: Load director relationships
             include_address: Load registered addresses
+            concurrency: Maximum in-flight API requests (defaults to the
+                adapter's rate-limited maximum)
 
         Returns:
-            List of LoadResults for each company
+            List of LoadResults for each company loaded, in input order
         """
-        results = []
-        for orgnr in orgnrs:
+        orgnrs = list(dict.fromkeys(o.replace("-", "").replace(" ", "") for o in orgnrs))
+        chunks = [
+            orgnrs[i:i + self.write_batch_size]
+            for i in range(0, len(orgnrs), self.write_batch_size)
+        ]
+        stats = {
+            "requested": len(orgnrs),
+            "fetched": 0,
+            "loaded": 0,
+            "created": 0,
+            "updated": 0,
+            "failed": 0,
+            "nodes_written": 0,
+            "edges_written": 0,
+            "fetch_seconds": 0.0,
+            "transform_seconds": 0.0,
+            "write_seconds": 0.0,
+        }
+        self.batch_stats = stats
+        results: list[LoadResult] = []
+
+        async def fetch(chunk: list[str]) -> tuple[dict[str, IngestionRecord], float]:
+            start = time.perf_counter()
+            records = await self.bolagsverket.fetch_company_records(chunk, concurrency)
+            return records, time.perf_counter() - start
+
+        pending_fetch = asyncio.create_task(fetch(chunks[0])) if chunks else None
+        for i in range(len(chunks)):
+            records, fetch_elapsed = await pending_fetch
+            # Fetch the next chunk while this one is transformed and written
+            if i + 1 < len(chunks):
+                pending_fetch = asyncio.create_task(fetch(chunks[i + 1]))
+            stats["fetched"] += len(records)
+            stats["fetch_seconds"] += fetch_elapsed
+
+            start = time.perf_counter()
+            pending_addresses: dict[str, Address] = {}
+            plans = []
+            for orgnr, record in records.items():
+                try:
+                    plans.append(self._plan_bolagsverket_company(
+                        record,
+                        include_directors=include_directors,
+                        include_address=include_address,
+                        pending_addresses=pending_addresses,
+                    ))
+                except Exception as e:
+                    stats["failed"] += 1
+                    logger.error(f"Failed to transform company {orgnr}: {e}")
+            stats["transform_seconds"] += time.perf_counter() - start
+
+            start = time.perf_counter()
             try:
-                result = await self.load_company_from_bolagsverket(
-                    orgnr,
-                    include_directors=include_directors,
-                    include_address=include_address,
-                )
-                if result:
-                    results.append(result)
+                results.extend(await self._write_plans(plans, pending_addresses, stats))
             except Exception as e:
-                logger.error(f"Failed to load company {orgnr}: {e}")
+                stats["failed"] += len(plans)
+                logger.error(f"Failed to write batch of {len(plans)} companies: {e}")
+            stats["write_seconds"] += time.perf_counter() - start
+
+        stats["loaded"] = len(results)
+        stats["created"] = sum(1 for r in results if r.created)
+        stats["updated"] = stats["loaded"] - stats["created"]
+        for stage, rows in (
+            ("fetch", stats["fetched"]),
+            ("transform", stats["fetched"]),
+            ("write", stats["nodes_written"] + stats["edges_written"]),
+        ):
+            elapsed = stats[f"{stage}_seconds"]
+            stats[f"{stage}_rows_per_second"] = rows / elapsed if elapsed > 0 else 0.0
+
+        logger.info(
+            f"Loaded {stats['loaded']}/{stats['requested']} companies "
+            f"({stats['created']} new, {stats['failed']} failed): "
+            f"fetch {stats['fetch_rows_per_second']:.1f}/s, "
+            f"transform {stats['transform_rows_per_second']:.0f}/s, "
+            f"write {stats['write_rows_per_second']:.0f} rows/s"
+        )
         return results
 
     async def _load_bolagsverket_company(
@@ -138,40 +228,86 @@ class GraphLoader:
         include_address: bool = True,
     ) -> LoadResult:
         """Transform and load a Bolagsverket company record."""
+        pending_addresses: dict[str, Address] = {}
+        plan = self._plan_bolagsverket_company(
+            record,
+            include_directors=include_directors,
+            include_address=include_address,
+            pending_addresses=pending_addresses,
+        )
+        results = await self._write_plans([plan], pending_addresses)
+        return results[0]
+
+    def _plan_bolagsverket_company(
+        self,
+        record: IngestionRecord,
+        include_directors: bool,
+        include_address: bool,
+        pending_addresses: dict[str, Address],
+    ) -> CompanyLoadPlan:
+        """Transform a Bolagsverket company record into nodes and edges."""
         data = record.raw_data
-        edges_created = 0
+        plan = CompanyLoadPlan(company=self._transform_bolagsverket_company(data))
 
-        # Extract company data
-        company = self._transform_bolagsverket_company(data)
+        if include_address:
+            self._plan_bolagsverket_address(data, plan, pending_addresses)
+        if include_directors:
+            self._plan_bolagsverket_directors(data, plan)
 
-        # Check if company already exists
-        existing = await self.graph.find_company_by_orgnr(company.orgnr)
-        created = existing is None
+        return plan
 
-        # Add/update company
-        company_id = await self.graph.add_company(company)
-        logger.info(f"{'Created' if created else 'Updated'} company: {company.orgnr}")
+    async def _write_plans(
+        self,
+        plans: list[CompanyLoadPlan],
+        pending_addresses: dict[str, Address],
+        stats: Optional[dict[str, Any]] = None,
+    ) -> list[LoadResult]:
+        """
+        Write planned companies with one batch call per node kind.
 
-        # Load address if present
-        if include_address:
-            address_id = await self._load_bolagsverket_address(data, company_id)
-            if address_id:
-                edges_created += 1
+        Existence is checked for all companies with one orgnr lookup
+        before writing. Nodes are written before the edges that use them.
+        """
+        if not plans:
+            return []
 
-        # Load directors/board members if present
-        if include_directors:
-            director_count = await self._load_bolagsverket_directors(data, company_id)
-            edges_created += director_count
-
-        return LoadResult(
-            entity_id=company_id,
-            entity_type="Company",
-            created=created,
-            edges_created=edges_created,
-            source="bolagsverket_hvd",
-            timestamp=datetime.utcnow(),
+        existing = await self.graph.find_companies_by_orgnrs(
+            [p.company.orgnr for p in plans if p.company.orgnr]
         )
 
+        companies = [p.company for p in plans]
+        addresses = [a for p in plans for a in p.addresses]
+        persons = [person for p in plans for person in p.persons]
+        edges = [e for p in plans for e in p.edges]
+
+        await self.graph.add_companies_batch(companies)
+        if addresses:
+            await self.graph.add_addresses_batch(addresses)
+        if persons:
+            await self.graph.add_persons_batch(persons)
+        if edges:
+            await self.graph.add_edges_batch(edges)
+
+        self._address_cache.update({key: a.id for key, a in pending_addresses.items()})
+        if stats is not None:
+            stats["nodes_written"] += len(companies) + len(addresses) + len(persons)
+            stats["edges_written"] += len(edges)
+
+        now = datetime.utcnow()
+        results = []
+        for plan in plans:
+            created = plan.company.orgnr not in existing
+            logger.debug(f"{'Created' if created else 'Updated'} company: {plan.company.orgnr}")
+            results.append(LoadResult(
+                entity_id=plan.company.id,
+                entity_type="Company",
+                created=created,
+                edges_created=len(plan.edges),
+                source="bolagsverket_hvd",
+                timestamp=now,
+            ))
+        return results
+
     def _transform_bolagsverket_company(self, data: dict[str, Any]) -> Company:
         """Transform Bolagsverket HVD raw data to Company node."""
         # Extract organisationsidentitet
@@ -235,12 +371,13 @@ class GraphLoader:
             sources=["bolagsverket_hvd"],
         )
 
-    async def _load_bolagsverket_address(
+    def _plan_bolagsverket_address(
         self,
         data: dict[str, Any],
-        company_id: str,
+        plan: CompanyLoadPlan,
+        pending_addresses: dict[str, Address],
     ) -> Optional[str]:
-        """Load address from Bolagsverket HVD data and create relationship."""
+        """Plan the registered address and its edge from Bolagsverket HVD data."""
         # Extract postal address from HVD format
         post_org = data.get("postadressOrganisation", {})
         postadress = post_org.get("postadress", {})
@@ -256,9 +393,11 @@ class GraphLoader:
 
         address_key = f"{street}|{postal_code}|{city}".lower()
 
-        # Check cache
+        # Check cache, then addresses planned earlier in this batch
         if address_key in self._address_cache:
             address_id = self._address_cache[address_key]
+        elif address_key in pending_addresses:
+            address_id = pending_addresses[address_key].id
         else:
             # Create new address using schema-compliant format
             raw_parts = [co_address, street, postal_code, city]
@@ -276,26 +415,26 @@ class GraphLoader:
                 type="registered",
                 sources=["bolagsverket_hvd"],
             )
-            address_id = await self.graph.add_address(address)
-            self._address_cache[address_key] = address_id
+            address_id = address.id
+            pending_addresses[address_key] = address
+            plan.addresses.append(address)
             logger.debug(f"Created address: {postal_code} {city}")
 
         # Create registration edge
-        edge = RegisteredAtEdge(
-            from_id=company_id,
+        plan.edges.append(RegisteredAtEdge(
+            from_id=plan.company.id,
             to_id=address_id,
             type="registered",
-        )
-        await self.graph.add_registration(edge)
+        ))
 
         return address_id
 
-    async def _load_bolagsverket_directors(
+    def _plan_bolagsverket_directors(
         self,
         data: dict[str, Any],
-        company_id: str,
+        plan: CompanyLoadPlan,
     ) -> int:
-        """Load directors/board members from Bolagsverket data.
+        """Plan directors/board members from Bolagsverket data.
 
         Note: HVD (free) API does not include director data.
         This is available in the paid Företagsinformation API.
@@ -318,22 +457,20 @@ class GraphLoader:
 
             # Create person node
             person_id = f"person-{uuid4().hex[:8]}"
-            person = Person(
+            plan.persons.append(Person(
                 id=person_id,
                 names=[{"name": name}],
-            )
-            await self.graph.add_person(person)
+            ))
 
             # Create directorship edge
-            edge = DirectsEdge(
+            plan.edges.append(DirectsEdge(
                 from_id=person_id,
-                to_id=company_id,
+                to_id=plan.company.id,
                 role=role,
-            )
-            await self.graph.add_directorship(edge)
+            ))
             edges_created += 1
 
-            logger.debug(f"Created director: {name} -> {company_id}")
+            logger.debug(f"Created director: {name} -> {plan.company.id}")
 
         return edges_created
 
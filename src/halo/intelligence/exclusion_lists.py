@@ -13,7 +13,8 @@ Categories:
 """
 
 import re
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Optional
 
 
 # ============================================================================
@@ -237,18 +238,61 @@ GOVERNMENT_ENTITIES = [
 # LOOKUP FUNCTIONS
 # ============================================================================
 
-def _compile_patterns(pattern_list: list[str]) -> list[re.Pattern]:
-    """Compile patterns for efficient matching."""
-    return [re.compile(re.escape(p), re.IGNORECASE) for p in pattern_list]
+# Lists in priority order: a name on several lists gets the first category
+EXCLUSION_CATEGORIES = [
+    ("audit_firm", AUDIT_FIRMS),
+    ("pe_vc", PE_VC_FIRMS),
+    ("law_firm", LAW_FIRMS),
+    ("bank", BANKS),
+    ("corporate_service", CORPORATE_SERVICE_PROVIDERS),
+    ("government", GOVERNMENT_ENTITIES),
+]
+
+
+def _compile_matcher(categories: list[tuple[str, list[str]]]) -> tuple[re.Pattern, dict[str, int]]:
+    """
+    Compile every list into one pattern, tried once per position.
+
+    The pattern is a lookahead, so finditer reports a zero-width match at
+    every position where some entry starts, overlapping ones included.
+    Entries are grouped by first character, which lets the regex engine
+    skip a position after one character test, and ordered by priority
+    within a group, so the entry reported at a position is the
+    best-ranked one starting there.
+
+    Returns the pattern and each entry's category rank.
+    """
+    ranks: dict[str, int] = {}
+    for rank, (_, patterns) in enumerate(categories):
+        for pattern in patterns:
+            ranks.setdefault(pattern.lower(), rank)
+
+    by_first: dict[str, list[str]] = {}
+    for entry in sorted(ranks, key=ranks.get):
+        by_first.setdefault(entry[0], []).append(entry)
+
+    branches = "|".join(
+        re.escape(first) + "(?:" + "|".join(re.escape(e[1:]) for e in entries) + ")"
+        for first, entries in by_first.items()
+    )
+    return re.compile(f"(?=({branches}))"), ranks
+
 
+_MATCHER, _ENTRY_RANKS = _compile_matcher(EXCLUSION_CATEGORIES)
+_CATEGORY_NAMES = [name for name, _ in EXCLUSION_CATEGORIES]
 
-# Pre-compiled patterns
-_AUDIT_PATTERNS = _compile_patterns(AUDIT_FIRMS)
-_PE_PATTERNS = _compile_patterns(PE_VC_FIRMS)
-_LAW_PATTERNS = _compile_patterns(LAW_FIRMS)
-_BANK_PATTERNS = _compile_patterns(BANKS)
-_CSP_PATTERNS = _compile_patterns(CORPORATE_SERVICE_PROVIDERS)
-_GOV_PATTERNS = _compile_patterns(GOVERNMENT_ENTITIES)
+
+@lru_cache(maxsize=1 << 16)
+def _classify(name_lower: str) -> Optional[str]:
+    """Highest-priority category with an entry in the name, in one scan."""
+    best = None
+    for match in _MATCHER.finditer(name_lower):
+        rank = _ENTRY_RANKS[match.group(1)]
+        if best is None or rank < best:
+            best = rank
+            if rank == 0:
+                break
+    return None if best is None else _CATEGORY_NAMES[best]
 
 
 def is_excluded_entity(name: str) -> Optional[str]:
@@ -260,34 +304,23 @@ def is_excluded_entity(name: str) -> Optional[str]:
     """
     if not name:
         return None
+    return _classify(name.lower())
 
-    name_lower = name.lower()
-
-    for pattern in _AUDIT_PATTERNS:
-        if pattern.search(name_lower):
-            return "audit_firm"
-
-    for pattern in _PE_PATTERNS:
-        if pattern.search(name_lower):
-            return "pe_vc"
-
-    for pattern in _LAW_PATTERNS:
-        if pattern.search(name_lower):
-            return "law_firm"
-
-    for pattern in _BANK_PATTERNS:
-        if pattern.search(name_lower):
-            return "bank"
 
-    for pattern in _CSP_PATTERNS:
-        if pattern.search(name_lower):
-            return "corporate_service"
-
-    for pattern in _GOV_PATTERNS:
-        if pattern.search(name_lower):
-            return "government"
+def classify_names(names: Iterable[str]) -> list[Optional[str]]:
+    """
+    Classify many names at once.
 
-    return None
+    Returns the is_excluded_entity category (or None) for each name, in
+    order. Repeated names are classified once.
+    """
+    categories: dict[str, Optional[str]] = {}
+    result = []
+    for name in names:
+        if name not in categories:
+            categories[name] = is_excluded_entity(name)
+        result.append(categories[name])
+    return result
 
 
 def should_exclude_from_serial_director(name: str) -> bool:
@@ -311,8 +344,7 @@ def get_exclusion_stats(names: list[str]) -> dict:
     excluded = []
     not_excluded = []
 
-    for name in names:
-        category = is_excluded_entity(name)
+    for name, category in zip(names, classify_names(names)):
         if category:
             categories[category] += 1
             excluded.append((name, category))
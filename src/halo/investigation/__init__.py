@@ -16,6 +16,7 @@ from halo.investigation.case_manager import (
     CasePriority,
     CaseType,
 )
+from halo.investigation.blob_store import BlobStore
 from halo.investigation.evidence import (
     Evidence,
     EvidenceType,
@@ -45,6 +46,7 @@ __all__ = [
     "EvidenceType",
     "EvidenceChain",
     "EvidenceCollector",
+    "BlobStore",
     # Timeline
     "TimelineEvent",
     "Timeline",
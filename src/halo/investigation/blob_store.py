@@ -0,0 +1,216 @@
+"""
+Content-addressed storage for evidence payloads.
+
+Payloads are written once under their SHA-256 digest
+(root/ab/cdef...), so identical content is stored once however many
+evidence items refer to it. Content is streamed to a temporary file while
+it is hashed and moved into place atomically; memory use does not depend
+on the payload size. Evidence metadata and chain of custody live on the
+Evidence objects, never in the store.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+Content = Union[bytes, bytearray, memoryview, BinaryIO, Iterable[bytes]]
+
+_DIGEST = re.compile(r"[0-9a-f]{64}")
+
+
+@dataclass
+class BlobInfo:
+    """A stored payload."""
+
+    digest: str  # SHA-256, hex
+    size: int
+    path: Path
+    deduplicated: bool = False  # Content was already in the store
+
+
+def file_sha256(path: Union[str, Path]) -> str:
+    """SHA-256 of a file, read in 1 MB chunks into a reused buffer."""
+    sha256 = hashlib.sha256()
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while n := f.readinto(buffer):
+            sha256.update(view[:n])
+    return sha256.hexdigest()
+
+
+def is_digest(value: str) -> bool:
+    """Whether value is a lowercase hex SHA-256 digest, the only valid blob name."""
+    return isinstance(value, str) and _DIGEST.fullmatch(value) is not None
+
+
+def _chunks(content: Content) -> Iterator[bytes]:
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        yield content
+    elif hasattr(content, "read"):
+        while chunk := content.read(CHUNK_SIZE):
+            yield chunk
+    else:
+        yield from content
+
+
+def verify_files(
+    expected: dict[Path, str],
+    cache: dict[Path, tuple[int, int, str]],
+    max_workers: Optional[int] = None,
+) -> dict[Path, bool]:
+    """
+    Check files against their expected SHA-256 digests in parallel.
+
+    A file whose size and modification time match the cache entry from
+    its last verified hash is not read again. The cache is updated with
+    every file that was hashed.
+
+    Args:
+        expected: Expected digest per file
+        cache: (size, mtime_ns, digest) per file from earlier runs
+        max_workers: Hashing threads (None = up to 8)
+
+    Returns:
+        Whether each file matches its digest; missing files do not
+    """
+    results: dict[Path, bool] = {}
+    to_hash: dict[Path, tuple[int, int]] = {}
+
+    for path, digest in expected.items():
+        try:
+            stat = path.stat()
+        except OSError as e:
+            logger.error(f"Cannot verify {path}: {e}")
+            results[path] = False
+            continue
+        cached = cache.get(path)
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            results[path] = cached[2] == digest
+        else:
+            to_hash[path] = (stat.st_size, stat.st_mtime_ns)
+
+    if to_hash:
+        # hashlib releases the GIL while hashing large buffers
+        workers = max_workers or min(8, os.cpu_count() or 1, len(to_hash))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="evidence-verify") as pool:
+            futures = {path: pool.submit(file_sha256, path) for path in to_hash}
+        for path, future in futures.items():
+            try:
+                digest = future.result()
+            except OSError as e:
+                logger.error(f"Cannot verify {path}: {e}")
+                results[path] = False
+                continue
+            cache[path] = (*to_hash[path], digest)
+            results[path] = digest == expected[path]
+
+    logger.debug(f"Verified {len(expected)} files, hashed {len(to_hash)}")
+    return results
+
+
+class BlobStore:
+    """
+    Content-addressed blob store on the local filesystem.
+
+    Blobs are read-only once written; a changed blob no longer matches
+    its name, which verify_files detects.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory for blobs (created on first write)
+        """
+        self.root = Path(root)
+
+    def path_for(self, digest: str) -> Path:
+        """
+        Location of a blob.
+
+        Raises:
+            ValueError: If digest is not 64 lowercase hex characters, so no
+                name can reach a path outside the store root
+        """
+        if not is_digest(digest):
+            raise ValueError(f"Invalid blob digest: {digest!r}")
+        return self.root / digest[:2] / digest[2:]
+
+    def exists(self, digest: str) -> bool:
+        return self.path_for(digest).exists()
+
+    def put(self, content: Content) -> BlobInfo:
+        """
+        Store content, hashing it while it is written.
+
+        Args:
+            content: Bytes, a binary file object, or an iterable of chunks
+
+        Returns:
+            BlobInfo for the stored content
+        """
+        tmp_dir = self.root / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+
+        sha256 = hashlib.sha256()
+        size = 0
+        fd, tmp_name = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in _chunks(content):
+                    sha256.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+
+            digest = sha256.hexdigest()
+            path = self.path_for(digest)
+            if path.exists():
+                os.unlink(tmp_name)
+                return BlobInfo(digest=digest, size=size, path=path, deduplicated=True)
+
+            path.parent.mkdir(exist_ok=True)
+            os.chmod(tmp_name, 0o444)
+            os.replace(tmp_name, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+        logger.debug(f"Stored blob {digest} ({size} bytes)")
+        return BlobInfo(digest=digest, size=size, path=path)
+
+    def open(self, digest: str) -> BinaryIO:
+        """Open a blob for streaming reads."""
+        return open(self.path_for(digest), "rb")
+
+    @contextmanager
+    def map(self, digest: str) -> Iterator[Union[mmap.mmap, bytes]]:
+        """
+        Memory-map a blob read-only.
+
+        Yields an mmap (bytes-like, sliceable) that is valid inside the
+        with block; empty blobs, which cannot be mapped, yield b"".
+        """
+        with self.open(digest) as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield b""
+                return
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield mapped
+            finally:
+                mapped.close()
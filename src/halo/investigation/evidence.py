@@ -1,18 +1,23 @@
 """
 Evidence management for investigations.
 
-Tracks evidence items and maintains chain of custody.
+Tracks evidence items and maintains chain of custody. Evidence payloads
+are kept in a content-addressed BlobStore on disk; Evidence objects hold
+only metadata and custody records.
 """
 
 import hashlib
 import logging
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, BinaryIO, Iterator, Optional
 from uuid import UUID, uuid4
 
+from halo.investigation.blob_store import BlobStore, Content, file_sha256, verify_files
+
 logger = logging.getLogger(__name__)
 
 
@@ -83,7 +88,8 @@ class Evidence:
 
     # Content
     content: Optional[str] = None  # Text content or structured data
-    content_bytes: Optional[bytes] = None  # Raw binary content
+    content_bytes: Optional[bytes] = None  # Raw binary content (payloads now go to the blob store)
+    blob_hash: Optional[str] = None  # Payload digest in the collector's blob store
     file_path: Optional[str] = None  # Path to file if applicable
     file_hash: Optional[str] = None  # SHA-256 hash for integrity
     hash: Optional[str] = None  # SHA-256 hash of content (alias for file_hash)
@@ -178,11 +184,7 @@ class Evidence:
     @staticmethod
     def _calculate_file_hash(file_path: str) -> str:
         """Calculate SHA-256 hash of a file."""
-        sha256 = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+        return file_sha256(file_path)
 
 
 @dataclass
@@ -238,44 +240,53 @@ class EvidenceCollector:
             storage_path: Path for storing evidence files
         """
         self.storage_path = storage_path or Path("./evidence")
+        self.blobs = BlobStore(self.storage_path / "blobs")
 
         # In-memory storage for demo
         self._evidence: dict[UUID, Evidence] = {}
         self._chains: dict[UUID, EvidenceChain] = {}
 
+        # (size, mtime_ns, digest) of files verified earlier
+        self._verified: dict[Path, tuple[int, int, str]] = {}
+
     def add_evidence(
         self,
         case_id: UUID,
         title: str,
         evidence_type: EvidenceType,
         source: str,
-        content: bytes,
+        content: Content,
         collected_by: UUID,
     ) -> Evidence:
         """
         Add evidence to a case.
 
+        The content is streamed into the blob store and hashed on the way;
+        content already in the store is not written again.
+
         Args:
             case_id: Case to add evidence to
             title: Evidence title
             evidence_type: Type of evidence
             source: Source of evidence
-            content: Raw content bytes
+            content: Raw content bytes, a binary file object or an
+                iterable of byte chunks
             collected_by: User collecting the evidence
 
         Returns:
             Created Evidence object with hash and chain of custody
         """
-        # Calculate hash of content
-        content_hash = hashlib.sha256(content).hexdigest()
+        blob = self.blobs.put(content)
 
         evidence = Evidence(
             evidence_type=evidence_type,
             title=title,
             source=source,
-            content_bytes=content,
-            file_hash=content_hash,
-            hash=content_hash,
+            blob_hash=blob.digest,
+            file_path=str(blob.path),
+            file_hash=blob.digest,
+            hash=blob.digest,
+            file_size=blob.size,
             collected_by=collected_by,
         )
 
@@ -286,14 +297,44 @@ class EvidenceCollector:
             action="collected",
             actor_id=collected_by,
             notes=f"Evidence collected from {source}",
+            location=str(blob.path),
         )
 
         self._evidence[evidence.id] = evidence
 
-        logger.info(f"Added evidence: {title}")
+        logger.info(
+            f"Added evidence: {title} ({blob.size} bytes"
+            f"{', already stored' if blob.deduplicated else ''})"
+        )
 
         return evidence
 
+    def open_content(self, evidence: Evidence) -> BinaryIO:
+        """
+        Open stored evidence content for streaming reads.
+
+        Raises:
+            ValueError: If the evidence has no stored content
+        """
+        if not evidence.blob_hash:
+            raise ValueError(f"Evidence has no stored content: {evidence.id}")
+        return self.blobs.open(evidence.blob_hash)
+
+    @contextmanager
+    def map_content(self, evidence: Evidence) -> Iterator:
+        """
+        Memory-map stored evidence content read-only.
+
+        The mapping is only valid inside the with block.
+
+        Raises:
+            ValueError: If the evidence has no stored content
+        """
+        if not evidence.blob_hash:
+            raise ValueError(f"Evidence has no stored content: {evidence.id}")
+        with self.blobs.map(evidence.blob_hash) as content:
+            yield content
+
     def verify_integrity(self, evidence: Evidence, content: bytes) -> bool:
         """
         Verify evidence content matches its hash.
@@ -706,12 +747,35 @@ class EvidenceCollector:
 
         return chain
 
-    def verify_all_integrity(self) -> dict[UUID, bool]:
-        """Verify integrity of all file-based evidence."""
-        results = {}
-        for evidence_id, evidence in self._evidence.items():
-            if evidence.file_path:
-                results[evidence_id] = evidence.verify_integrity()
+    def verify_all_integrity(self, max_workers: Optional[int] = None) -> dict[UUID, bool]:
+        """
+        Verify integrity of all file-based evidence.
+
+        Files are hashed in parallel, and each file once even when several
+        evidence items share it. Files whose size and modification time
+        are unchanged since they were last hashed are not read again.
+
+        Args:
+            max_workers: Hashing threads (None = up to 8)
+        """
+        files = {
+            evidence_id: Path(evidence.file_path)
+            for evidence_id, evidence in self._evidence.items()
+            if evidence.file_path
+        }
+
+        expected: dict[Path, str] = {}
+        results: dict[UUID, bool] = {}
+        for evidence_id, path in files.items():
+            file_hash = self._evidence[evidence_id].file_hash
+            if not file_hash:
+                results[evidence_id] = True  # No hash to verify against
+            elif expected.setdefault(path, file_hash) != file_hash:
+                results[evidence_id] = False  # Same file recorded with another hash
+
+        verified = verify_files(expected, self._verified, max_workers)
+        for evidence_id, path in files.items():
+            results.setdefault(evidence_id, verified.get(path, False))
         return results
 
     def _guess_mime_type(self, path: Path) -> str:
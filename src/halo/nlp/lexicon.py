@@ -0,0 +1,216 @@
+"""
+Compiled keyword lexicon for Swedish text.
+
+One Lexicon holds the keyword categories of several components (sentiment
+indicators, threat vocabulary) and matches all of them in a single scan:
+the text is tokenised once and every token is looked up in hash indexes
+built from the keywords, so a scan costs O(text length) however many
+keywords are registered.
+
+Categories use one of two match modes:
+- word: keywords match whole tokens, case-insensitively. Within a
+  category, the longest keyword wins and matches do not overlap.
+- substring: keywords match anywhere inside tokens, so stems also match
+  inflected forms and compounds ("hota" in "hotade", "fara" in
+  "livsfara"). Every occurrence is reported.
+
+Multi-word keywords match consecutive tokens. Match offsets are
+character offsets into the original text in both modes.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class LexiconMatch:
+    """A keyword occurrence in text."""
+
+    category: str
+    keyword: str
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class _Entry:
+    category: str
+    keyword: str
+    tokens: tuple[str, ...]
+    substring: bool
+
+
+def tokenize(text: str) -> list[tuple[str, int, int]]:
+    """Lowercase word tokens with their character offsets."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return [(m.group(), *m.span()) for m in TOKEN_PATTERN.finditer(lowered)]
+    # A few characters lowercase to several; keep offsets into the original
+    return [(m.group().lower(), *m.span()) for m in TOKEN_PATTERN.finditer(text)]
+
+
+class Lexicon:
+    """
+    Keyword categories compiled for single-pass matching.
+
+    Usage:
+        lexicon = Lexicon()
+        lexicon.add_category("vocab:drugs", ["knark", "kokain"])
+        lexicon.add_category("sentiment:fear", ["rädd", "hotad"], substring=True)
+        matches = lexicon.scan("Han var rädd för knarket")
+    """
+
+    def __init__(self, cache_size: int = 65536):
+        """
+        Initialize an empty lexicon.
+
+        Args:
+            cache_size: Distinct tokens whose index lookups are cached
+        """
+        self.cache_size = cache_size
+        self._categories: dict[str, tuple[frozenset[str], bool]] = {}
+        self._compiled = False
+
+    def add_category(self, category: str, keywords: Iterable[str], substring: bool = False):
+        """
+        Register (or replace) a keyword category.
+
+        Args:
+            category: Category name, unique within the lexicon
+            keywords: Keywords; case is ignored
+            substring: Match keywords inside tokens instead of whole tokens
+        """
+        self._categories[category] = (frozenset(k.lower() for k in keywords), substring)
+        self._compiled = False
+
+    @property
+    def categories(self) -> list[str]:
+        return list(self._categories)
+
+    def keywords(self, category: str) -> frozenset[str]:
+        """Keywords registered for a category."""
+        return self._categories[category][0]
+
+    def _compile(self):
+        """Build the token indexes."""
+        # Single-token keywords by token; multi-token keywords by first token
+        self._words: dict[str, list[_Entry]] = {}
+        self._substrings: dict[str, list[_Entry]] = {}
+        self._phrases: dict[str, list[_Entry]] = {}
+        self._suffix_phrases: dict[str, list[_Entry]] = {}
+
+        for category, (keywords, substring) in self._categories.items():
+            # Keywords that tokenise alike ("id-kort", "id kort") are one
+            # entry, so a hit is reported once per category
+            seen: set[tuple[str, ...]] = set()
+            for keyword in sorted(keywords):
+                tokens = tuple(token for token, _, _ in tokenize(keyword))
+                if not tokens or tokens in seen:
+                    continue
+                seen.add(tokens)
+                entry = _Entry(category, keyword, tokens, substring)
+                if len(tokens) == 1:
+                    index = self._substrings if substring else self._words
+                else:
+                    index = self._suffix_phrases if substring else self._phrases
+                index.setdefault(tokens[0], []).append(entry)
+
+        self._max_substring = max(map(len, self._substrings), default=0)
+        self._lookup = lru_cache(maxsize=self.cache_size)(self._lookup_token)
+        self._compiled = True
+        logger.debug(
+            f"Compiled lexicon: {len(self._categories)} categories, "
+            f"{sum(len(v) for v in self._categories.values())} keywords"
+        )
+
+    def _lookup_token(self, token: str) -> tuple:
+        """
+        Index hits for one token.
+
+        Returns (offset, length, entry) tuples: single-token keywords found
+        in the token, and multi-token keywords whose first token matches
+        here (offset and length cover that first token only).
+        """
+        hits = [(0, len(token), entry) for entry in self._words.get(token, ())]
+        hits.extend((0, len(token), entry) for entry in self._phrases.get(token, ()))
+
+        if self._substrings or self._suffix_phrases:
+            size = len(token)
+            for i in range(size):
+                for j in range(i + 1, min(size, i + self._max_substring) + 1):
+                    for entry in self._substrings.get(token[i:j], ()):
+                        hits.append((i, j - i, entry))
+                # In substring mode a phrase's first token may end a longer token
+                for entry in self._suffix_phrases.get(token[i:], ()):
+                    hits.append((i, size - i, entry))
+
+        return tuple(hits)
+
+    def scan(self, text: str) -> list[LexiconMatch]:
+        """
+        Find keyword occurrences of every category in one pass.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Matches ordered by position
+        """
+        if not self._compiled:
+            self._compile()
+
+        tokens = tokenize(text)
+        candidates = []
+        for position, (token, token_start, _) in enumerate(tokens):
+            for offset, length, entry in self._lookup(token):
+                if len(entry.tokens) == 1:
+                    end = token_start + offset + length
+                else:
+                    end = self._match_end(entry, tokens, position)
+                    if end is None:
+                        continue
+                candidates.append((token_start + offset, end, entry))
+
+        # Word-mode categories keep the longest non-overlapping matches
+        candidates.sort(key=lambda c: (c[0], c[0] - c[1]))
+        matches = []
+        last_end: dict[str, int] = {}
+        for start, end, entry in candidates:
+            if not entry.substring:
+                if start < last_end.get(entry.category, -1):
+                    continue
+                last_end[entry.category] = end
+            matches.append(LexiconMatch(entry.category, entry.keyword, start, end))
+
+        return matches
+
+    def scan_batch(self, texts: Iterable[str]) -> list[list[LexiconMatch]]:
+        """
+        Scan many texts.
+
+        Token lookups are cached across texts, so a corpus pays for each
+        distinct token once.
+        """
+        return [self.scan(text) for text in texts]
+
+    @staticmethod
+    def _match_end(entry: _Entry, tokens: list, position: int):
+        """End offset of a multi-token keyword starting at position, or None."""
+        last = position + len(entry.tokens) - 1
+        if last >= len(tokens):
+            return None
+        for expected, (token, _, _) in zip(entry.tokens[1:-1], tokens[position + 1 : last]):
+            if token != expected:
+                return None
+        token, token_start, _ = tokens[last]
+        final = entry.tokens[-1]
+        if token == final or (entry.substring and token.startswith(final)):
+            return token_start + len(final)
+        return None
@@ -7,6 +7,9 @@ Orchestrates all NLP components:
 - Sentiment Analysis
 - Threat Vocabulary Detection
 - Text Summarization (GPT-SW3)
+
+Sentiment and threat vocabulary keywords share one compiled Lexicon, so
+the lexicon stage tokenises each text once for both components.
 """
 
 import logging
@@ -17,6 +20,7 @@ from typing import Any, Optional
 from uuid import UUID
 
 from halo.config import settings
+from halo.nlp.lexicon import Lexicon
 from halo.nlp.ner import Entity, NamedEntityRecognizer
 from halo.nlp.sentiment import SentimentAnalyzer, SentimentResult
 from halo.nlp.threat_vocab import ThreatVocabularyDetector, VocabMatch
@@ -155,8 +159,9 @@ class NLPPipeline:
             model_path=ner_model_path or settings.kb_bert_model_path,
             use_gpu=use_gpu,
         )
-        self.sentiment = SentimentAnalyzer()
-        self.threat_vocab = ThreatVocabularyDetector()
+        self.lexicon = Lexicon()
+        self.sentiment = SentimentAnalyzer(lexicon=self.lexicon)
+        self.threat_vocab = ThreatVocabularyDetector(lexicon=self.lexicon)
 
         # Summarizer is loaded lazily
         self._summarizer = None
@@ -201,10 +206,18 @@ class NLPPipeline:
                 logger.error(f"Entity extraction failed: {e}")
                 result.entities = []
 
+        # One lexicon scan serves sentiment and threat vocabulary
+        scan = None
+        if analyze_sentiment or detect_threats:
+            try:
+                scan = self.lexicon.scan(text)
+            except Exception as e:
+                logger.error(f"Lexicon scan failed: {e}")
+
         # Analyze sentiment
         if analyze_sentiment:
             try:
-                result.sentiment = self.sentiment.analyze(text)
+                result.sentiment = self.sentiment.analyze(text, scan=scan)
             except Exception as e:
                 logger.error(f"Sentiment analysis failed: {e}")
                 result.sentiment = None
@@ -212,7 +225,7 @@ class NLPPipeline:
         # Detect threat vocabulary
         if detect_threats:
             try:
-                result.vocab_matches = self.threat_vocab.detect(text)
+                result.vocab_matches = self.threat_vocab.detect(text, scan=scan)
             except Exception as e:
                 logger.error(f"Threat vocabulary detection failed: {e}")
                 result.vocab_matches = []
@@ -238,6 +251,11 @@ class NLPPipeline:
         """
         Analyze multiple texts.
 
+        Entity extraction runs once for the whole batch, so model windows
+        from all texts share forward passes; the other components run per
+        text. Each result's processing time includes an equal share of the
+        batched NER time.
+
         Args:
             texts: List of texts to analyze
             **kwargs: Arguments passed to analyze()
@@ -245,7 +263,27 @@ class NLPPipeline:
         Returns:
             List of NLPResult objects
         """
-        return [self.analyze(text, **kwargs) for text in texts]
+        import time
+
+        extract_entities = kwargs.pop("extract_entities", True)
+
+        start_time = time.time()
+        entities = [[] for _ in texts]
+        if extract_entities and texts:
+            try:
+                entities = self.ner.extract_entities_batch(texts)
+            except Exception as e:
+                logger.error(f"Entity extraction failed: {e}")
+        ner_time_ms = (time.time() - start_time) * 1000 / max(1, len(texts))
+
+        results = []
+        for text, text_entities in zip(texts, entities):
+            result = self.analyze(text, extract_entities=False, **kwargs)
+            result.entities = text_entities
+            result.processing_time_ms += ner_time_ms
+            results.append(result)
+
+        return results
 
     def _generate_summary(self, text: str, max_length: int = 150) -> Optional[str]:
         """
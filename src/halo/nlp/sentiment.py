@@ -11,12 +11,14 @@ Used for risk scoring in financial crime and threat detection.
 """
 
 import logging
+import math
 import re
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
 from halo.config import settings
+from halo.nlp.lexicon import Lexicon, LexiconMatch
 
 logger = logging.getLogger(__name__)
 
@@ -147,46 +149,107 @@ class SentimentAnalyzer:
         "ditt hus",
     }
 
-    def __init__(self, model_path: Optional[Path] = None):
+    # Polarity word lists (Swedish)
+    POSITIVE_WORDS = {
+        "bra",
+        "fantastisk",
+        "utmärkt",
+        "glad",
+        "lycklig",
+        "underbar",
+        "perfekt",
+        "fin",
+        "trevlig",
+        "positiv",
+        "succé",
+        "framgång",
+        "vänlig",
+        "vacker",
+        "rolig",
+    }
+
+    NEGATIVE_WORDS = {
+        "dålig",
+        "hemsk",
+        "fruktansvärd",
+        "ledsen",
+        "olycklig",
+        "besviken",
+        "fel",
+        "misslyckad",
+        "ful",
+        "elak",
+        "dum",
+        "svår",
+        "jobbig",
+        "problematisk",
+        "katastrof",
+    }
+
+    # Lexicon categories scored by analyze()
+    CATEGORIES = {
+        "fear": FEAR_KEYWORDS,
+        "violence": VIOLENCE_KEYWORDS,
+        "urgency": URGENCY_KEYWORDS,
+        "threat": THREAT_KEYWORDS,
+        "positive": POSITIVE_WORDS,
+        "negative": NEGATIVE_WORDS,
+    }
+
+    def __init__(self, model_path: Optional[Path] = None, lexicon: Optional[Lexicon] = None):
         """
         Initialize the sentiment analyzer.
 
         Args:
             model_path: Path to sentiment model (optional)
+            lexicon: Lexicon to register the keyword categories in, so
+                they can be matched in the same scan as other components'
+                categories (a private lexicon is created if not given)
         """
         self.model_path = model_path
         self._model = None
         self._model_loaded = False
 
-    def analyze(self, text: str) -> SentimentResult:
+        # Keywords are word stems, matched inside words
+        self.lexicon = lexicon or Lexicon()
+        for name, keywords in self.CATEGORIES.items():
+            self.lexicon.add_category(f"sentiment:{name}", keywords, substring=True)
+
+    def analyze(self, text: str, scan: Optional[list[LexiconMatch]] = None) -> SentimentResult:
         """
         Analyze sentiment and risk indicators in text.
 
         Args:
             text: Input text
+            scan: Result of lexicon.scan(text), if already computed
 
         Returns:
             SentimentResult with scores and detected keywords
         """
-        text_lower = text.lower()
-        detected_keywords = []
+        if scan is None:
+            scan = self.lexicon.scan(text)
+
+        # Distinct keywords per category, in order of first occurrence
+        found: dict[str, dict[str, None]] = {name: {} for name in self.CATEGORIES}
+        for match in scan:
+            namespace, _, name = match.category.partition(":")
+            if namespace == "sentiment" and name in found:
+                found[name][match.keyword] = None
 
         # Calculate keyword-based scores
-        fear_score = self._calculate_keyword_score(
-            text_lower, self.FEAR_KEYWORDS, detected_keywords
-        )
-        violence_score = self._calculate_keyword_score(
-            text_lower, self.VIOLENCE_KEYWORDS, detected_keywords
-        )
-        urgency_score = self._calculate_keyword_score(
-            text_lower, self.URGENCY_KEYWORDS, detected_keywords
-        )
-        threat_score = self._calculate_keyword_score(
-            text_lower, self.THREAT_KEYWORDS, detected_keywords
-        )
+        fear_score = self._calculate_keyword_score(found["fear"], self.FEAR_KEYWORDS)
+        violence_score = self._calculate_keyword_score(found["violence"], self.VIOLENCE_KEYWORDS)
+        urgency_score = self._calculate_keyword_score(found["urgency"], self.URGENCY_KEYWORDS)
+        threat_score = self._calculate_keyword_score(found["threat"], self.THREAT_KEYWORDS)
+
+        detected_keywords = [
+            keyword
+            for name in ("fear", "violence", "urgency", "threat")
+            for keyword in found[name]
+        ]
 
         # Calculate overall polarity (simplified)
-        polarity = self._calculate_polarity(text_lower)
+        polarity = self._calculate_polarity(len(found["positive"]), len(found["negative"]))
 
         # Calculate aggregate risk score
         risk_score = self._calculate_risk_score(
@@ -203,31 +266,32 @@ class SentimentAnalyzer:
             detected_keywords=detected_keywords,
         )
 
-    def _calculate_keyword_score(
-        self,
-        text: str,
-        keywords: set,
-        detected: list,
-    ) -> float:
+    def analyze_batch(self, texts: list[str]) -> list[SentimentResult]:
         """
-        Calculate score based on keyword presence.
+        Analyze many texts, sharing lexicon token lookups across them.
 
         Args:
-            text: Lowercase text
-            keywords: Set of keywords to check
-            detected: List to append found keywords to
+            texts: Input texts
 
         Returns:
-            Score from 0 to 1
+            SentimentResult per text
         """
-        found = []
+        return [
+            self.analyze(text, scan)
+            for text, scan in zip(texts, self.lexicon.scan_batch(texts))
+        ]
 
-        for keyword in keywords:
-            if keyword in text:
-                found.append(keyword)
+    def _calculate_keyword_score(self, found, keywords: set) -> float:
+        """
+        Calculate score based on keyword presence.
 
-        detected.extend(found)
+        Args:
+            found: Distinct keywords found in the text
+            keywords: Set of keywords in the category
 
+        Returns:
+            Score from 0 to 1
+        """
         if not found:
             return 0.0
 
@@ -237,58 +301,21 @@ class SentimentAnalyzer:
         max_count = len(keywords)
 
         # Use logarithmic scaling
-        import math
-
         return min(1.0, math.log(count + 1) / math.log(max_count + 1) * 2)
 
-    def _calculate_polarity(self, text: str) -> float:
+    def _calculate_polarity(self, pos_count: int, neg_count: int) -> float:
         """
         Calculate overall sentiment polarity.
 
-        Simplified approach using positive/negative word lists.
+        Simplified approach using positive/negative word counts.
+
+        Args:
+            pos_count: Distinct positive words found
+            neg_count: Distinct negative words found
 
         Returns:
             Polarity from -1 (negative) to 1 (positive)
         """
-        positive_words = {
-            "bra",
-            "fantastisk",
-            "utmärkt",
-            "glad",
-            "lycklig",
-            "underbar",
-            "perfekt",
-            "fin",
-            "trevlig",
-            "positiv",
-            "succé",
-            "framgång",
-            "vänlig",
-            "vacker",
-            "rolig",
-        }
-
-        negative_words = {
-            "dålig",
-            "hemsk",
-            "fruktansvärd",
-            "ledsen",
-            "olycklig",
-            "besviken",
-            "fel",
-            "misslyckad",
-            "ful",
-            "elak",
-            "dum",
-            "svår",
-            "jobbig",
-            "problematisk",
-            "katastrof",
-        }
-
-        pos_count = sum(1 for word in positive_words if word in text)
-        neg_count = sum(1 for word in negative_words if word in text)
-
         total = pos_count + neg_count
         if total == 0:
             return 0.0
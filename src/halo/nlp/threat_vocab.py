@@ -13,7 +13,7 @@ import logging
 from dataclasses import dataclass
 from typing import Optional
 
-from flashtext import KeywordProcessor
+from halo.nlp.lexicon import Lexicon, LexiconMatch
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +34,7 @@ class ThreatVocabularyDetector:
     """
     Detects criminal and threat vocabulary in Swedish text.
 
-    Uses FlashText for efficient multi-keyword matching.
+    Uses a compiled Lexicon, which matches every category in one pass.
     Includes:
     - Standard Swedish criminal vocabulary
     - Gang slang
@@ -42,9 +42,17 @@ class ThreatVocabularyDetector:
     - Financial crime indicators
     """
 
-    def __init__(self):
-        """Initialize the vocabulary detector with keyword databases."""
-        self._processors: dict[str, KeywordProcessor] = {}
+    def __init__(self, lexicon: Optional[Lexicon] = None):
+        """
+        Initialize the vocabulary detector with keyword databases.
+
+        Args:
+            lexicon: Lexicon to register the vocabularies in, so they can
+                be matched in the same scan as other components' categories
+                (a private lexicon is created if not given)
+        """
+        self.lexicon = lexicon or Lexicon()
+        self._categories: list[str] = []
         self._severities: dict[str, str] = {}
         self._load_vocabularies()
 
@@ -210,19 +218,19 @@ class ThreatVocabularyDetector:
             keywords: Dict of keyword -> severity
             severity_default: Default severity if not specified
         """
-        processor = KeywordProcessor(case_sensitive=False)
-
         for keyword, severity in keywords.items():
-            processor.add_keyword(keyword)
             self._severities[f"{category}:{keyword}"] = severity
 
-        self._processors[category] = processor
+        self.lexicon.add_category(f"vocab:{category}", keywords)
+        if category not in self._categories:
+            self._categories.append(category)
 
     def detect(
         self,
         text: str,
         categories: Optional[list[str]] = None,
         min_severity: str = "low",
+        scan: Optional[list[LexiconMatch]] = None,
     ) -> list[VocabMatch]:
         """
         Detect vocabulary matches in text.
@@ -231,6 +239,7 @@ class ThreatVocabularyDetector:
             text: Input text
             categories: Categories to check (None = all)
             min_severity: Minimum severity to return
+            scan: Result of lexicon.scan(text), if already computed
 
         Returns:
             List of VocabMatch objects
@@ -238,39 +247,35 @@ class ThreatVocabularyDetector:
         severity_order = {"low": 0, "medium": 1, "high": 2}
         min_sev = severity_order.get(min_severity, 0)
 
+        if scan is None:
+            scan = self.lexicon.scan(text)
+        wanted = set(categories or self._categories)
+
         matches = []
-        categories = categories or list(self._processors.keys())
+        for match in scan:
+            namespace, _, category = match.category.partition(":")
+            if namespace != "vocab" or category not in wanted:
+                continue
 
-        for category in categories:
-            processor = self._processors.get(category)
-            if not processor:
+            severity = self._severities.get(f"{category}:{match.keyword}", "medium")
+            if severity_order.get(severity, 0) < min_sev:
                 continue
 
-            # FlashText returns (keyword, start, end) tuples
-            keywords_found = processor.extract_keywords(text, span_info=True)
-
-            for keyword, start, end in keywords_found:
-                severity_key = f"{category}:{keyword.lower()}"
-                severity = self._severities.get(severity_key, "medium")
-
-                if severity_order.get(severity, 0) < min_sev:
-                    continue
-
-                # Get context (50 chars before and after)
-                context_start = max(0, start - 50)
-                context_end = min(len(text), end + 50)
-                context = text[context_start:context_end]
-
-                matches.append(
-                    VocabMatch(
-                        keyword=keyword,
-                        category=category,
-                        start=start,
-                        end=end,
-                        context=context,
-                        severity=severity,
-                    )
+            # Get context (50 chars before and after)
+            context_start = max(0, match.start - 50)
+            context_end = min(len(text), match.end + 50)
+            context = text[context_start:context_end]
+
+            matches.append(
+                VocabMatch(
+                    keyword=match.keyword,
+                    category=category,
+                    start=match.start,
+                    end=match.end,
+                    context=context,
+                    severity=severity,
                 )
+            )
 
         # Sort by severity (high first) then position
         matches.sort(
@@ -279,6 +284,28 @@ class ThreatVocabularyDetector:
 
         return matches
 
+    def detect_batch(
+        self,
+        texts: list[str],
+        categories: Optional[list[str]] = None,
+        min_severity: str = "low",
+    ) -> list[list[VocabMatch]]:
+        """
+        Detect vocabulary matches in many texts.
+
+        Args:
+            texts: Input texts
+            categories: Categories to check (None = all)
+            min_severity: Minimum severity to return
+
+        Returns:
+            List of VocabMatch objects per text
+        """
+        return [
+            self.detect(text, categories, min_severity, scan)
+            for text, scan in zip(texts, self.lexicon.scan_batch(texts))
+        ]
+
     def get_risk_score(self, text: str) -> float:
         """
         Calculate overall risk score based on vocabulary.
@@ -305,4 +332,4 @@ class ThreatVocabularyDetector:
 
     def get_categories(self) -> list[str]:
         """Get list of available vocabulary categories."""
-        return list(self._processors.keys())
+        return list(self._categories)
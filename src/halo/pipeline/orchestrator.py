@@ -25,6 +25,8 @@ Usage:
 import asyncio
 import json
 import logging
+import os
+import socket
 import sqlite3
 import sys
 from dataclasses import dataclass, field, asdict
@@ -75,6 +77,7 @@ class PipelineJob:
     updated_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     error: Optional[str] = None
     retry_count: int = 0
+    lease_owner: Optional[str] = None  # Worker holding the job's lease, set by claim_jobs
 
 
 @dataclass
@@ -89,16 +92,42 @@ class PipelineStats:
     completed_at: Optional[str] = None
 
 
+STAGE_ORDER = [
+    PipelineStage.SCB,
+    PipelineStage.BOLAGSVERKET,
+    PipelineStage.ALLABOLAG,
+    PipelineStage.GRAPH,
+]
+
+
 class PipelineDatabase:
-    """SQLite database for pipeline state management."""
+    """
+    SQLite database for pipeline state management.
 
-    def __init__(self, db_path: Path):
+    Uses one persistent WAL-mode connection so readers never block the
+    writer, batches writes with executemany, and hands out jobs through
+    time-limited leases so several orchestrator workers can share a queue.
+    """
+
+    # Default lease length for claimed jobs
+    LEASE_SECONDS = 600
+
+    def __init__(self, db_path: Path, lease_seconds: int = LEASE_SECONDS):
         self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self._conn = sqlite3.connect(db_path, timeout=30.0)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
         self._init_db()
 
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
     def _init_db(self):
         """Initialize database schema."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn
         conn.executescript("""
             CREATE TABLE IF NOT EXISTS pipeline_jobs (
                 orgnr TEXT PRIMARY KEY,
@@ -125,37 +154,49 @@ class PipelineDatabase:
                 status TEXT DEFAULT 'running'
             );
         """)
-        # Add directors_data column if it doesn't exist (migration)
-        try:
-            conn.execute("ALTER TABLE pipeline_jobs ADD COLUMN directors_data TEXT")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
+        # Add columns if they don't exist (migration)
+        for column in ("directors_data TEXT", "lease_owner TEXT", "lease_expires TEXT"):
+            try:
+                conn.execute(f"ALTER TABLE pipeline_jobs ADD COLUMN {column}")
+            except sqlite3.OperationalError:
+                pass  # Column already exists
         conn.commit()
-        conn.close()
 
-    def add_orgnrs(self, orgnrs: list[str], stage: PipelineStage = PipelineStage.SCB):
-        """Add new org numbers to the pipeline."""
-        conn = sqlite3.connect(self.db_path)
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> PipelineJob:
+        return PipelineJob(
+            orgnr=row['orgnr'],
+            current_stage=PipelineStage(row['current_stage']),
+            status=JobStatus(row['status']),
+            scb_data=json.loads(row['scb_data']) if row['scb_data'] else None,
+            bolagsverket_data=json.loads(row['bolagsverket_data']) if row['bolagsverket_data'] else None,
+            directors_data=json.loads(row['directors_data']) if row['directors_data'] else None,
+            allabolag_data=json.loads(row['allabolag_data']) if row['allabolag_data'] else None,
+            created_at=row['created_at'],
+            updated_at=row['updated_at'],
+            error=row['error'],
+            retry_count=row['retry_count'],
+            lease_owner=row['lease_owner'],
+        )
+
+    def add_orgnrs(self, orgnrs: list[str], stage: PipelineStage = PipelineStage.SCB) -> int:
+        """Add new org numbers to the pipeline. Returns the number inserted."""
         now = datetime.now(timezone.utc).isoformat()
 
-        added = 0
+        rows = []
         for orgnr in orgnrs:
             orgnr = orgnr.replace("-", "").strip()
-            if len(orgnr) != 10:
-                continue
-            try:
-                conn.execute("""
-                    INSERT OR IGNORE INTO pipeline_jobs
-                    (orgnr, current_stage, status, created_at, updated_at)
-                    VALUES (?, ?, 'pending', ?, ?)
-                """, (orgnr, stage.value, now, now))
-                added += 1
-            except sqlite3.IntegrityError:
-                pass
-
-        conn.commit()
-        conn.close()
-        return added
+            if len(orgnr) == 10:
+                rows.append((orgnr, stage.value, now, now))
+
+        with self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany("""
+                INSERT OR IGNORE INTO pipeline_jobs
+                (orgnr, current_stage, status, created_at, updated_at)
+                VALUES (?, ?, 'pending', ?, ?)
+            """, rows)
+            return self._conn.total_changes - before
 
     def get_jobs_for_stage(
         self,
@@ -163,108 +204,179 @@ class PipelineDatabase:
         status: JobStatus = JobStatus.PENDING,
         limit: int = 100
     ) -> list[PipelineJob]:
-        """Get jobs ready for a specific stage."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-
-        rows = conn.execute("""
+        """Get jobs ready for a specific stage (without leasing them)."""
+        rows = self._conn.execute("""
             SELECT * FROM pipeline_jobs
             WHERE current_stage = ? AND status = ?
             ORDER BY created_at ASC
             LIMIT ?
         """, (stage.value, status.value, limit)).fetchall()
 
-        conn.close()
+        return [self._row_to_job(row) for row in rows]
 
-        jobs = []
-        for row in rows:
-            jobs.append(PipelineJob(
-                orgnr=row['orgnr'],
-                current_stage=PipelineStage(row['current_stage']),
-                status=JobStatus(row['status']),
-                scb_data=json.loads(row['scb_data']) if row['scb_data'] else None,
-                bolagsverket_data=json.loads(row['bolagsverket_data']) if row['bolagsverket_data'] else None,
-                directors_data=json.loads(row['directors_data']) if row['directors_data'] else None,
-                allabolag_data=json.loads(row['allabolag_data']) if row['allabolag_data'] else None,
-                created_at=row['created_at'],
-                updated_at=row['updated_at'],
-                error=row['error'],
-                retry_count=row['retry_count'],
-            ))
+    def claim_jobs(
+        self,
+        stage: PipelineStage,
+        worker_id: str,
+        limit: int = 100,
+        lease_seconds: Optional[int] = None,
+    ) -> list[PipelineJob]:
+        """
+        Lease pending jobs for a stage to one worker.
 
+        Claimed jobs move to in_progress with a lease expiry. Jobs whose
+        lease has expired (crashed worker) are claimable again. The select
+        and update run under BEGIN IMMEDIATE, so concurrent workers never
+        receive the same job.
+        """
+        now = datetime.now(timezone.utc)
+        expires = datetime.fromtimestamp(
+            now.timestamp() + (lease_seconds or self.lease_seconds), timezone.utc
+        ).isoformat()
+        now_iso = now.isoformat()
+
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute("""
+                SELECT * FROM pipeline_jobs
+                WHERE current_stage = ?
+                  AND (status = 'pending'
+                       OR (status = 'in_progress' AND lease_expires IS NOT NULL
+                           AND lease_expires < ?))
+                ORDER BY created_at ASC
+                LIMIT ?
+            """, (stage.value, now_iso, limit)).fetchall()
+
+            conn.executemany("""
+                UPDATE pipeline_jobs
+                SET status = 'in_progress', lease_owner = ?, lease_expires = ?, updated_at = ?
+                WHERE orgnr = ?
+            """, [(worker_id, expires, now_iso, row['orgnr']) for row in rows])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        jobs = [self._row_to_job(row) for row in rows]
+        for job in jobs:
+            job.status = JobStatus.IN_PROGRESS
+            job.updated_at = now_iso
+            job.lease_owner = worker_id
         return jobs
 
-    def update_job(self, job: PipelineJob):
-        """Update a job's status and data."""
-        conn = sqlite3.connect(self.db_path)
-        job.updated_at = datetime.now(timezone.utc).isoformat()
-
-        conn.execute("""
-            UPDATE pipeline_jobs SET
-                current_stage = ?,
-                status = ?,
-                scb_data = ?,
-                bolagsverket_data = ?,
-                directors_data = ?,
-                allabolag_data = ?,
-                updated_at = ?,
-                error = ?,
-                retry_count = ?
-            WHERE orgnr = ?
-        """, (
-            job.current_stage.value,
-            job.status.value,
-            json.dumps(job.scb_data) if job.scb_data else None,
-            json.dumps(job.bolagsverket_data) if job.bolagsverket_data else None,
-            json.dumps(job.directors_data) if job.directors_data else None,
-            json.dumps(job.allabolag_data) if job.allabolag_data else None,
-            job.updated_at,
-            job.error,
-            job.retry_count,
-            job.orgnr,
-        ))
+    def update_jobs(self, jobs: list[PipelineJob]) -> list[PipelineJob]:
+        """
+        Update several jobs' status and data in one transaction.
 
-        conn.commit()
-        conn.close()
+        A job is only written while the row is still leased to the job's
+        lease_owner (or unleased, for jobs that were never claimed). If its
+        lease expired and another worker reclaimed it, the write is skipped
+        so the two workers cannot overwrite each other's results.
 
-    def advance_job(self, job: PipelineJob):
-        """Advance a job to the next pipeline stage."""
-        stage_order = [
-            PipelineStage.SCB,
-            PipelineStage.BOLAGSVERKET,
-            PipelineStage.ALLABOLAG,
-            PipelineStage.GRAPH,
-        ]
+        Returns:
+            Jobs whose lease was lost; their changes were not written
+        """
+        if not jobs:
+            return []
+
+        now = datetime.now(timezone.utc).isoformat()
+        rows = []
+        for job in jobs:
+            job.updated_at = now
+            rows.append((
+                job.current_stage.value,
+                job.status.value,
+                json.dumps(job.scb_data) if job.scb_data else None,
+                json.dumps(job.bolagsverket_data) if job.bolagsverket_data else None,
+                json.dumps(job.directors_data) if job.directors_data else None,
+                json.dumps(job.allabolag_data) if job.allabolag_data else None,
+                job.updated_at,
+                job.error,
+                job.retry_count,
+                job.status.value,
+                job.status.value,
+                job.orgnr,
+                job.lease_owner,
+            ))
+
+        lost = []
+        with self._conn:
+            # Leases are released as soon as a job leaves in_progress
+            for job, row in zip(jobs, rows):
+                cursor = self._conn.execute("""
+                    UPDATE pipeline_jobs SET
+                        current_stage = ?,
+                        status = ?,
+                        scb_data = ?,
+                        bolagsverket_data = ?,
+                        directors_data = ?,
+                        allabolag_data = ?,
+                        updated_at = ?,
+                        error = ?,
+                        retry_count = ?,
+                        lease_owner = CASE WHEN ? = 'in_progress' THEN lease_owner END,
+                        lease_expires = CASE WHEN ? = 'in_progress' THEN lease_expires END
+                    WHERE orgnr = ? AND lease_owner IS ?
+                    """, row)
+                if cursor.rowcount == 0:
+                    lost.append(job)
+                elif job.status != JobStatus.IN_PROGRESS:
+                    job.lease_owner = None
+
+        if lost:
+            logger.warning(
+                f"Lost the lease on {len(lost)} jobs, results not written: "
+                f"{', '.join(job.orgnr for job in lost[:10])}"
+            )
+        return lost
+
+    def update_job(self, job: PipelineJob) -> bool:
+        """Update a job's status and data. Returns False if its lease was lost."""
+        return not self.update_jobs([job])
 
-        current_idx = stage_order.index(job.current_stage)
-        if current_idx < len(stage_order) - 1:
-            job.current_stage = stage_order[current_idx + 1]
+    @staticmethod
+    def _advance(job: PipelineJob):
+        current_idx = STAGE_ORDER.index(job.current_stage)
+        if current_idx < len(STAGE_ORDER) - 1:
+            job.current_stage = STAGE_ORDER[current_idx + 1]
             job.status = JobStatus.PENDING
         else:
             job.status = JobStatus.COMPLETED
 
-        self.update_job(job)
+    def advance_jobs(self, jobs: list[PipelineJob]) -> list[PipelineJob]:
+        """
+        Advance several jobs to their next pipeline stage in one transaction.
 
-    def get_stats(self) -> dict:
-        """Get pipeline statistics."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        Returns:
+            Jobs whose lease was lost (see update_jobs); they were not advanced
+        """
+        for job in jobs:
+            self._advance(job)
+        return self.update_jobs(jobs)
 
-        stats = {}
-        for stage in PipelineStage:
-            for status in JobStatus:
-                count = conn.execute("""
-                    SELECT COUNT(*) as cnt FROM pipeline_jobs
-                    WHERE current_stage = ? AND status = ?
-                """, (stage.value, status.value)).fetchone()['cnt']
+    def advance_job(self, job: PipelineJob) -> bool:
+        """Advance a job to the next pipeline stage. Returns False if its lease was lost."""
+        return not self.advance_jobs([job])
 
-                key = f"{stage.value}_{status.value}"
-                stats[key] = count
+    def get_stats(self) -> dict:
+        """Get pipeline statistics."""
+        stats = {
+            f"{stage.value}_{status.value}": 0
+            for stage in PipelineStage
+            for status in JobStatus
+        }
+
+        rows = self._conn.execute("""
+            SELECT current_stage, status, COUNT(*) as cnt
+            FROM pipeline_jobs
+            GROUP BY current_stage, status
+        """).fetchall()
 
-        total = conn.execute("SELECT COUNT(*) as cnt FROM pipeline_jobs").fetchone()['cnt']
-        stats['total_jobs'] = total
+        for row in rows:
+            stats[f"{row['current_stage']}_{row['status']}"] = row['cnt']
 
-        conn.close()
+        stats['total_jobs'] = sum(row['cnt'] for row in rows)
         return stats
 
 
@@ -279,9 +391,17 @@ class PipelineOrchestrator:
     4. Graph: Update the intelligence graph and run pattern detection
     """
 
+    # Concurrent Bolagsverket workers; throughput is bounded by the token bucket
+    BOLAGSVERKET_CONCURRENCY = 8
+    # Finished jobs are written to the next stage in batches of this size
+    STAGE_FLUSH_SIZE = 25
+    # Per-worker cool-down after an HTTP 429
+    RATE_LIMIT_BACKOFF = 30
+
     def __init__(self, data_dir: Path = None):
         self.data_dir = data_dir or Path(__file__).parent.parent.parent / "data"
         self.db = PipelineDatabase(self.data_dir / "pipeline.db")
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
 
         # Lazy-loaded adapters
         self._scb_adapter = None
@@ -449,16 +569,18 @@ class PipelineOrchestrator:
         logger.info(f"  Added {added} org numbers from files")
         return added
 
-    async def run_bolagsverket_enrichment(self, limit: int = 100):
+    async def run_bolagsverket_enrichment(self, limit: int = 100, concurrency: Optional[int] = None):
         """
         Stage 2: Enrich org numbers with Bolagsverket HVD data.
 
         Fetches official company registration data AND extracts directors
-        from annual reports (XBRL/PDF).
+        from annual reports (XBRL/PDF). Jobs are processed by a bounded pool
+        of workers; request pacing comes from the shared Bolagsverket token
+        bucket rather than fixed sleeps.
         """
         logger.info("[Stage 2] Bolagsverket Enrichment")
 
-        jobs = self.db.get_jobs_for_stage(PipelineStage.BOLAGSVERKET, limit=limit)
+        jobs = self.db.claim_jobs(PipelineStage.BOLAGSVERKET, self.worker_id, limit=limit)
         if not jobs:
             logger.info("  No jobs pending for Bolagsverket stage")
             return
@@ -475,100 +597,36 @@ class PipelineOrchestrator:
                 # Move jobs to next stage without enrichment
                 for job in jobs:
                     job.status = JobStatus.SKIPPED
-                    self.db.advance_job(job)
+                self.db.advance_jobs(jobs)
                 return
 
             adapter = BolagsverketHVDAdapter()
 
-            # Also initialize extraction pipeline for directors
+            # Also initialize extraction pipeline for directors. It shares the
+            # adapter's token bucket so both clients stay inside one API quota.
             extraction_pipeline = None
             try:
                 from halo.extraction.pipeline import ExtractionPipeline, PipelineConfig
+                from halo.ingestion.bolagsverket_hvd import BOLAGSVERKET_RATE_LIMITER
                 extraction_config = PipelineConfig(
                     bv_client_id=settings.bolagsverket_client_id,
                     bv_client_secret=settings.bolagsverket_client_secret,
-                    rate_limit_delay=1.0,
                 )
-                extraction_pipeline = ExtractionPipeline(extraction_config)
+                extraction_pipeline = ExtractionPipeline(
+                    extraction_config, rate_limiter=BOLAGSVERKET_RATE_LIMITER
+                )
             except ImportError as e:
                 logger.warning(f"  Extraction pipeline not available: {e}")
 
             try:
-                enriched = 0
-                directors_extracted = 0
-
                 # Start extraction pipeline context if available
                 if extraction_pipeline:
                     await extraction_pipeline.__aenter__()
 
-                for job in jobs:
-                    try:
-                        job.status = JobStatus.IN_PROGRESS
-                        self.db.update_job(job)
-
-                        # Step 1: Fetch basic company data
-                        record = await adapter.fetch_company(job.orgnr)
-
-                        if record:
-                            job.bolagsverket_data = record.raw_data
-                            enriched += 1
-
-                        # Step 2: Extract directors from annual reports
-                        if extraction_pipeline:
-                            try:
-                                results = await extraction_pipeline.process_company(
-                                    job.orgnr, max_documents=1
-                                )
-                                if results and results[0].directors:
-                                    # Store extracted directors
-                                    job.directors_data = [
-                                        {
-                                            "first_name": d.first_name,
-                                            "last_name": d.last_name,
-                                            "role": d.role,
-                                            "role_normalized": d.role_normalized,
-                                            "confidence": d.confidence,
-                                        }
-                                        for d in results[0].directors
-                                    ]
-                                    directors_extracted += 1
-                                    logger.debug(f"  Extracted {len(results[0].directors)} directors for {job.orgnr}")
-                            except Exception as e:
-                                logger.debug(f"  Director extraction failed for {job.orgnr}: {e}")
-
-                        job.status = JobStatus.COMPLETED
-                        self.db.advance_job(job)
-
-                        # Rate limiting - Bolagsverket enforces strict limits
-                        await asyncio.sleep(1.5)
-
-                    except httpx.HTTPStatusError as e:
-                        if e.response.status_code == 429:
-                            # Rate limited - wait longer and retry
-                            logger.warning(f"  Rate limited, waiting 30s...")
-                            await asyncio.sleep(30)
-                            job.status = JobStatus.PENDING  # Retry later
-                            self.db.update_job(job)
-                        else:
-                            logger.error(f"  Failed to enrich {job.orgnr}: {e}")
-                            job.error = str(e)
-                            job.retry_count += 1
-                            if job.retry_count >= 3:
-                                job.status = JobStatus.FAILED
-                            else:
-                                job.status = JobStatus.PENDING
-                            self.db.update_job(job)
-                            self.stats.errors += 1
-                    except Exception as e:
-                        logger.error(f"  Failed to enrich {job.orgnr}: {e}")
-                        job.error = str(e)
-                        job.retry_count += 1
-                        if job.retry_count >= 3:
-                            job.status = JobStatus.FAILED
-                        else:
-                            job.status = JobStatus.PENDING
-                        self.db.update_job(job)
-                        self.stats.errors += 1
+                enriched, directors_extracted = await self._run_bolagsverket_workers(
+                    jobs, adapter, extraction_pipeline,
+                    concurrency=concurrency or self.BOLAGSVERKET_CONCURRENCY,
+                )
 
                 self.stats.bolagsverket_enriched = enriched
                 logger.info(f"  Enriched {enriched} org numbers")
@@ -583,11 +641,122 @@ class PipelineOrchestrator:
             logger.warning("Bolagsverket adapter not available, skipping stage")
             for job in jobs:
                 job.status = JobStatus.SKIPPED
-                self.db.advance_job(job)
+            self.db.advance_jobs(jobs)
         except Exception as e:
             logger.error(f"Bolagsverket enrichment failed: {e}")
             self.stats.errors += 1
 
+    async def _run_bolagsverket_workers(
+        self,
+        jobs: list[PipelineJob],
+        adapter,
+        extraction_pipeline,
+        concurrency: int,
+    ) -> tuple[int, int]:
+        """
+        Enrich jobs with a pool of concurrent workers.
+
+        Each worker fetches a company and then extracts its directors, so
+        document downloads and extraction overlap with other workers' fetches.
+        Finished jobs are flushed to the next stage in small batches as they
+        complete instead of after the whole batch.
+
+        Returns:
+            (enriched, directors_extracted) counts
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+
+        advanced: list[PipelineJob] = []
+        updated: list[PipelineJob] = []
+        counts = {"enriched": 0, "directors": 0}
+
+        def flush(force: bool = False):
+            if advanced and (force or len(advanced) >= self.STAGE_FLUSH_SIZE):
+                self.db.advance_jobs(advanced)
+                advanced.clear()
+            if updated and (force or len(updated) >= self.STAGE_FLUSH_SIZE):
+                self.db.update_jobs(updated)
+                updated.clear()
+
+        def record_failure(job: PipelineJob, error: Exception):
+            logger.error(f"  Failed to enrich {job.orgnr}: {error}")
+            job.error = str(error)
+            job.retry_count += 1
+            if job.retry_count >= 3:
+                job.status = JobStatus.FAILED
+            else:
+                job.status = JobStatus.PENDING
+            updated.append(job)
+            self.stats.errors += 1
+
+        async def worker():
+            while True:
+                try:
+                    job = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                try:
+                    # Step 1: Fetch basic company data
+                    record = await adapter.fetch_company(job.orgnr)
+
+                    if record:
+                        job.bolagsverket_data = record.raw_data
+                        counts["enriched"] += 1
+
+                    # Step 2: Extract directors from annual reports
+                    if extraction_pipeline:
+                        try:
+                            results = await extraction_pipeline.process_company(
+                                job.orgnr, max_documents=1
+                            )
+                            if results and results[0].directors:
+                                # Store extracted directors
+                                job.directors_data = [
+                                    {
+                                        "first_name": d.first_name,
+                                        "last_name": d.last_name,
+                                        "role": d.role,
+                                        "role_normalized": d.role_normalized,
+                                        "confidence": d.confidence,
+                                    }
+                                    for d in results[0].directors
+                                ]
+                                counts["directors"] += 1
+                                logger.debug(f"  Extracted {len(results[0].directors)} directors for {job.orgnr}")
+                        except Exception as e:
+                            logger.debug(f"  Director extraction failed for {job.orgnr}: {e}")
+
+                    job.status = JobStatus.COMPLETED
+                    advanced.append(job)
+
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code == 429:
+                        # Server-side throttling despite the token bucket; put the
+                        # job back and let this worker cool down.
+                        logger.warning(f"  Rate limited, waiting {self.RATE_LIMIT_BACKOFF}s...")
+                        job.status = JobStatus.PENDING  # Retry later
+                        updated.append(job)
+                        await asyncio.sleep(self.RATE_LIMIT_BACKOFF)
+                    else:
+                        record_failure(job, e)
+                except Exception as e:
+                    record_failure(job, e)
+
+                flush()
+
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, min(concurrency, len(jobs))))]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            flush(force=True)
+
+        return counts["enriched"], counts["directors"]
+
     async def run_allabolag_scraping(self, limit: int = 50):
         """
         Stage 3: Scrape allabolag.se for detailed company data.
@@ -621,7 +790,7 @@ class PipelineOrchestrator:
             # Mark jobs as in progress (they'll be completed when scraper runs)
             for job in jobs:
                 job.status = JobStatus.IN_PROGRESS
-                self.db.update_job(job)
+            self.db.update_jobs(jobs)
 
             # Check if any have already been scraped
             scraped = self._check_allabolag_results(jobs)
@@ -643,7 +812,7 @@ class PipelineOrchestrator:
         conn = sqlite3.connect(allabolag_db)
         conn.row_factory = sqlite3.Row
 
-        scraped = 0
+        scraped = []
         for job in jobs:
             row = conn.execute(
                 "SELECT * FROM companies WHERE orgnr = ?",
@@ -653,11 +822,11 @@ class PipelineOrchestrator:
             if row:
                 job.allabolag_data = dict(row)
                 job.status = JobStatus.COMPLETED
-                self.db.advance_job(job)
-                scraped += 1
+                scraped.append(job)
 
         conn.close()
-        return scraped
+        self.db.advance_jobs(scraped)
+        return len(scraped)
 
     async def run_graph_update(self):
         """
@@ -668,7 +837,7 @@ class PipelineOrchestrator:
         """
         logger.info("[Stage 3] Graph Update")
 
-        jobs = self.db.get_jobs_for_stage(PipelineStage.GRAPH, limit=1000)
+        jobs = self.db.claim_jobs(PipelineStage.GRAPH, self.worker_id, limit=1000)
         if not jobs:
             logger.info("  No jobs pending for Graph stage")
             return
@@ -676,134 +845,139 @@ class PipelineOrchestrator:
         logger.info(f"  Processing {len(jobs)} org numbers")
 
         try:
-            import pickle
-            import networkx as nx
-            from pathlib import Path
+            from halo.graph.snapshot_store import GraphDelta
 
-            GRAPH_PATH = self.data_dir / "company_graph.pickle"
+            store = self._open_graph_store()
+            # The base snapshot is only needed while the delta is built
+            with store.open_reader() as base:
+                logger.info(f"  Graph store version {base.version}: {base.number_of_nodes()} nodes")
 
-            # Load existing graph or create new
-            if GRAPH_PATH.exists():
-                with open(GRAPH_PATH, "rb") as f:
-                    graph = pickle.load(f)
-                logger.info(f"  Loaded existing graph: {graph.number_of_nodes()} nodes")
-            else:
-                graph = nx.MultiDiGraph()
+                # Collect this batch as a delta; only the delta is written
+                graph = GraphDelta(base)
 
-            # Add companies from Bolagsverket data
-            updated = 0
-            for job in jobs:
-                try:
-                    # Create company node from Bolagsverket data
-                    company_id = f"company-{job.orgnr}"
-
-                    if job.bolagsverket_data:
-                        bv = job.bolagsverket_data
-
-                        # Extract company name from organisationsnamn structure
-                        company_name = ""
-                        org_namn = bv.get("organisationsnamn", {})
-                        if org_namn:
-                            namn_lista = org_namn.get("organisationsnamnLista", [])
-                            if namn_lista:
-                                # Get primary name (FORETAGSNAMN type preferred)
-                                for namn_entry in namn_lista:
-                                    namn_type = namn_entry.get("organisationsnamntyp", {}).get("kod", "")
-                                    if namn_type == "FORETAGSNAMN":
-                                        company_name = namn_entry.get("namn", "")
-                                        break
-                                # Fall back to first name if no FORETAGSNAMN
-                                if not company_name and namn_lista:
-                                    company_name = namn_lista[0].get("namn", "")
-
-                        # Extract company info from Bolagsverket response
-                        node_data = {
-                            "_type": "Company",
-                            "orgnr": job.orgnr,
-                            "names": [{"name": company_name, "type": "legal"}],
-                            "legal_form": bv.get("juridiskForm", {}).get("beskrivning"),
-                            "status": bv.get("status", {}).get("beskrivning"),
-                            "registration_date": bv.get("organisationsdatum", {}).get("registreringsdatum"),
-                            "source": "bolagsverket_hvd",
-                            "pipeline_loaded_at": datetime.now(timezone.utc).isoformat(),
-                        }
-
-                        # Address - nested under postadressOrganisation.postadress
-                        post_addr_org = bv.get("postadressOrganisation", {})
-                        if post_addr_org:
-                            addr = post_addr_org.get("postadress", {})
-                            if addr:
-                                node_data["address"] = {
-                                    "street": addr.get("utdelningsadress"),
-                                    "postal_code": addr.get("postnummer"),
-                                    "city": addr.get("postort"),
-                                }
-
-                        # SNI codes - nested under naringsgrenOrganisation.sni
-                        naringsgren = bv.get("naringsgrenOrganisation", {})
-                        if naringsgren:
-                            sni_list = naringsgren.get("sni", [])
-                            # Filter out empty entries
-                            valid_sni = [s for s in sni_list if s.get("kod", "").strip()]
-                            if valid_sni:
-                                node_data["sni_codes"] = valid_sni
-
-                        # Business description - nested under verksamhetsbeskrivning.beskrivning
-                        verks = bv.get("verksamhetsbeskrivning", {})
-                        if verks and verks.get("beskrivning"):
-                            node_data["purpose"] = verks["beskrivning"]
-
-                        graph.add_node(company_id, **node_data)
-                        updated += 1
-
-                    # Add directors from extracted data
-                    if hasattr(job, 'directors_data') and job.directors_data:
-                        for i, director in enumerate(job.directors_data):
-                            # Create unique person ID based on name
-                            first_name = director.get("first_name", "")
-                            last_name = director.get("last_name", "")
-                            full_name = f"{first_name} {last_name}".strip()
-
-                            # Create deterministic ID from name
-                            name_key = full_name.lower().replace(" ", "_")
-                            person_id = f"person-{name_key}"
-
-                            # Add or update person node
-                            if person_id not in graph:
-                                graph.add_node(person_id, **{
-                                    "_type": "Person",
-                                    "names": [{"name": full_name, "type": "legal"}],
+                # Add companies from Bolagsverket data
+                updated = 0
+                added: list[PipelineJob] = []
+                failed: list[PipelineJob] = []
+                for job in jobs:
+                    try:
+                        # Create company node from Bolagsverket data
+                        company_id = f"company-{job.orgnr}"
+
+                        if job.bolagsverket_data:
+                            bv = job.bolagsverket_data
+
+                            # Extract company name from organisationsnamn structure
+                            company_name = ""
+                            org_namn = bv.get("organisationsnamn", {})
+                            if org_namn:
+                                namn_lista = org_namn.get("organisationsnamnLista", [])
+                                if namn_lista:
+                                    # Get primary name (FORETAGSNAMN type preferred)
+                                    for namn_entry in namn_lista:
+                                        namn_type = namn_entry.get("organisationsnamntyp", {}).get("kod", "")
+                                        if namn_type == "FORETAGSNAMN":
+                                            company_name = namn_entry.get("namn", "")
+                                            break
+                                    # Fall back to first name if no FORETAGSNAMN
+                                    if not company_name and namn_lista:
+                                        company_name = namn_lista[0].get("namn", "")
+
+                            # Extract company info from Bolagsverket response
+                            node_data = {
+                                "_type": "Company",
+                                "orgnr": job.orgnr,
+                                "names": [{"name": company_name, "type": "legal"}],
+                                "legal_form": bv.get("juridiskForm", {}).get("beskrivning"),
+                                "status": bv.get("status", {}).get("beskrivning"),
+                                "registration_date": bv.get("organisationsdatum", {}).get("registreringsdatum"),
+                                "source": "bolagsverket_hvd",
+                                "pipeline_loaded_at": datetime.now(timezone.utc).isoformat(),
+                            }
+
+                            # Address - nested under postadressOrganisation.postadress
+                            post_addr_org = bv.get("postadressOrganisation", {})
+                            if post_addr_org:
+                                addr = post_addr_org.get("postadress", {})
+                                if addr:
+                                    node_data["address"] = {
+                                        "street": addr.get("utdelningsadress"),
+                                        "postal_code": addr.get("postnummer"),
+                                        "city": addr.get("postort"),
+                                    }
+
+                            # SNI codes - nested under naringsgrenOrganisation.sni
+                            naringsgren = bv.get("naringsgrenOrganisation", {})
+                            if naringsgren:
+                                sni_list = naringsgren.get("sni", [])
+                                # Filter out empty entries
+                                valid_sni = [s for s in sni_list if s.get("kod", "").strip()]
+                                if valid_sni:
+                                    node_data["sni_codes"] = valid_sni
+
+                            # Business description - nested under verksamhetsbeskrivning.beskrivning
+                            verks = bv.get("verksamhetsbeskrivning", {})
+                            if verks and verks.get("beskrivning"):
+                                node_data["purpose"] = verks["beskrivning"]
+
+                            graph.add_node(company_id, **node_data)
+                            updated += 1
+
+                        # Add directors from extracted data
+                        if hasattr(job, 'directors_data') and job.directors_data:
+                            for i, director in enumerate(job.directors_data):
+                                # Create unique person ID based on name
+                                first_name = director.get("first_name", "")
+                                last_name = director.get("last_name", "")
+                                full_name = f"{first_name} {last_name}".strip()
+
+                                # Create deterministic ID from name
+                                name_key = full_name.lower().replace(" ", "_")
+                                person_id = f"person-{name_key}"
+
+                                # Add or update person node
+                                if person_id not in graph:
+                                    graph.add_node(person_id, **{
+                                        "_type": "Person",
+                                        "names": [{"name": full_name, "type": "legal"}],
+                                        "source": "bolagsverket_xbrl",
+                                    })
+
+                                # Add director edge
+                                role = director.get("role_normalized", "STYRELSELEDAMOT")
+                                graph.add_edge(person_id, company_id, **{
+                                    "_type": "director",
+                                    "role": role,
                                     "source": "bolagsverket_xbrl",
                                 })
 
-                            # Add director edge
-                            role = director.get("role_normalized", "STYRELSELEDAMOT")
-                            graph.add_edge(person_id, company_id, **{
-                                "_type": "director",
-                                "role": role,
-                                "source": "bolagsverket_xbrl",
-                            })
+                        job.status = JobStatus.COMPLETED
+                        added.append(job)
 
-                    # Advance to allabolag stage for async enrichment
-                    job.status = JobStatus.COMPLETED
-                    self.db.advance_job(job)
+                    except Exception as e:
+                        logger.error(f"  Failed to add {job.orgnr} to graph: {e}")
+                        job.error = str(e)
+                        job.status = JobStatus.FAILED
+                        failed.append(job)
+                        self.stats.errors += 1
 
-                except Exception as e:
-                    logger.error(f"  Failed to add {job.orgnr} to graph: {e}")
-                    job.error = str(e)
-                    job.status = JobStatus.FAILED
-                    self.db.update_job(job)
-                    self.stats.errors += 1
-
-            # Save graph
-            with open(GRAPH_PATH, "wb") as f:
-                pickle.dump(graph, f)
-            logger.info(f"  Graph saved: {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges")
-
-            # Run pattern detection
+            # Append delta as a new segment
+            manifest = store.append(graph)
+
+            # Only advance once the segment is durable; if the append fails the
+            # leases expire and the batch is picked up again.
+            self.db.advance_jobs(added)
+            self.db.update_jobs(failed)
+            logger.info(
+                f"  Graph saved: +{len(graph.nodes)} nodes, +{len(graph.edges)} edges "
+                f"(total {manifest['node_count']} nodes, {manifest['edge_count']} edges)"
+            )
+
+            # Run pattern detection on a read-only snapshot
             try:
                 from scripts.load_allabolag import run_pattern_detection
-                run_pattern_detection(graph)
+                with store.open_reader() as snapshot:
+                    run_pattern_detection(snapshot)
             except Exception as e:
                 logger.warning(f"  Pattern detection skipped: {e}")
 
@@ -814,6 +988,29 @@ class PipelineOrchestrator:
             logger.error(f"Graph update failed: {e}")
             self.stats.errors += 1
 
+    def _open_graph_store(self):
+        """
+        Open the graph snapshot store, importing a legacy pickle once.
+
+        Earlier versions kept the whole graph in company_graph.pickle. If the
+        store is empty and that file exists, it is imported as the first
+        segment and renamed so it is never loaded again.
+        """
+        from halo.graph.snapshot_store import GraphSnapshotStore
+
+        store = GraphSnapshotStore(self.data_dir / "company_graph.store")
+        legacy_path = self.data_dir / "company_graph.pickle"
+
+        if not store.exists() and legacy_path.exists():
+            import pickle
+
+            logger.info(f"  Importing legacy graph pickle {legacy_path.name}")
+            with open(legacy_path, "rb") as f:
+                store.import_graph(pickle.load(f))
+            legacy_path.rename(legacy_path.with_name(legacy_path.name + ".imported"))
+
+        return store
+
     async def queue_allabolag_enrichment(self):
         """
         Stage 4: Queue companies for async allabolag enrichment.
@@ -844,7 +1041,7 @@ class PipelineOrchestrator:
             # Mark as in progress in pipeline (allabolag will complete them)
             for job in jobs:
                 job.status = JobStatus.IN_PROGRESS
-                self.db.update_job(job)
+            self.db.update_jobs(jobs)
 
             self.stats.allabolag_scraped = len(orgnrs)
             logger.info(f"  Queued {len(orgnrs)} orgnrs for allabolag enrichment")
@@ -897,6 +1094,7 @@ async def main():
     parser.add_argument('--watch', action='store_true', help='Watch mode (continuous)')
     parser.add_argument('--interval', type=int, default=300, help='Watch interval in seconds')
     parser.add_argument('--limit', type=int, default=100, help='Limit for stage processing')
+    parser.add_argument('--concurrency', type=int, help='Concurrent Bolagsverket workers')
     parser.add_argument('--stats', action='store_true', help='Show pipeline statistics')
     parser.add_argument('--reset', action='store_true', help='Reset pipeline state')
     parser.add_argument('--discover', type=int, help='Discover N orgnrs from SCB')
@@ -973,7 +1171,9 @@ async def main():
         if args.stage == 'scb':
             await orchestrator.run_scb_discovery(limit=args.limit)
         elif args.stage == 'bolagsverket':
-            await orchestrator.run_bolagsverket_enrichment(limit=args.limit)
+            await orchestrator.run_bolagsverket_enrichment(
+                limit=args.limit, concurrency=args.concurrency
+            )
         elif args.stage == 'graph':
             await orchestrator.run_graph_update()
         elif args.stage == 'allabolag':
@@ -6,14 +6,41 @@ Uses rule-based weighted scoring (no ML for MVP).
 """
 
 import logging
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
 from typing import Any, Optional
 
 from halo.resolution.blocking import CandidateEntity, Mention
 
+try:
+    import jellyfish
+except ImportError:  # pragma: no cover - exercised only without jellyfish
+    jellyfish = None
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class NameProfile:
+    """Precomputed forms of a name used by the string features."""
+
+    text: str
+    lowered: str
+    tokens: frozenset[str]
+
+
+@lru_cache(maxsize=65536)
+def name_profile(text: str) -> NameProfile:
+    """
+    Lowercase and tokenise a name once.
+
+    Entity canonical names recur across every mention they are compared
+    with, so profiles are cached by the raw string.
+    """
+    lowered = text.lower()
+    return NameProfile(text=text, lowered=lowered, tokens=frozenset(lowered.split()))
+
+
 @dataclass
 class FeatureScores:
     """Comparison feature scores between a mention and candidate."""
@@ -60,6 +87,9 @@ class FeatureScores:
         }
 
 
+_FEATURE_NAMES = tuple(f.name for f in fields(FeatureScores))
+
+
 @dataclass
 class WeightConfig:
     """Feature weights for scoring."""
@@ -166,18 +196,16 @@ class FeatureComparator:
         else:
             weights = self.address_weights
 
-        feature_dict = features.to_dict()
-
         total = 0.0
         max_possible = 0.0
 
-        for feature_name, value in feature_dict.items():
+        for feature_name in _FEATURE_NAMES:
             weight = getattr(weights, feature_name, 0.0)
-            if weight > 0 and value > 0:
-                total += value * weight
-                max_possible += weight
-            elif weight > 0:
-                # Count towards max but not total
+            if weight > 0:
+                value = getattr(features, feature_name)
+                if value > 0:
+                    total += value * weight
+                # Count towards max even when the feature did not fire
                 max_possible += weight
 
         if max_possible == 0:
@@ -185,6 +213,22 @@ class FeatureComparator:
 
         return min(total / max_possible, 1.0)
 
+    def score_pairs(
+        self,
+        pairs: list[tuple[Mention, CandidateEntity]],
+    ) -> list[tuple[FeatureScores, float]]:
+        """
+        Compute features and scores for many mention/candidate pairs.
+
+        Equivalent to calling compute_features and score_features per pair;
+        name profiles are shared across the batch.
+        """
+        scored = []
+        for mention, entity in pairs:
+            features = self.compute_features(mention, entity)
+            scored.append((features, self.score_features(features, mention.mention_type)))
+        return scored
+
     def _compute_person_features(
         self,
         mention: Mention,
@@ -200,15 +244,7 @@ class FeatureComparator:
                 scores.identifier_match = 1.0
 
         # Name similarity
-        scores.name_jaro_winkler = self._jaro_winkler(
-            mention.normalized_form, entity.canonical_name
-        )
-        scores.name_token_jaccard = self._token_jaccard(
-            mention.normalized_form, entity.canonical_name
-        )
-        scores.name_levenshtein_norm = self._levenshtein_normalized(
-            mention.normalized_form, entity.canonical_name
-        )
+        self._name_features(scores, mention.normalized_form, entity.canonical_name)
 
         # Birth year/date
         mention_year = mention.extracted_attributes.get("birth_year")
@@ -253,15 +289,7 @@ class FeatureComparator:
                 scores.identifier_match = 1.0
 
         # Name similarity (more important for companies)
-        scores.name_jaro_winkler = self._jaro_winkler(
-            mention.normalized_form, entity.canonical_name
-        )
-        scores.name_token_jaccard = self._token_jaccard(
-            mention.normalized_form, entity.canonical_name
-        )
-        scores.name_levenshtein_norm = self._levenshtein_normalized(
-            mention.normalized_form, entity.canonical_name
-        )
+        self._name_features(scores, mention.normalized_form, entity.canonical_name)
 
         # Address similarity
         mention_postal = mention.extracted_attributes.get("postal_code")
@@ -323,43 +351,58 @@ class FeatureComparator:
 
         return scores
 
+    def _name_features(self, scores: FeatureScores, s1: str, s2: str) -> None:
+        """Fill the three name similarity features from cached profiles."""
+        if not s1 or not s2:
+            return
+        p1 = name_profile(s1)
+        p2 = name_profile(s2)
+        scores.name_jaro_winkler = self._jaro_winkler_profiles(p1, p2)
+        scores.name_token_jaccard = self._token_jaccard_profiles(p1, p2)
+        scores.name_levenshtein_norm = self._levenshtein_profiles(p1, p2)
+
     def _jaro_winkler(self, s1: str, s2: str) -> float:
         """Compute Jaro-Winkler similarity."""
         if not s1 or not s2:
             return 0.0
-        try:
-            import jellyfish
-
-            return jellyfish.jaro_winkler_similarity(s1.lower(), s2.lower())
-        except ImportError:
-            # Fallback to basic comparison
-            return 1.0 if s1.lower() == s2.lower() else 0.0
+        return self._jaro_winkler_profiles(name_profile(s1), name_profile(s2))
 
     def _token_jaccard(self, s1: str, s2: str) -> float:
         """Compute Jaccard similarity of tokens."""
         if not s1 or not s2:
             return 0.0
+        return self._token_jaccard_profiles(name_profile(s1), name_profile(s2))
 
-        tokens1 = set(s1.lower().split())
-        tokens2 = set(s2.lower().split())
+    def _levenshtein_normalized(self, s1: str, s2: str) -> float:
+        """Compute normalized Levenshtein similarity (1 - normalized distance)."""
+        if not s1 or not s2:
+            return 0.0
+        return self._levenshtein_profiles(name_profile(s1), name_profile(s2))
+
+    @staticmethod
+    def _jaro_winkler_profiles(p1: NameProfile, p2: NameProfile) -> float:
+        if jellyfish is None:
+            # Fallback to basic comparison
+            return 1.0 if p1.lowered == p2.lowered else 0.0
+        return jellyfish.jaro_winkler_similarity(p1.lowered, p2.lowered)
+
+    @staticmethod
+    def _token_jaccard_profiles(p1: NameProfile, p2: NameProfile) -> float:
+        tokens1 = p1.tokens
+        tokens2 = p2.tokens
 
         if not tokens1 or not tokens2:
             return 0.0
 
         intersection = len(tokens1 & tokens2)
-        union = len(tokens1 | tokens2)
+        union = len(tokens1) + len(tokens2) - intersection
 
         return intersection / union if union > 0 else 0.0
 
-    def _levenshtein_normalized(self, s1: str, s2: str) -> float:
-        """Compute normalized Levenshtein similarity (1 - normalized distance)."""
-        if not s1 or not s2:
-            return 0.0
-        try:
-            import jellyfish
-
-            distance = jellyfish.levenshtein_distance(s1.lower(), s2.lower())
-            max_len = max(len(s1), len(s2))
-            return 1.0 - (distance / max_len) if max_len > 0 else 0.0
-        except ImportError:
-            return 1.0 if s1.lower() == s2.lower() else 0.0
+    @staticmethod
+    def _levenshtein_profiles(p1: NameProfile, p2: NameProfile) -> float:
+        if jellyfish is None:
+            return 1.0 if p1.lowered == p2.lowered else 0.0
+        distance = jellyfish.levenshtein_distance(p1.lowered, p2.lowered)
+        max_len = max(len(p1.text), len(p2.text))
+        return 1.0 - (distance / max_len) if max_len > 0 else 0.0
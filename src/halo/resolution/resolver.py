@@ -6,6 +6,8 @@ mentions to entities.
 """
 
 import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -118,10 +120,18 @@ class BatchResolutionResult:
 
     results: list[ResolutionResult]
     clusters: list[MentionCluster]
-    stats: dict[str, int] = field(default_factory=dict)
+    stats: dict[str, Any] = field(default_factory=dict)
     duration_ms: int = 0
 
 
+def _score_chunk(
+    comparator: FeatureComparator,
+    pairs: list[tuple[Mention, CandidateEntity]],
+) -> list[tuple[FeatureScores, float]]:
+    """Process-pool entry point for scoring a chunk of pairs."""
+    return comparator.score_pairs(pairs)
+
+
 class EntityResolver:
     """
     Main resolution pipeline.
@@ -133,6 +143,9 @@ class EntityResolver:
     4. Clustering: Group matched mentions
     """
 
+    # Below this many pairs a process pool costs more than it saves
+    PARALLEL_MIN_PAIRS = 2000
+
     def __init__(
         self,
         config: Optional[ResolutionConfig] = None,
@@ -155,7 +168,24 @@ class EntityResolver:
         # 1. Get candidates via blocking
         candidates = self.blocker.get_candidates(mention)
 
-        if not candidates:
+        # 2. Score each candidate
+        scored_candidates = [
+            CandidateScore(entity=candidate, score=score, features=features)
+            for candidate, (features, score) in zip(
+                candidates,
+                self.comparator.score_pairs([(mention, c) for c in candidates]),
+            )
+        ]
+
+        return self._decide(mention, scored_candidates)
+
+    def _decide(
+        self,
+        mention: Mention,
+        scored_candidates: list[CandidateScore],
+    ) -> ResolutionResult:
+        """Rank scored candidates and apply the decision thresholds."""
+        if not scored_candidates:
             # No candidates - create new entity
             logger.debug(f"No candidates for mention {mention.id}, creating new entity")
             return ResolutionResult(
@@ -166,15 +196,6 @@ class EntityResolver:
                 reason="No matching candidates found",
             )
 
-        # 2. Score each candidate
-        scored_candidates: list[CandidateScore] = []
-        for candidate in candidates:
-            features = self.comparator.compute_features(mention, candidate)
-            score = self.comparator.score_features(features, mention.mention_type)
-            scored_candidates.append(
-                CandidateScore(entity=candidate, score=score, features=features)
-            )
-
         # Sort by score descending
         scored_candidates.sort(key=lambda x: x.score, reverse=True)
 
@@ -229,28 +250,60 @@ class EntityResolver:
         self,
         mentions: list[Mention],
         cluster: bool = True,
+        workers: Optional[int] = None,
     ) -> BatchResolutionResult:
         """
         Resolve a batch of mentions.
 
+        Candidates for the whole batch are gathered first and every
+        mention/candidate pair is scored in one pass, so name profiles are
+        computed once per distinct string rather than once per comparison.
+
         Args:
             mentions: List of mentions to resolve
             cluster: Whether to cluster results
+            workers: Score pairs across this many processes (in-process if None or 1)
 
         Returns:
             Batch resolution result with all decisions and clusters
         """
-        import time
-
-        start = time.time()
-
+        start = time.perf_counter()
+        timings: dict[str, float] = {}
+
+        # 1. Blocking
+        stage = time.perf_counter()
+        candidate_lists = [self.blocker.get_candidates(mention) for mention in mentions]
+        pairs = [
+            (mention, candidate)
+            for mention, candidates in zip(mentions, candidate_lists)
+            for candidate in candidates
+        ]
+        timings["blocking_ms"] = (time.perf_counter() - stage) * 1000
+
+        # 2. Scoring
+        stage = time.perf_counter()
+        scored_pairs = self._score_pairs(pairs, workers)
+        timings["scoring_ms"] = (time.perf_counter() - stage) * 1000
+
+        # 3. Decisions
+        stage = time.perf_counter()
         results = []
+        offset = 0
+        for mention, candidates in zip(mentions, candidate_lists):
+            scored_candidates = [
+                CandidateScore(entity=candidate, score=score, features=features)
+                for candidate, (features, score) in zip(
+                    candidates, scored_pairs[offset:offset + len(candidates)]
+                )
+            ]
+            offset += len(candidates)
+            results.append(self._decide(mention, scored_candidates))
+        timings["decision_ms"] = (time.perf_counter() - stage) * 1000
+
+        # 4. Clustering
+        stage = time.perf_counter()
         clustering_engine = ClusteringEngine(min_confidence=0.6)
-
-        for mention in mentions:
-            result = self.resolve_mention(mention)
-            results.append(result)
-
+        for mention, result in zip(mentions, results):
             # Add to clustering if matched
             if result.decision in [
                 ResolutionDecision.AUTO_MATCH,
@@ -269,8 +322,9 @@ class EntityResolver:
         if cluster:
             cluster_result = clustering_engine.get_clusters()
             clusters = cluster_result.clusters
+        timings["clustering_ms"] = (time.perf_counter() - stage) * 1000
 
-        duration_ms = int((time.time() - start) * 1000)
+        duration_ms = int((time.perf_counter() - start) * 1000)
 
         # Compute stats
         stats = {
@@ -285,6 +339,8 @@ class EntityResolver:
                 1 for r in results if r.decision == ResolutionDecision.NEW_ENTITY
             ),
             "clusters": len(clusters),
+            "pairs_scored": len(pairs),
+            **{name: round(ms, 3) for name, ms in timings.items()},
         }
 
         return BatchResolutionResult(
@@ -294,6 +350,23 @@ class EntityResolver:
             duration_ms=duration_ms,
         )
 
+    def _score_pairs(
+        self,
+        pairs: list[tuple[Mention, CandidateEntity]],
+        workers: Optional[int],
+    ) -> list[tuple[FeatureScores, float]]:
+        """Score pairs in-process, or in chunks across a process pool."""
+        if not workers or workers <= 1 or len(pairs) < self.PARALLEL_MIN_PAIRS:
+            return self.comparator.score_pairs(pairs)
+
+        chunk_size = -(-len(pairs) // workers)
+        chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+        scored: list[tuple[FeatureScores, float]] = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk_scores in pool.map(_score_chunk, [self.comparator] * len(chunks), chunks):
+                scored.extend(chunk_scores)
+        return scored
+
     def submit_human_decision(
         self,
         mention_id: UUID,
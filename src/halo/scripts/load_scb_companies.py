@@ -294,11 +294,9 @@ async def main():
         data_dir = Path("./halo/data")
         data_dir.mkdir(parents=True, exist_ok=True)
 
-        graph_file = data_dir / "scb_graph.pickle"
-        # NetworkX graph can be saved with pickle
-        import pickle
-        with open(graph_file, "wb") as f:
-            pickle.dump(loader.graph.backend.graph, f)
+        graph_file = data_dir / "scb_graph.store"
+        from halo.graph.snapshot_store import GraphSnapshotStore
+        GraphSnapshotStore(graph_file).import_graph(loader.graph.backend.graph, replace=True)
         print(f"\n5. Graph saved to {graph_file}")
 
         # Also save company list for reference
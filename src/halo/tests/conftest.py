@@ -3,13 +3,18 @@ Pytest configuration and shared fixtures for Halo tests.
 """
 
 import asyncio
+import importlib
+import sys
+import types
 from datetime import datetime, timedelta
 from decimal import Decimal
+from pathlib import Path
 from typing import Generator
 from uuid import uuid4
 
 import pytest
 
+import halo
 from halo.entities.schemas import Entity
 from halo.fincrime.watchlist import WatchlistChecker, WatchlistEntry, WatchlistType
 from halo.fincrime.aml_patterns import AMLPatternDetector, TransactionForAnalysis
@@ -31,6 +36,33 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
     loop.close()
 
 
+@pytest.fixture(scope="module")
+def import_nlp():
+    """
+    Import a halo.nlp submodule by name.
+
+    The package __init__ imports halo.nlp.tokenizer, which is not in this
+    tree; when it fails, submodules that do not need the tokenizer are
+    imported without running the __init__.
+    """
+    def nlp_modules():
+        return [name for name in sys.modules if name == "halo.nlp" or name.startswith("halo.nlp.")]
+
+    saved = {name: sys.modules[name] for name in nlp_modules()}
+    try:
+        importlib.import_module("halo.nlp")
+    except ImportError:
+        package = types.ModuleType("halo.nlp")
+        package.__path__ = [str(Path(halo.__file__).parent / "nlp")]
+        sys.modules["halo.nlp"] = package
+
+    yield lambda name: importlib.import_module(f"halo.nlp.{name}")
+
+    for name in nlp_modules():
+        del sys.modules[name]
+    sys.modules.update(saved)
+
+
 @pytest.fixture
 def sample_entity() -> Entity:
     """Create a sample entity for testing."""
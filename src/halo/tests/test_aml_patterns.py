@@ -8,6 +8,8 @@ Tests the detection of:
 - Round-trip transactions
 """
 
+import random
+import time
 from datetime import datetime, timedelta
 from decimal import Decimal
 from uuid import uuid4
@@ -22,6 +24,7 @@ from halo.fincrime.aml_patterns import (
     RapidMovementDetector,
     RoundTripDetector,
     SmurfingDetector,
+    TransactionPathIndex,
 )
 
 
@@ -341,3 +344,143 @@ class TestAMLPatternDetector:
         alerts = detector.detect_all(transactions)
         # Single normal transaction should not trigger alerts
         assert len(alerts) == 0
+
+
+def _txn(sender, receiver, amount, when):
+    return {
+        "id": uuid4(),
+        "from_entity_id": sender,
+        "to_entity_id": receiver,
+        "amount": Decimal(amount),
+        "timestamp": when,
+    }
+
+
+def _brute_force_cycles(transactions, start, window, max_depth):
+    """Reference enumeration of time-respecting round trips."""
+    trips = []
+
+    def dfs(current, path, visited):
+        if len(path) >= max_depth:
+            return
+        for txn in transactions:
+            if txn["from_entity_id"] != current:
+                continue
+            if path and (
+                txn["timestamp"] < path[-1]["timestamp"]
+                or txn["timestamp"] > path[0]["timestamp"] + window
+            ):
+                continue
+            receiver = txn["to_entity_id"]
+            if receiver == start and path:
+                trips.append(path + [txn])
+            elif receiver not in visited:
+                dfs(receiver, path + [txn], visited | {receiver})
+
+    dfs(start, [], {start})
+    return trips
+
+
+class TestTransactionPathIndex:
+    """Tests for the shared time-respecting path engine."""
+
+    @pytest.fixture
+    def random_transactions(self):
+        rng = random.Random(11)
+        entities = [uuid4() for _ in range(8)]
+        base = datetime(2025, 1, 1)
+        return entities, [
+            _txn(*rng.sample(entities, 2), "100000", base + timedelta(hours=rng.randint(0, 96)))
+            for _ in range(40)
+        ]
+
+    def test_cycles_match_reference(self, random_transactions):
+        """Pruned cycle search finds exactly the brute-force round trips."""
+        entities, transactions = random_transactions
+        index = TransactionPathIndex(transactions)
+        window = timedelta(hours=48)
+
+        for start in entities:
+            found = {tuple(t["id"] for t in trip) for trip in index.cycles(start, window, 5)}
+            expected = {
+                tuple(t["id"] for t in trip)
+                for trip in _brute_force_cycles(transactions, start, window, 5)
+            }
+            assert found == expected
+
+    def test_chains_respect_time_order(self):
+        """A later hop may not precede the previous one."""
+        a, b, c, d = (uuid4() for _ in range(4))
+        base = datetime(2025, 1, 1)
+        transactions = [
+            _txn(a, b, "100000", base),
+            _txn(b, c, "100000", base + timedelta(hours=1)),
+            _txn(c, d, "100000", base - timedelta(hours=1)),  # before a->b
+        ]
+        index = TransactionPathIndex(transactions)
+
+        chains = index.chains(a, timedelta(hours=72), min_length=2, max_depth=10)
+        assert [len(chain) for chain in chains] == [2]
+        assert index.chains(a, timedelta(hours=72), min_length=3, max_depth=10) == []
+
+    def test_chain_window_is_bounded(self):
+        """Hops after the window are excluded; the prefix is still a chain."""
+        a, b, c, d = (uuid4() for _ in range(4))
+        base = datetime(2025, 1, 1)
+        transactions = [
+            _txn(a, b, "100000", base),
+            _txn(b, c, "100000", base + timedelta(hours=1)),
+            _txn(c, d, "100000", base + timedelta(hours=2)),
+            _txn(d, a, "100000", base + timedelta(hours=100)),
+        ]
+        detector = LayeringDetector(max_hours=72)
+
+        matches = detector.detect(transactions, entity_id=a)
+        assert len(matches) == 1
+        assert matches[0].details["hop_count"] == 3
+
+    def test_small_hops_are_not_layering(self):
+        """Chains broken by a hop below min_amount do not reach min_hops."""
+        a, b, c, d = (uuid4() for _ in range(4))
+        base = datetime(2025, 1, 1)
+        transactions = [
+            _txn(a, b, "100000", base),
+            _txn(b, c, "1000", base + timedelta(hours=1)),
+            _txn(c, d, "100000", base + timedelta(hours=2)),
+        ]
+        assert LayeringDetector().detect(transactions) == []
+
+    def test_hub_account_is_capped(self, caplog):
+        """Dense hubs stay fast thanks to the per-start expansion cap."""
+        rng = random.Random(3)
+        entities = [uuid4() for _ in range(60)]
+        base = datetime(2025, 1, 1)
+        transactions = [
+            _txn(*rng.sample(entities, 2), "100000", base + timedelta(minutes=rng.randint(0, 600)))
+            for _ in range(3000)
+        ]
+
+        started = time.perf_counter()
+        layering = LayeringDetector(max_expansions=500)
+        round_trip = RoundTripDetector(max_expansions=500)
+        detector = AMLPatternDetector(detectors=[layering, round_trip])
+        with caplog.at_level("WARNING", logger="halo.fincrime.aml_patterns"):
+            matches = detector.detect_all(transactions)
+        assert time.perf_counter() - started < 10
+        assert matches
+
+        # Truncation is reported, not silently dropped
+        assert layering.truncated_starts > 0
+        assert round_trip.truncated_starts > 0
+        assert any(m.details["search_truncated"] for m in matches)
+        assert "results are incomplete" in caplog.text
+
+    def test_complete_search_is_not_truncated(self, random_transactions):
+        _, transactions = random_transactions
+        detector = RoundTripDetector(min_amount=Decimal("1"))
+
+        matches = detector.detect(transactions)
+
+        assert matches
+        assert detector.truncated_starts == 0
+        assert not any(m.details["search_truncated"] for m in matches)
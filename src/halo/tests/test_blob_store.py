@@ -0,0 +1,149 @@
+"""
+Tests for content-addressed evidence storage and integrity verification.
+"""
+
+import hashlib
+import io
+import os
+from uuid import uuid4
+
+import pytest
+
+from halo.investigation.blob_store import BlobStore, file_sha256, is_digest, verify_files
+from halo.investigation.evidence import EvidenceCollector, EvidenceType
+
+
+def _add(collector, content, title="Kontoutdrag"):
+    return collector.add_evidence(
+        case_id=uuid4(),
+        title=title,
+        evidence_type=EvidenceType.DOCUMENT,
+        source="Bank",
+        content=content,
+        collected_by=uuid4(),
+    )
+
+
+class TestBlobStore:
+    """Tests for BlobStore."""
+
+    def test_put_streams_and_deduplicates(self, tmp_path):
+        store = BlobStore(tmp_path / "blobs")
+        data = os.urandom(3 * 1024 * 1024 + 17)
+        digest = hashlib.sha256(data).hexdigest()
+
+        first = store.put(io.BytesIO(data))
+        second = store.put(data[i : i + 1000] for i in range(0, len(data), 1000))
+
+        assert first.digest == second.digest == digest
+        assert first.size == len(data)
+        assert not first.deduplicated
+        assert second.deduplicated
+        assert first.path == store.path_for(digest)
+        assert file_sha256(first.path) == digest
+        assert list((tmp_path / "blobs" / "tmp").iterdir()) == []
+
+    def test_read_and_map(self, tmp_path):
+        store = BlobStore(tmp_path)
+        blob = store.put(b"transaktioner 2024")
+        empty = store.put(b"")
+
+        with store.open(blob.digest) as f:
+            assert f.read() == b"transaktioner 2024"
+        with store.map(blob.digest) as mapped:
+            assert mapped[:13] == b"transaktioner"
+            assert len(mapped) == blob.size
+        with store.map(empty.digest) as mapped:
+            assert mapped == b""
+
+    @pytest.mark.parametrize("digest", [
+        "../etc/passwd",
+        "../../" + "a" * 58,
+        "/etc/passwd",
+        "/" + "a" * 63,
+        "A" * 64,
+        "a" * 63,
+        "a" * 65,
+        "",
+    ])
+    def test_rejects_invalid_digests(self, tmp_path, digest):
+        store = BlobStore(tmp_path / "blobs")
+        (tmp_path / "etc").mkdir()
+        (tmp_path / "etc" / "passwd").write_text("root")
+
+        assert not is_digest(digest)
+        with pytest.raises(ValueError):
+            store.path_for(digest)
+        with pytest.raises(ValueError):
+            store.exists(digest)
+        with pytest.raises(ValueError):
+            store.open(digest)
+
+    def test_verify_files_skips_unchanged(self, tmp_path, monkeypatch):
+        path = tmp_path / "statement.pdf"
+        path.write_bytes(b"original")
+        digest = hashlib.sha256(b"original").hexdigest()
+        cache = {}
+
+        hashed = []
+        monkeypatch.setattr(
+            "halo.investigation.blob_store.file_sha256",
+            lambda p: hashed.append(p) or file_sha256(p),
+        )
+
+        assert verify_files({path: digest}, cache) == {path: True}
+        assert verify_files({path: digest}, cache) == {path: True}
+        assert hashed == [path]
+
+        # Same size, new mtime: hashed again and detected
+        path.write_bytes(b"tampered")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert verify_files({path: digest}, cache) == {path: False}
+        assert len(hashed) == 2
+
+        assert verify_files({tmp_path / "missing": digest}, cache) == {tmp_path / "missing": False}
+
+
+class TestCollectorBlobStorage:
+    """Tests for EvidenceCollector with the blob store."""
+
+    def test_add_evidence_stores_payload(self, tmp_path):
+        collector = EvidenceCollector(storage_path=tmp_path)
+        content = b"%PDF-1.7 kontoutdrag" * 1000
+
+        evidence = _add(collector, io.BytesIO(content))
+        duplicate = _add(collector, content, title="Samma utdrag")
+
+        assert evidence.content_bytes is None
+        assert evidence.file_size == len(content)
+        assert evidence.hash == hashlib.sha256(content).hexdigest()
+        assert duplicate.file_path == evidence.file_path
+        assert "content" not in evidence.chain_of_custody[0].to_dict()
+
+        with collector.open_content(evidence) as f:
+            assert f.read() == content
+        with collector.map_content(duplicate) as mapped:
+            assert mapped[:8] == b"%PDF-1.7"
+        assert collector.verify_integrity(evidence, content)
+
+    def test_verify_all_integrity(self, tmp_path):
+        collector = EvidenceCollector(storage_path=tmp_path / "store")
+        document = tmp_path / "dump.txt"
+        document.write_bytes(b"dokument")
+
+        stored = _add(collector, b"payload")
+        shared = _add(collector, b"payload")
+        collected = collector.collect_document("Dump", str(document), source="Beslag")
+        collector.collect_transaction({"amount": 100}, source="Bank")
+
+        assert collector.verify_all_integrity(max_workers=2) == {
+            stored.id: True,
+            shared.id: True,
+            collected.id: True,
+        }
+
+        document.write_bytes(b"andra data")
+        results = collector.verify_all_integrity()
+        assert not results[collected.id]
+        assert results[stored.id] and results[shared.id]
@@ -0,0 +1,149 @@
+"""
+Tests for the set-based DerivationDBService.
+"""
+
+from types import SimpleNamespace
+from uuid import UUID
+
+import pytest
+
+from halo.derivation.db_service import DerivationDBService
+
+
+def _uuid(i: int) -> UUID:
+    return UUID(int=i + 1)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeSession:
+    """Serves keyset pages from in-memory rows and records every statement."""
+
+    def __init__(self, companies=(), persons=(), addresses=()):
+        self.companies = sorted(companies, key=lambda r: r.entity_id)
+        self.persons = sorted(persons, key=lambda r: r.entity_id)
+        self.addresses = list(addresses)
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, clause, params=None):
+        sql = str(clause)
+        self.statements.append((sql, params or {}))
+        if sql.lstrip().startswith("UPDATE"):
+            return FakeResult([])
+        if "FROM onto_facts f" in sql and "GROUP BY f.object_id" in sql and "onto_entities" not in sql:
+            return FakeResult(self.addresses)
+        rows = self.companies if "'COMPANY'" in sql else self.persons
+        after = params["after_id"]
+        page = [r for r in rows if r.entity_id > after][: params["batch_size"]]
+        return FakeResult(page)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+def _company(i, street=None):
+    return SimpleNamespace(
+        entity_id=_uuid(i),
+        canonical_name=f"Bolag {i} AB",
+        orgnummer=f"55{i:08d}",
+        status="ACTIVE",
+        registration_date=None,
+        latest_employees=0,
+        latest_revenue=0,
+        sni_primary="64200",
+        director_change_velocity=0.0,
+        shell_indicators=None,
+        current_risk_score=0.0,
+        address_street=street,
+    )
+
+
+def _person(i, shell_count=0):
+    return SimpleNamespace(
+        entity_id=_uuid(i),
+        canonical_name=f"Person {i}",
+        company_count=4,
+        active_directorship_count=4,
+        current_risk_score=0.0,
+        risk_factors=None,
+        shell_count=shell_count,
+    )
+
+
+def _updates(session):
+    return [(sql, params) for sql, params in session.statements if sql.lstrip().startswith("UPDATE")]
+
+
+class TestDerivationDBService:
+    """Tests for keyset pagination and bulk writes."""
+
+    @pytest.mark.asyncio
+    async def test_company_derivation_one_update_per_page(self):
+        """Each page is written with one bulk UPDATE and no per-row queries."""
+        session = FakeSession(companies=[_company(i, "c/o Box 1" if i % 2 else "Gatan 1") for i in range(25)])
+        service = DerivationDBService(session)
+        service.BATCH_SIZE = 10
+
+        stats = await service.compute_company_derivations()
+
+        assert stats.entities_processed == 25
+        assert stats.entities_updated == 25
+        assert not stats.errors
+        updates = _updates(session)
+        assert len(updates) == 3
+        assert "FROM (VALUES" in updates[0][0]
+        assert len([k for k in updates[0][1] if k.startswith("entity_id_")]) == 10
+        # 3 data pages + 1 empty page, nothing else
+        assert len(session.statements) == 3 + 4
+        assert set(stats.phase_seconds) == {"fetch", "compute", "write"}
+
+    @pytest.mark.asyncio
+    async def test_keyset_pagination_advances_by_id(self):
+        """Pages start strictly after the last entity id of the previous page."""
+        session = FakeSession(companies=[_company(i) for i in range(5)])
+        service = DerivationDBService(session)
+        service.BATCH_SIZE = 2
+
+        await service.compute_company_derivations()
+
+        fetches = [p["after_id"] for sql, p in session.statements if "after_id" in p]
+        assert fetches == [UUID(int=0), _uuid(1), _uuid(3), _uuid(4)]
+
+    @pytest.mark.asyncio
+    async def test_person_risk_uses_joined_shell_count(self):
+        """Shell associations come from the page query, not a per-person lookup."""
+        session = FakeSession(persons=[_person(0, shell_count=0), _person(1, shell_count=5)])
+        service = DerivationDBService(session)
+
+        stats = await service.compute_person_risk_scores()
+
+        assert stats.entities_updated == 2
+        sql, params = _updates(session)[0]
+        assert "onto_person_attributes" in sql
+        assert params["risk_score_1"] > params["risk_score_0"]
+
+    @pytest.mark.asyncio
+    async def test_address_statistics_bulk_update(self):
+        """Address counts are written in bulk with hub detection."""
+        session = FakeSession(addresses=[
+            SimpleNamespace(address_id=_uuid(0), company_count=12, person_count=2),
+            SimpleNamespace(address_id=_uuid(1), company_count=1, person_count=1),
+        ])
+        service = DerivationDBService(session)
+
+        stats = await service.compute_address_statistics()
+
+        assert stats.entities_updated == 2
+        _, params = _updates(session)[0]
+        assert params["is_hub_0"] is True
+        assert params["is_hub_1"] is False
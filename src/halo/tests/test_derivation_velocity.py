@@ -0,0 +1,120 @@
+"""
+Tests for the indexed DirectorVelocityCalculator.
+"""
+
+import random
+from datetime import date, timedelta
+from types import SimpleNamespace
+from uuid import UUID
+
+import pytest
+
+from halo.derivation.velocity import DirectorChange, DirectorVelocityCalculator
+
+
+AS_OF = date(2025, 6, 30)
+
+
+def _brute_force(changes, key, entity_id, period_days, as_of):
+    cutoff = as_of - timedelta(days=period_days)
+    return sum(
+        1 for c in changes
+        if getattr(c, key) == entity_id and cutoff <= c.change_date <= as_of
+    )
+
+
+@pytest.fixture
+def changes():
+    rng = random.Random(7)
+    companies = [UUID(int=i) for i in range(1, 40)]
+    persons = [UUID(int=1000 + i) for i in range(1, 60)]
+    result = []
+    for _ in range(800):
+        result.append(DirectorChange(
+            company_id=rng.choice(companies),
+            person_id=rng.choice(persons),
+            person_name="Anna Andersson",
+            change_type=rng.choice(["added", "removed"]),
+            change_date=AS_OF - timedelta(days=rng.randint(-100, 1500)),
+        ))
+    return result
+
+
+@pytest.fixture
+def calculator(changes):
+    calc = DirectorVelocityCalculator()
+    calc.add_changes(changes)
+    return calc
+
+
+class TestDirectorVelocityCalculator:
+    """Tests for window queries over the change index."""
+
+    def test_company_velocity_matches_scan(self, calculator, changes):
+        """Bisect window counts match a linear scan, boundaries inclusive."""
+        for company_id in {c.company_id for c in changes}:
+            result = calculator.calculate_company_velocity(company_id, AS_OF)
+            expected = _brute_force(changes, "company_id", company_id, calculator.period_days, AS_OF)
+            assert result.total_changes == expected
+            assert len(result.changes) == expected
+            assert result.velocity == pytest.approx(expected / 2)
+
+    def test_person_velocity_matches_scan(self, calculator, changes):
+        for person_id in {c.person_id for c in changes}:
+            result = calculator.calculate_person_velocity(person_id, AS_OF)
+            assert result.total_changes == _brute_force(
+                changes, "person_id", person_id, calculator.period_days, AS_OF
+            )
+
+    def test_all_company_velocities(self, calculator, changes):
+        """The vectorised pass agrees with the single-company query."""
+        velocities = calculator.calculate_all_company_velocities(AS_OF)
+
+        assert set(velocities) == {c.company_id for c in changes}
+        for company_id, velocity in velocities.items():
+            single = calculator.calculate_company_velocity(company_id, AS_OF)
+            assert velocity == pytest.approx(single.velocity)
+
+    def test_index_refreshes_after_add(self, calculator):
+        company_id = UUID(int=9999)
+        assert calculator.calculate_all_company_velocities(AS_OF).get(company_id) is None
+
+        calculator.add_change(DirectorChange(
+            company_id=company_id,
+            person_id=UUID(int=1),
+            person_name="",
+            change_type="added",
+            change_date=AS_OF,
+        ))
+
+        assert calculator.calculate_all_company_velocities(AS_OF)[company_id] == pytest.approx(0.5)
+        assert calculator.calculate_company_velocity(company_id, AS_OF).total_changes == 1
+
+    def test_find_high_velocity_sorted(self, calculator):
+        results = calculator.find_high_velocity_companies(threshold=5.0, as_of_date=AS_OF)
+
+        assert results
+        assert all(r.velocity >= 5.0 for r in results)
+        assert [r.velocity for r in results] == sorted((r.velocity for r in results), reverse=True)
+
+    def test_load_fact_rows(self):
+        """Fact rows become added events plus removed events when valid_to is set."""
+        calc = DirectorVelocityCalculator()
+        rows = [
+            SimpleNamespace(
+                company_id=UUID(int=1), person_id=UUID(int=2), person_name=None,
+                valid_from=date(2025, 1, 1), valid_to=date(2025, 3, 1), role=None,
+            ),
+            SimpleNamespace(
+                company_id=UUID(int=1), person_id=UUID(int=3), person_name="Bo",
+                valid_from=date(2025, 2, 1), valid_to=None, role="ordförande",
+            ),
+        ]
+
+        assert calc.load_fact_rows(rows) == 3
+        stats = calc.stats()
+        assert stats["additions"] == 2
+        assert stats["removals"] == 1
+        assert stats["unique_companies"] == 1
+        assert stats["unique_persons"] == 2
+        assert calc.calculate_company_velocity(UUID(int=1), AS_OF).total_changes == 3
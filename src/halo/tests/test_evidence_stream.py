@@ -0,0 +1,200 @@
+"""
+Tests for streaming evidence package export.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import zipfile
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from halo.evidence import EvidenceExporter, EvidenceItem, ExportFormat, create_evidence_package
+from halo.investigation.blob_store import BlobStore
+
+
+def _item(content_hash, title="Kontoutdrag"):
+    return EvidenceItem(
+        id=uuid4(),
+        item_type="document",
+        title=title,
+        description='Utdrag, "mars" <2024>',
+        source="bank",
+        source_timestamp=datetime(2024, 3, 31),
+        content_hash=content_hash,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlobStore(tmp_path / "blobs")
+
+
+@pytest.fixture
+def package(store):
+    package = create_evidence_package(case_id=uuid4(), title="Ärende & <bevis>", created_by="analyst_1")
+    statement = store.put(b"%PDF-1.7 kontoutdrag")
+    dump = store.put(os.urandom(3 * 1024 * 1024))
+    package.add_item(_item(statement.digest))
+    package.add_item(_item(f"sha256:{dump.digest}", title="Dump"))
+    package.add_item(_item(statement.digest, title="Kopia"))
+    package.add_item(_item("sha256:" + "f" * 64))  # Not in the store
+    package.seal("analyst_1")
+    return package
+
+
+def _archive(export):
+    chunks = list(export)
+    data = b"".join(chunks)
+    assert export.size == len(data)
+    return zipfile.ZipFile(io.BytesIO(data))
+
+
+class TestStreamingExport:
+    """Tests for EvidenceExporter.export_stream."""
+
+    @pytest.mark.parametrize("format", [ExportFormat.JSON, ExportFormat.CSV, ExportFormat.XML])
+    def test_archive_contents(self, package, store, format):
+        export = EvidenceExporter().export_stream(package, format, blob_store=store)
+        assert export.package_hash is None
+        assert export.filename.endswith(".zip")
+
+        archive = _archive(export)
+        assert archive.testzip() is None
+        assert export.package_hash == package.package_hash
+
+        manifest = json.loads(archive.read("manifest.json"))
+        assert manifest["package_hash"] == package.package_hash
+        assert manifest["hash_verified"] is True
+        for entry in manifest["files"]:
+            assert hashlib.sha256(archive.read(entry["path"])).hexdigest() == entry["sha256"]
+
+        # Referenced payloads once each; items without a stored payload are listed only
+        blobs = sorted(n for n in archive.namelist() if n.startswith("blobs/"))
+        assert len(blobs) == 2
+        for name in blobs:
+            assert hashlib.sha256(archive.read(name)).hexdigest() == name.removeprefix("blobs/")
+
+        header = json.loads(archive.read("package.json"))
+        assert header["item_count"] == 4
+        assert "items" not in header
+
+    def test_items_match_in_memory_export(self, package, store):
+        exporter = EvidenceExporter()
+        expected_ids = [str(item.id) for item in package.hash_order()]
+
+        archive = _archive(exporter.export_stream(package, ExportFormat.JSON, blob_store=store))
+        lines = archive.read("items.ndjson").decode("utf-8").splitlines()
+        assert [json.loads(line)["id"] for line in lines] == expected_ids
+        assert json.loads(lines[0]) == next(i.to_dict() for i in package.items if str(i.id) == expected_ids[0])
+
+        archive = _archive(exporter.export_stream(package, ExportFormat.CSV))
+        streamed = archive.read("items.csv").decode("utf-8")
+        in_memory = exporter.export(package, ExportFormat.CSV).content.decode("utf-8")
+        assert sorted(csv.reader(io.StringIO(streamed))) == sorted(csv.reader(io.StringIO(in_memory)))
+
+        archive = _archive(exporter.export_stream(package, ExportFormat.XML))
+        streamed = archive.read("items.xml").decode("utf-8")
+        in_memory = exporter.export(package, ExportFormat.XML).content.decode("utf-8")
+        assert sorted(streamed.splitlines()) == sorted(in_memory.splitlines())
+        assert not any(n.startswith("blobs/") for n in archive.namelist())
+
+    def test_unsealed_package_hash(self, store):
+        package = create_evidence_package(case_id=uuid4(), title="Utkast", created_by="analyst_1")
+        for i in range(50):
+            package.add_item(_item(f"{i:064x}"))
+
+        export = EvidenceExporter().export_stream(package, ExportFormat.JSON, blob_store=store)
+        manifest = json.loads(_archive(export).read("manifest.json"))
+
+        assert export.package_hash == package.calculate_hash()
+        assert manifest["hash_verified"] is None
+
+    @pytest.mark.parametrize("content_hash", [
+        "sha256:../secret.txt",
+        "sha256:../../secret.txt",
+        "../secret.txt",
+        "SECRET_PATH",
+        "sha256:" + "F" * 64,
+    ])
+    def test_invalid_hash_never_reaches_store(self, tmp_path, store, content_hash):
+        secret = tmp_path / "secret.txt"
+        secret.write_bytes(b"not evidence")
+        if content_hash == "SECRET_PATH":
+            content_hash = f"sha256:{secret}"
+        package = create_evidence_package(case_id=uuid4(), title="Intrång", created_by="analyst_1")
+        package.add_item(_item(content_hash))
+
+        archive = _archive(EvidenceExporter().export_stream(package, ExportFormat.JSON, blob_store=store))
+
+        assert not any(n.startswith("blobs/") for n in archive.namelist())
+        assert all(b"not evidence" not in archive.read(n) for n in archive.namelist())
+
+    def test_abandoned_stream_closes_cleanly(self, package, store):
+        chunks = iter(EvidenceExporter().export_stream(package, ExportFormat.JSON, blob_store=store))
+        next(chunks)
+        chunks.close()
+
+    def test_pdf_is_not_streamed(self, package):
+        with pytest.raises(ValueError):
+            EvidenceExporter().export_stream(package, ExportFormat.PDF)
+
+
+class TestPackageHash:
+    """Tests for EvidencePackage.calculate_hash."""
+
+    def test_hash_tracks_additions_and_title(self):
+        package = create_evidence_package(case_id=uuid4(), title="Hash", created_by="analyst_1")
+        package.add_item(_item("a" * 64))
+        first = package.calculate_hash()
+        assert package.calculate_hash() == first
+
+        package.add_item(_item("b" * 64))
+        second = package.calculate_hash()
+        assert second != first
+
+        package.title = "Nytt namn"
+        assert package.calculate_hash() != second
+
+    def test_hash_tracks_item_changes(self):
+        package = create_evidence_package(case_id=uuid4(), title="Byte", created_by="analyst_1")
+        package.add_item(_item("a" * 64))
+        package.add_item(_item("b" * 64))
+        first = package.calculate_hash()
+
+        package.items[0] = _item("c" * 64)
+        replaced = package.calculate_hash()
+        assert replaced != first
+
+        package.items[1].content_hash = "d" * 64
+        assert package.calculate_hash() != replaced
+
+    def test_seal_after_in_place_edit(self):
+        package = create_evidence_package(case_id=uuid4(), title="Sigill", created_by="analyst_1")
+        package.add_item(_item("a" * 64))
+        package.calculate_hash()
+
+        package.items[0] = _item("b" * 64)
+        package.seal("analyst_1")
+        assert package.verify_integrity()
+        assert package.package_hash == package.calculate_hash()
+
+        fresh = create_evidence_package(case_id=uuid4(), title="Sigill", created_by="analyst_1")
+        fresh.add_item(_item("a" * 64))
+        fresh.calculate_hash()
+        fresh.items[0].content_hash = "c" * 64
+        fresh.seal("analyst_1")
+        assert fresh.verify_integrity()
+
+    def test_verify_integrity_recomputes(self):
+        package = create_evidence_package(case_id=uuid4(), title="Sigill", created_by="analyst_1")
+        package.add_item(_item("a" * 64))
+        package.seal("analyst_1")
+        assert package.verify_integrity()
+
+        package.items[0].content_hash = "b" * 64
+        assert not package.verify_integrity()
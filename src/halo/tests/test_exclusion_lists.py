@@ -0,0 +1,74 @@
+"""
+Tests for the single-pattern exclusion list matcher.
+"""
+
+import random
+import re
+
+from halo.intelligence.exclusion_lists import (
+    EXCLUSION_CATEGORIES,
+    classify_names,
+    get_exclusion_stats,
+    is_excluded_entity,
+    should_exclude_from_address_cluster,
+    should_exclude_from_serial_director,
+)
+
+
+def _reference(name):
+    """Per-list scans in priority order, as the lists were matched before."""
+    if not name:
+        return None
+    for category, patterns in EXCLUSION_CATEGORIES:
+        for pattern in patterns:
+            if re.search(re.escape(pattern), name.lower(), re.IGNORECASE):
+                return category
+    return None
+
+
+class TestExclusionMatcher:
+    """Tests for is_excluded_entity and classify_names."""
+
+    def test_categories_and_priority(self):
+        assert is_excluded_entity("KPMG AB") == "audit_firm"
+        assert is_excluded_entity("EQT Partners") == "pe_vc"
+        assert is_excluded_entity("Mannheimer Swartling Advokatbyrå") == "law_firm"
+        assert is_excluded_entity("Nordea Bank Abp") == "bank"
+        assert is_excluded_entity("Startabolag Sverige") == "corporate_service"
+        assert is_excluded_entity("Stockholms kommun") == "government"
+        # Overlapping entries: the higher-priority list wins wherever it matches
+        assert is_excluded_entity("SEB Revision AB") == "audit_firm"
+        assert is_excluded_entity("Kommunal Holding AB") == "pe_vc"
+        assert is_excluded_entity("Anna Lindgren") is None
+        assert is_excluded_entity("") is None
+        assert is_excluded_entity(None) is None
+
+    def test_matches_per_list_scans(self):
+        rng = random.Random(3)
+        entries = [p for _, patterns in EXCLUSION_CATEGORIES for p in patterns]
+        words = ["Anna", "Sebastian", "Berg", "AB", "Bygg", "Jeyla", "Nordic", "i", "&"]
+        names = []
+        for _ in range(2000):
+            parts = rng.choices(words, k=rng.randrange(1, 4))
+            if rng.random() < 0.5:
+                parts.insert(rng.randrange(len(parts) + 1), rng.choice(entries).upper())
+            names.append(" ".join(parts))
+
+        assert [is_excluded_entity(n) for n in names] == [_reference(n) for n in names]
+
+    def test_classify_names(self):
+        names = ["Deloitte AB", "Per Ek", "Deloitte AB", "Region Skåne", ""]
+
+        assert classify_names(names) == ["audit_firm", None, "audit_firm", "government", None]
+        assert classify_names(iter(names[:2])) == ["audit_firm", None]
+        assert classify_names([]) == []
+
+    def test_helpers_use_categories(self):
+        assert should_exclude_from_serial_director("Handelsbanken")
+        assert not should_exclude_from_serial_director("Bolagsplatsen AB")
+        assert should_exclude_from_address_cluster("Bolagsplatsen AB")
+
+        stats = get_exclusion_stats(["PwC", "Erik Berg", "Vattenfall AB"])
+        assert stats["excluded"] == 2
+        assert stats["by_category"] == {"audit_firm": 1, "government": 1}
+        assert stats["excluded_entities"] == [("PwC", "audit_firm"), ("Vattenfall AB", "government")]
@@ -0,0 +1,158 @@
+"""
+Tests for incremental XBRL parsing and off-loop document extraction.
+"""
+
+import io
+import zipfile
+
+import pytest
+
+from halo.extraction.pipeline import CompanyInfo, DocumentInfo, ExtractionPipeline, PipelineConfig
+from halo.extraction.xbrl_extractor import XBRLExtractor
+
+IX = "http://www.xbrl.org/2013/inlineXBRL"
+
+
+def _field(name, value, context="c1"):
+    return f'<ix:nonNumeric name="se-gen-base:{name}" contextRef="{context}">{value}</ix:nonNumeric>'
+
+
+def _signature(prefix, first, last, role):
+    return (
+        f"<p>{_field(prefix + 'Tilltalsnamn', first)} {_field(prefix + 'Efternamn', last)}</p>"
+        f"<p>{_field(prefix + 'Foretradarroll', role)}</p>"
+    )
+
+
+def _report(trailing=30, board=(("Anna", "Berg", "Styrelseordförande"),
+                                ("Erik", "Lund", "Verkställande direktör"),
+                                ("Sara", "Ek", "Styrelseledamot"))):
+    """A small iXBRL report: certificate, body, board signatures, audit part."""
+    parts = [
+        f'<?xml version="1.0" encoding="UTF-8"?><html xmlns="http://www.w3.org/1999/xhtml" xmlns:ix="{IX}">',
+        "<body><div>",
+        _signature("UnderskriftFaststallelseintygForetradare", "Anna", "Berg", "Styrelseordförande"),
+        _field("UnderskriftFastallelseintygDatum", "2024-05-02"),
+    ]
+    for i in range(20):
+        parts.append(f"<p>Rad {i} {_field('Forvaltningsberattelse' + str(i), 'Text <b>fet</b> ' + str(i))}</p>")
+    # A nested text block, as iXBRL uses for notes
+    parts.append(_field("Redovisningsprinciper", "Principer " + _field("Valuta", "SEK")))
+    for first, last, role in board:
+        parts.append(_signature("UnderskriftHandling", first, last, role))
+    parts.append(_field("UnderskriftHandlingDatum", "2024-04-20"))
+    for i in range(trailing):
+        parts.append(f"<p>{_field('Revisionsberattelse' + str(i), 'Revision ' + str(i))}</p>")
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+
+def _zip(content, name="report.xhtml"):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(name, content)
+    return buf.getvalue()
+
+
+def _directors(result):
+    return sorted((d.first_name, d.last_name, d.role_normalized, d.confidence) for d in result.directors)
+
+
+class TestIncrementalXBRL:
+    """Tests for the iterparse XBRL path."""
+
+    def test_fields_match_full_parse_and_stop_early(self):
+        extractor = XBRLExtractor()
+        content = _report()
+
+        full = extractor._extract_xbrl_fields(content)
+        streamed = extractor._iterparse_xbrl_fields(io.BytesIO(content.encode("utf-8")))
+
+        names = [f.name for f in full]
+        # Stops at the first field after the board signature block
+        stop = names.index("se-gen-base:Revisionsberattelse0")
+        assert [(f.name, f.value, f.context_ref) for f in streamed] == [
+            (f.name, f.value, f.context_ref) for f in full[:stop]
+        ]
+        # Nested fields keep document order
+        assert names.index("se-gen-base:Redovisningsprinciper") + 1 == names.index("se-gen-base:Valuta")
+
+    def test_no_early_stop_without_board_signatures(self):
+        extractor = XBRLExtractor()
+        content = _report(board=())
+
+        full = extractor._extract_xbrl_fields(content)
+        streamed = extractor._iterparse_xbrl_fields(io.BytesIO(content.encode("utf-8")))
+
+        assert [f.name for f in streamed] == [f.name for f in full]
+
+    def test_zip_matches_xhtml_extraction(self):
+        extractor = XBRLExtractor()
+        content = _report()
+
+        from_zip = extractor.extract_from_zip(_zip(content), "5560000001", "doc1")
+        from_xhtml = extractor.extract_from_xhtml(content, "5560000001", "doc1")
+
+        assert _directors(from_zip) == _directors(from_xhtml)
+        assert len(from_zip.directors) == 3
+        assert from_zip.signature_date == from_xhtml.signature_date
+        assert from_zip.extraction_confidence == from_xhtml.extraction_confidence
+
+    def test_malformed_xml_uses_regex_fallback(self):
+        extractor = XBRLExtractor()
+        content = _report().replace("<div>", "<div><br>", 1)  # Unclosed tag
+
+        from_zip = extractor.extract_from_zip(_zip(content), "5560000001", "doc1")
+        from_xhtml = extractor.extract_from_xhtml(content, "5560000001", "doc1")
+
+        assert _directors(from_zip) == _directors(from_xhtml)
+        assert from_zip.directors
+
+
+class TestExtractionPool:
+    """Tests for ExtractionPipeline document extraction."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("workers", [0, 2])
+    async def test_extract_document(self, workers):
+        config = PipelineConfig(bv_client_id="x", bv_client_secret="y", extraction_workers=workers)
+        content = _report()
+
+        async with ExtractionPipeline(config) as pipeline:
+            assert (pipeline._pool is not None) == (workers > 0)
+            result = await pipeline.extract_document(_zip(content), "5560000001", "doc1")
+
+        expected = XBRLExtractor().extract_from_xhtml(content, "5560000001", "doc1")
+        assert _directors(result) == _directors(expected)
+        assert result.extraction_method == "xbrl"
+        assert result.processing_time_ms >= 0
+        assert pipeline._pool is None
+
+    @pytest.mark.asyncio
+    async def test_process_batch_through_pool(self):
+        config = PipelineConfig(
+            bv_client_id="x", bv_client_secret="y", extraction_workers=2, rate_limit_delay=0
+        )
+        pipeline = ExtractionPipeline(config)
+
+        async def company_info(orgnr):
+            return CompanyInfo(orgnr=orgnr, name=f"Bolag {orgnr}")
+
+        async def document_list(orgnr):
+            return [DocumentInfo(document_id=f"doc-{orgnr}", file_format="application/zip")]
+
+        async def download(document_id):
+            return b"not a zip" if document_id.endswith("3") else _zip(_report())
+
+        pipeline.get_company_info = company_info
+        pipeline.get_document_list = document_list
+        pipeline.download_document = download
+
+        async with pipeline:
+            results = await pipeline.process_batch(["1", "2", "3"], concurrency=3)
+
+        assert len(results["1"][0].directors) == 3
+        assert results["2"][0].company_name == "Bolag 2"
+        # Not a ZIP: XBRL reports it, the PDF fallback cannot parse it either
+        assert not results["3"][0].directors
+        assert results["3"][0].warnings
@@ -0,0 +1,260 @@
+"""
+Tests for FlowGraph path and cycle enumeration.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import networkx as nx
+import pytest
+
+from halo.fusion.flow import FlowAnalyzer, FlowEdge, FlowGraph, FlowNode, FlowType
+
+
+T0 = datetime(2025, 1, 1)
+
+
+def _node(i):
+    return FlowNode(id=UUID(int=i + 1), entity_id=UUID(int=i + 1), entity_type="company", label=f"n{i}")
+
+
+def _edge(a, b, value=100.0, flow_type=FlowType.FINANCIAL, k=0):
+    return FlowEdge(
+        source_id=UUID(int=a + 1),
+        target_id=UUID(int=b + 1),
+        flow_type=flow_type,
+        value=value,
+        occurred_at=T0 + timedelta(hours=k),
+        description="",
+    )
+
+
+def _analyzer(n=30, m=90, seed=7, parallel=True):
+    rng = random.Random(seed)
+    analyzer = FlowAnalyzer()
+    for i in range(n):
+        analyzer.add_node(_node(i))
+    seen = set()
+    for k in range(m):
+        a, b = rng.randrange(n), rng.randrange(n)
+        if a == b or (not parallel and (a, b) in seen):
+            continue
+        seen.add((a, b))
+        flow_type = FlowType.FINANCIAL if k % 4 else FlowType.OWNERSHIP
+        analyzer.add_edge(_edge(a, b, float(rng.randrange(10, 1000)), flow_type, k))
+    return analyzer
+
+
+def _reference_paths(analyzer, source_id, target_id=None, flow_type=None, max_depth=5):
+    """The recursive list-copying DFS FlowAnalyzer used before FlowGraph."""
+    paths = []
+
+    def dfs(current, path_nodes, path_edges, visited):
+        if len(path_nodes) > max_depth:
+            return
+        if target_id and current == target_id and path_edges:
+            paths.append([e.occurred_at for e in path_edges])
+            return
+        if not target_id and path_edges:
+            paths.append([e.occurred_at for e in path_edges])
+        for edge in analyzer._adjacency.get(current, []):
+            if flow_type and edge.flow_type != flow_type:
+                continue
+            if edge.target_id in visited or edge.target_id not in analyzer._nodes:
+                continue
+            visited.add(edge.target_id)
+            dfs(edge.target_id, path_nodes + [edge.target_id], path_edges + [edge], visited)
+            visited.remove(edge.target_id)
+
+    if source_id in analyzer._nodes:
+        dfs(source_id, [source_id], [], {source_id})
+    return paths
+
+
+def _key(path):
+    return [e.occurred_at for e in path.edges]
+
+
+def _canonical(node_ids):
+    cycle = list(node_ids)
+    start = cycle.index(min(cycle))
+    return tuple(cycle[start:] + cycle[:start])
+
+
+class TestFlowGraph:
+    """Tests for the index-based search engine."""
+
+    def test_construction_filters_edges(self):
+        node_ids = [UUID(int=i + 1) for i in range(3)]
+        kept = _edge(0, 1, 500)
+        adjacency = {
+            node_ids[0]: [kept, _edge(0, 2, 50), _edge(0, 5, 500)],
+            node_ids[1]: [_edge(1, 0, 500, FlowType.OWNERSHIP)],
+            UUID(int=99): [_edge(98, 0, 500)],
+        }
+
+        graph = FlowGraph(node_ids, adjacency, FlowType.FINANCIAL, min_edge_value=100)
+
+        assert graph.index == {node_id: i for i, node_id in enumerate(node_ids)}
+        assert graph.out == [[(1, kept)], [], []]
+        assert graph.reverse == [[], [0], []]
+        assert sorted(graph.strongly_connected_components()) == [[0], [1], [2]]
+        assert list(graph.iter_cycles()) == []
+
+    def test_strongly_connected_components(self):
+        analyzer = _analyzer(n=60, m=80)
+        graph = analyzer.flow_graph()
+
+        components = graph.strongly_connected_components()
+
+        reference = nx.DiGraph()
+        reference.add_nodes_from(range(len(graph.node_ids)))
+        reference.add_edges_from((i, j) for i, out in enumerate(graph.out) for j, _ in out)
+        assert {frozenset(c) for c in components} == {
+            frozenset(c) for c in nx.strongly_connected_components(reference)
+        }
+        assert graph.stats["components"] == len(components)
+
+    @pytest.mark.parametrize("max_length", [2, 4, 6])
+    def test_cycles_match_networkx(self, max_length):
+        analyzer = _analyzer(n=25, m=70, parallel=False)
+        graph = analyzer.flow_graph()
+
+        found = [nodes for nodes, _ in graph.iter_cycles(max_length=max_length)]
+
+        reference = nx.DiGraph()
+        reference.add_edges_from((i, j) for i, out in enumerate(graph.out) for j, _ in out)
+        expected = {_canonical(c) for c in nx.simple_cycles(reference, length_bound=max_length)}
+        assert all(nodes[0] == nodes[-1] == min(nodes) for nodes in found)
+        assert len(found) == len(expected)
+        assert {_canonical(nodes[:-1]) for nodes in found} == expected
+
+    def test_parallel_edges_are_distinct_cycles(self):
+        analyzer = FlowAnalyzer()
+        for i in range(2):
+            analyzer.add_node(_node(i))
+        analyzer.add_edge(_edge(0, 1, k=0))
+        analyzer.add_edge(_edge(0, 1, k=1))
+        analyzer.add_edge(_edge(1, 0, k=2))
+
+        cycles = list(analyzer.flow_graph().iter_cycles())
+
+        assert len(cycles) == 2
+
+    def test_min_value_filters_and_prunes(self):
+        analyzer = _analyzer(n=25, m=70, parallel=False)
+        everything = analyzer.flow_graph()
+        all_cycles = list(everything.iter_cycles(max_length=5))
+        bounded = analyzer.flow_graph()
+
+        rich = list(bounded.iter_cycles(max_length=5, min_value=2500))
+
+        expected = [c for c in all_cycles if sum(e.value for e in c[1]) >= 2500]
+        assert [c[0] for c in rich] == [c[0] for c in expected]
+        assert bounded.stats["paths_explored"] < everything.stats["paths_explored"]
+
+    def test_acyclic_graph_explores_nothing(self):
+        analyzer = FlowAnalyzer()
+        for i in range(200):
+            analyzer.add_node(_node(i))
+        for i in range(199):
+            analyzer.add_edge(_edge(i, i + 1))
+
+        assert analyzer.find_circular_flows() == []
+        assert analyzer.search_stats["paths_explored"] == 0
+        assert analyzer.search_stats["cyclic_components"] == 0
+
+
+class TestFlowAnalyzer:
+    """Tests for FlowAnalyzer searches built on FlowGraph."""
+
+    @pytest.mark.parametrize("flow_type", [None, FlowType.FINANCIAL])
+    def test_find_paths_matches_reference(self, flow_type):
+        analyzer = _analyzer()
+        for i in range(0, 30, 7):
+            source = UUID(int=i + 1)
+            target = UUID(int=(i * 3) % 30 + 2)
+            assert [_key(p) for p in analyzer.find_paths(source, flow_type=flow_type)] == \
+                _reference_paths(analyzer, source, flow_type=flow_type)
+            assert [_key(p) for p in analyzer.find_paths(source, target, flow_type=flow_type)] == \
+                _reference_paths(analyzer, source, target, flow_type=flow_type)
+
+    def test_iter_paths_stops_early(self):
+        analyzer = _analyzer()
+        source = UUID(int=1)
+
+        first = list(analyzer.iter_paths(source, max_paths=5))
+
+        assert len(first) == 5
+        assert analyzer.search_stats["truncated"] is True
+        assert [_key(p) for p in first] == _reference_paths(analyzer, source)[:5]
+
+    def test_circular_flows(self):
+        analyzer = FlowAnalyzer()
+        for i in range(4):
+            analyzer.add_node(_node(i))
+        analyzer.add_edge(_edge(0, 1, 500))
+        analyzer.add_edge(_edge(1, 2, 450))
+        analyzer.add_edge(_edge(2, 0, 400))
+        analyzer.add_edge(_edge(2, 3, 50))
+
+        cycles = analyzer.find_circular_flows()
+
+        assert len(cycles) == 1
+        assert [n.label for n in cycles[0].nodes] == ["n0", "n1", "n2", "n0"]
+        assert cycles[0].total_value == 1350
+        assert cycles[0].risk_indicators == ["Circular flow detected"]
+        assert analyzer.find_circular_flows(min_value=2000) == []
+        assert analyzer.find_circular_flows(max_length=2) == []
+
+    def test_layering_matches_unpruned_filter(self):
+        analyzer = _analyzer(n=20, m=70)
+        pass_through = {n.id for n in analyzer._nodes.values() if n.is_pass_through()}
+        assert pass_through
+
+        for min_layers in (1, 2, 3):
+            found = analyzer.find_layering_patterns(min_layers=min_layers)
+            expected = [
+                p for source in analyzer._nodes for p in analyzer.find_paths(source)
+                if sum(1 for n in p.nodes[1:-1] if n.id in pass_through) >= min_layers
+            ]
+            assert [_key(p) for p in found] == [_key(p) for p in expected]
+
+        assert len(analyzer.find_layering_patterns(min_layers=1, max_paths=3)) == 3
+
+    def test_average_path_length(self):
+        analyzer = _analyzer()
+        lengths = [
+            len(p) for source in analyzer._nodes
+            for p in _reference_paths(analyzer, source, max_depth=3)
+        ]
+
+        summary = analyzer.get_flow_summary()
+
+        assert summary["average_path_length"] == pytest.approx(sum(lengths) / len(lengths))
+
+    def test_circular_flows_at_scale(self):
+        """Tens of thousands of accounts, mostly acyclic, with embedded rings."""
+        rng = random.Random(1)
+        analyzer = FlowAnalyzer()
+        n = 20_000
+        for i in range(n):
+            analyzer.add_node(_node(i))
+        for i in range(n):
+            for _ in range(2):
+                j = rng.randrange(i + 1, n + 1) if i < n - 1 else n - 1
+                if j < n and j != i:
+                    analyzer.add_edge(_edge(i, j))
+        for ring in range(200):
+            members = rng.sample(range(n), 4)
+            for a, b in zip(members, members[1:] + members[:1]):
+                analyzer.add_edge(_edge(b, a))
+
+        start = time.perf_counter()
+        cycles = analyzer.find_circular_flows(max_length=6)
+        elapsed = time.perf_counter() - start
+
+        assert len(cycles) >= 200
+        assert elapsed < 10.0, f"Circular flow detection took {elapsed:.2f}s"
@@ -0,0 +1,200 @@
+"""
+Tests for the sliding-window TemporalAnalyzer.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import pytest
+
+from halo.fusion.temporal import (
+    EventType,
+    PatternType,
+    SlidingWindowEngine,
+    TemporalAnalyzer,
+    TimelineEvent,
+)
+
+
+T0 = datetime(2025, 1, 1)
+ENTITIES = [UUID(int=i + 1) for i in range(5)]
+
+
+def _event(i, hours, entity=None, event_type=EventType.TRANSACTION):
+    return TimelineEvent(
+        id=UUID(int=10_000 + i),
+        entity_id=entity or ENTITIES[0],
+        event_type=event_type,
+        occurred_at=T0 + timedelta(hours=hours),
+        description="",
+    )
+
+
+def _random_events(n=400, seed=3):
+    rng = random.Random(seed)
+    return [
+        _event(i, rng.uniform(0, 24 * 60), rng.choice(ENTITIES), rng.choice(list(EventType)))
+        for i in range(n)
+    ]
+
+
+def _reference_windows(events, span, min_events, min_entities=1):
+    """Greedy non-overlapping windows by rescanning, for comparison."""
+    windows, i = [], 0
+    while i < len(events):
+        end = events[i].occurred_at + span
+        j = i
+        while j + 1 < len(events) and events[j + 1].occurred_at <= end:
+            j += 1
+        window = events[i:j + 1]
+        if len(window) >= min_events and len({e.entity_id for e in window}) >= min_entities:
+            windows.append(window)
+            i = j + 1
+        else:
+            i += 1
+    return windows
+
+
+class TestSlidingWindowEngine:
+    """Tests for the two-pointer window engine."""
+
+    @pytest.mark.parametrize("min_events,min_entities", [(3, 1), (5, 1), (2, 2), (4, 3)])
+    def test_matches_rescanning_reference(self, min_events, min_entities):
+        events = sorted(_random_events(), key=lambda e: e.occurred_at)
+        span = timedelta(hours=24)
+
+        engine = SlidingWindowEngine(span, min_events=min_events, min_entities=min_entities)
+        windows = engine.run(events)
+
+        expected = _reference_windows(events, span, min_events, min_entities)
+        assert [[e.id for e in w] for w in windows] == [[e.id for e in w] for w in expected]
+
+    def test_windows_do_not_overlap(self):
+        events = sorted(_random_events(), key=lambda e: e.occurred_at)
+        windows = SlidingWindowEngine(timedelta(hours=12), min_events=3).run(events)
+
+        assert windows
+        for earlier, later in zip(windows, windows[1:]):
+            assert earlier[-1].occurred_at <= later[0].occurred_at
+            assert not {e.id for e in earlier} & {e.id for e in later}
+        for window in windows:
+            assert window[-1].occurred_at - window[0].occurred_at <= timedelta(hours=12)
+
+    def test_out_of_order_rejected(self):
+        engine = SlidingWindowEngine(timedelta(hours=1))
+        engine.push(_event(0, 5))
+        with pytest.raises(ValueError):
+            engine.push(_event(1, 4))
+
+
+class TestTemporalAnalyzer:
+    """Tests for timeline storage and pattern detection."""
+
+    def test_insort_matches_stable_sort(self):
+        events = _random_events(200)
+        events += [_event(900 + i, 10) for i in range(5)]  # equal timestamps
+        incremental = TemporalAnalyzer()
+        for event in events:
+            incremental.add_event(event)
+        bulk = TemporalAnalyzer()
+        bulk.add_events(events)
+
+        expected = [e.id for e in sorted(events, key=lambda e: e.occurred_at)]
+        assert [e.id for e in incremental.get_timeline()] == expected
+        assert [e.id for e in bulk.get_timeline()] == expected
+        for entity_id in ENTITIES:
+            assert [e.id for e in incremental.get_timeline(entity_id)] == [
+                e.id for e in bulk.get_timeline() if e.entity_id == entity_id
+            ]
+
+    def test_timeline_range_filter(self):
+        events = _random_events(300)
+        analyzer = TemporalAnalyzer()
+        analyzer.add_events(events)
+        start, end = T0 + timedelta(days=10), T0 + timedelta(days=20)
+
+        result = analyzer.get_timeline(entity_id=ENTITIES[1], start=start, end=end)
+
+        expected = sorted(
+            (e for e in events if e.entity_id == ENTITIES[1] and start <= e.occurred_at <= end),
+            key=lambda e: e.occurred_at,
+        )
+        assert [e.id for e in result] == [e.id for e in expected]
+
+    def test_detect_bursts(self):
+        analyzer = TemporalAnalyzer(burst_threshold=timedelta(hours=24), burst_min_events=3)
+        hours = [0, 1, 2, 3, 100, 200, 201, 202, 500]
+        analyzer.add_events([_event(i, h) for i, h in enumerate(hours)])
+
+        bursts = analyzer.detect_bursts()
+
+        assert len(bursts) == 2
+        assert all(p.pattern_type == PatternType.BURST for p in bursts)
+        assert sorted(len(p.events) for p in bursts) == [3, 4]
+        assert bursts[0].confidence >= bursts[1].confidence
+
+    def test_streaming_matches_batch(self):
+        """push_event reports the same per-entity bursts as detect_bursts."""
+        events = sorted(_random_events(600), key=lambda e: e.occurred_at)
+        streaming = TemporalAnalyzer(burst_threshold=timedelta(hours=48))
+        reported = []
+        for event in events:
+            reported.extend(streaming.push_event(event))
+        reported.extend(streaming.flush_bursts())
+
+        batch = TemporalAnalyzer(burst_threshold=timedelta(hours=48))
+        batch.add_events(events)
+        expected = [p for eid in ENTITIES for p in batch.detect_bursts(entity_id=eid)]
+
+        key = lambda p: tuple(e.id for e in p.events)  # noqa: E731
+        assert reported
+        assert sorted(map(key, reported)) == sorted(map(key, expected))
+
+    def test_burst_reported_when_window_closes(self):
+        analyzer = TemporalAnalyzer(burst_threshold=timedelta(hours=2), burst_min_events=3)
+
+        assert analyzer.push_event(_event(0, 0)) == []
+        assert analyzer.push_event(_event(1, 1)) == []
+        assert analyzer.push_event(_event(2, 1.5)) == []
+        closed = analyzer.push_event(_event(3, 10))
+
+        assert len(closed) == 1
+        assert [e.id for e in closed[0].events] == [UUID(int=10_000 + i) for i in range(3)]
+
+    def test_coordinated_activity(self):
+        analyzer = TemporalAnalyzer(coordination_window=timedelta(hours=1))
+        analyzer.add_events([
+            _event(0, 0, ENTITIES[0]),
+            _event(1, 0.5, ENTITIES[1]),
+            _event(2, 0.75, ENTITIES[2]),
+            _event(3, 5, ENTITIES[0]),
+            _event(4, 5.5, ENTITIES[0]),
+            _event(5, 9, ENTITIES[3]),
+            _event(6, 9.2, ENTITIES[1]),
+        ])
+
+        patterns = analyzer.detect_coordinated_activity(ENTITIES[:4])
+
+        assert len(patterns) == 2
+        assert set(patterns[0].entity_ids) == set(ENTITIES[:3])
+        assert patterns[0].confidence == pytest.approx(3 / 4)
+        assert set(patterns[1].entity_ids) == {ENTITIES[1], ENTITIES[3]}
+        assert patterns[0].end_time == patterns[0].start_time + timedelta(hours=1)
+
+    def test_large_timeline_linear(self):
+        rng = random.Random(1)
+        events = [
+            _event(i, rng.uniform(0, 24 * 365), rng.choice(ENTITIES))
+            for i in range(50_000)
+        ]
+        analyzer = TemporalAnalyzer()
+        analyzer.add_events(events)
+
+        start = time.perf_counter()
+        analyzer.detect_bursts()
+        analyzer.detect_coordinated_activity(ENTITIES)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 2.0, f"Window detection over 50K events took {elapsed:.2f}s"
@@ -371,3 +371,87 @@ class TestGraphClientFactory:
         """Test creating unknown backend raises error."""
         with pytest.raises(ValueError):
             create_graph_client("unknown_backend")
+
+
+class _FakeConnection:
+    """Records statements executed through a fake asyncpg connection."""
+
+    def __init__(self, log):
+        self.log = log
+
+    async def execute(self, query, *args):
+        self.log.append((query, args))
+
+    def transaction(self):
+        return _FakeContext(None)
+
+
+class _FakeContext:
+    def __init__(self, value):
+        self.value = value
+
+    async def __aenter__(self):
+        return self.value
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakePool:
+    def __init__(self):
+        self.log = []
+
+    def acquire(self):
+        return _FakeContext(_FakeConnection(self.log))
+
+
+class TestAgeBackendBatch:
+    """Tests for AGE batch ingestion (no database required)."""
+
+    @pytest.fixture
+    def backend(self):
+        from halo.graph.age_backend import AgeBackend
+
+        backend = AgeBackend("postgresql://unused", batch_size=2)
+        backend._pool = _FakePool()
+        return backend
+
+    @pytest.mark.asyncio
+    async def test_nodes_grouped_by_label_and_chunked(self, backend):
+        """One UNWIND statement per label and chunk, rows sent as a parameter."""
+        import json
+
+        nodes = [Company(id=f"c{i}", orgnr=f"55600000{i}") for i in range(3)]
+        nodes.append(Person(id="p1", personnummer="198501011234"))
+
+        ids = await backend.create_nodes_batch(nodes)
+
+        assert ids == ["c0", "c1", "c2", "p1"]
+        log = backend._pool.log
+        assert len(log) == 3  # Company x2 chunks, Person x1
+        assert all("UNWIND $rows AS row" in q for q, _ in log)
+        rows = json.loads(log[0][1][0])["rows"]
+        assert [r["id"] for r in rows] == ["c0", "c1"]
+        assert backend.ingest_stats["nodes_written"] == 4
+        assert backend.ingest_stats["statements"] == 3
+
+    @pytest.mark.asyncio
+    async def test_edges_batch(self, backend):
+        """Edges are grouped by relationship type with endpoint ids per row."""
+        import json
+
+        edges = [
+            DirectsEdge(id="e1", from_id="p1", to_id="c1", from_date=date(2020, 1, 1)),
+            OwnsEdge(id="e2", from_id="c1", from_type="company", to_id="c2", share=60.0),
+        ]
+
+        ids = await backend.create_edges_batch(edges)
+
+        assert ids == ["e1", "e2"]
+        log = backend._pool.log
+        assert len(log) == 2
+        assert ":DIRECTS]" in log[0][0]
+        row = json.loads(log[0][1][0])["rows"][0]
+        assert row["from_id"] == "p1" and row["to_id"] == "c1"
+        assert row["props"]["from_date"] == "2020-01-01"
+        assert "from_type" not in json.loads(log[1][1][0])["rows"][0]["props"]
@@ -0,0 +1,146 @@
+"""
+Tests for the compact array-backed graph backend.
+"""
+
+import random
+
+import networkx as nx
+import pytest
+
+from halo.graph.client import NetworkXBackend, create_graph_client
+from halo.graph.compact_backend import CompactGraphBackend
+from halo.graph.schema import Person, Company, Address
+from halo.graph.edges import DirectsEdge, OwnsEdge, RegisteredAtEdge
+
+
+async def _build(backend, edges):
+    nodes = {n for e in edges for n in e[:2]}
+    for node_id in sorted(nodes):
+        await backend.create_node(Company(id=node_id))
+    for i, (a, b) in enumerate(edges):
+        await backend.create_edge(
+            OwnsEdge(id=f"e{i}", from_id=a, from_type="company", to_id=b)
+        )
+
+
+def _random_edges(n=40, m=90, seed=7):
+    rng = random.Random(seed)
+    return [
+        (f"n{rng.randrange(n)}", f"n{rng.randrange(n)}")
+        for _ in range(m)
+    ]
+
+
+class TestCompactGraphBackend:
+    """Tests for CompactGraphBackend."""
+
+    @pytest.fixture
+    def backend(self):
+        return CompactGraphBackend()
+
+    @pytest.mark.asyncio
+    async def test_create_and_get_node(self, backend):
+        """Nodes round-trip with defaults restored and type checked."""
+        await backend.create_node(Company(id="c1", orgnr="5560125790", names=[{"name": "Test AB"}]))
+
+        node = await backend.get_node("c1", "Company")
+        assert node["orgnr"] == "5560125790"
+        assert node["names"] == [{"name": "Test AB"}]
+        assert node["sni_codes"] == []
+        assert node["_type"] == "Company"
+        assert await backend.get_node("c1", "Person") is None
+        assert (await backend.find_by_orgnr("5560125790"))["id"] == "c1"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("backend_class", [CompactGraphBackend, NetworkXBackend])
+    async def test_identifier_update_drops_old_key(self, backend_class):
+        """Updating a node's orgnr or personnummer unindexes the previous value."""
+        backend = backend_class()
+        await backend.create_node(Company(id="c1", orgnr="5560125790"))
+        await backend.create_node(Company(id="c2", orgnr="5560000001"))
+        await backend.create_node(Company(id="c1", orgnr="5569999999"))
+
+        assert await backend.find_by_orgnr("5560125790") is None
+        assert (await backend.find_by_orgnr("5569999999"))["id"] == "c1"
+        assert await backend.find_by_orgnrs(["5560125790", "5560000001"]) == {
+            "5560000001": await backend.find_by_orgnr("5560000001")
+        }
+
+        # Clearing the identifier also unindexes it
+        await backend.create_node(Company(id="c2"))
+        assert await backend.find_by_orgnr("5560000001") is None
+
+        if backend_class is CompactGraphBackend:
+            await backend.create_node(Person(id="p1", personnummer="198001011234"))
+            await backend.create_node(Person(id="p1", personnummer="199002022345"))
+            assert await backend.find_by_personnummer("198001011234") is None
+            assert (await backend.find_by_personnummer("199002022345"))["id"] == "p1"
+
+    @pytest.mark.asyncio
+    async def test_get_neighbors(self, backend):
+        """Direction and edge type filters match NetworkXBackend."""
+        await backend.create_node(Person(id="p1"))
+        await backend.create_node(Company(id="c1"))
+        await backend.create_node(Address(id="a1"))
+        await backend.create_edge(DirectsEdge(id="e1", from_id="p1", to_id="c1", role="vd"))
+        await backend.create_edge(RegisteredAtEdge(id="e2", from_id="c1", to_id="a1"))
+
+        assert len(await backend.get_neighbors("c1")) == 2
+        out = await backend.get_neighbors("c1", direction="out")
+        assert [n["m"]["id"] for n in out] == ["a1"]
+        inc = await backend.get_neighbors("c1", edge_types=["DirectsEdge"], direction="in")
+        assert inc[0]["edge"]["role"] == "vd"
+        assert inc[0]["edge"]["from_id"] == "p1"
+        assert await backend.get_neighbors("c1", edge_types=["OwnsEdge"]) == []
+
+    @pytest.mark.asyncio
+    async def test_metrics_match_networkx(self, backend):
+        """Degree, PageRank, exact betweenness and clustering agree with NetworkX."""
+        edges = _random_edges()
+        await _build(backend, edges)
+        reference = NetworkXBackend()
+        await _build(reference, edges)
+
+        ours = backend.compute_centrality(betweenness_samples=None)
+        theirs = reference.compute_centrality()
+
+        for metric in ("degree", "betweenness", "pagerank", "clustering"):
+            for node_id, value in theirs[metric].items():
+                assert ours[metric][node_id] == pytest.approx(value, abs=1e-5), metric
+
+    @pytest.mark.asyncio
+    async def test_connected_components(self, backend):
+        """Weak components match NetworkX."""
+        edges = [("a", "b"), ("b", "c"), ("d", "e"), ("f", "f")]
+        await _build(backend, edges)
+
+        components = backend.connected_components()
+        expected = nx.connected_components(nx.Graph(edges))
+        assert sorted(map(sorted, components)) == sorted(map(sorted, expected))
+
+    @pytest.mark.asyncio
+    async def test_sampled_betweenness_is_bounded(self, backend):
+        """Sampled betweenness runs on k sources and returns finite scores."""
+        await _build(backend, _random_edges(n=200, m=600))
+
+        scores = backend.betweenness_centrality(k=10)
+        assert len(scores) == backend.node_count
+        assert (scores >= 0).all()
+
+
+class TestGraphClientCompact:
+    """GraphClient integration with the compact backend."""
+
+    @pytest.mark.asyncio
+    async def test_client_algorithms(self):
+        client = create_graph_client("compact")
+        assert isinstance(client.backend, CompactGraphBackend)
+
+        async with client:
+            await _build(client.backend, [("a", "b"), ("c", "d")])
+            assert len(client.find_connected_components()) == 2
+            assert set(client.compute_centrality()["pagerank"]) == {"a", "b", "c", "d"}
+
+            stats = await client.get_statistics()
+            assert stats["companies"] == 4
+            assert stats["edges"] == 2
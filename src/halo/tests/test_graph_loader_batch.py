@@ -0,0 +1,188 @@
+"""
+Tests for concurrent batch loading in GraphLoader and BolagsverketHVDAdapter.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from halo.graph.client import GraphClient, NetworkXBackend
+from halo.graph.compact_backend import CompactGraphBackend
+from halo.ingestion.base_adapter import IngestionRecord
+from halo.ingestion.bolagsverket_hvd import BolagsverketHVDAdapter
+from halo.ingestion.graph_loader import GraphLoader
+from halo.ingestion.rate_limiter import RateLimiter, RateLimitConfig
+
+
+def _raw(orgnr, city="Stockholm", directors=0):
+    return {
+        "organisationsidentitet": {"identitetsbeteckning": orgnr},
+        "organisationsnamn": {"organisationsnamnLista": [{"namn": f"Bolag {orgnr} AB"}]},
+        "verksamOrganisation": {"kod": "JA"},
+        "postadressOrganisation": {
+            "postadress": {"utdelningsadress": "Storgatan 1", "postnummer": "11122", "postort": city}
+        },
+        "funktionarer": {
+            "styrelse": [{"person": {"namn": f"Person {orgnr}-{i}"}} for i in range(directors)]
+        },
+    }
+
+
+class FakeAdapter(BolagsverketHVDAdapter):
+    """Adapter answering from a dict, tracking concurrent requests."""
+
+    def __init__(self, companies, delay=0.01, fail=()):
+        super().__init__(client_id="id", client_secret="secret", base_url="http://unused")
+        self.companies = companies
+        self.delay = delay
+        self.fail = set(fail)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    async def fetch_company(self, orgnr):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if orgnr in self.fail:
+                raise RuntimeError("upstream error")
+            raw = self.companies.get(orgnr)
+            if raw is None:
+                return None
+            return IngestionRecord(
+                source="bolagsverket_hvd", source_id=orgnr, entity_type="company",
+                raw_data=raw, fetched_at=datetime.utcnow(),
+            )
+        finally:
+            self.in_flight -= 1
+
+
+class CountingClient(GraphClient):
+    """GraphClient counting bulk lookups and per-company lookups."""
+
+    def __init__(self, backend):
+        super().__init__(backend)
+        self.bulk_lookups = 0
+        self.single_lookups = 0
+
+    async def find_companies_by_orgnrs(self, orgnrs):
+        self.bulk_lookups += 1
+        return await super().find_companies_by_orgnrs(orgnrs)
+
+    async def find_company_by_orgnr(self, orgnr):
+        self.single_lookups += 1
+        return await super().find_company_by_orgnr(orgnr)
+
+
+ORGNRS = [f"55{i:08d}" for i in range(40)]
+
+
+class TestFetchCompanyRecords:
+    """Tests for the adapter's bounded concurrent fetch."""
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency_and_order(self):
+        adapter = FakeAdapter({o: _raw(o) for o in ORGNRS[::2]}, fail=[ORGNRS[4]])
+        try:
+            records = await adapter.fetch_company_records(ORGNRS + [ORGNRS[0]], concurrency=5)
+        finally:
+            await adapter.close()
+
+        assert list(records) == [o for o in ORGNRS[::2] if o != ORGNRS[4]]
+        assert adapter.calls == len(ORGNRS)
+        assert adapter.max_in_flight == 5
+
+    @pytest.mark.asyncio
+    async def test_concurrency_capped_by_rate_budget(self):
+        adapter = FakeAdapter({})
+        adapter.rate_limiter = RateLimiter(RateLimitConfig(requests_per_window=3, window_seconds=1.0))
+        try:
+            assert adapter.batch_concurrency() == 3
+            assert adapter.batch_concurrency(50) == 3
+            adapter.rate_limiter = RateLimiter(RateLimitConfig(requests_per_window=100))
+            assert adapter.batch_concurrency() == adapter.MAX_CONCURRENCY
+        finally:
+            await adapter.close()
+
+    @pytest.mark.asyncio
+    async def test_parsed_batch(self):
+        adapter = FakeAdapter({o: _raw(o) for o in ORGNRS[:3]})
+        try:
+            parsed = await adapter.fetch_companies_batch(ORGNRS[:5])
+        finally:
+            await adapter.close()
+
+        assert [p.orgnummer for p in parsed] == ORGNRS[:3]
+        assert parsed[0].name == f"Bolag {ORGNRS[0]} AB"
+
+
+class TestLoadCompaniesBatch:
+    """Tests for GraphLoader batch loading."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("backend_cls", [NetworkXBackend, CompactGraphBackend])
+    async def test_matches_sequential_load(self, backend_cls):
+        companies = {o: _raw(o, city=f"Ort {i % 4}", directors=i % 3) for i, o in enumerate(ORGNRS)}
+        batch_loader = GraphLoader(CountingClient(backend_cls()), FakeAdapter(companies), write_batch_size=7)
+        single_loader = GraphLoader(GraphClient(backend_cls()), FakeAdapter(companies))
+
+        results = await batch_loader.load_companies_batch(ORGNRS + ["5599999999"])
+        expected = [await single_loader.load_company_from_bolagsverket(o) for o in ORGNRS]
+
+        assert [r.entity_id for r in results] == [r.entity_id for r in expected]
+        assert [r.edges_created for r in results] == [r.edges_created for r in expected]
+        assert all(r.created for r in results)
+        assert await batch_loader.graph.get_statistics() == await single_loader.graph.get_statistics()
+        assert batch_loader.graph.bulk_lookups == 6
+        assert batch_loader.graph.single_lookups == 0
+        assert len(batch_loader._address_cache) == 4
+
+        await batch_loader.bolagsverket.close()
+        await single_loader.bolagsverket.close()
+
+    @pytest.mark.asyncio
+    async def test_existing_companies_are_updates(self):
+        companies = {o: _raw(o) for o in ORGNRS[:10]}
+        loader = GraphLoader(GraphClient(NetworkXBackend()), FakeAdapter(companies))
+
+        await loader.load_companies_batch(ORGNRS[:4])
+        results = await loader.load_companies_batch(ORGNRS[:10])
+
+        assert [r.created for r in results] == [False] * 4 + [True] * 6
+        assert loader.batch_stats["updated"] == 4
+        addresses = (await loader.graph.get_statistics())["addresses"]
+        assert addresses == 1
+        await loader.bolagsverket.close()
+
+    @pytest.mark.asyncio
+    async def test_stage_metrics(self):
+        companies = {o: _raw(o, directors=2) for o in ORGNRS}
+        adapter = FakeAdapter(companies, fail=ORGNRS[:2])
+        loader = GraphLoader(GraphClient(NetworkXBackend()), adapter, write_batch_size=10)
+
+        results = await loader.load_companies_batch(ORGNRS)
+        stats = loader.batch_stats
+
+        assert stats["requested"] == 40
+        assert stats["fetched"] == stats["loaded"] == len(results) == 38
+        assert stats["edges_written"] == 38 * 3
+        assert stats["nodes_written"] == 38 + 1 + 38 * 2
+        for stage in ("fetch", "transform", "write"):
+            assert stats[f"{stage}_rows_per_second"] > 0
+        assert adapter.max_in_flight == adapter.batch_concurrency()
+        await adapter.close()
+
+    @pytest.mark.asyncio
+    async def test_networkx_orgnr_index(self):
+        backend = NetworkXBackend()
+        loader = GraphLoader(GraphClient(backend), FakeAdapter({o: _raw(o) for o in ORGNRS[:3]}))
+        await loader.load_companies_batch(ORGNRS[:3])
+
+        found = await backend.find_by_orgnrs([ORGNRS[2], "missing", ORGNRS[0]])
+
+        assert list(found) == [ORGNRS[2], ORGNRS[0]]
+        assert (await backend.find_by_orgnr(ORGNRS[1]))["id"] == f"company-{ORGNRS[1]}"
+        await loader.bolagsverket.close()
@@ -0,0 +1,250 @@
+"""
+Tests for the versioned graph metrics cache.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from halo.graph.client import GraphClient, NetworkXBackend
+from halo.graph.compact_backend import CompactGraphBackend
+from halo.graph.edges import OwnsEdge
+from halo.graph.metrics_cache import GraphMetricsCache
+from halo.graph.schema import Company
+
+
+EDGES = [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d"), ("d", "e")]
+
+
+async def _build(backend, edges=EDGES):
+    for node_id in sorted({n for e in edges for n in e}):
+        await backend.create_node(Company(id=node_id))
+    for i, (a, b) in enumerate(edges):
+        await backend.create_edge(OwnsEdge(id=f"e{i}", from_id=a, from_type="company", to_id=b))
+
+
+class CountingBackend(NetworkXBackend):
+    """NetworkXBackend that counts full centrality computations."""
+
+    def __init__(self):
+        super().__init__()
+        # Shared with frozen copies, which run the computations
+        self._computations = [0]
+
+    @property
+    def computations(self):
+        return self._computations[0]
+
+    def compute_centrality(self):
+        self._computations[0] += 1
+        return super().compute_centrality()
+
+
+class PausingMixin:
+    """Pauses the metrics computation until the test lets it continue."""
+
+    resume = None
+
+    def pause(self):
+        self.started = threading.Event()
+        self.resume = threading.Event()
+
+    def _wait(self):
+        if self.resume is None:
+            return
+        self.started.set()
+        assert self.resume.wait(5)
+
+
+class PausingNetworkXBackend(PausingMixin, NetworkXBackend):
+    def compute_centrality(self):
+        self._wait()
+        return super().compute_centrality()
+
+
+class PausingCompactBackend(PausingMixin, CompactGraphBackend):
+    def compute_centrality_arrays(self, *args, **kwargs):
+        self._wait()
+        return super().compute_centrality_arrays(*args, **kwargs)
+
+
+class FlakyBackend(NetworkXBackend):
+    """Backend without frozen_copy whose first computations race a mutation."""
+
+    frozen_copy = None
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def compute_centrality(self):
+        if self.failures:
+            self.failures -= 1
+            self.version += 1
+            raise RuntimeError("dictionary changed size during iteration")
+        return super().compute_centrality()
+
+
+class TestGraphMetricsCache:
+    """Tests for per-version metric snapshots."""
+
+    @pytest.mark.asyncio
+    async def test_matches_compute_centrality(self):
+        backend = NetworkXBackend()
+        await _build(backend)
+        cache = GraphMetricsCache(backend)
+        expected = backend.compute_centrality()
+
+        for node_id in "abcde":
+            metrics = await cache.get(node_id)
+            for name in ("degree", "betweenness", "pagerank", "clustering"):
+                assert metrics[name] == pytest.approx(expected[name][node_id])
+            assert metrics["stale"] is False
+            assert metrics["graph_version"] == backend.version
+            assert metrics["computed_at"]
+
+    @pytest.mark.asyncio
+    async def test_computed_once_per_version(self):
+        """Repeated lookups reuse the snapshot until the graph changes."""
+        backend = CountingBackend()
+        await _build(backend)
+        cache = GraphMetricsCache(backend)
+
+        for node_id in "abcde":
+            await cache.get(node_id)
+        assert backend.computations == 1
+
+        await backend.create_edge(OwnsEdge(id="extra", from_id="e", from_type="company", to_id="a"))
+        metrics = await cache.get("e")
+        assert backend.computations == 2
+        assert metrics["graph_version"] == backend.version
+        assert metrics["betweenness"] > 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_entity_gets_zeros(self):
+        backend = NetworkXBackend()
+        await _build(backend)
+        metrics = await GraphMetricsCache(backend).get("missing")
+
+        assert metrics["degree"] == 0.0
+        assert metrics["pagerank"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_serves_stale(self):
+        """With background refresh, a stale snapshot is served while recomputing."""
+        backend = CountingBackend()
+        await _build(backend)
+        cache = GraphMetricsCache(backend, refresh_in_background=True)
+        first = await cache.get("a")
+
+        await backend.create_node(Company(id="f"))
+        stale = await cache.get("a")
+        assert stale["stale"] is True
+        assert stale["computed_at"] == first["computed_at"]
+
+        await cache._refresh_task
+        fresh = await cache.get("f")
+        assert fresh["stale"] is False
+        assert backend.computations == 2
+
+    @pytest.mark.asyncio
+    async def test_compact_backend_arrays(self):
+        """The compact backend is served from a frozen copy of its node index."""
+        backend = CompactGraphBackend()
+        await _build(backend)
+        cache = GraphMetricsCache(backend)
+
+        metrics = await cache.get("c")
+        assert cache.snapshot.index == {n: backend.node_index(n) for n in "abcde"}
+        assert cache.snapshot.index is not backend.node_index_map()
+        assert metrics["degree"] == pytest.approx(backend.compute_centrality()["degree"]["c"])
+
+        await backend.close()
+        assert cache.is_stale()
+
+    @pytest.mark.asyncio
+    async def test_stale_compact_snapshot_after_rebuild(self):
+        """A stale snapshot keeps answering for the graph it was computed on."""
+        backend = CompactGraphBackend()
+        await _build(backend)
+        expected = backend.compute_centrality()
+        cache = GraphMetricsCache(backend, refresh_in_background=True)
+        await cache.get("a")
+
+        # Rebuild with the nodes in a different index order
+        await backend.close()
+        for node_id in "xedcba":
+            await backend.create_node(Company(id=node_id))
+        await backend.create_edge(OwnsEdge(id="y", from_id="x", from_type="company", to_id="a"))
+
+        for node_id in "abcde":
+            metrics = await cache.get(node_id)
+            assert metrics["stale"] is True
+            for name in ("degree", "betweenness", "pagerank", "clustering"):
+                assert metrics[name] == pytest.approx(expected[name][node_id])
+        assert (await cache.get("x"))["degree"] == 0.0
+
+        await cache._refresh_task
+        assert (await cache.get("x"))["stale"] is False
+
+
+class TestConcurrentMutation:
+    """Graph mutations while metrics are computed in the worker thread."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("backend_class", [PausingNetworkXBackend, PausingCompactBackend])
+    async def test_worker_sees_frozen_graph(self, backend_class):
+        backend = backend_class()
+        await _build(backend)
+        expected = backend.compute_centrality()
+        version = backend.version
+        backend.pause()
+
+        cache = GraphMetricsCache(backend)
+        lookup = asyncio.create_task(cache.get("c"))
+        assert await asyncio.to_thread(backend.started.wait, 5)
+
+        for i in range(200):
+            await backend.create_node(Company(id=f"n{i}"))
+            await backend.create_edge(OwnsEdge(id=f"x{i}", from_id="c", from_type="company", to_id=f"n{i}"))
+        backend.resume.set()
+
+        metrics = await lookup
+        assert metrics["graph_version"] == version
+        assert metrics["stale"] is True
+        assert metrics["degree"] == pytest.approx(expected["degree"]["c"])
+        assert metrics["betweenness"] == pytest.approx(expected["betweenness"]["c"])
+
+    @pytest.mark.asyncio
+    async def test_foreground_retries_when_graph_changed(self):
+        backend = FlakyBackend(failures=GraphMetricsCache.MAX_ATTEMPTS)
+        await _build(backend)
+
+        metrics = await GraphMetricsCache(backend).get("c")
+        assert metrics["stale"] is False
+        assert metrics["graph_version"] == backend.version
+        assert backend.failures == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_on_unchanged_graph_propagate(self, monkeypatch):
+        backend = FlakyBackend(failures=0)
+        await _build(backend)
+        monkeypatch.setattr(backend, "compute_centrality", lambda: {}["missing"])
+
+        with pytest.raises(KeyError):
+            await GraphMetricsCache(backend).get("c")
+
+
+class TestEntityWithContext:
+    """Tests for GraphClient.get_entity_with_context."""
+
+    @pytest.mark.asyncio
+    async def test_network_metrics_cached(self):
+        client = GraphClient(CountingBackend())
+        await _build(client.backend)
+
+        entities = await asyncio.gather(*(client.get_entity_with_context(n) for n in "abc"))
+
+        assert all("computed_at" in e["network_metrics"] for e in entities)
+        assert client.backend.computations == 1
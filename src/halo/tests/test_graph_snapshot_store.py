@@ -0,0 +1,152 @@
+"""
+Tests for the append-only graph snapshot store.
+"""
+
+import networkx as nx
+import pytest
+
+from halo.graph.snapshot_store import GraphDelta, GraphSnapshotReader, GraphSnapshotStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return GraphSnapshotStore(tmp_path / "graph.store", max_segments=3)
+
+
+def _delta(store, nodes=(), edges=()):
+    with store.open_reader() as base:
+        delta = GraphDelta(base)
+        for node_id, attrs in nodes:
+            delta.add_node(node_id, **attrs)
+        for from_id, to_id, attrs in edges:
+            delta.add_edge(from_id, to_id, **attrs)
+    return delta
+
+
+class TestGraphSnapshotStore:
+    """Tests for GraphSnapshotStore and GraphSnapshotReader."""
+
+    def test_empty_store(self, store):
+        """A new store opens with no data."""
+        assert not store.exists()
+        with store.open_reader() as reader:
+            assert reader.number_of_nodes() == 0
+            assert list(reader.nodes()) == []
+
+    def test_append_and_lookup(self, store):
+        """Appended nodes and edges are served from the index."""
+        store.append(_delta(
+            store,
+            nodes=[("company-1", {"_type": "Company", "orgnr": "5560125790"}),
+                   ("person-a", {"_type": "Person"})],
+            edges=[("person-a", "company-1", {"_type": "director", "role": "VD"})],
+        ))
+
+        with store.open_reader() as reader:
+            assert reader.version == 1
+            assert "company-1" in reader.nodes
+            assert "company-2" not in reader.nodes
+            assert reader.nodes["company-1"]["orgnr"] == "5560125790"
+            assert list(reader.out_edges("person-a", data=True)) == [
+                ("person-a", "company-1", {"_type": "director", "role": "VD"})
+            ]
+            assert [u for u, _ in reader.in_edges("company-1")] == ["person-a"]
+
+    def test_node_upserts_merge_across_segments(self, store):
+        """Later segments override attributes and node counts stay unique."""
+        store.append(_delta(store, nodes=[("c1", {"name": "Old", "city": "Malmö"})]))
+        store.append(_delta(store, nodes=[("c1", {"name": "New"}), ("c2", {})]))
+
+        with store.open_reader() as reader:
+            assert reader.nodes["c1"] == {"name": "New", "city": "Malmö"}
+            assert reader.number_of_nodes() == 2
+            assert sorted(reader.nodes()) == ["c1", "c2"]
+
+    def test_delta_membership_uses_base(self, store):
+        """GraphDelta.__contains__ sees both pending and stored nodes."""
+        store.append(_delta(store, nodes=[("p1", {})]))
+        delta = _delta(store, nodes=[("p2", {})])
+        with store.open_reader() as base:
+            delta.base = base
+            assert "p1" in delta
+            assert "p2" in delta
+            assert "p3" not in delta
+
+    def test_compaction(self, store):
+        """Exceeding max_segments compacts into a single segment."""
+        for i in range(4):
+            store.append(_delta(
+                store,
+                nodes=[(f"n{i}", {"i": i}), ("hub", {"seen": i})],
+                edges=[(f"n{i}", "hub", {})],
+            ))
+
+        with store.open_reader() as reader:
+            assert len(reader.manifest["segments"]) == 1
+            assert reader.number_of_nodes() == 5
+            assert reader.number_of_edges() == 4
+            assert reader.nodes["hub"] == {"seen": 3}
+            assert len(list(reader.in_edges("hub"))) == 4
+
+    def test_compaction_keeps_previous_segments(self, store):
+        """A manifest loaded before a compaction can still be opened after it."""
+        for i in range(3):
+            store.append(_delta(store, nodes=[(f"n{i}", {})]))
+        old_manifest = store._read_manifest()
+
+        store.compact()
+        with GraphSnapshotReader(store.root, old_manifest) as reader:
+            assert sorted(reader.nodes()) == ["n0", "n1", "n2"]
+
+        # The next compaction deletes them
+        for i in range(3, 5):
+            store.append(_delta(store, nodes=[(f"n{i}", {})]))
+        store.compact()
+        with pytest.raises(FileNotFoundError):
+            GraphSnapshotReader(store.root, old_manifest)
+        assert len(list(store.root.glob("seg-*.nodes.jsonl"))) == 4
+
+    def test_open_rereads_manifest_of_deleted_segments(self, store, monkeypatch):
+        """A reader racing two compactions retries with the current manifest."""
+        for i in range(3):
+            store.append(_delta(store, nodes=[(f"n{i}", {})]))
+        stale = store._read_manifest()
+        store.compact()
+        store.append(_delta(store, nodes=[("n3", {})]))
+        store.compact()
+        current = store._read_manifest()
+
+        manifests = iter([stale, current])
+        monkeypatch.setattr("halo.graph.snapshot_store.json.load", lambda f: next(manifests))
+        with store.open_reader() as reader:
+            assert reader.version == current["version"]
+            assert len(reader.nodes) == 4
+
+    def test_reader_snapshot_isolation(self, store):
+        """An open reader keeps its version while the writer appends."""
+        store.append(_delta(store, nodes=[("a", {})]))
+        reader = store.open_reader()
+        store.append(_delta(store, nodes=[("b", {})]))
+
+        assert "b" not in reader.nodes
+        reader.close()
+        with GraphSnapshotReader.open(store.root) as latest:
+            assert "b" in latest.nodes
+
+    def test_import_networkx_roundtrip(self, store):
+        """A MultiDiGraph round-trips, including parallel edges."""
+        graph = nx.MultiDiGraph()
+        graph.add_node("x", _type="Company")
+        graph.add_node("y", _type="Person")
+        graph.add_edge("y", "x", role="a")
+        graph.add_edge("y", "x", role="b")
+
+        store.import_graph(graph)
+        with store.open_reader() as reader:
+            restored = reader.to_networkx()
+        assert dict(restored.nodes(data=True)) == dict(graph.nodes(data=True))
+        assert restored.number_of_edges() == 2
+
+        store.import_graph(nx.MultiDiGraph([("p", "q")]), replace=True)
+        with store.open_reader() as reader:
+            assert sorted(reader.nodes()) == ["p", "q"]
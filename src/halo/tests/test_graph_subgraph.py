@@ -0,0 +1,201 @@
+"""
+Tests for induced-subgraph extraction and the /graph/full endpoint.
+"""
+
+import random
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from halo.api.routes.graph import get_full_graph
+from halo.graph.client import GraphClient, NetworkXBackend, label_components
+from halo.graph.compact_backend import CompactGraphBackend
+from halo.graph.edges import DirectsEdge, OwnsEdge
+from halo.graph.schema import Company, Person
+
+
+async def _populate(backend, companies=30, persons=20, edges=60, seed=11):
+    rng = random.Random(seed)
+    for i in range(companies):
+        await backend.create_node(Company(
+            id=f"c{i}", names=[{"name": f"Bolag {i} AB"}], shell_score=rng.random(),
+        ))
+    for i in range(persons):
+        await backend.create_node(Person(id=f"p{i}", names=[{"name": f"Person {i}"}]))
+    for i in range(edges):
+        if i % 2:
+            await backend.create_edge(DirectsEdge(
+                id=f"d{i}", from_id=f"p{rng.randrange(persons)}", to_id=f"c{rng.randrange(companies)}",
+            ))
+        else:
+            await backend.create_edge(OwnsEdge(
+                id=f"o{i}", from_id=f"c{rng.randrange(companies)}", from_type="company",
+                to_id=f"c{rng.randrange(companies)}",
+            ))
+
+
+def _partition(subgraph):
+    groups = {}
+    for node_id, label in subgraph["components"].items():
+        groups.setdefault(label, set()).add(node_id)
+    return {frozenset(g) for g in groups.values()}
+
+
+class FakeAuditRepo:
+    def __init__(self):
+        self.entries = []
+
+    async def log(self, **kwargs):
+        self.entries.append(kwargs)
+
+
+class TestInducedSubgraph:
+    """Tests for backend induced_subgraph implementations."""
+
+    @pytest.fixture
+    async def backends(self):
+        nx_backend = NetworkXBackend()
+        compact = CompactGraphBackend()
+        await _populate(nx_backend)
+        await _populate(compact)
+        return nx_backend, compact
+
+    @pytest.mark.asyncio
+    async def test_backends_agree(self, backends):
+        nx_backend, compact = backends
+        ids = [f"c{i}" for i in range(0, 30, 2)] + [f"p{i}" for i in range(10)] + ["missing"]
+
+        ours = await compact.induced_subgraph(ids)
+        theirs = await nx_backend.induced_subgraph(ids)
+
+        assert [n["id"] for n in ours["nodes"]] == [n["id"] for n in theirs["nodes"]]
+        assert sorted(e["id"] for e in ours["edges"]) == sorted(e["id"] for e in theirs["edges"])
+        assert _partition(ours) == _partition(theirs)
+        wanted = set(ids)
+        assert all(e["from_id"] in wanted and e["to_id"] in wanted for e in ours["edges"])
+
+    @pytest.mark.asyncio
+    async def test_components_are_global(self):
+        """Two selected nodes joined through an unselected node share a label."""
+        backend = NetworkXBackend()
+        for node_id in "abc":
+            await backend.create_node(Company(id=node_id))
+        await backend.create_edge(OwnsEdge(id="e1", from_id="a", from_type="company", to_id="b"))
+        await backend.create_edge(OwnsEdge(id="e2", from_id="b", from_type="company", to_id="c"))
+
+        subgraph = await backend.induced_subgraph(["a", "c"])
+
+        assert subgraph["edges"] == []
+        assert subgraph["components"]["a"] == subgraph["components"]["c"]
+        assert subgraph["component_sizes"][subgraph["components"]["a"]] == 3
+
+    @pytest.mark.asyncio
+    async def test_component_labels_cached_per_version(self):
+        backend = NetworkXBackend()
+        await _populate(backend)
+        first = backend.component_labels()
+        assert backend.component_labels()[0] is first[0]
+
+        await backend.create_node(Company(id="new"))
+        labels, sizes = backend.component_labels()
+        assert sizes[labels["new"]] == 1
+        assert labels is not first[0]
+
+    @pytest.mark.asyncio
+    async def test_fallback_matches(self, backends):
+        """The per-node GraphBackend fallback agrees with the native path."""
+        nx_backend, _ = backends
+        ids = [f"c{i}" for i in range(15)] + [f"p{i}" for i in range(5)]
+
+        native = await nx_backend.induced_subgraph(ids)
+        fallback = await super(NetworkXBackend, nx_backend).induced_subgraph(ids)
+
+        assert sorted(e["id"] for e in fallback["edges"]) == sorted(e["id"] for e in native["edges"])
+
+    def test_label_components(self):
+        labels, sizes = label_components(
+            ["a", "b", "c", "d"],
+            [{"from_id": "a", "to_id": "b"}, {"from_id": "c", "to_id": "b"}],
+        )
+        assert labels["a"] == labels["b"] == labels["c"] != labels["d"]
+        assert sorted(sizes.values()) == [1, 3]
+
+
+class TestListNodes:
+    """Tests for ranked node listing."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("backend_cls", [NetworkXBackend, CompactGraphBackend])
+    async def test_ranked_by_degree(self, backend_cls):
+        backend = backend_cls()
+        await _populate(backend)
+
+        nodes = await backend.list_nodes(10, order_by="degree")
+
+        assert len(nodes) == 10
+        degrees = [n["degree"] for n in nodes]
+        assert degrees == sorted(degrees, reverse=True)
+        assert nodes[0]["name"]
+
+    @pytest.mark.asyncio
+    async def test_backends_list_same_summaries(self):
+        nx_backend, compact = NetworkXBackend(), CompactGraphBackend()
+        await _populate(nx_backend)
+        await _populate(compact)
+
+        for order_by in (None, "degree", "shell_score"):
+            ours = await compact.list_nodes(25, order_by=order_by)
+            theirs = await nx_backend.list_nodes(25, order_by=order_by)
+            assert ours == theirs
+
+
+class TestFullGraphEndpoint:
+    """Tests for get_full_graph against an in-memory graph."""
+
+    async def _call(self, client, **params):
+        return await get_full_graph(
+            graph=client,
+            audit_repo=FakeAuditRepo(),
+            user=SimpleNamespace(id="u1", username="analyst"),
+            **{"max_nodes": 200, "min_shell_score": 0, "mode": "connected", **params},
+        )
+
+    @pytest.mark.asyncio
+    async def test_clusters_and_edges(self):
+        client = GraphClient(CompactGraphBackend())
+        await _populate(client.backend)
+
+        response = await self._call(client, max_nodes=40)
+
+        node_ids = {n["id"] for n in response.nodes}
+        assert len(node_ids) == 40
+        assert all(e["source"] in node_ids and e["target"] in node_ids for e in response.edges)
+        clustered = {n for c in response.clusters for n in c["nodes"]}
+        assert all(n["clusterId"] is not None for n in response.nodes if n["id"] in clustered)
+        sizes = [c["size"] for c in response.clusters]
+        assert sum(sizes) == len(clustered)
+        assert response.stats["displayed_edges"] == len(response.edges)
+
+    @pytest.mark.asyncio
+    async def test_high_risk_filter(self):
+        client = GraphClient(NetworkXBackend())
+        await _populate(client.backend)
+
+        response = await self._call(client, mode="high_risk", min_shell_score=0.5)
+
+        scores = [n["shellScore"] for n in response.nodes]
+        assert scores and all(s >= 0.5 for s in scores)
+        assert scores == sorted(scores, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_thousand_nodes_fast(self):
+        client = GraphClient(CompactGraphBackend())
+        await _populate(client.backend, companies=3000, persons=2000, edges=8000)
+
+        start = time.perf_counter()
+        response = await self._call(client, max_nodes=1000)
+        elapsed = time.perf_counter() - start
+
+        assert len(response.nodes) == 1000
+        assert elapsed < 1.0, f"/graph/full for 1000 nodes took {elapsed:.2f}s"
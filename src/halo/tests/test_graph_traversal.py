@@ -0,0 +1,232 @@
+"""
+Tests for frontier-batched graph traversal.
+"""
+
+import json
+import random
+
+import pytest
+
+from halo.graph.client import GraphBackend, GraphClient, Neo4jBackend, NetworkXBackend
+from halo.graph.compact_backend import CompactGraphBackend
+from halo.graph.edges import DirectsEdge, OwnsEdge
+from halo.graph.schema import Company, Person
+
+
+async def _populate(backend, seed=5):
+    rng = random.Random(seed)
+    for i in range(40):
+        await backend.create_node(Company(id=f"c{i:02d}"))
+    for i in range(25):
+        await backend.create_node(Person(id=f"p{i:02d}"))
+    for i in range(120):
+        if i % 3:
+            await backend.create_edge(OwnsEdge(
+                id=f"o{i}", from_id=f"c{rng.randrange(40):02d}", from_type="company",
+                to_id=f"c{rng.randrange(40):02d}", share=rng.randrange(1, 100),
+            ))
+        else:
+            await backend.create_edge(DirectsEdge(
+                id=f"d{i}", from_id=f"p{rng.randrange(25):02d}", to_id=f"c{rng.randrange(40):02d}",
+            ))
+    # A hub with many directors
+    await backend.create_node(Company(id="hub"))
+    for i in range(25):
+        await backend.create_edge(DirectsEdge(id=f"h{i}", from_id=f"p{i:02d}", to_id="hub"))
+
+
+class CountingBackend(NetworkXBackend):
+    """NetworkXBackend that records backend round-trips."""
+
+    def __init__(self):
+        super().__init__()
+        self.single_calls = 0
+        self.batch_calls = 0
+
+    async def get_neighbors(self, *args, **kwargs):
+        self.single_calls += 1
+        return await super().get_neighbors(*args, **kwargs)
+
+    async def get_neighbors_batch(self, *args, **kwargs):
+        self.batch_calls += 1
+        return await super().get_neighbors_batch(*args, **kwargs)
+
+
+async def _reference_expand(backend, seeds, hops, edge_types=None):
+    """Node-at-a-time expansion, as GraphClient did before batching."""
+    visited, nodes, edges, frontier = set(), {}, [], set(seeds)
+    for _ in range(hops):
+        next_frontier = set()
+        for node_id in frontier:
+            if node_id in visited:
+                continue
+            visited.add(node_id)
+            for neighbor in await backend.get_neighbors(node_id, edge_types=edge_types):
+                neighbor_id = neighbor["m"].get("id")
+                if neighbor_id:
+                    nodes[neighbor_id] = neighbor["m"]
+                    edges.append((node_id, neighbor_id, neighbor["edge"]["id"]))
+                    if neighbor_id not in visited:
+                        next_frontier.add(neighbor_id)
+        frontier = next_frontier
+    return set(nodes), sorted(edges)
+
+
+def _ids(batch):
+    return {k: [n["edge"]["id"] for n in v] for k, v in batch.items()}
+
+
+class TestGetNeighborsBatch:
+    """Tests for backend get_neighbors_batch implementations."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("direction", ["out", "in", "both"])
+    @pytest.mark.parametrize("edge_types", [None, ["OwnsEdge"]])
+    async def test_matches_single_calls(self, direction, edge_types):
+        """Batched results equal per-node get_neighbors, in the same order."""
+        ids = ["c00", "c05", "p03", "hub", "missing", "c05"]
+        for backend in (NetworkXBackend(), CompactGraphBackend()):
+            await _populate(backend)
+            batch = await backend.get_neighbors_batch(ids, edge_types=edge_types, direction=direction)
+
+            assert list(batch) == ["c00", "c05", "p03", "hub", "missing"]
+            for node_id, neighbors in batch.items():
+                single = await backend.get_neighbors(node_id, edge_types=edge_types, direction=direction)
+                assert [n["edge"]["id"] for n in neighbors] == [n["edge"]["id"] for n in single]
+                assert [n["m"].get("id") for n in neighbors] == [n["m"].get("id") for n in single]
+
+    @pytest.mark.asyncio
+    async def test_backends_agree_with_limit(self):
+        nx_backend, compact = NetworkXBackend(), CompactGraphBackend()
+        await _populate(nx_backend)
+        await _populate(compact)
+        ids = ["hub", "c01", "c02", "p00"]
+
+        ours = await compact.get_neighbors_batch(ids, limit_per_node=3)
+        theirs = await nx_backend.get_neighbors_batch(ids, limit_per_node=3)
+        fallback = await GraphBackend.get_neighbors_batch(nx_backend, ids, limit_per_node=3)
+
+        assert _ids(ours) == _ids(theirs) == _ids(fallback)
+        assert len(ours["hub"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_neo4j_single_unwind_query(self):
+        backend = Neo4jBackend("bolt://unused", "neo4j", "unused")
+        calls = []
+
+        async def execute(query, params=None):
+            calls.append((query, params))
+            return [{
+                "node_id": "c1",
+                "rows": [{
+                    "m": {"id": "p1", "names": '[{"name": "Anna"}]'},
+                    "labels": ["Person"],
+                    "edge_type": "DIRECTS",
+                    "edge": {"id": "e1"},
+                }],
+            }]
+
+        backend.execute = execute
+        batch = await backend.get_neighbors_batch(["c1", "c2"], edge_types=["DirectsEdge"], direction="in")
+
+        assert len(calls) == 1
+        query, params = calls[0]
+        assert "UNWIND $ids" in query and ":DIRECTS" in query
+        assert params == {"ids": ["c1", "c2"], "limit": None}
+        assert batch["c2"] == []
+        assert batch["c1"][0]["m"]["_type"] == "Person"
+        assert batch["c1"][0]["m"]["names"] == [{"name": "Anna"}]
+
+    @pytest.mark.asyncio
+    async def test_age_single_cypher_call(self):
+        from halo.graph.age_backend import AgeBackend
+
+        backend = AgeBackend("postgresql://unused")
+        calls = []
+
+        async def fetch(query, params):
+            calls.append((query, params))
+            return [
+                {"source": "c1", "props": {"id": f"p{i}"}, "label": "Person",
+                 "edge_type": "DIRECTS", "edge": {"id": f"e{i}"}}
+                for i in range(4)
+            ]
+
+        backend._fetch = fetch
+        batch = await backend.get_neighbors_batch(["c1"], limit_per_node=2)
+
+        assert len(calls) == 1
+        assert "UNWIND $ids" in calls[0][0]
+        assert [n["m"]["id"] for n in batch["c1"]] == ["p0", "p1"]
+        assert json.dumps(calls[0][1]) == '{"ids": ["c1"]}'
+
+
+class TestBatchedTraversal:
+    """Tests for GraphClient traversal helpers."""
+
+    @pytest.mark.asyncio
+    async def test_expand_network_matches_reference(self):
+        backend = CountingBackend()
+        await _populate(backend)
+        client = GraphClient(backend)
+
+        result = await client.expand_network(["c00", "p01"], hops=3)
+
+        assert backend.batch_calls == 3
+        assert backend.single_calls == 0
+        nodes, edges = await _reference_expand(backend, ["c00", "p01"], 3)
+        assert set(result["nodes"]) == nodes
+        assert sorted((e["from"], e["to"], e["data"]["id"]) for e in result["edges"]) == edges
+        assert result["truncated"] is False
+
+    @pytest.mark.asyncio
+    async def test_expand_network_budgets(self):
+        client = GraphClient(CompactGraphBackend())
+        await _populate(client.backend)
+
+        first = await client.expand_network(["hub"], hops=2, max_nodes=10, max_edges=15)
+        again = await client.expand_network(["hub"], hops=2, max_nodes=10, max_edges=15)
+
+        assert len(first["nodes"]) <= 10
+        assert len(first["edges"]) <= 15
+        assert first["truncated"] is True
+        assert list(first["nodes"]) == list(again["nodes"])
+
+        capped = await client.expand_network(["hub"], hops=1, max_neighbors=5)
+        assert len(capped["edges"]) == 5
+
+    @pytest.mark.asyncio
+    async def test_multi_hop_neighbors(self):
+        backend = CountingBackend()
+        await _populate(backend)
+        client = GraphClient(backend)
+
+        neighbors = await client.get_neighbors("p02", hops=2)
+
+        assert backend.batch_calls == 2
+        ids = [n["m"]["id"] for n in neighbors]
+        assert len(ids) == len(set(ids))
+        assert "p02" not in ids
+        assert len(await client.get_neighbors("p02", hops=2, max_nodes=4)) == 4
+
+    @pytest.mark.asyncio
+    async def test_ownership_chain_one_call_per_level(self):
+        backend = CountingBackend()
+        for i in range(5):
+            await backend.create_node(Company(id=f"c{i}"))
+        await backend.create_node(Person(id="p"))
+        for i in range(4):
+            await backend.create_edge(OwnsEdge(
+                id=f"o{i}", from_id=f"c{i + 1}", from_type="company", to_id=f"c{i}", share=50,
+            ))
+        await backend.create_edge(OwnsEdge(id="op", from_id="p", from_type="person", to_id="c4"))
+        client = GraphClient(backend)
+
+        chain = await client.get_ownership_chain("c0")
+
+        assert [(e["depth"], e["owner_id"]) for e in chain] == [
+            (0, "c1"), (1, "c2"), (2, "c3"), (3, "c4"), (4, "p"),
+        ]
+        assert backend.batch_calls == 5
+        assert len(await client.get_ownership_chain("c0", max_edges=2)) == 2
+        assert len(await client.get_ownership_chain("c0", max_nodes=3)) == 3
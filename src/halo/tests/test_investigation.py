@@ -181,9 +181,9 @@ class TestCaseManager:
 class TestEvidenceCollector:
     """Tests for evidence collection and management."""
 
-    def test_add_evidence(self):
+    def test_add_evidence(self, tmp_path):
         """Should add evidence with metadata."""
-        collector = EvidenceCollector()
+        collector = EvidenceCollector(storage_path=tmp_path)
 
         evidence = collector.add_evidence(
             case_id=uuid4(),
@@ -198,9 +198,9 @@ class TestEvidenceCollector:
         assert evidence.hash is not None  # SHA-256 hash
         assert evidence.chain_of_custody is not None
 
-    def test_evidence_hash_integrity(self):
+    def test_evidence_hash_integrity(self, tmp_path):
         """Should verify evidence hash for integrity."""
-        collector = EvidenceCollector()
+        collector = EvidenceCollector(storage_path=tmp_path)
 
         content = b"Important document content"
         evidence = collector.add_evidence(
@@ -218,9 +218,9 @@ class TestEvidenceCollector:
         # Tampered content should fail
         assert not collector.verify_integrity(evidence, b"Modified content")
 
-    def test_chain_of_custody(self):
+    def test_chain_of_custody(self, tmp_path):
         """Should track chain of custody."""
-        collector = EvidenceCollector()
+        collector = EvidenceCollector(storage_path=tmp_path)
         case_id = uuid4()
         user1 = uuid4()
         user2 = uuid4()
@@ -240,9 +240,9 @@ class TestEvidenceCollector:
         updated = collector.get_evidence(evidence.id)
         assert len(updated.chain_of_custody) >= 2
 
-    def test_evidence_types(self):
+    def test_evidence_types(self, tmp_path):
         """Should support different evidence types."""
-        collector = EvidenceCollector()
+        collector = EvidenceCollector(storage_path=tmp_path)
         case_id = uuid4()
         user_id = uuid4()
 
@@ -0,0 +1,167 @@
+"""
+Tests for the compiled keyword lexicon and the components scored with it.
+"""
+
+import math
+import random
+import string
+import types
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def nlp(import_nlp):
+    return types.SimpleNamespace(
+        lexicon=import_nlp("lexicon"),
+        sentiment=import_nlp("sentiment"),
+        threat_vocab=import_nlp("threat_vocab"),
+    )
+
+
+SWEDISH_LETTERS = "åäöÅÄÖéÉüÜ"
+
+FILLER = (
+    "bolaget har sitt säte i stockholm och omsättningen ökade under året "
+    "enligt uppgift från banken skickades pengarna vidare till ett konto i utlandet"
+).split()
+
+
+def _random_texts(keywords, count=400, seed=11):
+    """Texts mixing filler words with keywords, inflected and compounded."""
+    rng = random.Random(seed)
+    keywords = sorted(keywords)
+    texts = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randrange(3, 40)):
+            if rng.random() < 0.3:
+                word = rng.choice(keywords)
+                word = rng.choice([word, word, word.capitalize(), word + "en", word + "arna", "livs" + word])
+            else:
+                word = rng.choice(FILLER)
+            words.append(word)
+        punctuation = rng.choice([" ", " ", ", ", ". ", "! "])
+        texts.append(punctuation.join(words))
+    return texts
+
+
+def _reference_sentiment(analyzer, text):
+    """Scores as computed before the lexicon: substring tests per keyword."""
+    text = text.lower()
+
+    def score(keywords):
+        found = [k for k in keywords if k in text]
+        if not found:
+            return 0.0, found
+        return min(1.0, math.log(len(found) + 1) / math.log(len(keywords) + 1) * 2), found
+
+    fear, _ = score(analyzer.FEAR_KEYWORDS)
+    violence, _ = score(analyzer.VIOLENCE_KEYWORDS)
+    urgency, _ = score(analyzer.URGENCY_KEYWORDS)
+    threat, _ = score(analyzer.THREAT_KEYWORDS)
+    positive = sum(1 for word in analyzer.POSITIVE_WORDS if word in text)
+    negative = sum(1 for word in analyzer.NEGATIVE_WORDS if word in text)
+    polarity = (positive - negative) / (positive + negative) if positive + negative else 0.0
+    return fear, violence, urgency, threat, polarity
+
+
+def _reference_vocab(detector, text):
+    """
+    Matches as found before the lexicon: one flashtext processor per category.
+
+    flashtext's default word characters are ASCII only, so "ansen" matched
+    inside "röansen"; the lexicon treats Swedish letters as word
+    characters, and so does this reference.
+    """
+    flashtext = pytest.importorskip("flashtext")
+    matches = []
+    for category in detector.get_categories():
+        processor = flashtext.KeywordProcessor(case_sensitive=False)
+        processor.set_non_word_boundaries(set(string.ascii_letters + string.digits + "_" + SWEDISH_LETTERS))
+        for keyword in detector.lexicon.keywords(f"vocab:{category}"):
+            processor.add_keyword(keyword)
+        for keyword, start, end in processor.extract_keywords(text, span_info=True):
+            severity = detector._severities.get(f"{category}:{keyword.lower()}", "medium")
+            matches.append((category, keyword, start, end, severity))
+    return sorted(matches)
+
+
+class TestLexicon:
+    """Tests for Lexicon.scan."""
+
+    def test_word_and_substring_modes(self, nlp):
+        lexicon = nlp.lexicon.Lexicon()
+        lexicon.add_category("vocab", ["knark", "hells angels"])
+        lexicon.add_category("stems", ["hota", "fara"], substring=True)
+
+        text = "Knarket och Hells  Angels hotade med livsfara"
+        matches = [(m.category, m.keyword, text[m.start:m.end]) for m in lexicon.scan(text)]
+
+        assert ("vocab", "hells angels", "Hells  Angels") in matches
+        assert ("stems", "hota", "hota") in matches
+        assert ("stems", "fara", "fara") in matches
+        # Whole tokens only in word mode
+        assert not any(m[1] == "knark" for m in matches)
+
+    def test_swedish_letters_are_word_characters(self, nlp):
+        lexicon = nlp.lexicon.Lexicon()
+        lexicon.add_category("slang", ["ansen", "röansen"])
+        assert [m.keyword for m in lexicon.scan("röansen och ansen")] == ["röansen", "ansen"]
+
+    def test_longest_match_wins(self, nlp):
+        lexicon = nlp.lexicon.Lexicon()
+        lexicon.add_category("money", ["svarta", "svarta pengar"])
+        matches = lexicon.scan("svarta pengar")
+        assert [m.keyword for m in matches] == ["svarta pengar"]
+
+    @pytest.mark.parametrize("substring", [False, True])
+    def test_equivalent_keywords_counted_once(self, nlp, substring):
+        lexicon = nlp.lexicon.Lexicon()
+        lexicon.add_category("fraud", ["id-kapning", "id kapning", "ID-kapning", "id-kapning "], substring=substring)
+        lexicon.add_category("other", ["id kapning"], substring=substring)
+
+        matches = lexicon.scan("Han utsattes för id-kapning igen")
+
+        assert sorted(m.category for m in matches) == ["fraud", "other"]
+
+    def test_scan_batch(self, nlp):
+        lexicon = nlp.lexicon.Lexicon()
+        lexicon.add_category("drugs", ["kokain"])
+        texts = ["kokain", "inget", "KOKAIN och kokain"]
+        assert lexicon.scan_batch(texts) == [lexicon.scan(t) for t in texts]
+
+
+class TestLexiconScoring:
+    """Sentiment and vocabulary results match the implementations the lexicon replaced."""
+
+    def test_sentiment_matches_substring_scoring(self, nlp):
+        analyzer = nlp.sentiment.SentimentAnalyzer()
+        keywords = set().union(*analyzer.CATEGORIES.values())
+        texts = _random_texts(keywords)
+
+        for text, result in zip(texts, analyzer.analyze_batch(texts)):
+            fear, violence, urgency, threat, polarity = _reference_sentiment(analyzer, text)
+            assert result.fear_score == pytest.approx(fear)
+            assert result.violence_score == pytest.approx(violence)
+            assert result.urgency_score == pytest.approx(urgency)
+            assert result.threat_score == pytest.approx(threat)
+            assert result.polarity == pytest.approx(polarity)
+
+    def test_vocabulary_matches_flashtext(self, nlp):
+        detector = nlp.threat_vocab.ThreatVocabularyDetector()
+        keywords = set().union(*(detector.lexicon.keywords(f"vocab:{c}") for c in detector.get_categories()))
+        texts = _random_texts(keywords, seed=5)
+
+        for text, found in zip(texts, detector.detect_batch(texts)):
+            expected = _reference_vocab(detector, text)
+            assert sorted((m.category, m.keyword, m.start, m.end, m.severity) for m in found) == expected
+
+    def test_vocabulary_risk_score(self, nlp):
+        detector = nlp.threat_vocab.ThreatVocabularyDetector()
+        text = "Han köpte kokain och heroin av en langare, betalade med bitcoin"
+        severities = sorted((m[4] for m in _reference_vocab(detector, text)), key=["high", "medium", "low"].index)
+        scores = {"low": 0.2, "medium": 0.5, "high": 1.0}
+        expected = min(1.0, sum(scores[s] / (i + 1) for i, s in enumerate(severities)) / 3.0)
+
+        assert detector.get_risk_score(text) == pytest.approx(expected)
@@ -0,0 +1,173 @@
+"""
+Tests for merging NER predictions across overlapping token windows.
+
+The model is not needed: windows, offsets and label probabilities are
+built here the way the tokenizer and _predict produce them.
+"""
+
+import random
+import re
+
+import numpy as np
+import pytest
+
+LABELS = ["O", "B-PER", "I-PER", "B-ORG", "I-ORG"]
+LABEL_MAP = dict(enumerate(LABELS))
+
+TEXT = "Mötet hölls igår med Anna Maria Berg från Volvo Personvagnar AB i Göteborg enligt protokollet"
+GOLD = ["O", "O", "O", "O", "B-PER", "I-PER", "I-PER", "O", "B-ORG", "I-ORG", "I-ORG", "O", "O", "O", "O"]
+EXPECTED = [("Anna Maria Berg", "PER"), ("Volvo Personvagnar AB", "ORG")]
+
+
+@pytest.fixture(scope="module")
+def ner(import_nlp):
+    return import_nlp("ner")
+
+
+def word_offsets(text):
+    """One token per word, as (start, end) character offsets."""
+    return [m.span() for m in re.finditer(r"\S+", text)]
+
+
+def split_windows(count, size, overlap):
+    """Token indices of each window, like the tokenizer's stride/overflow split."""
+    windows = []
+    start = 0
+    while True:
+        windows.append(list(range(start, min(start + size, count))))
+        if start + size >= count:
+            return windows
+        start += size - overlap
+
+
+def window_inputs(offsets, labels, window, edge_label=None, score=0.9):
+    """
+    Offsets and probabilities for one window, framed by special tokens.
+
+    With edge_label, the window's first and last tokens are predicted as
+    that label instead, as a model does with no context on one side.
+    """
+    window_offsets = [(0, 0)] + [offsets[i] for i in window] + [(0, 0)]
+    predicted = ["O"] + [labels[i] for i in window] + ["O"]
+    if edge_label is not None:
+        predicted[1] = predicted[-2] = edge_label
+
+    probabilities = np.full((len(predicted), len(LABELS)), (1 - score) / (len(LABELS) - 1))
+    for j, label in enumerate(predicted):
+        probabilities[j, LABELS.index(label)] = score
+    return window_offsets, probabilities
+
+
+def collect(ner, windows, offsets, labels, edge_label=None):
+    tokens = {}
+    for window in windows:
+        ner.NamedEntityRecognizer._collect_window(
+            tokens, *window_inputs(offsets, labels, window, edge_label)
+        )
+    return tokens
+
+
+def decode(ner, tokens, text=TEXT):
+    entities = ner.NamedEntityRecognizer._decode_bio(text, sorted(tokens.items()), LABEL_MAP)
+    return [(e.text, e.label) for e in entities]
+
+
+class TestCollectWindow:
+    """Tests for NamedEntityRecognizer._collect_window."""
+
+    @pytest.mark.parametrize("size,overlap", [(5, 2), (6, 3), (4, 1), (15, 0)])
+    def test_entity_across_window_boundary(self, ner, size, overlap):
+        offsets = word_offsets(TEXT)
+        windows = split_windows(len(offsets), size, overlap)
+        tokens = collect(ner, windows, offsets, GOLD)
+
+        assert decode(ner, tokens) == EXPECTED
+
+    def test_overlap_tokens_kept_once(self, ner):
+        offsets = word_offsets(TEXT)
+        windows = split_windows(len(offsets), 5, 2)
+        # "Anna" ends the first window, which shares "med Anna" with the second
+        assert windows[0][-1] == 4 and windows[1][0] == 3
+
+        tokens = collect(ner, windows, offsets, GOLD)
+
+        assert sorted(tokens) == [start for start, _ in offsets]
+        assert [(start, end) for start, (_, end, _, _) in sorted(tokens.items())] == offsets
+        assert len(decode(ner, tokens)) == len(EXPECTED)
+
+    def test_prediction_from_most_central_window(self, ner):
+        offsets = word_offsets(TEXT)
+        windows = split_windows(len(offsets), 5, 2)
+
+        # Every window drops the entity label at its edge tokens; each
+        # overlap token sits further inside the neighbouring window, whose
+        # prediction wins
+        tokens = collect(ner, windows, offsets, GOLD, edge_label="O")
+
+        assert decode(ner, tokens) == EXPECTED
+        for index, (start, _) in enumerate(offsets[1:-1], start=1):
+            distance, _, pred, _ = tokens[start]
+            assert distance > 0
+            assert LABEL_MAP[pred] == GOLD[index]
+
+    def test_window_order_does_not_matter(self, ner):
+        offsets = word_offsets(TEXT)
+        windows = split_windows(len(offsets), 5, 2)
+        expected = collect(ner, windows, offsets, GOLD, edge_label="O")
+
+        # Batches are sorted by window length, so windows arrive out of order
+        rng = random.Random(3)
+        for _ in range(10):
+            shuffled = windows[:]
+            rng.shuffle(shuffled)
+            assert collect(ner, shuffled, offsets, GOLD, edge_label="O") == expected
+
+    def test_special_tokens_ignored(self, ner):
+        tokens = {}
+        offsets, probabilities = window_inputs([(0, 4)], ["B-PER"], [0])
+        # Padding rows after the closing special token
+        offsets = offsets + [(0, 0), (0, 0)]
+        probabilities = np.vstack([probabilities, probabilities[:2]])
+
+        ner.NamedEntityRecognizer._collect_window(tokens, offsets, probabilities)
+
+        assert tokens == {0: (0, 4, LABELS.index("B-PER"), pytest.approx(0.9))}
+
+    def test_window_without_text_tokens(self, ner):
+        tokens = {}
+        ner.NamedEntityRecognizer._collect_window(tokens, [(0, 0), (0, 0)], np.ones((2, len(LABELS))))
+        assert tokens == {}
+
+
+class TestDecodeBio:
+    """Tests for NamedEntityRecognizer._decode_bio."""
+
+    @staticmethod
+    def tokens(text, labels, scores=None):
+        scores = scores or [0.9] * len(labels)
+        return [
+            (start, (0, end, LABELS.index(label), score))
+            for (start, end), label, score in zip(word_offsets(text), labels, scores)
+        ]
+
+    def test_spans_and_confidence(self, ner):
+        text = "Anna Maria Berg och Volvo AB"
+        tokens = self.tokens(text, ["B-PER", "I-PER", "I-PER", "O", "B-ORG", "I-ORG"], [0.9, 0.6, 0.8, 0.9, 0.7, 0.95])
+
+        entities = ner.NamedEntityRecognizer._decode_bio(text, tokens, LABEL_MAP)
+
+        assert [(e.text, e.label, e.start, e.end) for e in entities] == [
+            ("Anna Maria Berg", "PER", 0, 15),
+            ("Volvo AB", "ORG", 20, 28),
+        ]
+        assert [e.confidence for e in entities] == pytest.approx([0.6, 0.7])
+
+    def test_adjacent_entities(self, ner):
+        text = "Anna Volvo AB"
+        tokens = self.tokens(text, ["B-PER", "B-ORG", "I-ORG"])
+        assert decode(ner, dict(tokens), text) == [("Anna", "PER"), ("Volvo AB", "ORG")]
+
+    def test_continuation_without_begin_ignored(self, ner):
+        text = "och Berg igen"
+        tokens = self.tokens(text, ["O", "I-PER", "O"])
+        assert decode(ner, dict(tokens), text) == []
@@ -0,0 +1,138 @@
+"""
+Tests for the pipeline job queue (PipelineDatabase).
+"""
+
+import pytest
+
+from halo.pipeline.orchestrator import JobStatus, PipelineDatabase, PipelineStage
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "pipeline.db"
+
+
+@pytest.fixture
+def db(db_path):
+    database = PipelineDatabase(db_path)
+    yield database
+    database.close()
+
+
+def _seed(db, count):
+    """Add org numbers and move them to the Bolagsverket stage."""
+    db.add_orgnrs([f"55{i:08d}" for i in range(count)])
+    jobs = db.get_jobs_for_stage(PipelineStage.SCB, limit=count)
+    db.advance_jobs(jobs)
+
+
+class TestPipelineDatabase:
+    """Tests for bulk writes, stats and job leasing."""
+
+    def test_add_orgnrs_ignores_duplicates(self, db):
+        """Bulk insert reports only newly added org numbers."""
+        assert db.add_orgnrs(["5560000001", "5560000002"]) == 2
+        assert db.add_orgnrs(["5560000002", "5560000003"]) == 1
+
+        stats = db.get_stats()
+        assert stats["total_jobs"] == 3
+        assert stats["scb_pending"] == 3
+        assert stats["graph_completed"] == 0
+
+    def test_advance_jobs(self, db):
+        """Jobs advance through the stages in order."""
+        _seed(db, 5)
+        stats = db.get_stats()
+        assert stats["bolagsverket_pending"] == 5
+        assert stats["scb_pending"] == 0
+
+        jobs = db.get_jobs_for_stage(PipelineStage.BOLAGSVERKET, limit=10)
+        db.advance_jobs(jobs)
+        assert db.get_stats()["allabolag_pending"] == 5
+
+    def test_claim_is_exclusive_across_connections(self, db, db_path):
+        """Two workers on separate connections never receive the same job."""
+        _seed(db, 10)
+        other = PipelineDatabase(db_path)
+        try:
+            first = db.claim_jobs(PipelineStage.BOLAGSVERKET, "worker-a", limit=6)
+            second = other.claim_jobs(PipelineStage.BOLAGSVERKET, "worker-b", limit=6)
+        finally:
+            other.close()
+
+        assert len(first) == 6
+        assert len(second) == 4
+        assert not {j.orgnr for j in first} & {j.orgnr for j in second}
+        assert all(j.status == JobStatus.IN_PROGRESS for j in first + second)
+        assert db.get_stats()["bolagsverket_in_progress"] == 10
+
+    def test_expired_lease_is_reclaimed(self, db):
+        """Jobs from a crashed worker become claimable once the lease expires."""
+        _seed(db, 3)
+        claimed = db.claim_jobs(PipelineStage.BOLAGSVERKET, "crashed", lease_seconds=-1)
+        assert len(claimed) == 3
+
+        reclaimed = db.claim_jobs(PipelineStage.BOLAGSVERKET, "worker-b")
+        assert {j.orgnr for j in reclaimed} == {j.orgnr for j in claimed}
+
+    def test_active_lease_is_not_reclaimed(self, db):
+        """Jobs under a live lease are not handed out again."""
+        _seed(db, 3)
+        db.claim_jobs(PipelineStage.BOLAGSVERKET, "worker-a")
+        assert db.claim_jobs(PipelineStage.BOLAGSVERKET, "worker-b") == []
+
+    def test_update_releases_lease(self, db):
+        """Finishing a claimed job clears its lease and stores its data."""
+        _seed(db, 2)
+        jobs = db.claim_jobs(PipelineStage.BOLAGSVERKET, "worker-a")
+        jobs[0].bolagsverket_data = {"name": "Test AB"}
+        jobs[1].status = JobStatus.FAILED
+        jobs[1].error = "not found"
+
+        db.advance_jobs([jobs[0]])
+        db.update_jobs([jobs[1]])
+
+        stats = db.get_stats()
+        assert stats["allabolag_pending"] == 1
+        assert stats["bolagsverket_failed"] == 1
+
+        row = db._conn.execute(
+            "SELECT lease_owner, lease_expires, bolagsverket_data FROM pipeline_jobs WHERE orgnr = ?",
+            (jobs[0].orgnr,),
+        ).fetchone()
+        assert row["lease_owner"] is None
+        assert row["lease_expires"] is None
+        assert "Test AB" in row["bolagsverket_data"]
+
+    def test_stale_worker_cannot_overwrite_reclaimed_job(self, db, db_path):
+        """A worker whose lease expired and was reclaimed loses its write."""
+        _seed(db, 2)
+        stale = db.claim_jobs(PipelineStage.BOLAGSVERKET, "worker-a", lease_seconds=-1)
+        other = PipelineDatabase(db_path)
+        try:
+            current = other.claim_jobs(PipelineStage.BOLAGSVERKET, "worker-b")
+            assert {j.orgnr for j in current} == {j.orgnr for j in stale}
+
+            stale[0].bolagsverket_data = {"name": "Stale AB"}
+            stale[1].retry_count = 2
+            stale[1].status = JobStatus.FAILED
+            assert db.advance_jobs([stale[0]]) == [stale[0]]
+            assert not db.update_job(stale[1])
+
+            stats = db.get_stats()
+            assert stats["bolagsverket_in_progress"] == 2
+            assert stats["allabolag_pending"] == 0
+
+            current[0].bolagsverket_data = {"name": "Current AB"}
+            assert other.advance_jobs(current) == []
+        finally:
+            other.close()
+
+        rows = db._conn.execute(
+            "SELECT current_stage, lease_owner, retry_count, bolagsverket_data FROM pipeline_jobs"
+        ).fetchall()
+        assert {row["current_stage"] for row in rows} == {"allabolag"}
+        assert {row["lease_owner"] for row in rows} == {None}
+        assert {row["retry_count"] for row in rows} == {0}
+        assert not any("Stale AB" in (row["bolagsverket_data"] or "") for row in rows)
+        assert any("Current AB" in (row["bolagsverket_data"] or "") for row in rows)
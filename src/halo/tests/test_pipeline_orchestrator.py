@@ -0,0 +1,137 @@
+"""
+Tests for concurrent stage execution in the pipeline orchestrator.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from halo.ingestion.rate_limiter import RateLimitConfig, RateLimiter
+from halo.pipeline.orchestrator import JobStatus, PipelineOrchestrator, PipelineStage
+
+
+class FakeAdapter:
+    """Bolagsverket adapter stand-in that paces calls through a RateLimiter."""
+
+    def __init__(self, limiter=None, fail=(), throttle=()):
+        self.limiter = limiter
+        self.fail = set(fail)
+        self.throttle = set(throttle)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+
+    async def fetch_company(self, orgnr):
+        if self.limiter:
+            await self.limiter.acquire_async()
+        self.calls.append(orgnr)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if orgnr in self.throttle:
+                request = httpx.Request("POST", "https://example.invalid")
+                raise httpx.HTTPStatusError(
+                    "429", request=request, response=httpx.Response(429, request=request)
+                )
+            if orgnr in self.fail:
+                raise ValueError("boom")
+            return SimpleNamespace(raw_data={"orgnr": orgnr})
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def orchestrator(tmp_path):
+    orch = PipelineOrchestrator(data_dir=tmp_path)
+    orch.RATE_LIMIT_BACKOFF = 0
+    yield orch
+    orch.db.close()
+
+
+def _claim(orch, count):
+    orch.db.add_orgnrs([f"55{i:08d}" for i in range(count)], stage=PipelineStage.BOLAGSVERKET)
+    return orch.db.claim_jobs(PipelineStage.BOLAGSVERKET, orch.worker_id, limit=count)
+
+
+class TestBolagsverketWorkers:
+    """Tests for the Bolagsverket worker pool."""
+
+    @pytest.mark.asyncio
+    async def test_workers_run_concurrently(self, orchestrator):
+        """Jobs are fetched in parallel, bounded by the concurrency setting."""
+        jobs = _claim(orchestrator, 20)
+        adapter = FakeAdapter()
+
+        enriched, directors = await orchestrator._run_bolagsverket_workers(
+            jobs, adapter, None, concurrency=4
+        )
+
+        assert enriched == 20
+        assert directors == 0
+        assert adapter.max_in_flight == 4
+        assert sorted(adapter.calls) == sorted(j.orgnr for j in jobs)
+
+        stats = orchestrator.db.get_stats()
+        assert stats["allabolag_pending"] == 20
+        assert stats["bolagsverket_in_progress"] == 0
+
+    @pytest.mark.asyncio
+    async def test_rate_limiter_bounds_throughput(self, orchestrator):
+        """The token bucket, not the worker count, caps the request rate."""
+        jobs = _claim(orchestrator, 6)
+        limiter = RateLimiter(RateLimitConfig(requests_per_window=3, window_seconds=0.3))
+        adapter = FakeAdapter(limiter=limiter)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        enriched, _ = await orchestrator._run_bolagsverket_workers(
+            jobs, adapter, None, concurrency=6
+        )
+
+        assert enriched == 6
+        assert loop.time() - started >= 0.3
+
+    @pytest.mark.asyncio
+    async def test_failures_and_throttling_requeue(self, orchestrator):
+        """Errors count retries; 429 responses put the job back as pending."""
+        jobs = _claim(orchestrator, 5)
+        adapter = FakeAdapter(fail={jobs[0].orgnr}, throttle={jobs[1].orgnr})
+
+        enriched, _ = await orchestrator._run_bolagsverket_workers(
+            jobs, adapter, None, concurrency=3
+        )
+
+        assert enriched == 3
+        assert jobs[0].status == JobStatus.PENDING
+        assert jobs[0].retry_count == 1
+        assert jobs[1].status == JobStatus.PENDING
+        assert jobs[1].retry_count == 0
+        assert orchestrator.stats.errors == 1
+
+        stats = orchestrator.db.get_stats()
+        assert stats["bolagsverket_pending"] == 2
+        assert stats["allabolag_pending"] == 3
+
+    @pytest.mark.asyncio
+    async def test_completed_jobs_flush_before_batch_ends(self, orchestrator):
+        """Finished jobs reach the next stage while others are still running."""
+        orchestrator.STAGE_FLUSH_SIZE = 2
+        jobs = _claim(orchestrator, 6)
+        adapter = FakeAdapter()
+        seen = []
+
+        original = adapter.fetch_company
+
+        async def fetch_and_observe(orgnr):
+            seen.append(orchestrator.db.get_stats()["allabolag_pending"])
+            return await original(orgnr)
+
+        adapter.fetch_company = fetch_and_observe
+
+        await orchestrator._run_bolagsverket_workers(jobs, adapter, None, concurrency=1)
+
+        assert seen[-1] >= 4
+        assert orchestrator.db.get_stats()["allabolag_pending"] == 6
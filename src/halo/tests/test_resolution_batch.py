@@ -0,0 +1,156 @@
+"""
+Tests for batch scoring in EntityResolver.resolve_batch.
+"""
+
+import random
+from uuid import UUID
+
+import jellyfish
+import pytest
+
+from halo.resolution.blocking import BlockingIndex, CandidateEntity, Mention
+from halo.resolution.comparison import FeatureComparator
+from halo.resolution.resolver import EntityResolver, ResolutionDecision
+
+
+FIRST = ["Anna", "Erik", "Karin", "Lars", "Maria", "Johan", "Eva", "Per"]
+LAST = ["Andersson", "Johansson", "Karlsson", "Nilsson", "Eriksson", "Larsson"]
+
+
+def _entities():
+    rng = random.Random(3)
+    entities = []
+    for i in range(120):
+        name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+        entities.append(CandidateEntity(
+            id=UUID(int=i + 1),
+            entity_type="PERSON",
+            canonical_name=name,
+            attributes={"birth_year": 1950 + i % 40, "companies": [f"c{i % 7}"]},
+        ))
+    for i in range(40):
+        entities.append(CandidateEntity(
+            id=UUID(int=1000 + i),
+            entity_type="COMPANY",
+            canonical_name=f"{rng.choice(LAST)} Bygg AB",
+            identifiers={"ORGANISATIONSNUMMER": f"55{i:08d}"},
+            attributes={"city": rng.choice(["Stockholm", "Malmö"])},
+        ))
+    return entities
+
+
+def _mentions():
+    rng = random.Random(5)
+    mentions = []
+    for i in range(150):
+        if i % 5 == 0:
+            mentions.append(Mention(
+                id=UUID(int=5000 + i),
+                mention_type="COMPANY",
+                surface_form="",
+                normalized_form=f"{rng.choice(LAST)} bygg ab",
+                extracted_orgnummer=f"55{i % 60:08d}",
+                extracted_attributes={"city": "stockholm"},
+            ))
+            continue
+        name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+        if i % 3 == 0:
+            name = name[:-1]
+        mentions.append(Mention(
+            id=UUID(int=5000 + i),
+            mention_type="PERSON",
+            surface_form=name,
+            normalized_form=name.lower(),
+            extracted_attributes={"birth_year": 1950 + i % 40, "companies": [f"c{i % 7}"]},
+        ))
+    return mentions
+
+
+@pytest.fixture
+def resolver():
+    index = BlockingIndex()
+    for entity in _entities():
+        index.add_entity(entity)
+    return EntityResolver(blocking_index=index)
+
+
+def _assert_same(batch_result, single_result):
+    assert batch_result.decision == single_result.decision
+    assert batch_result.score == single_result.score
+    assert [c.entity.id for c in batch_result.all_candidates] == [
+        c.entity.id for c in single_result.all_candidates
+    ]
+    if batch_result.decision != ResolutionDecision.NEW_ENTITY:
+        assert batch_result.entity_id == single_result.entity_id
+
+
+class TestResolveBatch:
+    """Tests for the grouped scoring path."""
+
+    def test_matches_resolve_mention(self, resolver):
+        """Batch decisions equal one-at-a-time resolution."""
+        mentions = _mentions()
+        batch = resolver.resolve_batch(mentions)
+
+        assert len(batch.results) == len(mentions)
+        for mention, result in zip(mentions, batch.results):
+            assert result.mention_id == mention.id
+            _assert_same(result, resolver.resolve_mention(mention))
+
+        decided = batch.stats["auto_matched"] + batch.stats["pending_review"] + batch.stats["new_entities"]
+        assert decided == len(mentions)
+        assert batch.stats["auto_matched"] > 0
+
+    def test_stage_timings_reported(self, resolver):
+        batch = resolver.resolve_batch(_mentions())
+
+        for stage in ("blocking_ms", "scoring_ms", "decision_ms", "clustering_ms"):
+            assert batch.stats[stage] >= 0
+        assert batch.stats["pairs_scored"] > len(batch.results)
+
+    def test_process_pool_scores_match(self, resolver):
+        """Scoring across worker processes returns pairs in input order."""
+        mentions = _mentions()
+        resolver.PARALLEL_MIN_PAIRS = 0
+
+        serial = resolver.resolve_batch(mentions)
+        parallel = resolver.resolve_batch(mentions, workers=2)
+
+        assert parallel.stats["pairs_scored"] == serial.stats["pairs_scored"]
+        for a, b in zip(parallel.results, serial.results):
+            _assert_same(a, b)
+
+    def test_empty_batch(self, resolver):
+        batch = resolver.resolve_batch([])
+
+        assert batch.results == []
+        assert batch.stats["total_mentions"] == 0
+        assert batch.stats["pairs_scored"] == 0
+
+
+class TestFeatureComparator:
+    """Tests for the profile-based string features."""
+
+    @pytest.mark.parametrize("s1,s2", [
+        ("Anna Andersson", "anna andersson"),
+        ("Erik  Nilsson", "ERIK NILSSON AB"),
+        ("Åsa Öberg", "Asa Oberg"),
+        ("Bygg", "Byggare Stockholm"),
+    ])
+    def test_string_features_match_reference(self, s1, s2):
+        comparator = FeatureComparator()
+        t1, t2 = set(s1.lower().split()), set(s2.lower().split())
+
+        assert comparator._jaro_winkler(s1, s2) == jellyfish.jaro_winkler_similarity(s1.lower(), s2.lower())
+        assert comparator._token_jaccard(s1, s2) == len(t1 & t2) / len(t1 | t2)
+        assert comparator._levenshtein_normalized(s1, s2) == 1.0 - (
+            jellyfish.levenshtein_distance(s1.lower(), s2.lower()) / max(len(s1), len(s2))
+        )
+
+    def test_empty_strings_score_zero(self):
+        comparator = FeatureComparator()
+
+        assert comparator._jaro_winkler("", "Anna") == 0.0
+        assert comparator._token_jaccard("Anna", "") == 0.0
+        assert comparator._token_jaccard("  ", "Anna") == 0.0
+        assert comparator._levenshtein_normalized("", "") == 0.0
@@ -8,6 +8,8 @@ Tests screening against:
 - Identifier matching
 """
 
+import random
+
 import pytest
 
 from halo.fincrime.watchlist import (
@@ -15,6 +17,7 @@ from halo.fincrime.watchlist import (
     WatchlistEntry,
     WatchlistType,
     MatchType,
+    _bounded_levenshtein,
 )
 
 
@@ -269,3 +272,91 @@ class TestMatchScoring:
 
         for i in range(len(matches) - 1):
             assert matches[i].match_score >= matches[i + 1].match_score
+
+
+def _reference_fuzzy(checker, name, lists=None):
+    """Brute-force fuzzy scores over every active entry, as the old scan did."""
+    lists = lists or list(WatchlistType)
+    query = checker._normalize_name(name)
+    scores = {}
+    for list_type in lists:
+        for entry in checker._entries[list_type]:
+            if not entry.is_active or query == checker._normalize_name(entry.name):
+                continue
+            score = checker._fuzzy_match(query, entry.name)
+            if score >= checker.min_fuzzy_score:
+                scores[entry.id] = score
+    return scores
+
+
+class TestWatchlistIndex:
+    """The precompiled index must agree with a full scan."""
+
+    FIRST = ["Anna", "Erik", "Lars", "Karin", "Mohammed", "Åsa", "Per", "Li", "Jo"]
+    LAST = ["Andersson", "Eriksson", "Larsson", "Öberg", "Ali", "Ng", "Svensson", "Berg"]
+
+    @pytest.fixture
+    def names(self):
+        rng = random.Random(5)
+
+        def mutate(text):
+            chars = list(text)
+            for _ in range(rng.randint(0, 2)):
+                pos = rng.randrange(len(chars))
+                op = rng.choice(["sub", "del", "ins"])
+                if op == "sub":
+                    chars[pos] = rng.choice("abcdeiklnorsv")
+                elif op == "del" and len(chars) > 2:
+                    del chars[pos]
+                else:
+                    chars.insert(pos, rng.choice("aeiou"))
+            return "".join(chars)
+
+        base = [
+            f"{rng.choice(self.FIRST)} {rng.choice(self.LAST)}" for _ in range(150)
+        ]
+        queries = [mutate(rng.choice(base)) for _ in range(80)] + ["Li", "Ng Li", "Xy"]
+        return base, queries
+
+    @pytest.mark.parametrize("min_score", [0.85, 0.7, 0.5])
+    def test_fuzzy_matches_full_scan(self, names, min_score):
+        base, queries = names
+        checker = WatchlistChecker(min_fuzzy_score=min_score)
+        checker.load_entries([
+            WatchlistEntry(id=f"E{i}", list_type=WatchlistType.SANCTIONS_EU, name=n)
+            for i, n in enumerate(base)
+        ])
+
+        for query in queries:
+            fuzzy = {
+                m.entry.id: m.match_score
+                for m in checker.check_entity(query)
+                if m.match_type == MatchType.FUZZY
+            }
+            assert fuzzy == _reference_fuzzy(checker, query)
+
+    def test_bounded_levenshtein(self):
+        checker = WatchlistChecker()
+        rng = random.Random(9)
+        for _ in range(300):
+            a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 8)))
+            b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 8)))
+            k = rng.randint(0, 5)
+            exact = checker._levenshtein_distance(a, b)
+            assert _bounded_levenshtein(a, b, k) == (exact if exact <= k else k + 1)
+
+    def test_inactive_and_list_filters(self):
+        checker = WatchlistChecker()
+        checker.add_entry(WatchlistEntry(
+            id="A", list_type=WatchlistType.SANCTIONS_UN, name="Karin Berg", is_active=False,
+        ))
+        checker.add_entry(WatchlistEntry(
+            id="B", list_type=WatchlistType.PEP_FOREIGN, name="Karin Berg",
+            identifiers={"passport": "X 123"},
+        ))
+
+        assert [m.entry.id for m in checker.check_entity("Karin Berg")] == ["B"]
+        assert checker.check_entity("Karin Berg", lists_to_check=[WatchlistType.SANCTIONS_UN]) == []
+
+        matches = checker.check_entity("Someone", identifier="x-123", identifier_type="passport")
+        assert [(m.entry.id, m.match_type) for m in matches] == [("B", MatchType.IDENTIFIER)]
@@ -0,0 +1,241 @@
+"""
+Unit tests for the allabolag scraper's concurrent crawl scheduler.
+"""
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+from allabolag_scraper.config import ScraperConfig
+from allabolag_scraper.scraper import scheduler as scheduler_module
+from allabolag_scraper.scraper.orchestrator import Orchestrator
+from allabolag_scraper.scraper.scheduler import CrawlScheduler, PolitenessBudget
+from allabolag_scraper.scraper.worker import FetchResult, FetchType
+
+COMPANIES = [f"55600000{i:02d}" for i in range(6)]
+PERSONS = [(f"p{i}", f"Person {i}") for i in range(4)]
+
+
+class FakeWorker:
+    """Stands in for Worker: answers from a script of status codes per identifier."""
+
+    def __init__(self, responses=None, default=404, delays=None):
+        self.responses = {k: list(v) for k, v in (responses or {}).items()}
+        self.default = default
+        self.delays = delays or {}
+        self.fetches = Counter()
+        self.starts = []
+
+    def __call__(self, config):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def _fetch(self, identifier, kind):
+        self.fetches[identifier] += 1
+        self.starts.append(asyncio.get_running_loop().time())
+        await asyncio.sleep(self.delays.get(identifier, 0))
+        script = self.responses.get(identifier)
+        status = script.pop(0) if script else self.default
+        error = None if status == 404 else f"HTTP {status}"
+        return FetchResult(identifier, kind, None, status, error)
+
+    async def fetch_company(self, org_nr):
+        return await self._fetch(org_nr, FetchType.COMPANY)
+
+    async def fetch_person(self, name, person_id):
+        return await self._fetch(person_id, FetchType.PERSON)
+
+
+@pytest.fixture
+def config(tmp_path):
+    return ScraperConfig(
+        database_path=tmp_path / "allabolag.db",
+        min_delay=0.0,
+        max_delay=0.0,
+        max_workers=3,
+        batch_size=2,
+        max_retries=3,
+    )
+
+
+@pytest.fixture
+def orchestrator(config):
+    orchestrator = Orchestrator(config)
+    orchestrator.conn.executemany(
+        "INSERT INTO company_scrape_queue (org_nr) VALUES (?)", [(o,) for o in COMPANIES]
+    )
+    orchestrator.conn.executemany(
+        "INSERT INTO person_scrape_queue (allabolag_person_id, name) VALUES (?, ?)", PERSONS
+    )
+    orchestrator.conn.commit()
+    yield orchestrator
+    orchestrator.conn.close()
+
+
+def statuses(orchestrator, table="company_scrape_queue", key="org_nr"):
+    rows = orchestrator.conn.execute(f"SELECT {key}, status, attempts FROM {table}")
+    return {row[0]: (row[1], row[2]) for row in rows}
+
+
+def record_slots(monkeypatch):
+    """Collect every slot PolitenessBudget.acquire reserves."""
+    slots = []
+    acquire = PolitenessBudget.acquire
+
+    async def recording_acquire(self):
+        slot = await acquire(self)
+        slots.append(slot)
+        return slot
+
+    monkeypatch.setattr(PolitenessBudget, "acquire", recording_acquire)
+    return slots
+
+
+async def crawl(orchestrator, worker, monkeypatch, timeout=10):
+    monkeypatch.setattr(scheduler_module, "Worker", worker)
+    scheduler = CrawlScheduler(orchestrator)
+    await asyncio.wait_for(scheduler.run(), timeout)
+    return scheduler
+
+
+class TestCrawlScheduler:
+    """Tests for CrawlScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_runs_to_completion(self, orchestrator, monkeypatch):
+        worker = FakeWorker()
+        await crawl(orchestrator, worker, monkeypatch)
+
+        assert set(worker.fetches) == set(COMPANIES) | {p for p, _ in PERSONS}
+        assert set(worker.fetches.values()) == {1}
+        assert set(statuses(orchestrator).values()) == {("completed", 0)}
+        people = statuses(orchestrator, "person_scrape_queue", "allabolag_person_id")
+        assert set(people.values()) == {("completed", 0)}
+        assert orchestrator.pending == {"company": 0, "person": 0}
+        assert len(orchestrator.writer) == 0
+
+    @pytest.mark.asyncio
+    async def test_empty_queue_terminates(self, config, monkeypatch):
+        orchestrator = Orchestrator(config)
+        try:
+            worker = FakeWorker()
+            await crawl(orchestrator, worker, monkeypatch)
+            assert not worker.fetches
+        finally:
+            orchestrator.conn.close()
+
+    @pytest.mark.asyncio
+    async def test_retry_cap(self, orchestrator, config, monkeypatch):
+        failing = COMPANIES[0]
+        worker = FakeWorker(responses={failing: [500] * 10})
+        await crawl(orchestrator, worker, monkeypatch)
+
+        assert worker.fetches[failing] == config.max_retries
+        assert statuses(orchestrator)[failing] == ("failed", config.max_retries)
+        assert orchestrator.company_stats["failed"] == config.max_retries
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_backs_off_without_using_attempts(self, orchestrator, monkeypatch):
+        limited = COMPANIES[1]
+        worker = FakeWorker(responses={limited: [429, 429, 429, 429]})
+        scheduler = await crawl(orchestrator, worker, monkeypatch)
+
+        # Four 429s exceed max_retries, but rate limits do not count as attempts
+        assert worker.fetches[limited] == 5
+        assert statuses(orchestrator)[limited] == ("completed", 0)
+        assert scheduler.budget.multiplier > 1.0
+
+    @pytest.mark.asyncio
+    async def test_workers_share_request_spacing(self, orchestrator, config, monkeypatch):
+        config.min_delay = config.max_delay = 0.02
+        worker = FakeWorker(delays={o: 0.1 for o in COMPANIES})
+        slots = record_slots(monkeypatch)
+        await crawl(orchestrator, worker, monkeypatch)
+
+        assert len(worker.starts) == len(COMPANIES) + len(PERSONS)
+        assert len(slots) == len(worker.starts)
+        slots.sort()
+        assert all(b - a >= 0.02 - 1e-9 for a, b in zip(slots, slots[1:]))
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_does_not_abort(self, orchestrator, monkeypatch):
+        flush = orchestrator.flush
+        calls = []
+
+        def failing_flush():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("disk I/O error")
+            flush()
+
+        monkeypatch.setattr(orchestrator, "flush", failing_flush)
+        worker = FakeWorker()
+        await crawl(orchestrator, worker, monkeypatch)
+
+        assert len(calls) > 1
+        assert set(worker.fetches) == set(COMPANIES) | {p for p, _ in PERSONS}
+
+    @pytest.mark.asyncio
+    async def test_timed_flush(self, orchestrator, config, monkeypatch):
+        """Buffered results are written after flush_interval while fetches are still running."""
+        config.flush_interval = 0.05
+        orchestrator.writer.flush_interval = 0.05
+        slow = COMPANIES[-1]
+        worker = FakeWorker(delays={slow: 1.0})
+        written_early = []
+
+        async def watch():
+            await asyncio.sleep(0.5)
+            written_early.extend(
+                org_nr for org_nr, (status, _) in statuses(orchestrator).items() if status == "completed"
+            )
+
+        monkeypatch.setattr(scheduler_module, "Worker", worker)
+        watcher = asyncio.create_task(watch())
+        await asyncio.wait_for(CrawlScheduler(orchestrator, workers=1).run(), 10)
+        await watcher
+
+        assert written_early
+        assert slow not in written_early
+
+
+class TestPolitenessBudget:
+    """Tests for PolitenessBudget."""
+
+    @pytest.mark.asyncio
+    async def test_spacing_between_request_starts(self):
+        budget = PolitenessBudget(0.05, 0.05)
+        loop = asyncio.get_running_loop()
+
+        async def request():
+            slot = await budget.acquire()
+            # asyncio may wake up to one clock tick early, never meaningfully so
+            assert loop.time() >= slot - 0.001
+            return slot
+
+        slots = await asyncio.gather(*(request() for _ in range(5)))
+
+        # Concurrent requests get back-to-back slots, in the order they asked
+        assert slots == sorted(slots)
+        assert [b - a for a, b in zip(slots, slots[1:])] == pytest.approx([0.05] * 4)
+
+    @pytest.mark.asyncio
+    async def test_back_off_and_recover(self):
+        budget = PolitenessBudget(0.02, 0.02, backoff_factor=2.0, max_backoff=4.0)
+        for _ in range(5):
+            budget.back_off()
+        assert budget.multiplier == 4.0
+
+        first = await budget.acquire()
+        second = await budget.acquire()
+        assert second - first == pytest.approx(0.08)
+
+        for _ in range(50):
+            budget.recover()
+        assert budget.multiplier == 1.0
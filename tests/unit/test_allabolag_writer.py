@@ -0,0 +1,169 @@
+"""
+Unit tests for the allabolag scraper's batched database writer.
+"""
+
+import sqlite3
+
+import pytest
+
+from allabolag_scraper.config import ScraperConfig
+from allabolag_scraper.db.connection import MIN_SQLITE_VERSION, init_db
+from allabolag_scraper.db.writer import BatchWriter
+from allabolag_scraper.scraper.orchestrator import Orchestrator
+from allabolag_scraper.scraper.parser_company import Company, Person
+
+NOW = "2024-05-01T12:00:00"
+
+
+def make_company(org_nr, revenue=1000, persons=()):
+    return Company(
+        org_nr=org_nr,
+        name=f"Bolag {org_nr} AB",
+        legal_name=None,
+        status="ACTIVE",
+        status_date=None,
+        registration_date=None,
+        company_type="AB",
+        sni_code=None,
+        sni_name=None,
+        municipality="Stockholm",
+        county="Stockholm",
+        parent_org_nr=None,
+        parent_name=None,
+        revenue=revenue,
+        profit=None,
+        employees=3,
+        allabolag_company_id=None,
+        persons=list(persons),
+        raw_json={},
+    )
+
+
+def board_member(person_id, name="Anna Berg"):
+    return Person(name=name, birth_date=None, allabolag_id=person_id, role="Ledamot", role_group="Board")
+
+
+@pytest.fixture
+def config(tmp_path):
+    return ScraperConfig(database_path=tmp_path / "allabolag.db")
+
+
+@pytest.fixture
+def conn(config):
+    conn = init_db(config)
+    conn.executemany(
+        "INSERT INTO company_scrape_queue (org_nr, status) VALUES (?, 'in_progress')",
+        [("5560000001",), ("5560000002",), ("5560000003",)],
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def queue_status(conn, org_nr):
+    row = conn.execute(
+        "SELECT status, attempts FROM company_scrape_queue WHERE org_nr = ?", (org_nr,)
+    ).fetchone()
+    return tuple(row)
+
+
+def company_names(conn):
+    return {row[0] for row in conn.execute("SELECT org_nr FROM companies")}
+
+
+class TestInitDb:
+    """Tests for init_db."""
+
+    def test_requires_returning_support(self, config, monkeypatch):
+        monkeypatch.setattr(sqlite3, "sqlite_version_info", (3, 34, 1))
+        with pytest.raises(RuntimeError, match="3.35.0"):
+            init_db(config)
+
+        monkeypatch.setattr(sqlite3, "sqlite_version_info", MIN_SQLITE_VERSION)
+        init_db(config).close()
+
+
+class TestBatchWriter:
+    """Tests for BatchWriter."""
+
+    def test_data_and_completion_in_one_transaction(self, conn):
+        writer = BatchWriter(conn, batch_size=10)
+        writer.add_company(make_company("5560000001", persons=[board_member("p1")]), NOW)
+        writer.complete_company("5560000001")
+
+        # Nothing is visible before the flush
+        assert company_names(conn) == set()
+        assert queue_status(conn, "5560000001") == ("in_progress", 0)
+
+        queued = writer.flush()
+        assert queued == {"company": 0, "person": 1}
+        assert company_names(conn) == {"5560000001"}
+        assert queue_status(conn, "5560000001") == ("completed", 0)
+        assert conn.execute("SELECT COUNT(*) FROM roles").fetchone()[0] == 1
+        assert len(writer) == 0
+        assert writer.stats["flushes"] == 1
+
+    def test_due(self, conn):
+        writer = BatchWriter(conn, batch_size=2, flush_interval=3600)
+        assert not writer.due()
+        writer.complete_company("5560000001")
+        assert not writer.due()
+        writer.complete_company("5560000002")
+        assert writer.due()
+
+        writer.flush()
+        writer.flush_interval = 0
+        writer.complete_company("5560000003")
+        assert writer.due()
+
+    def test_failed_flush_isolates_bad_record(self, conn):
+        writer = BatchWriter(conn, batch_size=10)
+        for org_nr, revenue in [("5560000001", 1), ("5560000002", 2**70), ("5560000003", 3)]:
+            writer.add_company(make_company(org_nr, revenue=revenue, persons=[board_member(f"p{org_nr}")]), NOW)
+            writer.complete_company(org_nr)
+
+        queued = writer.flush()
+
+        assert company_names(conn) == {"5560000001", "5560000003"}
+        assert queue_status(conn, "5560000001")[0] == "completed"
+        assert queue_status(conn, "5560000002")[0] == "in_progress"
+        assert queued == {"company": 0, "person": 2}
+        assert len(writer) == 0
+        assert writer.stats["dropped"] == 1
+
+        failed = writer.take_failed()
+        assert [(kind, identifier) for kind, identifier, _ in failed] == [("company", "5560000002")]
+        assert writer.take_failed() == []
+
+    def test_flush_after_failure(self, conn):
+        writer = BatchWriter(conn, batch_size=10)
+        writer.add_company(make_company("5560000001", revenue=2**70), NOW)
+        writer.complete_company("5560000001")
+        writer.flush()
+
+        writer.add_company(make_company("5560000002"), NOW)
+        writer.complete_company("5560000002")
+        writer.flush()
+
+        assert company_names(conn) == {"5560000002"}
+        assert queue_status(conn, "5560000002")[0] == "completed"
+
+
+class TestOrchestratorFlush:
+    """Tests for Orchestrator.flush with dropped records."""
+
+    def test_dropped_records_are_requeued(self, config, conn):
+        orchestrator = Orchestrator(config)
+        try:
+            orchestrator.save_company(make_company("5560000001", revenue=2**70))
+            orchestrator.mark_company_completed("5560000001")
+            orchestrator.save_company(make_company("5560000002"))
+            orchestrator.mark_company_completed("5560000002")
+            orchestrator.flush()
+
+            assert queue_status(orchestrator.conn, "5560000001") == ("pending", 1)
+            assert queue_status(orchestrator.conn, "5560000002") == ("completed", 0)
+            assert orchestrator.pending["company"] == 1
+            assert orchestrator.company_stats["failed"] == 1
+        finally:
+            orchestrator.conn.close()
@@ -0,0 +1,107 @@
+"""
+Unit tests for __NEXT_DATA__ extraction in the allabolag scraper.
+"""
+
+import json
+
+import pytest
+
+from allabolag_scraper.scraper.next_data import (
+    extract_next_data,
+    extract_next_data_fast,
+    extract_next_data_soup,
+)
+
+DATA = {
+    "props": {"pageProps": {"company": {
+        "orgnr": "5567037485",
+        "name": "Spotify AB",
+        "legalName": "Spotify AB",
+        "location": {"municipality": "Stockholm", "county": "Stockholms län"},
+        "roles": {"roleGroups": [{"name": "Board", "roles": [
+            {"type": "Person", "name": "Åsa Öberg", "id": "123", "birthDate": "01.02.1970"},
+        ]}]},
+        "purpose": "Bolaget ska bedriva handel med <musik> & tjänster",
+    }}},
+    "page": "/foretag/[orgnr]",
+    "buildId": "abc123",
+}
+
+
+def page(script, head_scripts=True):
+    """Markup shaped like an allabolag.se company page around one script tag."""
+    head = (
+        '<script src="/_next/static/chunks/webpack.js" defer=""></script>'
+        '<script>window.dataLayer=window.dataLayer||[];</script>'
+        if head_scripts else ''
+    )
+    rows = "".join(f'<div class="row"><span>Rad {i}</span><a href="/x/{i}">länk</a></div>' for i in range(50))
+    return (
+        '<!DOCTYPE html><html lang="sv"><head><meta charset="utf-8"/>'
+        f'<title>Spotify AB - Org.nr 556703-7485</title>{head}</head>'
+        f'<body><div id="__next">{rows}</div>{script}</body></html>'
+    )
+
+
+def next_data(body, attrs='id="__NEXT_DATA__" type="application/json"'):
+    return f'<script {attrs}>{body}</script>'
+
+
+# Next.js escapes "</" in the blob, so the JSON cannot close the tag
+ENCODED = json.dumps(DATA, ensure_ascii=False).replace("</", "<\\/")
+
+PAGES = {
+    "standard": page(next_data(ENCODED)),
+    "attribute order": page(next_data(ENCODED, 'type="application/json" id="__NEXT_DATA__"')),
+    "crossorigin": page(next_data(ENCODED, 'id="__NEXT_DATA__" type="application/json" crossorigin=""')),
+    "whitespace": page(next_data(f"\n  {ENCODED}\n")),
+    "marker in inline script": page(
+        '<script>window.__NEXT_DATA__ && console.log(1)</script>' + next_data(ENCODED)
+    ),
+    "no head scripts": page(next_data(ENCODED), head_scripts=False),
+    "no marker": page(""),
+    "empty marker": page(next_data("")),
+    "blank marker": page(next_data("   \n ")),
+    "malformed json": page(next_data(ENCODED[:-10])),
+    "json not an object": page(next_data("[1, 2, 3]")),
+    "unterminated tag": page("")[:-len("</body></html>")] + '<script id="__NEXT_DATA__">' + ENCODED,
+}
+
+EXPECTED_MISSING = {"no marker", "empty marker", "blank marker", "malformed json", "json not an object"}
+
+
+class TestExtractNextData:
+    """Tests for extract_next_data."""
+
+    @pytest.mark.parametrize("name", sorted(PAGES))
+    @pytest.mark.parametrize("encoding", ["str", "bytes"])
+    def test_matches_beautifulsoup(self, name, encoding):
+        html = PAGES[name]
+        if encoding == "bytes":
+            html = html.encode("utf-8")
+
+        expected = extract_next_data_soup(html)
+        assert extract_next_data(html) == expected
+        if name in EXPECTED_MISSING:
+            assert expected is None
+        elif name != "unterminated tag":
+            assert expected == DATA
+
+    @pytest.mark.parametrize("name", sorted(set(PAGES) - EXPECTED_MISSING - {"unterminated tag"}))
+    def test_fast_path_answers(self, name):
+        assert extract_next_data_fast(PAGES[name].encode("utf-8")) == DATA
+
+    def test_malformed_json_returns_none(self):
+        assert extract_next_data_fast(PAGES["malformed json"]) is None
+        assert extract_next_data(PAGES["malformed json"].encode("utf-8")) is None
+
+    @pytest.mark.parametrize("empty", ["", "  \n"])
+    def test_skips_empty_marker(self, empty):
+        html = page(next_data(empty) + next_data(ENCODED))
+        assert extract_next_data_fast(html) == DATA
+        assert extract_next_data_fast(html.encode("utf-8")) == DATA
+        assert extract_next_data_soup(html) == DATA
+
+    def test_invalid_utf8(self):
+        html = page(next_data(ENCODED)).encode("utf-8").replace("Rad 1<".encode(), b"Rad \xff<")
+        assert extract_next_data(html) == DATA